@@ -1,16 +1,46 @@
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from sunstone_backend.settings import get_settings
-from .routes import artifacts, projects, runs
+from .routes import artifacts, projects, runs, sweeps
 from .routes import backends, ulf, materials, materials_expand
 
 
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    import sys
+
+    from sunstone_backend.scheduler import get_scheduler
+    from sunstone_backend.ssh_poller import get_ssh_poller
+    from sunstone_backend.worker_pool import get_worker_pool
+
+    settings = get_settings()
+    pool = get_worker_pool(settings)
+    if pool is not None:
+        for backend in settings.local_worker_pool_prewarm:
+            pool.warm(sys.executable, backend.strip().lower())
+    # Start local runs queued before this API process came up and keep starting them as slots free
+    scheduler = get_scheduler(settings.data_dir, pool=pool)
+    scheduler.start_daemon(settings)
+    # Probe SSH runs (including ones submitted before a restart) in one batch per host
+    poller = get_ssh_poller(settings)
+    poller.start(settings.data_dir)
+    try:
+        yield
+    finally:
+        poller.stop()
+        scheduler.stop_daemon()
+        if pool is not None:
+            pool.shutdown()
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
-    app = FastAPI(title="SunStone API", version="0.1.0")
+    app = FastAPI(title="SunStone API", version="0.1.0", lifespan=_lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -23,6 +53,7 @@ def create_app() -> FastAPI:
 
     app.include_router(projects.router)
     app.include_router(runs.router)
+    app.include_router(sweeps.router)
     app.include_router(artifacts.router)
     app.include_router(backends.router)
     app.include_router(ulf.router)
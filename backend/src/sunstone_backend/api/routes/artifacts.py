@@ -4,17 +4,22 @@ import os
 from pathlib import Path
 import json
 import io
+import logging
 import zipfile
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import FileResponse, StreamingResponse
 
 from ...models.api import ArtifactEntry, ArtifactList
+from ...monitor_data import iter_monitor_csv, list_monitors, read_monitor_series
+from ...remote_sync import sync_remote_run
 from ...settings import Settings, get_settings
 from ...store import RunStore
 from ...util.paths import safe_join
 
 router = APIRouter(tags=["artifacts"])
+logger = logging.getLogger(__name__)
 
 
 def _store(settings: Settings) -> RunStore:
@@ -23,6 +28,15 @@ def _store(settings: Settings) -> RunStore:
     return s
 
 
+def _sync_remote(store: RunStore, run_id: str, settings: Settings, force: bool = False) -> None:
+    """Pull an SSH run's outputs before serving them (no-op for other runs or a recent pull)."""
+    try:
+        sync_remote_run(store, run_id, max_age=0.0 if force else settings.ssh_sync_interval)
+    except Exception as e:
+        # serve whatever was synced before; the host may just be unreachable right now
+        logger.warning(f"Could not sync remote run {run_id}: {e}")
+
+
 def _iter_artifacts(run_dir: Path) -> list[ArtifactEntry]:
     artifacts: list[ArtifactEntry] = []
     for rel_root in ["outputs", "logs", "runtime"]:
@@ -49,6 +63,7 @@ def list_artifacts(run_id: str, settings: Settings = Depends(get_settings)) -> A
     run_dir = store.run_dir(run_id)
     if not run_dir.exists():
         raise HTTPException(status_code=404, detail="run not found")
+    _sync_remote(store, run_id, settings)
     return ArtifactList(run_id=run_id, artifacts=_iter_artifacts(run_dir))
 
 
@@ -64,12 +79,61 @@ def download_artifact(run_id: str, path: str, settings: Settings = Depends(get_s
     except ValueError as err:
         raise HTTPException(status_code=400, detail="invalid path") from err
 
+    _sync_remote(store, run_id, settings, force=not resolved.is_file())
     if not resolved.exists() or not resolved.is_file():
         raise HTTPException(status_code=404, detail="artifact not found")
 
     return FileResponse(str(resolved), filename=os.path.basename(resolved))
 
 
+@router.get("/runs/{run_id}/monitors")
+def list_run_monitors(run_id: str, settings: Settings = Depends(get_settings)) -> list[dict]:
+    """Monitor time series of a run (Zarr outputs), with their components and sample counts."""
+    store = _store(settings)
+    run_dir = store.run_dir(run_id)
+    if not run_dir.exists():
+        raise HTTPException(status_code=404, detail="run not found")
+    _sync_remote(store, run_id, settings)
+    return list_monitors(run_dir)
+
+
+@router.get("/runs/{run_id}/monitors/{monitor_id}")
+def get_monitor_series(
+    run_id: str,
+    monitor_id: str,
+    component: list[str] | None = Query(default=None),
+    start: int | None = None,
+    stop: int | None = None,
+    step: int | None = Query(default=None, ge=1),
+    format: Literal["json", "csv"] = "json",
+    settings: Settings = Depends(get_settings),
+):
+    """One monitor's samples[start:stop:step] as JSON, or the whole series as a CSV export.
+
+    Complex components are returned as {"re": [...], "im": [...]} in JSON and as a+bj in CSV.
+    """
+    store = _store(settings)
+    run_dir = store.run_dir(run_id)
+    if not run_dir.exists():
+        raise HTTPException(status_code=404, detail="run not found")
+    _sync_remote(store, run_id, settings)
+    try:
+        t, values = read_monitor_series(run_dir, monitor_id, component, start, stop, step)
+    except KeyError as err:
+        raise HTTPException(status_code=404, detail=str(err.args[0])) from err
+    if format == "csv":
+        headers = {"Content-Disposition": f"attachment; filename={monitor_id}.csv"}
+        rows = iter_monitor_csv(run_dir, monitor_id, component)
+        return StreamingResponse(rows, media_type="text/csv", headers=headers)
+    out = {}
+    for comp, arr in values.items():
+        if arr.dtype.kind == "c":
+            out[comp] = {"re": arr.real.tolist(), "im": arr.imag.tolist()}
+        else:
+            out[comp] = arr.tolist()
+    return {"id": monitor_id, "t": t.tolist(), "values": out}
+
+
 @router.get("/runs/{run_id}/dispersion")
 def list_dispersion(run_id: str, settings: Settings = Depends(get_settings)) -> dict:
     """List fitted dispersion artifacts for a run (if any).
@@ -38,6 +38,11 @@ CAPABILITIES: dict[str, dict[str, Any]] = {
         "capabilities": {
             "pml_thickness": {"type": "number", "min": 0.0, "max": 10.0, "default": 0.0, "label": "PML thickness"},
             "max_time": {"type": "number", "min": 0.0, "default": 200, "label": "Max time"},
+            # > 1 runs the worker under MPI (see mpi.py)
+            "mpi_ranks": {
+                "type": "number", "integer": True, "min": 1, "max": 4096, "default": 1,
+                "label": "MPI ranks",
+            },
         },
         "boundary_types": ["pml","pec","periodic","symmetry","impedance"],
         "per_face_boundary": True,
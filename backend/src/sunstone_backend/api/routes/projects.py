@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
 
-from ...models.api import CreateProjectRequest, ProjectRecord
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ...catalog import SORT_COLUMNS
+from ...models.api import CreateProjectRequest, ProjectRecord, RunList, RunSummary
 from ...settings import Settings, get_settings
 from ...store import RunStore
 
@@ -33,3 +36,44 @@ def get_project(project_id: str, settings: Settings = Depends(get_settings)) ->
         return ProjectRecord(**rec)
     except FileNotFoundError as err:
         raise HTTPException(status_code=404, detail="project not found") from err
+
+
+@router.get("/{project_id}/runs", response_model=RunList)
+def list_project_runs(
+    project_id: str,
+    status: list[str] | None = Query(None),
+    backend: list[str] | None = Query(None),
+    created_after: str | None = None,
+    created_before: str | None = None,
+    sort: str = "created_at",
+    order: Literal["asc", "desc"] = "desc",
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = None,
+    settings: Settings = Depends(get_settings),
+) -> RunList:
+    store = _store(settings)
+    try:
+        store.get_project(project_id)
+    except FileNotFoundError as err:
+        raise HTTPException(status_code=404, detail="project not found") from err
+    if sort not in SORT_COLUMNS:
+        raise HTTPException(
+            status_code=400, detail=f"sort must be one of {', '.join(SORT_COLUMNS)}"
+        )
+    try:
+        rows, next_cursor = store.list_runs(
+            project_id,
+            status=status,
+            backend=backend,
+            created_after=created_after,
+            created_before=created_before,
+            sort=sort,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err)) from err
+    return RunList(
+        project_id=project_id, items=[RunSummary(**r) for r in rows], next_cursor=next_cursor
+    )
@@ -2,10 +2,18 @@
 from __future__ import annotations
 
 import json
+from dataclasses import asdict
+from ...checkpoint import clear_requests, latest_checkpoint, request_pause, request_resume
 from ...hardware import detect_environment
-from ...jobs import LocalJobRunner
+from ...jobs import LocalJobRunner, SlurmJobRunner
 from ...models.api import CreateRunRequest, SubmitRunRequest, SubmitRunResponse
 from ...models.run import JobFile, RunRecord, StatusFile
+from ...mpi import option_ranks
+from ...remote_sync import sync_remote_run
+from ...result_cache import ResultCache, cache_key, get_result_cache, write_pending_key
+from ...scheduler import TERMINAL_STATUSES, QueueLimits, get_scheduler
+from ...ssh_poller import get_ssh_poller
+from ...worker_pool import get_worker_pool
 
 from ...settings import Settings, get_settings
 from ...store import RunStore
@@ -23,6 +31,52 @@ def _store(settings: Settings) -> RunStore:
     return s
 
 
+def sync_slurm_runs(
+    store: RunStore, run_ids: list[str], runner: SlurmJobRunner | None = None
+) -> dict[str, str]:
+    """Poll the SLURM jobs of run_ids in one batch and return {run_id: SLURM state}.
+
+    Workers record their own progress in status.json; this only fills in outcomes a worker cannot
+    report itself (time limit, out of memory, node failure, scancel) or never got to start.
+    """
+    jobs: dict[str, str] = {}
+    for run_id in run_ids:
+        try:
+            meta = json.loads((store.run_dir(run_id) / "runtime" / "job.json").read_text())
+        except (OSError, ValueError):
+            continue
+        if meta.get("mode") == "slurm" and meta.get("slurm_job_id"):
+            jobs[run_id] = str(meta["slurm_job_id"])
+    if not jobs:
+        return {}
+    states = (runner or SlurmJobRunner()).poll(list(jobs.values()))
+    result: dict[str, str] = {}
+    for run_id, job_id in jobs.items():
+        state = states.get(job_id)
+        if state is None:
+            continue
+        result[run_id] = state
+        status = SlurmJobRunner.run_status(state)
+        if status not in ("failed", "canceled"):
+            continue
+        try:
+            current = store.load_status(run_id)
+        except FileNotFoundError:
+            continue
+        if current.status in ("succeeded", "failed", "canceled", "paused"):
+            continue
+        run = store.load_run(run_id)
+        run.status = status
+        store.save_run(run)
+        store.save_status(
+            run_id,
+            StatusFile(
+                status=status, updated_at=utc_now_iso(), detail=f"SLURM job {job_id} {state}"
+            ),
+        )
+    return result
+
+
 @router.get("/runs/{run_id}/resource")
 def get_resource(run_id: str, settings: Settings = Depends(get_settings)):
     store = _store(settings)
@@ -61,49 +115,14 @@ def get_run(run_id: str, settings: Settings = Depends(get_settings)) -> RunRecor
         raise HTTPException(status_code=404, detail="run not found") from err
 
 
-@router.post("/runs/{run_id}/submit", response_model=SubmitRunResponse)
-def submit_run(
-    run_id: str,
-    req: SubmitRunRequest,
-    settings: Settings = Depends(get_settings),
-) -> SubmitRunResponse:
-    # Support different modes. Local mode will launch a local worker; ssh/slurm modes are recorded
-    # and set to submitted, but actual cluster integration is not implemented in v0.
-    if req.mode not in ("local", "ssh", "slurm"):
-        raise HTTPException(status_code=400, detail="unsupported mode")
-    if req.mode == "local" and not settings.allow_local_execution:
-        raise HTTPException(status_code=403, detail="local execution disabled")
+def validate_spec(spec: dict, backend: str) -> bool:
+    """Check spec against the capabilities `backend` declares; HTTP 400 on the first problem.
 
-    store = _store(settings)
-    try:
-        run = store.load_run(run_id)
-    except FileNotFoundError as err:
-        raise HTTPException(status_code=404, detail="run not found") from err
-
-    run_dir = store.run_dir(run_id)
-    backend = (req.backend or run.backend).strip().lower()
-
-    # Environment snapshot
-    (run_dir / "runtime" / "environment.json").write_text(
-        json.dumps(detect_environment(), indent=2)
-    )
-
-    # Persist backend-specific options (if provided) to the run runtime so workers can use them
-    # Basic validation against known capability schemas if available
+    Materials are normalized to the mapping form in place; returns True if spec was changed.
+    """
     from .backends import CAPABILITIES as _CAPS  # local import to avoid circular issues
     caps = _CAPS.get(backend, {})
-    cap_opts = caps.get('capabilities', {})
-
-    # Validate run spec items (basic checks against backend declared capabilities)
-    # Use spec stored in the run directory (SubmitRunRequest does not include spec)
-    spec_path = run_dir / 'spec.json'
-    if spec_path.exists():
-        try:
-            spec = json.loads(spec_path.read_text())
-        except Exception:
-            spec = {}
-    else:
-        spec = {}
+    changed = False
     # boundary_conditions: list of {type, params}
     if 'boundary_conditions' in spec:
         bcs = spec.get('boundary_conditions')
@@ -151,15 +170,11 @@ def submit_run(
             if mtype not in allowed_mat:
                 raise HTTPException(status_code=400, detail=f'Material "{m.get("name")}" type "{mtype}" not supported by backend {backend}')
 
-        # Persist normalized (mapping) materials back into the run's spec.json so workers
-        # always receive a consistent mapping representation. This write is non-destructive
-        # because normalize_materials only renames keys and copies values; complex
-        # structures are preserved.
+        # Normalized (mapping) materials go back into the spec so workers always receive a
+        # consistent mapping representation. This is non-destructive because normalize_materials
+        # only renames keys and copies values; complex structures are preserved.
         spec['materials'] = materials_map
-        try:
-            spec_path.write_text(json.dumps(spec, indent=2))
-        except Exception:
-            raise HTTPException(status_code=500, detail='Failed to persist normalized materials to run spec')
+        changed = True
 
     # sources: list of source definitions
     if 'sources' in spec:
@@ -173,62 +188,250 @@ def submit_run(
             if s['type'] not in allowed_src:
                 raise HTTPException(status_code=400, detail=f'Source type "{s["type"]}" not supported by backend {backend}')
 
+    return changed
+
+
+def validate_backend_options(options: dict, backend: str) -> None:
+    """Basic validation of backend options against the schemas `backend` declares (HTTP 400)."""
+    from .backends import CAPABILITIES as _CAPS  # local import to avoid circular issues
+    cap_opts = _CAPS.get(backend, {}).get('capabilities', {})
+    for k, v in (options or {}).items():
+        sch = cap_opts.get(k)
+        if sch is None:
+            raise HTTPException(status_code=400, detail=f"Unknown backend option: {k}")
+        t = sch.get('type')
+        if t == 'number' and not isinstance(v, (int, float)):
+            raise HTTPException(status_code=400, detail=f"Option {k} must be numeric")
+        if t == 'number' and sch.get('integer'):
+            lo, hi = sch.get('min', v), sch.get('max', v)
+            if isinstance(v, bool) or v != int(v) or not lo <= v <= hi:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Option {k} must be an integer between {sch.get('min')} and "
+                    f"{sch.get('max')}",
+                )
+        if t == 'enum' and v not in sch.get('values', []):
+            raise HTTPException(
+                status_code=400, detail=f"Option {k} must be one of {sch.get('values')}"
+            )
+        fields = sch.get('fields') or []
+        if t == 'range' and (not isinstance(v, dict) or any(f not in v for f in fields)):
+            raise HTTPException(
+                status_code=400, detail=f"Option {k} must be an object with fields {fields}"
+            )
+
+
+def backend_version(backend: str, python_executable: str | None = None) -> str | None:
+    """Backend.version for the result cache key, or None for a backend this API does not know."""
+    from ...backends.registry import get_backend as _get_backend
+
+    try:
+        return _get_backend(backend).version(python_executable)
+    except ValueError:
+        return None  # unknown backend; the launch reports it
+
+
+def reuse_cached_result(
+    store: RunStore,
+    run: RunRecord,
+    backend: str,
+    req: SubmitRunRequest,
+    settings: Settings,
+    cache: ResultCache | None = None,
+    version: str | None = None,
+) -> bool:
+    """Finish `run` from the result cache if identical inputs succeeded before; True on a hit.
+
+    On a miss (or with the cache off) the run's key is left for the worker to file its outputs
+    under.
+    `cache` and `version` (Backend.version) can be passed in when submitting many runs at once.
+    """
+    key = None
+    run_dir = store.run_dir(run.id)
+    if settings.result_cache_enabled and req.use_cache:
+        if version is None:
+            version = backend_version(backend, req.python_executable)
+        if version is not None:
+            cache = cache or get_result_cache(settings)
+            key = cache_key(run_dir, backend, req.backend_options, version)
+            hit = cache.lookup(key)
+            if hit is not None:
+                cache.restore(key, run_dir)
+                write_pending_key(run_dir, None)
+                job = {
+                    "pid": 0,
+                    "started_at": utc_now_iso(),
+                    "backend": backend,
+                    "mode": "cache",
+                    "cached_from": hit["run_id"],
+                    "cache_key": key,
+                }
+                (run_dir / "runtime" / "job.json").write_text(json.dumps(job, indent=2))
+                run.status = "succeeded"
+                store.save_run(run)
+                store.save_status(
+                    run.id,
+                    StatusFile(
+                        status="succeeded",
+                        updated_at=utc_now_iso(),
+                        detail=f"Reused outputs of run {hit['run_id']} (result cache)",
+                    ),
+                )
+                return True
+    # filed in the cache by the worker once the run succeeds
+    write_pending_key(run_dir, key, backend)
+    return False
+
+
+def _resume_request(
+    store: RunStore, run: RunRecord, backend: str, req: SubmitRunRequest
+) -> SubmitRunRequest:
+    """The submit request that relaunches `run` from its latest checkpoint.
+
+    The run goes back to the mode it last ran in.
+    """
+    from ...backends.registry import get_backend as _get_backend
+
+    try:
+        supported = _get_backend(backend).supports_checkpoint
+    except ValueError:
+        supported = False
+    if not supported:
+        raise HTTPException(
+            status_code=400, detail=f"backend '{backend}' does not support checkpoint/restart"
+        )
+    if run.status in ("queued", "submitted", "running"):
+        raise HTTPException(status_code=409, detail="run is still active; pause it before resuming")
+    if req.spec_override is not None:
+        raise HTTPException(status_code=400, detail="spec_override cannot be combined with resume")
+    run_dir = store.run_dir(run.id)
+    try:
+        job = json.loads((run_dir / "runtime" / "job.json").read_text())
+    except (OSError, ValueError):
+        job = {}
+    mode = job.get("mode") if job.get("mode") in ("local", "ssh", "slurm") else "local"
+    update: dict = {"mode": mode, "use_cache": False}
+    if mode == "ssh":
+        # the checkpoint lives in the remote run dir: same host and path, and pull latest.json first
+        ssh_target = req.ssh_target or job.get("ssh_target") or ""
+        if job.get("remote_path") and "@" in ssh_target:
+            ssh_target = f"{ssh_target.split(':', 1)[0]}:{job['remote_path']}"
+        update.update(
+            ssh_target=ssh_target,
+            ssh_options=req.ssh_options or job.get("ssh_options"),
+            python_executable=req.python_executable or job.get("remote_python"),
+        )
+        try:
+            sync_remote_run(store, run.id, job, max_age=0.0)
+        except Exception as e:
+            store.logger.warning(f"Could not sync remote run {run.id} before resuming: {e}")
+    if latest_checkpoint(run_dir) is None:
+        raise HTTPException(status_code=409, detail="run has no checkpoint to resume from")
+    return req.model_copy(update=update)
+
+
+@router.post("/runs/{run_id}/submit", response_model=SubmitRunResponse)
+def submit_run(
+    run_id: str,
+    req: SubmitRunRequest,
+    settings: Settings = Depends(get_settings),
+) -> SubmitRunResponse:
+    # Support different modes. Local mode will launch a local worker; ssh/slurm modes are recorded
+    # and set to submitted, but actual cluster integration is not implemented in v0.
+    if req.mode not in ("local", "ssh", "slurm", "resume"):
+        raise HTTPException(status_code=400, detail="unsupported mode")
+
+    store = _store(settings)
+    try:
+        run = store.load_run(run_id)
+    except FileNotFoundError as err:
+        raise HTTPException(status_code=404, detail="run not found") from err
+
+    run_dir = store.run_dir(run_id)
+    backend = (req.backend or run.backend).strip().lower()
+    # A fresh submit starts from t=0; a resume relaunches from the checkpoint, where it ran before
+    clear_requests(run_dir)
+    if req.mode == "resume":
+        req = _resume_request(store, run, backend, req)
+        request_resume(run_dir)
+    if req.mode == "local" and not settings.allow_local_execution:
+        raise HTTPException(status_code=403, detail="local execution disabled")
+
+    # Environment snapshot
+    (run_dir / "runtime" / "environment.json").write_text(
+        json.dumps(detect_environment(), indent=2)
+    )
+
+    # Validate run spec items (basic checks against backend declared capabilities)
+    # Use spec stored in the run directory (SubmitRunRequest does not include spec)
+    spec_path = run_dir / 'spec.json'
+    if spec_path.exists():
+        try:
+            spec = json.loads(spec_path.read_text())
+        except Exception:
+            spec = {}
+    else:
+        spec = {}
+    if validate_spec(spec, backend):
+        # Persist normalized materials back into the run's spec.json
+        try:
+            spec_path.write_text(json.dumps(spec, indent=2))
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail='Failed to persist normalized materials to run spec'
+            ) from e
+
     # Persist a spec override if provided (this allows frontend pre-translation / expansion)
     if req.spec_override is not None:
         try:
             (run_dir / 'spec.json').write_text(json.dumps(req.spec_override, indent=2))
-        except Exception:
-            raise HTTPException(status_code=500, detail='Failed to persist spec override')
+        except Exception as e:
+            raise HTTPException(status_code=500, detail='Failed to persist spec override') from e
 
     if req.backend_options is not None:
-        for k, v in (req.backend_options or {}).items():
-            sch = cap_opts.get(k)
-            if sch is None:
-                raise HTTPException(status_code=400, detail=f"Unknown backend option: {k}")
-            t = sch.get('type')
-            if t == 'number' and not isinstance(v, (int, float)):
-                raise HTTPException(status_code=400, detail=f"Option {k} must be numeric")
-            if t == 'enum' and v not in sch.get('values', []):
-                raise HTTPException(status_code=400, detail=f"Option {k} must be one of {sch.get('values')}")
-            if t == 'range':
-                if not isinstance(v, dict) or any(f not in v for f in (sch.get('fields') or [])):
-                    raise HTTPException(status_code=400, detail=f"Option {k} must be an object with fields {sch.get('fields')}")
-        (run_dir / "runtime" / "backend_options.json").write_text(json.dumps(req.backend_options, indent=2))
+        validate_backend_options(req.backend_options, backend)
+        # Persist backend-specific options to the run runtime so workers can use them
+        (run_dir / "runtime" / "backend_options.json").write_text(
+            json.dumps(req.backend_options, indent=2)
+        )
+
+    # Identical inputs already ran successfully: reuse those outputs instead of running again
+    if reuse_cached_result(store, run, backend, req, settings):
+        return SubmitRunResponse(run_id=run_id, status="succeeded")
 
     # Launch worker or record submission depending on mode
     if req.mode == "local":
-        try:
-            runner = LocalJobRunner()
-            job = runner.submit(
-                run=run,
-                run_dir=run_dir,
-                backend=backend,
-                python_executable=req.python_executable,
-            )
-            (run_dir / "runtime" / "job.json").write_text(job.model_dump_json(indent=2))
-            # Mark submitted only if worker launch succeeded
-            run.status = "submitted"
-            store.save_run(run)
-            store.save_status(run_id, StatusFile(status="submitted", updated_at=utc_now_iso()))
-            return SubmitRunResponse(run_id=run_id, status=run.status)
-        except Exception as e:
-            # Log error to stderr.log
-            log_path = run_dir / "logs" / "stderr.log"
-            log_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(log_path, "a") as f:
-                f.write(f"[submit_run] Worker launch failed: {e}\n")
-            # Set status to failed with detail
-            run.status = "failed"
-            store.save_run(run)
-            store.save_status(run_id, StatusFile(status="failed", updated_at=utc_now_iso(), detail=f"Worker launch failed: {e}"))
-            raise HTTPException(status_code=500, detail=f"Worker launch failed: {e}")
+        # Local runs go through the persistent queue; they start now if the host has a free slot.
+        scheduler = get_scheduler(store.data_dir, pool=get_worker_pool(settings))
+        scheduler.enqueue(
+            run_id,
+            backend=backend,
+            python_executable=req.python_executable,
+            priority=req.priority,
+            # an MPI run keeps a core busy per rank
+            cores=max(req.cores, option_ranks(req.backend_options)),
+            memory_bytes=req.memory_bytes,
+        )
+        error = scheduler.tick(QueueLimits.from_settings(settings)).get(run_id)
+        if error is not None:
+            raise HTTPException(status_code=500, detail=f"Worker launch failed: {error}")
+        run = store.load_run(run_id)
+        return SubmitRunResponse(run_id=run_id, status=run.status)
     else:
         # For ssh/slurm we attempt to scaffold a remote runner; for ssh we build an SSH runner record
         if req.mode == 'ssh':
             try:
                 from ...jobs import SSHJobRunner
                 runner = SSHJobRunner()
-                job = runner.submit_ssh(run=run, run_dir=run_dir, backend=backend, ssh_target=req.ssh_target or '', python_executable=req.python_executable)
+                ssh_kwargs = {'ssh_options': req.ssh_options} if req.ssh_options else {}
+                job = runner.submit_ssh(
+                    run=run,
+                    run_dir=run_dir,
+                    backend=backend,
+                    ssh_target=req.ssh_target or '',
+                    python_executable=req.python_executable,
+                    **ssh_kwargs,
+                )
                 # Persist job.json with remote metadata
                 job_obj = job.model_dump()
                 job_obj['ssh_target'] = req.ssh_target
@@ -241,7 +444,10 @@ def submit_run(
                     job_obj['ssh_port'] = getattr(job, '_ssh_port')
                 if getattr(job, '_identity_file', None):
                     job_obj['identity_file'] = getattr(job, '_identity_file')
+                if getattr(job, '_python', None):
+                    job_obj['remote_python'] = job._python
                 (run_dir / "runtime" / "job.json").write_text(json.dumps(job_obj, indent=2))
+                get_ssh_poller(settings).watch(run_id, job_obj)
                 run.status = "submitted"
                 store.save_run(run)
                 store.save_status(run_id, StatusFile(status="submitted", updated_at=utc_now_iso(), detail=f"Recorded ssh submission"))
@@ -262,20 +468,88 @@ def submit_run(
                 store.save_status(run_id, StatusFile(status="submitted", updated_at=utc_now_iso(), detail=f"Recorded {req.mode} submission (fallback)"))
                 return SubmitRunResponse(run_id=run_id, status=run.status)
         else:
-            # slurm: record submission for now
-            job = {
-                "pid": 0,
-                "started_at": utc_now_iso(),
-                "backend": backend,
-                "mode": req.mode,
-            }
+            try:
+                job = SlurmJobRunner().submit(
+                    run=run,
+                    run_dir=run_dir,
+                    backend=backend,
+                    python_executable=req.python_executable,
+                    options=req.slurm_options,
+                    cores=req.cores,
+                    memory_bytes=req.memory_bytes,
+                )
+            except Exception as e:
+                run.status = "failed"
+                store.save_run(run)
+                store.save_status(
+                    run_id,
+                    StatusFile(
+                        status="failed",
+                        updated_at=utc_now_iso(),
+                        detail=f"SLURM submission failed: {e}",
+                    ),
+                )
+                raise HTTPException(
+                    status_code=500, detail=f"SLURM submission failed: {e}"
+                ) from e
             (run_dir / "runtime" / "job.json").write_text(json.dumps(job, indent=2))
             run.status = "submitted"
             store.save_run(run)
-            store.save_status(run_id, StatusFile(status="submitted", updated_at=utc_now_iso(), detail=f"Recorded {req.mode} submission"))
+            store.save_status(
+                run_id,
+                StatusFile(
+                    status="submitted",
+                    updated_at=utc_now_iso(),
+                    detail=f"SLURM job {job['slurm_job_id']}",
+                ),
+            )
             return SubmitRunResponse(run_id=run_id, status=run.status)
 
 
+@router.get("/cache")
+def get_result_cache_stats(settings: Settings = Depends(get_settings)) -> dict:
+    return {"enabled": settings.result_cache_enabled, **get_result_cache(settings).stats()}
+
+
+@router.get("/queue")
+def get_queue(settings: Settings = Depends(get_settings)) -> dict:
+    store = _store(settings)
+    scheduler = get_scheduler(store.data_dir, pool=get_worker_pool(settings))
+    limits = QueueLimits.from_settings(settings)
+    # reap finished runs first so the snapshot reflects free slots
+    scheduler.tick(limits)
+    entries = scheduler.entries()
+    running = [e for e in entries if e["state"] == "running"]
+    return {
+        "limits": asdict(limits),
+        "usage": {
+            "runs": len(running),
+            "cores": sum(e["cores"] for e in running),
+            "memory_bytes": sum(e["memory_bytes"] for e in running),
+        },
+        "running": running,
+        "queued": [e for e in entries if e["state"] == "queued"],
+    }
+
+
+def _check_cancelable(store: RunStore, run: RunRecord, job_meta: dict | None = None) -> None:
+    """409 for a run with nothing left to cancel.
+
+    That is a finished run, or one served from the result cache (there is no process).
+    """
+    try:
+        status = store.load_status(run.id).status
+    except FileNotFoundError:
+        status = run.status
+    if status in TERMINAL_STATUSES:
+        raise HTTPException(status_code=409, detail=f"run already {status}")
+    if job_meta is not None and job_meta.get("mode") == "cache":
+        raise HTTPException(
+            status_code=409,
+            detail="run was served from the result cache; there is no job to cancel",
+        )
+
+
 @router.post("/runs/{run_id}/cancel")
 def cancel_run(run_id: str, settings: Settings = Depends(get_settings)) -> dict:
     store = _store(settings)
@@ -285,6 +559,19 @@ def cancel_run(run_id: str, settings: Settings = Depends(get_settings)) -> dict:
         run = store.load_run(run_id)
     except FileNotFoundError as err:
         raise HTTPException(status_code=404, detail="run not found") from err
+    _check_cancelable(store, run)
+
+    scheduler = get_scheduler(store.data_dir, pool=get_worker_pool(settings))
+    entry = scheduler.remove(run_id)
+    if entry is not None and entry["state"] == "queued":
+        # never started: dropping it from the queue is the whole cancellation
+        run.status = "canceled"
+        store.save_run(run)
+        store.save_status(
+            run_id,
+            StatusFile(status="canceled", updated_at=utc_now_iso(), detail="canceled while queued"),
+        )
+        return {"ok": True}
 
     job_path = run_dir / "runtime" / "job.json"
     if not job_path.exists():
@@ -295,12 +582,15 @@ def cancel_run(run_id: str, settings: Settings = Depends(get_settings)) -> dict:
         job_meta = json.loads(job_path.read_text())
     except Exception:
         raise HTTPException(status_code=500, detail="failed to read job metadata")
+    _check_cancelable(store, run, job_meta)
 
     try:
         if job_meta.get("mode") == "ssh":
             from ...jobs import SSHJobRunner
 
             SSHJobRunner().cancel(job_meta)
+        elif job_meta.get("mode") == "slurm":
+            SlurmJobRunner().cancel(job_meta)
         else:
             job = JobFile.model_validate_json(json.dumps(job_meta))
             LocalJobRunner().cancel(job)
@@ -314,6 +604,62 @@ def cancel_run(run_id: str, settings: Settings = Depends(get_settings)) -> dict:
     return {"ok": True}
 
 
+@router.post("/runs/{run_id}/pause")
+def pause_run(run_id: str, settings: Settings = Depends(get_settings)) -> dict:
+    """Ask a running run to checkpoint and stop.
+
+    Its status turns "paused" once the checkpoint is written.
+    """
+    from ...backends.registry import get_backend as _get_backend
+
+    store = _store(settings)
+    try:
+        run = store.load_run(run_id)
+    except FileNotFoundError as err:
+        raise HTTPException(status_code=404, detail="run not found") from err
+    try:
+        supported = _get_backend(run.backend).supports_checkpoint
+    except ValueError:
+        supported = False
+    if not supported:
+        raise HTTPException(
+            status_code=400, detail=f"backend '{run.backend}' does not support checkpoint/restart"
+        )
+    if run.status not in ("submitted", "running"):
+        raise HTTPException(status_code=409, detail=f"run is {run.status}, not running")
+
+    run_dir = store.run_dir(run_id)
+    try:
+        job_meta = json.loads((run_dir / "runtime" / "job.json").read_text())
+    except (OSError, ValueError):
+        job_meta = {}
+    if job_meta.get("mode") == "ssh":
+        from ...jobs import SSHJobRunner
+
+        try:
+            SSHJobRunner().request_pause(job_meta)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"failed to pause job: {e}") from e
+    else:
+        # local and SLURM workers see the run dir directly
+        request_pause(run_dir)
+    return {"ok": True, "status": "pausing"}
+
+
+@router.post("/runs/{run_id}/resume", response_model=SubmitRunResponse)
+def resume_run(
+    run_id: str,
+    req: SubmitRunRequest | None = None,
+    settings: Settings = Depends(get_settings),
+) -> SubmitRunResponse:
+    """Relaunch a paused (or interrupted) run from its latest checkpoint.
+
+    Same as submitting in "resume" mode.
+    """
+    req = (req or SubmitRunRequest()).model_copy(update={"mode": "resume"})
+    return submit_run(run_id, req, settings)
+
+
 @router.get("/runs/{run_id}/logs")
 def get_logs(
     run_id: str,
@@ -361,7 +707,10 @@ def get_run_job(run_id: str, settings: Settings = Depends(get_settings)) -> dict
 
 @router.get("/runs/{run_id}/job/status")
 def get_run_job_status(run_id: str, settings: Settings = Depends(get_settings)) -> dict:
-    """Return runtime job status; for ssh-run jobs attempt to probe the remote PID."""
+    """Return runtime job status.
+
+    SSH runs report the batched per-host probe cached by the SSH poller.
+    """
     store = _store(settings)
     run_dir = store.run_dir(run_id)
     job_path = run_dir / "runtime" / "job.json"
@@ -375,16 +724,28 @@ def get_run_job_status(run_id: str, settings: Settings = Depends(get_settings))
     if job_meta.get("mode") == "ssh":
         pid = int(job_meta.get("pid", 0))
         ssh_target = job_meta.get("ssh_target")
+        out = {
+            "mode": "ssh",
+            "pid": pid,
+            "ssh_target": ssh_target,
+            "remote_path": job_meta.get("remote_path"),
+            "running": False,
+        }
         if pid > 0 and ssh_target:
-            try:
-                from ...jobs import SSHJobRunner
-                runner = SSHJobRunner()
-                running = runner.check_remote_pid(ssh_target, pid, port=job_meta.get("ssh_port"), identity_file=job_meta.get("identity_file"))
-                return {"mode": "ssh", "pid": pid, "ssh_target": ssh_target, "remote_path": job_meta.get("remote_path"), "running": running}
-            except Exception as e:
-                return {"mode": "ssh", "pid": pid, "ssh_target": ssh_target, "remote_path": job_meta.get("remote_path"), "running": False, "error": str(e)}
-        else:
-            return {"mode": "ssh", "pid": pid, "ssh_target": ssh_target, "remote_path": job_meta.get("remote_path"), "running": False}
+            probe = get_ssh_poller(settings).status(run_id, job_meta)
+            out.update(running=probe["running"], checked_at=probe["checked_at"])
+            if probe.get("error"):
+                out["error"] = probe["error"]
+        return out
+    elif job_meta.get("mode") == "slurm":
+        job_id = job_meta.get("slurm_job_id")
+        state = sync_slurm_runs(store, [run_id]).get(run_id)
+        return {
+            "mode": "slurm",
+            "slurm_job_id": job_id,
+            "state": state,
+            "running": SlurmJobRunner.run_status(state) == "running" if state else None,
+        }
     else:
         # For local or recorded runs we cannot probe reliably here; return stored metadata
         return {"mode": job_meta.get("mode"), "pid": job_meta.get("pid"), "running": None}
@@ -420,16 +781,16 @@ async def stream_run_job(run_id: str, request: Request, interval: float = 1.0, m
             running = None
             if job_meta.get("mode") == "ssh":
                 pid = int(job_meta.get("pid", 0))
-                ssh_target = job_meta.get("ssh_target")
-                if pid > 0 and ssh_target:
-                    try:
-                        from ...jobs import SSHJobRunner
-                        runner = SSHJobRunner()
-                        running = await asyncio.to_thread(runner.check_remote_pid, ssh_target, pid, job_meta.get("ssh_port"), job_meta.get("identity_file"))
-                    except Exception:
-                        running = False
+                if pid > 0 and job_meta.get("ssh_target"):
+                    probe = await asyncio.to_thread(
+                        get_ssh_poller(settings).status, run_id, job_meta
+                    )
+                    running = probe["running"]
                 else:
                     running = False
+            elif job_meta.get("mode") == "slurm":
+                state = (await asyncio.to_thread(sync_slurm_runs, store, [run_id])).get(run_id)
+                running = SlurmJobRunner.run_status(state) == "running" if state else None
 
             # Resource snapshot if available
             resource = None
@@ -475,6 +836,19 @@ def cancel_run_job(run_id: str, settings: Settings = Depends(get_settings)) -> d
         run = store.load_run(run_id)
     except FileNotFoundError as err:
         raise HTTPException(status_code=404, detail="run not found") from err
+    _check_cancelable(store, run)
+
+    scheduler = get_scheduler(store.data_dir, pool=get_worker_pool(settings))
+    entry = scheduler.remove(run_id)
+    if entry is not None and entry["state"] == "queued":
+        # never started: dropping it from the queue is the whole cancellation
+        run.status = "canceled"
+        store.save_run(run)
+        store.save_status(
+            run_id,
+            StatusFile(status="canceled", updated_at=utc_now_iso(), detail="canceled while queued"),
+        )
+        return {"ok": True}
 
     job_path = run_dir / "runtime" / "job.json"
     if not job_path.exists():
@@ -484,11 +858,14 @@ def cancel_run_job(run_id: str, settings: Settings = Depends(get_settings)) -> d
         job_meta = json.loads(job_path.read_text())
     except Exception:
         raise HTTPException(status_code=500, detail="failed to read job metadata")
+    _check_cancelable(store, run, job_meta)
 
     try:
         if job_meta.get("mode") == "ssh":
             from ...jobs import SSHJobRunner
             SSHJobRunner().cancel(job_meta)
+        elif job_meta.get("mode") == "slurm":
+            SlurmJobRunner().cancel(job_meta)
         else:
             job = JobFile.model_validate_json(json.dumps(job_meta))
             LocalJobRunner().cancel(job)
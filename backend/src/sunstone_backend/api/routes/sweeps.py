@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import copy
+import itertools
+import json
+from collections import Counter
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from ...hardware import detect_environment
+from ...jobs import SlurmJobRunner
+from ...models.api import (
+    CreateSweepRequest,
+    SubmitRunRequest,
+    SweepAxis,
+    SweepPoint,
+    SweepRecord,
+    SweepResult,
+    SweepStatus,
+)
+from ...models.run import RunRecord
+from ...mpi import option_ranks
+from ...result_cache import get_result_cache
+from ...scheduler import TERMINAL_STATUSES, QueueLimits, get_scheduler
+from ...settings import Settings, get_settings
+from ...store import RunStore
+from ...util.json_pointer import parse_pointer, set_pointer
+from ...worker_pool import get_worker_pool
+from .runs import (
+    backend_version,
+    reuse_cached_result,
+    sync_slurm_runs,
+    validate_backend_options,
+    validate_spec,
+)
+
+# Parameter sweeps: one request expands a base spec over a set of axes (JSON pointers into the
+# spec, each with a list of values) into child runs that share a sweep record (data_dir/sweeps/
+# sweep_<id>). Runs are created and, optionally, submitted in bulk: local points go through the
+# queue in one enqueue, SLURM points as one job array.
+
+router = APIRouter(tags=["sweeps"])
+
+
+def _store(settings: Settings) -> RunStore:
+    s = RunStore(settings.data_dir)
+    s.ensure()
+    return s
+
+
+def expand_axes(axes: list[SweepAxis], combine: str) -> list[dict]:
+    """Parameter sets ({pointer: value}) of a sweep, in run order."""
+    paths = [a.path for a in axes]
+    if len(set(paths)) != len(paths):
+        raise ValueError("each axis path may appear only once")
+    if combine == "zip":
+        lengths = {len(a.values) for a in axes}
+        if len(lengths) > 1:
+            raise ValueError(f"zip needs axes of equal length, got {sorted(lengths)}")
+        combos = zip(*(a.values for a in axes), strict=True)
+    else:
+        combos = itertools.product(*(a.values for a in axes))
+    return [dict(zip(paths, values, strict=True)) for values in combos]
+
+
+def sweep_size(axes: list[SweepAxis], combine: str) -> int:
+    if combine == "zip":
+        return len(axes[0].values)
+    size = 1
+    for a in axes:
+        size *= len(a.values)
+    return size
+
+
+def _record(sweep: dict) -> SweepRecord:
+    fields = {k: v for k, v in sweep.items() if k != "points"}
+    return SweepRecord(size=len(sweep.get("points", [])), **fields)
+
+
+def _statuses(store: RunStore, run_ids: list[str]) -> dict[str, dict]:
+    rows = store.catalog.get_many(run_ids)
+    for run_id in run_ids:
+        if run_id not in rows:
+            # not indexed (catalog write failed or rebuilt elsewhere): fall back to the run dir
+            try:
+                status = store.load_status(run_id)
+                rows[run_id] = {"status": status.status, "detail": status.detail}
+            except FileNotFoundError:
+                rows[run_id] = {"status": "failed", "detail": "run directory missing"}
+    return rows
+
+
+def _submit(
+    store: RunStore,
+    sweep: dict,
+    runs: list[RunRecord],
+    backend: str,
+    req: SubmitRunRequest,
+    settings: Settings,
+) -> None:
+    # One environment snapshot and one set of options for every point
+    environment = json.dumps(detect_environment(), indent=2)
+    (store.sweep_dir(sweep["id"]) / "environment.json").write_text(environment)
+    options = json.dumps(req.backend_options, indent=2) if req.backend_options is not None else None
+    cache = get_result_cache(settings) if settings.result_cache_enabled and req.use_cache else None
+    version = backend_version(backend, req.python_executable) if cache is not None else None
+    pending: list[RunRecord] = []
+    for run in runs:
+        runtime = store.run_dir(run.id) / "runtime"
+        (runtime / "environment.json").write_text(environment)
+        if options is not None:
+            (runtime / "backend_options.json").write_text(options)
+        if not reuse_cached_result(
+            store, run, backend, req, settings, cache=cache, version=version
+        ):
+            pending.append(run)
+    if not pending:
+        return
+
+    if req.mode == "local":
+        scheduler = get_scheduler(store.data_dir, pool=get_worker_pool(settings))
+        scheduler.enqueue_many(
+            [r.id for r in pending],
+            backend=backend,
+            python_executable=req.python_executable,
+            priority=req.priority,
+            # an MPI run keeps a core busy per rank
+            cores=max(req.cores, option_ranks(req.backend_options)),
+            memory_bytes=req.memory_bytes,
+        )
+        # start what fits now; the queue daemon starts the rest as slots free up
+        scheduler.tick(QueueLimits.from_settings(settings))
+        return
+
+    try:
+        jobs = SlurmJobRunner().submit_array(
+            [(r, store.run_dir(r.id)) for r in pending],
+            backend=backend,
+            script_dir=store.sweep_dir(sweep["id"]),
+            python_executable=req.python_executable,
+            options=req.slurm_options,
+            cores=req.cores,
+            memory_bytes=req.memory_bytes,
+            job_name=f"sunstone_sweep_{sweep['id'][:8]}",
+        )
+    except Exception as e:
+        store.save_statuses(pending, "failed", detail=f"SLURM submission failed: {e}")
+        raise HTTPException(status_code=500, detail=f"SLURM submission failed: {e}") from e
+    for run, job in zip(pending, jobs, strict=True):
+        (store.run_dir(run.id) / "runtime" / "job.json").write_text(json.dumps(job, indent=2))
+    job_id = jobs[0].get("slurm_array_id") or jobs[0]["slurm_job_id"]
+    store.save_statuses(pending, "submitted", detail=f"SLURM job {job_id}")
+
+
+@router.post("/projects/{project_id}/sweeps", response_model=SweepStatus)
+def create_sweep(
+    project_id: str,
+    req: CreateSweepRequest,
+    settings: Settings = Depends(get_settings),
+) -> SweepStatus:
+    store = _store(settings)
+    try:
+        store.get_project(project_id)
+    except FileNotFoundError as err:
+        raise HTTPException(status_code=404, detail="project not found") from err
+    submit = req.submit
+    if submit is not None:
+        if submit.mode == "ssh":
+            raise HTTPException(
+                status_code=400,
+                detail="sweeps can be submitted in 'local' or 'slurm' mode; "
+                "submit ssh runs one by one",
+            )
+        if submit.mode == "local" and not settings.allow_local_execution:
+            raise HTTPException(status_code=403, detail="local execution disabled")
+        if submit.spec_override is not None:
+            raise HTTPException(
+                status_code=400,
+                detail="spec_override does not apply to sweeps; change the base spec",
+            )
+    backend = req.backend or (submit.backend if submit else None) or settings.default_backend
+    backend = backend.strip().lower()
+
+    # Expand the axes into one spec per point before touching the disk; bad requests create nothing
+    try:
+        size = sweep_size(req.axes, req.combine)
+        if size > settings.sweep_max_points:
+            raise ValueError(
+                f"sweep has {size} points, more than the limit of {settings.sweep_max_points}"
+            )
+        points = expand_axes(req.axes, req.combine)
+        pointers = {a.path: parse_pointer(a.path) for a in req.axes}
+        specs = []
+        for params in points:
+            spec = copy.deepcopy(req.spec)
+            for path, value in params.items():
+                set_pointer(spec, pointers[path], value)
+            specs.append(spec)
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err)) from err
+    if submit is not None:
+        for spec in specs:
+            validate_spec(spec, backend)
+        if submit.backend_options is not None:
+            validate_backend_options(submit.backend_options, backend)
+
+    sweep = store.create_sweep(
+        project_id,
+        {
+            "name": req.name,
+            "backend": backend,
+            "combine": req.combine,
+            "axes": [a.model_dump() for a in req.axes],
+            "mode": submit.mode if submit else None,
+            "points": [],
+        },
+    )
+    runs = store.create_runs(project_id, specs, backend, sweep_id=sweep["id"])
+    sweep["points"] = [
+        {"run_id": run.id, "params": params} for run, params in zip(runs, points, strict=True)
+    ]
+    store.save_sweep(sweep)
+    if submit is not None:
+        _submit(store, sweep, runs, backend, submit, settings)
+    return get_sweep(sweep["id"], settings)
+
+
+@router.get("/projects/{project_id}/sweeps", response_model=list[SweepRecord])
+def list_sweeps(project_id: str, settings: Settings = Depends(get_settings)) -> list[SweepRecord]:
+    store = _store(settings)
+    try:
+        store.get_project(project_id)
+    except FileNotFoundError as err:
+        raise HTTPException(status_code=404, detail="project not found") from err
+    return [_record(s) for s in store.list_sweeps(project_id)]
+
+
+def _load(store: RunStore, sweep_id: str) -> dict:
+    try:
+        return store.load_sweep(sweep_id)
+    except FileNotFoundError as err:
+        raise HTTPException(status_code=404, detail="sweep not found") from err
+
+
+def _refresh(store: RunStore, sweep: dict) -> dict[str, dict]:
+    run_ids = [p["run_id"] for p in sweep["points"]]
+    rows = _statuses(store, run_ids)
+    if sweep.get("mode") == "slurm":
+        active = [r for r in run_ids if rows[r]["status"] not in TERMINAL_STATUSES]
+        # fill in SLURM-side outcomes (time limit, scancel, ...) with one squeue for the whole array
+        if active and sync_slurm_runs(store, active):
+            rows.update(_statuses(store, active))
+    return rows
+
+
+@router.get("/sweeps/{sweep_id}", response_model=SweepStatus)
+def get_sweep(sweep_id: str, settings: Settings = Depends(get_settings)) -> SweepStatus:
+    store = _store(settings)
+    sweep = _load(store, sweep_id)
+    rows = _refresh(store, sweep)
+    points = [
+        SweepPoint(run_id=p["run_id"], params=p["params"], status=rows[p["run_id"]]["status"])
+        for p in sweep["points"]
+    ]
+    counts = dict(Counter(p.status for p in points))
+    return SweepStatus(sweep=_record(sweep), counts=counts, points=points)
+
+
+@router.get("/sweeps/{sweep_id}/results", response_model=list[SweepResult])
+def get_sweep_results(
+    sweep_id: str, settings: Settings = Depends(get_settings)
+) -> list[SweepResult]:
+    store = _store(settings)
+    sweep = _load(store, sweep_id)
+    rows = _refresh(store, sweep)
+    results = []
+    for p in sweep["points"]:
+        row = rows[p["run_id"]]
+        outputs_dir = store.run_dir(p["run_id"]) / "outputs"
+        outputs = []
+        if outputs_dir.is_dir():
+            outputs = sorted(
+                f.relative_to(outputs_dir.parent).as_posix()
+                for f in outputs_dir.rglob("*")
+                if f.is_file()
+            )
+        results.append(
+            SweepResult(
+                run_id=p["run_id"],
+                params=p["params"],
+                status=row["status"],
+                detail=row.get("detail"),
+                outputs=outputs,
+            )
+        )
+    return results
@@ -1,12 +1,35 @@
 from __future__ import annotations
 
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import List, Any
+from concurrent.futures import Future, ProcessPoolExecutor
+import functools
+import math
+import multiprocessing
+import threading
+import time
 import uuid
-
-from sunstone_backend.ulf.geodesics import integrate_ray_from_cartesian, plebanski_tensor_from_metric
-from fastapi import BackgroundTasks
+from pathlib import Path
+
+import numpy as np
+
+from sunstone_backend.ulf.geodesics import integrate_rays_from_cartesian_adaptive
+from sunstone_backend.ulf.grid_cache import get_grid_cache
+from sunstone_backend.ulf.kerr_geodesics import integrate_kerr_rays_from_cartesian
+from sunstone_backend.ulf.job_index import get_job_index
+from sunstone_backend.ulf.trace_cache import get_trace_cache, ray_key
+from sunstone_backend.ulf.packed import (
+    MEDIA_TYPE as PACKED_MEDIA_TYPE,
+    concat_packed,
+    encode_binary,
+    iter_binary,
+    pack_rays,
+    pack_traces,
+    read_npz,
+    write_npz,
+)
 from sunstone_backend.settings import get_settings
 import os
 import json
@@ -36,6 +59,9 @@ class TraceRequest(BaseModel):
     samples: int = 200
     # If model == 'schwarzschild', attempt GR-based geodesic integration
     model: str | None = None
+    # Local error tolerances of the adaptive geodesic integrator (independent of `samples`)
+    rtol: float = Field(default=1e-6, gt=0)
+    atol: float = Field(default=1e-9, gt=0)
 
 class TracePoint(BaseModel):
     x: float
@@ -59,187 +85,477 @@ class TraceResponse(BaseModel):
     constitutive: dict | None = None
 
 
-from fastapi import BackgroundTasks
+def _grid_cache():
+    settings = get_settings()
+    return get_grid_cache(settings.data_dir, max_bytes=settings.ulf_grid_cache_bytes)
+
+
+def _straight_points(src: Source, samples: int) -> np.ndarray:
+    """Fallback: straight line along the source direction, or a radial fan for undirected sources.
+
+    Returns (S, 3) points.
+    """
+    pts = []
+    if src.direction:
+        dx = src.direction.x
+        dy = src.direction.y
+        dz = src.direction.z if src.direction.z is not None else 0.0
+        # normalize
+        norm = (dx*dx + dy*dy + dz*dz) ** 0.5
+        if norm == 0:
+            dx, dy, dz = 1.0, 0.0, 0.0
+            norm = 1.0
+        dx, dy, dz = dx / norm, dy / norm, dz / norm
+        length = 1.0
+        for i in range(samples):
+            t = (i / max(1, samples-1)) * length
+            pts.append((src.position.x + dx * t, src.position.y + dy * t, src.position.z + dz * t))
+    else:
+        # radial fan of few rays
+        for k in range(5):
+            angle = (k / 5.0) * 2.0 * math.pi
+            dx = 0.5 * (1.0 + 0.5 * k) * math.cos(angle)
+            dy = 0.5 * (1.0 + 0.5 * k) * math.sin(angle)
+            for i in range(samples // 5):
+                t = (i / max(1, samples//5 - 1)) * 0.8
+                pts.append((src.position.x + dx * t, src.position.y + dy * t, 0.0))
+    return np.array(pts, dtype=float).reshape(-1, 3)
+
+
+def _trace_spatial(req: TraceRequest, obj: SceneObject, idxs: list[int], rays: list[dict | None]):
+    """Trace the given directed sources in 3D around a Schwarzschild (a = 0) or Kerr object."""
+    M = float(obj.params.get('M', 1.0))
+    a = float(obj.params.get('a', 0.0)) if obj.kind == 'kerr' else 0.0
+    c = obj.center or Point(x=0.0, y=0.0, z=0.0)
+    center = np.array([float(c.x), float(c.y), float(c.z)])
+    srcs = [req.sources[i] for i in idxs]
+    pos = np.array([[s.position.x, s.position.y, s.position.z] for s in srcs], dtype=float) - center
+    dirs = np.array(
+        [[s.direction.x, s.direction.y, s.direction.z or 0.0] for s in srcs], dtype=float
+    )
+    # Other scene objects with a radius act as spherical obstacles.
+    obstacles = [
+        (
+            float(o.center.x) - center[0],
+            float(o.center.y) - center[1],
+            float(o.center.z) - center[2],
+            float(o.params['radius']),
+        )
+        for o in req.objects
+        if o is not obj and o.center is not None and 'radius' in o.params
+    ]
+    xyz, r_values, _, _, _ = integrate_kerr_rays_from_cartesian(
+        pos[:, 0], pos[:, 1], pos[:, 2], dirs[:, 0], dirs[:, 1], dirs[:, 2], M, a,
+        samples=req.samples, rtol=req.rtol, atol=req.atol, obstacles=obstacles or None,
+    )
+    points = xyz + center
+    tensors = _grid_cache().query(obj.kind, M, a, tuple(center), points.reshape(-1, 3))
+    eps, mu, xi, zeta = (t.reshape(xyz.shape[:2] + (3, 3)) for t in tensors)
+    for k, i in enumerate(idxs):
+        rays[i] = {
+            'points': points[k],
+            'r': r_values[k],
+            'eps': eps[k],
+            'mu': mu[k],
+            'xi': xi[k],
+            'zeta': zeta[k],
+        }
+
+
+def _trace_fan(req: TraceRequest, obj: SceneObject, idxs: list[int], rays: list[dict | None]):
+    """Trace the given directed sources with the equatorial Schwarzschild integrator in one call."""
+    M = float(obj.params.get('M', 1.0))
+    cx = float(obj.center.x) if obj.center else 0.0
+    cy = float(obj.center.y) if obj.center else 0.0
+    cz = float(obj.center.z) if obj.center else 0.0
+    srcs = [req.sources[i] for i in idxs]
+    x0 = np.array([float(s.position.x) for s in srcs]) - cx
+    y0 = np.array([float(s.position.y) for s in srcs]) - cy
+    dx = np.array([float(s.direction.x) for s in srcs])
+    dy = np.array([float(s.direction.y) for s in srcs])
+    # Other scene objects with a radius act as obstacles that stop rays on contact.
+    obstacles = [
+        (float(o.center.x) - cx, float(o.center.y) - cy, float(o.params['radius']))
+        for o in req.objects
+        if o is not obj and o.center is not None and 'radius' in o.params
+    ]
+    xy, r_values, _, _, _ = integrate_rays_from_cartesian_adaptive(
+        x0, y0, dx, dy, M, samples=req.samples, rtol=req.rtol, atol=req.atol,
+        obstacles=obstacles or None,
+    )
+    xy[..., 0] += cx
+    xy[..., 1] += cy
+    points = np.concatenate([xy, np.full(xy.shape[:2] + (1,), cz)], axis=-1)
+    # Use improved Plebanski mapping via isotropic Schwarzschild metric, interpolated for every
+    # point of every ray from the object's cached tensor grid.
+    tensors = _grid_cache().query('schwarzschild', M, 0.0, (cx, cy, cz), points.reshape(-1, 3))
+    eps, mu, xi, zeta = (t.reshape(xy.shape[:2] + (3, 3)) for t in tensors)
+    for k, i in enumerate(idxs):
+        rays[i] = {
+            'points': points[k],
+            'r': r_values[k],
+            'eps': eps[k],
+            'mu': mu[k],
+            'xi': xi[k],
+            'zeta': zeta[k],
+        }
+
+
+_ENGINES = {'fan': _trace_fan, 'spatial': _trace_spatial}
+
+
+def _plan_rays(req: TraceRequest) -> list[tuple]:
+    """Assign directed sources to an engine: [(engine, lensing object, source indices)].
+
+    Directed sources in a Schwarzschild scene are integrated together as a single vectorized
+    equatorial fan; directed sources around a Kerr object (model 'kerr'), and Schwarzschild rays
+    that leave the object's z plane, go through the 3D Kerr–Schild geodesic engine. Sources not
+    covered by the plan use the straight-line fallback.
+    """
+    # detect a schwarzschild / kerr object if present
+    sch_obj = next((o for o in req.objects if o.kind == 'schwarzschild'), None)
+    kerr_obj = next((o for o in req.objects if o.kind == 'kerr'), None)
+    directed = [i for i, src in enumerate(req.sources) if src.direction]
+    plan = []
+    if req.model == 'kerr' and kerr_obj and directed:
+        plan.append(('spatial', kerr_obj, directed))
+    if req.model == 'schwarzschild' and sch_obj and directed:
+        cz = float(sch_obj.center.z) if sch_obj.center else 0.0
+        off_plane = [
+            i for i in directed
+            if (req.sources[i].direction.z or 0.0) != 0.0 or float(req.sources[i].position.z) != cz
+        ]
+        fan = [i for i in directed if i not in off_plane]
+        if fan:
+            plan.append(('fan', sch_obj, fan))
+        if off_plane:
+            plan.append(('spatial', sch_obj, off_plane))
+    return plan
+
+
+def _trace_cache():
+    settings = get_settings()
+    return get_trace_cache(
+        settings.data_dir,
+        max_bytes=settings.ulf_trace_cache_bytes,
+        memory_bytes=settings.ulf_trace_cache_memory_bytes,
+    )
+
+
+def _ray_cache_key(req: TraceRequest, engine: str, obj: SceneObject, src: Source) -> str:
+    """Hash of everything a single ray depends on; unrelated objects and other sources are left
+    out."""
+    obstacles = sorted(
+        json.dumps([o.center.model_dump(), float(o.params['radius'])], sort_keys=True)
+        for o in req.objects
+        if o is not obj and o.center is not None and 'radius' in o.params
+    )
+    return ray_key(
+        engine=engine,
+        object={
+            'kind': obj.kind,
+            'params': obj.params,
+            'center': obj.center.model_dump() if obj.center else None,
+        },
+        obstacles=obstacles,
+        source=src.model_dump(),
+        samples=req.samples,
+        rtol=req.rtol,
+        atol=req.atol,
+    )
+
+
+def _trace_rays(req: TraceRequest) -> list[dict]:
+    """Compute one ray per source as arrays: {'points': (S, 3)} plus 'r' (S,) and eps/mu/xi/zeta
+    (S, 3, 3) for rays with metric samples (see `_plan_rays` for which engine traces which source).
+
+    Integrated rays are looked up in the per-ray trace cache first, so only new or changed rays
+    are traced.
+    """
+    settings = get_settings()
+    cache = _trace_cache() if settings.ulf_trace_cache else None
+    rays: list[dict | None] = [None] * len(req.sources)
+    for engine, obj, idxs in _plan_rays(req):
+        if cache is None:
+            _ENGINES[engine](req, obj, idxs, rays)
+            continue
+        keys = {i: _ray_cache_key(req, engine, obj, req.sources[i]) for i in idxs}
+        missing = []
+        for i in idxs:
+            rays[i] = cache.get(keys[i])
+            if rays[i] is None:
+                missing.append(i)
+        if missing:
+            _ENGINES[engine](req, obj, missing, rays)
+            for i in missing:
+                cache.put(keys[i], rays[i])
+
+    for i, src in enumerate(req.sources):
+        if rays[i] is None:
+            rays[i] = {'points': _straight_points(src, req.samples)}
+    return rays
+
+
+def _ray_to_dict(ray: dict) -> dict:
+    """JSON form of a ray from `_trace_rays` (same shape as TraceResult.model_dump())."""
+    pts = [{'x': x, 'y': y, 'z': z} for x, y, z in ray['points'].tolist()]
+    metric_samples = None
+    if ray.get('r') is not None:
+        metric_samples = [
+            {'r': r, 'eps': e, 'mu': m, 'xi': x_, 'zeta': z_}
+            for r, e, m, x_, z_ in zip(
+                ray['r'].tolist(),
+                ray['eps'].tolist(),
+                ray['mu'].tolist(),
+                ray['xi'].tolist(),
+                ray['zeta'].tolist(),
+                strict=True,
+            )
+        ]
+    return {'points': pts, 'metric_samples': metric_samples}
+
+
+def _trace_all(req: TraceRequest) -> list[TraceResult]:
+    """Compute one TraceResult per source."""
+    return [TraceResult.model_validate(_ray_to_dict(ray)) for ray in _trace_rays(req)]
 
 
 @router.post("/trace", response_model=TraceResponse)
-def trace_scene(req: TraceRequest) -> TraceResponse:
+def trace_scene(req: TraceRequest, format: str = Query('json', pattern='^(json|binary)$')):
     """Trace endpoint. If `req.model == 'schwarzschild'` and a Schwarzschild object is present,
     perform a Schwarzschild orbital integration and return metric + constitutive samples.
     Otherwise fall back to straight-line traces as before (POC behavior).
-    """
-    traces: List[TraceResult] = []
-
-    # detect a schwarzschild object if present
-    sch_obj = None
-    for o in req.objects:
-        if o.kind == 'schwarzschild':
-            sch_obj = o
-            break
-
-    for src in req.sources:
-        pts = []
-        metric_samples = []
-        if req.model == 'schwarzschild' and sch_obj and src.direction:
-            # Use Schwarzschild integrator in isotropic coordinates.
-            M = float(sch_obj.params.get('M', 1.0))
-            cx = float(sch_obj.center.x) if sch_obj.center else 0.0
-            cy = float(sch_obj.center.y) if sch_obj.center else 0.0
-            x0 = float(src.position.x) - cx
-            y0 = float(src.position.y) - cy
-            dx = float(src.direction.x)
-            dy = float(src.direction.y)
-            out, r_values = integrate_ray_from_cartesian(x0, y0, dx, dy, M, samples=req.samples)
-            for (x, y), r in zip(out, r_values):
-                pts.append(TracePoint(x=x + cx, y=y + cy, z=0.0))
-                # Use improved Plebanski mapping via isotropic Schwarzschild metric
-                eps, mu, xi, zeta = plebanski_tensor_from_metric(x + cx, y + cy, 0.0, M)
-                metric_samples.append({'r': r, 'eps': eps, 'mu': mu, 'xi': xi, 'zeta': zeta})
-            traces.append(TraceResult(points=pts, metric_samples=metric_samples))
-        else:
-            # Fallback: straight line or radial fan as earlier
-            if src.direction:
-                dx = src.direction.x
-                dy = src.direction.y
-                dz = src.direction.z if src.direction.z is not None else 0.0
-                # normalize
-                norm = (dx*dx + dy*dy + dz*dz) ** 0.5
-                if norm == 0:
-                    dx, dy, dz = 1.0, 0.0, 0.0
-                    norm = 1.0
-                dx /= norm; dy /= norm; dz /= norm
-                length = 1.0
-                for i in range(req.samples):
-                    t = (i / max(1, req.samples-1)) * length
-                    pts.append(TracePoint(x=src.position.x + dx * t, y=src.position.y + dy * t, z=src.position.z + dz * t))
-            else:
-                # radial fan of few rays
-                for k in range(5):
-                    angle = (k / 5.0) * 2.0 * 3.141592653589793
-                    dx = 0.5 * (1.0 + 0.5 * k) * float(__import__('math').cos(angle))
-                    dy = 0.5 * (1.0 + 0.5 * k) * float(__import__('math').sin(angle))
-                    for i in range(req.samples // 5):
-                        t = (i / max(1, req.samples//5 - 1)) * 0.8
-                        pts.append(TracePoint(x=src.position.x + dx * t, y=src.position.y + dy * t))
-            traces.append(TraceResult(points=pts))
 
+    With `format=binary` the rays are returned as packed float32 arrays (see `ulf.packed`).
+    """
+    if format == 'binary':
+        trace_id = str(uuid.uuid4())
+        return Response(
+            content=encode_binary(pack_rays(_trace_rays(req))), media_type=PACKED_MEDIA_TYPE,
+            headers={'X-Trace-Id': trace_id},
+        )
+    traces = _trace_all(req)
     constitutive = None
     return TraceResponse(id=str(uuid.uuid4()), traces=traces, constitutive=constitutive)
 
 
-# --- Background trace job endpoints ---
-JOBS_INDEX_NAME = 'jobs_index.json'
+class MetricRequest(BaseModel):
+    object: SceneObject
+    points: list[Point]
 
 
-def _jobs_index_path(settings):
-    return os.path.join(str(settings.data_dir), 'ulf', 'jobs', JOBS_INDEX_NAME)
+class MetricResponse(BaseModel):
+    samples: list[MetricSample]
 
 
-def _load_jobs(settings):
-    p = _jobs_index_path(settings)
-    if os.path.exists(p):
-        try:
-            with open(p, 'r') as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
+@router.post("/metric", response_model=MetricResponse)
+def sample_metric(req: MetricRequest) -> MetricResponse:
+    """Constitutive tensors of a single Schwarzschild/Kerr object at arbitrary points.
+
+    Answers come from the object's precomputed grid (built on first use), so repeated queries
+    for an unchanged object do not redo the tensor math.
+    """
+    kind = req.object.kind
+    if kind not in ('schwarzschild', 'kerr'):
+        raise HTTPException(status_code=400, detail=f"Unsupported object kind: {kind}")
+    M = float(req.object.params.get('M', 1.0))
+    a = float(req.object.params.get('a', 0.0)) if kind == 'kerr' else 0.0
+    c = req.object.center or Point(x=0.0, y=0.0, z=0.0)
+    center = (float(c.x), float(c.y), float(c.z))
+    points = np.array([[p.x, p.y, p.z] for p in req.points], dtype=float).reshape(-1, 3)
+    eps, mu, xi, zeta = (t.tolist() for t in _grid_cache().query(kind, M, a, center, points))
+    r = np.linalg.norm(points - np.array(center), axis=1).tolist()
+    return MetricResponse(samples=[
+        MetricSample(r=r[i], eps=eps[i], mu=mu[i], xi=xi[i], zeta=zeta[i]) for i in range(len(r))
+    ])
+
+
+@router.get('/cache')
+def trace_cache_stats():
+    """Hit/miss counters of this process's per-ray trace cache and the size of its disk tier."""
+    cache = _trace_cache()
+    entries, size = cache.disk_usage()
+    return {
+        **cache.stats(),
+        'disk_entries': entries,
+        'disk_bytes': size,
+        'enabled': get_settings().ulf_trace_cache,
+    }
+
+
+@router.delete('/cache')
+def clear_trace_cache():
+    _trace_cache().clear()
+    return {'cleared': True}
 
 
-def _save_jobs(settings, jobs):
-    p = _jobs_index_path(settings)
-    os.makedirs(os.path.dirname(p), exist_ok=True)
-    with open(p, 'w') as f:
-        json.dump(jobs, f)
+# --- Background trace job endpoints ---
+def _job_index():
+    return get_job_index(get_settings().data_dir)
+
+
+# Trace shards run in a pool of worker processes so ray integration neither blocks the API process
+# nor is pinned to a single core. 'spawn' keeps the children independent of the server's threads.
+_trace_pool: ProcessPoolExecutor | None = None
+_trace_pool_key: tuple | None = None
+_trace_pool_lock = threading.Lock()
 
 
-_jobs: dict = {}
+# Settings that trace pool workers need to share with the API process
+_WORKER_SETTINGS = (
+    'ulf_grid_cache_bytes',
+    'ulf_trace_cache',
+    'ulf_trace_cache_bytes',
+    'ulf_trace_cache_memory_bytes',
+)
+
+
+def _init_trace_worker(data_dir: str, overrides: dict):
+    # Children build their own Settings from the environment; align them with the parent's.
+    settings = get_settings()
+    settings.data_dir = Path(data_dir)
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+
+def _get_trace_pool(settings) -> ProcessPoolExecutor:
+    global _trace_pool, _trace_pool_key
+    workers = settings.ulf_trace_workers if settings.ulf_trace_workers > 0 else os.cpu_count() or 1
+    overrides = {name: getattr(settings, name) for name in _WORKER_SETTINGS}
+    key = (workers, str(settings.data_dir), tuple(sorted(overrides.items())))
+    with _trace_pool_lock:
+        if _trace_pool is None or _trace_pool_key != key:
+            if _trace_pool is not None:
+                _trace_pool.shutdown(wait=False)
+            _trace_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_trace_worker,
+                initargs=(str(settings.data_dir), overrides),
+            )
+            _trace_pool_key = key
+        return _trace_pool
+
+
+def _shard_request(req: TraceRequest, shard_rays: int) -> list[dict]:
+    """Split a trace request into payloads of at most `shard_rays` sources each (same scene)."""
+    size = max(1, int(shard_rays))
+    base = req.model_dump(exclude={'sources'})
+    return [
+        {**base, 'sources': [s.model_dump() for s in req.sources[i:i + size]]}
+        for i in range(0, max(1, len(req.sources)), size)
+    ]
+
+
+def _shard_dir(path: str) -> str:
+    return os.path.splitext(path)[0] + '.shards'
+
+
+def _trace_shard(data_dir: str, jid: str, path: str, i: int, payload: dict) -> None:
+    """Pool entry point: trace one shard, write it to disk and mark it done.
+
+    Each shard is stored as NDJSON (one trace per line, read by the stream endpoint) and as packed
+    arrays. The worker that completes the last shard also assembles the job's result files, so
+    nothing but the future's outcome travels back to the API process.
+    """
+    rays = _trace_rays(TraceRequest.model_validate(payload))
+    shard_base = os.path.join(_shard_dir(path), str(i))
+    write_npz(shard_base + '.npz', pack_rays(rays))
+    tmp = f"{shard_base}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        for ray in rays:
+            f.write(json.dumps(_ray_to_dict(ray)) + '\n')
+    os.replace(tmp, shard_base + '.ndjson')
+    index = get_job_index(Path(data_dir))
+    info = index.mark_shard(jid, i, 'done')
+    if info is not None and info['shards_done'] == info['shards_total']:
+        _assemble_trace_job(index, jid, path, info['shards_total'])
+
+
+def _assemble_trace_job(index, jid: str, path: str, n_shards: int) -> None:
+    """Join a job's shard files into <job_id>.npz and <job_id>.json, then mark the job done."""
+    shards_dir = _shard_dir(path)
+    packed_path = os.path.splitext(path)[0] + '.npz'
+    parts = [read_npz(os.path.join(shards_dir, f"{i}.npz")) for i in range(n_shards)]
+    write_npz(packed_path, concat_packed(parts))
+    # the shard lines already are the serialized traces; copy them instead of re-encoding
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as out:
+        out.write(f'{{"id": {json.dumps(jid)}, "traces": [')
+        sep = ''
+        for i in range(n_shards):
+            with open(os.path.join(shards_dir, f"{i}.ndjson")) as f:
+                for line in f:
+                    out.write(sep + line.rstrip('\n'))
+                    sep = ', '
+        out.write(']}')
+    os.replace(tmp, path)
+    index.update(jid, status='done', path=path, packed_path=packed_path)
+
+
+def _on_shard_done(index, jid: str, i: int, futures: list[Future], fut: Future) -> None:
+    """Done-callback in the API process: record a failed shard and drop the job's pending ones."""
+    if fut.cancelled() or fut.exception() is None:
+        return
+    error = str(fut.exception())
+
+    def _failed(info: dict) -> None:
+        # the last shard can fail after it was marked done, while assembling the job
+        if info['shards'][i] != 'done':
+            info['shards'][i] = 'error'
+        info.update(status='error', error=error)
+
+    index.update(jid, _failed)
+    for other in futures:
+        other.cancel()
+
+
+def _submit_trace_job(settings, jid: str, shards: list[dict], path: str) -> None:
+    # Even a single shard goes to the pool, and the workers write every result file themselves:
+    # no API thread waits on the job or handles its rays.
+    index = get_job_index(settings.data_dir)
+    os.makedirs(_shard_dir(path), exist_ok=True)
+    pool = _get_trace_pool(settings)
+    futures: list[Future] = []
+    for i, shard in enumerate(shards):
+        fut = pool.submit(_trace_shard, str(settings.data_dir), jid, path, i, shard)
+        futures.append(fut)
+        fut.add_done_callback(functools.partial(_on_shard_done, index, jid, i, futures))
+
 
 @router.post("/trace_job")
-def start_trace_job(req: TraceRequest, background: BackgroundTasks):
-    """Start a background trace job and return a job id. Results are written to disk under data_dir/ulf/jobs/<job_id>.json"""
+def start_trace_job(req: TraceRequest):
+    """Start a background trace job and return a job id. Results are written to disk under
+    data_dir/ulf/jobs/<job_id>.json (and packed float32 arrays to <job_id>.npz, see
+    `/trace_job/{job_id}/download`).
+
+    Sources are split into shards of `ulf_trace_shard_rays` rays which are traced in parallel by a
+    process pool of `ulf_trace_workers` workers; the job index records the state of every shard.
+    """
     settings = get_settings()
     data_dir = os.path.join(str(settings.data_dir), 'ulf', 'jobs')
     os.makedirs(data_dir, exist_ok=True)
-    # Load persisted index
-    global _jobs
-    _jobs = _load_jobs(settings) or {}
 
     job_id = str(uuid.uuid4())
-    _jobs[job_id] = { 'status': 'pending', 'path': None }
-    _save_jobs(settings, _jobs)
-
-    def _worker(jid: str, payload: dict):
-        try:
-            # Reconstruct TraceRequest-like dict
-            objects = payload.get('objects', [])
-            sources = payload.get('sources', [])
-            samples = int(payload.get('samples', 200))
-            model = payload.get('model', None)
-
-            # Simple reuse of trace logic: perform traces synchronously and write results
-            traces_out = []
-            sch_obj = None
-            for o in objects:
-                if o.get('kind') == 'schwarzschild':
-                    sch_obj = o
-                    break
-            for src in sources:
-                pts = []
-                metric_samples = []
-                if model == 'schwarzschild' and sch_obj and src.get('direction'):
-                    M = float(sch_obj.get('params', {}).get('M', 1.0))
-                    cx = float(sch_obj.get('center', {}).get('x', 0.0))
-                    cy = float(sch_obj.get('center', {}).get('y', 0.0))
-                    x0 = float(src.get('position', {}).get('x', 0.0)) - cx
-                    y0 = float(src.get('position', {}).get('y', 0.0)) - cy
-                    dx = float(src.get('direction', {}).get('x', 1.0))
-                    dy = float(src.get('direction', {}).get('y', 0.0))
-                    out, r_values = integrate_ray_from_cartesian(x0, y0, dx, dy, M, samples=samples)
-                    for (x, y), r in zip(out, r_values):
-                        pts.append({ 'x': x + cx, 'y': y + cy, 'z': 0.0 })
-                        eps, mu, xi, zeta = plebanski_tensor_from_metric(x + cx, y + cy, 0.0, M)
-                        metric_samples.append({ 'r': r, 'eps': eps, 'mu': mu, 'xi': xi, 'zeta': zeta })
-                else:
-                    # simple straight-line fallback
-                    if src.get('direction'):
-                        dx = float(src.get('direction', {}).get('x', 1.0))
-                        dy = float(src.get('direction', {}).get('y', 0.0))
-                        dz = float(src.get('direction', {}).get('z', 0.0))
-                        norm = (dx*dx + dy*dy + dz*dz) ** 0.5
-                        if norm == 0:
-                            dx, dy, dz = 1.0, 0.0, 0.0
-                            norm = 1.0
-                        dx /= norm; dy /= norm; dz /= norm
-                        length = 1.0
-                        for i in range(samples):
-                            t = (i / max(1, samples-1)) * length
-                            pts.append({ 'x': src.get('position', {}).get('x', 0.0) + dx * t, 'y': src.get('position', {}).get('y', 0.0) + dy * t, 'z': src.get('position', {}).get('z', 0.0) + dz * t })
-                traces_out.append({'points': pts, 'metric_samples': metric_samples})
-            result = {'id': job_id, 'traces': traces_out}
-            path = os.path.join(data_dir, f"{job_id}.json")
-            with open(path, 'w') as f:
-                json.dump(result, f)
-            _jobs[jid]['status'] = 'done'
-            _jobs[jid]['path'] = path
-            _save_jobs(settings, _jobs)
-        except Exception as e:
-            _jobs[jid]['status'] = 'error'
-            _jobs[jid]['error'] = str(e)
-            _save_jobs(settings, _jobs)
-
-    background.add_task(_worker, job_id, req.model_dump())
-    _jobs[job_id]['status'] = 'running'
-    _save_jobs(settings, _jobs)
+    shards = _shard_request(req, settings.ulf_trace_shard_rays)
+    shard_offsets = [0]
+    for shard in shards:
+        shard_offsets.append(shard_offsets[-1] + len(shard['sources']))
+    path = os.path.join(data_dir, f"{job_id}.json")
+    get_job_index(settings.data_dir).create(job_id, dict(
+        status='running', path=None, shards=['pending'] * len(shards), shards_done=0,
+        shards_total=len(shards), shard_offsets=shard_offsets, shards_dir=_shard_dir(path),
+    ))
+    try:
+        _submit_trace_job(settings, job_id, shards, path)
+    except Exception as e:
+        get_job_index(settings.data_dir).update(job_id, status='error', error=str(e))
     return { 'job_id': job_id }
 
 
 @router.get('/trace_job/{job_id}')
 def get_trace_job(job_id: str):
-    settings = get_settings()
-    global _jobs
-    _jobs = _load_jobs(settings) or {}
-    info = _jobs.get(job_id)
+    info = _job_index().get(job_id)
     if not info:
         return { 'status': 'not_found' }
     if info.get('status') == 'done' and info.get('path'):
@@ -248,5 +564,119 @@ def get_trace_job(job_id: str):
                 return { 'status': 'done', 'result': json.load(f) }
         except Exception:
             return { 'status': 'done', 'result': None }
-    return { 'status': info.get('status') }
+    out = { 'status': info.get('status') }
+    if 'shards_total' in info:
+        out['progress'] = {
+            'shards_done': info.get('shards_done', 0),
+            'shards_total': info['shards_total'],
+            'shards': info.get('shards', []),
+        }
+    if info.get('error'):
+        out['error'] = info['error']
+    return out
+
+
+def _iter_file(path: str, chunk_size: int = 1 << 20):
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+@router.get('/trace_job/{job_id}/download')
+def download_trace_job(job_id: str, format: str = Query('binary', pattern='^(binary|npz|json)$')):
+    """Stream a finished job's result: packed octet-stream (default), the .npz file or the JSON."""
+    info = _job_index().get(job_id)
+    if not info:
+        raise HTTPException(status_code=404, detail='job not found')
+    if info.get('status') != 'done' or not info.get('path'):
+        raise HTTPException(status_code=409, detail=f"job is {info.get('status')}")
+    if format == 'json':
+        return StreamingResponse(_iter_file(info['path']), media_type='application/json')
+    packed_path = info.get('packed_path')
+    if format == 'npz':
+        if not packed_path or not os.path.exists(packed_path):
+            raise HTTPException(status_code=404, detail='packed result not available')
+        return StreamingResponse(
+            _iter_file(packed_path), media_type='application/octet-stream',
+            headers={'Content-Disposition': f'attachment; filename="{job_id}.npz"'},
+        )
+    if packed_path and os.path.exists(packed_path):
+        packed = read_npz(packed_path)
+    else:
+        # jobs finished before packed results were written only have the JSON file
+        with open(info['path']) as f:
+            packed = pack_traces(json.load(f)['traces'])
+    return StreamingResponse(iter_binary(packed), media_type=PACKED_MEDIA_TYPE)
+
+
+def _iter_job_traces(job_id: str, offset: int, poll_interval: float):
+    """Yield (index, trace dict) for a job's rays in source order starting at `offset`, waiting for
+    shards that are still running. Ends with ('done' | 'error' | 'not_found', info)."""
+    index = _job_index()
+    next_shard = 0
+    while True:
+        info = index.get(job_id)
+        if not info or 'shard_offsets' not in info:
+            yield 'not_found', info
+            return
+        bounds = info['shard_offsets']
+        while next_shard < len(info['shards']) and info['shards'][next_shard] == 'done':
+            lo, hi = bounds[next_shard], bounds[next_shard + 1]
+            if hi > offset:
+                with open(os.path.join(info['shards_dir'], f"{next_shard}.ndjson")) as f:
+                    for k, line in enumerate(f, start=lo):
+                        if k >= offset:
+                            yield k, json.loads(line)
+            next_shard += 1
+        if next_shard >= len(info['shards']):
+            yield 'done', info
+            return
+        if info.get('status') == 'error' or info['shards'][next_shard] == 'error':
+            yield 'error', info
+            return
+        time.sleep(poll_interval)
+
+
+@router.get('/trace_job/{job_id}/stream')
+def stream_trace_job(
+    job_id: str,
+    request: Request,
+    offset: int = Query(0, ge=0),
+    format: str = Query('ndjson', pattern='^(ndjson|sse)$'),
+):
+    """Stream a job's traces as they finish, in source order, starting at ray `offset`.
+
+    - ndjson: one `{"index": k, "trace": {...}}` line per ray, then a final `{"status": ...}` line;
+    - sse: `trace` events with `id: k` (reconnecting clients resume via Last-Event-ID), then a
+      `status` event.
+    Finished shards are persisted, so a client can reconnect at any offset while or after the job
+    runs.
+    """
+    if not _job_index().get(job_id):
+        raise HTTPException(status_code=404, detail='job not found')
+    if format == 'sse':
+        last = request.headers.get('last-event-id')
+        if last is not None and last.strip().isdigit():
+            offset = max(offset, int(last) + 1)
+
+    def _gen():
+        for key, value in _iter_job_traces(job_id, offset, poll_interval=0.1):
+            if isinstance(key, int):
+                if format == 'sse':
+                    yield f"event: trace\nid: {key}\ndata: {json.dumps(value)}\n\n"
+                else:
+                    yield json.dumps({'index': key, 'trace': value}) + '\n'
+                continue
+            status = {'status': key}
+            if value and value.get('error'):
+                status['error'] = value['error']
+            if format == 'sse':
+                yield f"event: status\ndata: {json.dumps(status)}\n\n"
+            else:
+                yield json.dumps(status) + '\n'
 
+    media_type = 'text/event-stream' if format == 'sse' else 'application/x-ndjson'
+    return StreamingResponse(_gen(), media_type=media_type, headers={'Cache-Control': 'no-cache'})
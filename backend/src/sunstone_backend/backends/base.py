@@ -1,12 +1,32 @@
 from __future__ import annotations
 
+import sys
 from abc import ABC, abstractmethod
 from pathlib import Path
 
 
 class Backend(ABC):
     name: str
+    # run() honours runtime/pause.request and runtime/resume.json (see sunstone_backend.checkpoint)
+    supports_checkpoint: bool = False
 
     @abstractmethod
     def run(self, run_dir: Path) -> None:
         raise NotImplementedError
+
+    def preload(self) -> None:
+        """Import heavy solver modules ahead of time.
+
+        Called once by warm pool workers before they start forking runs.
+        """
+        return None
+
+    def version(self, python_executable: str | None = None) -> str:
+        """Identify the code that produces this backend's results; part of the result-cache key."""
+        from ..version import __version__
+
+        version = f"sunstone-backend {__version__}"
+        if python_executable and python_executable != sys.executable:
+            # a worker in another environment may run other solver/package versions
+            version += f" ({python_executable})"
+        return version
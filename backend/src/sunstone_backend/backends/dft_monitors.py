@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+# Frequency-domain (DFT) point monitors for time-domain backends.
+#
+# Instead of a time series, a DFT monitor keeps the running Fourier transform of its field
+# components at a set of frequencies,
+#     F(f) = 1/sqrt(2 pi) * sum_n f(t_n) exp(2 pi i f t_n) dt,
+# the normalization Meep uses for its own DFT fields, so both ways of computing it agree. With Meep
+# the transform is accumulated by the solver itself (Simulation.add_dft_fields); builds without it
+# use the batched point readers of point_monitors.py every time step. Either way the result is a
+# (n_freq, n_components) complex array per monitor, written to outputs/spectra/<id>.npz.
+#
+# The transform is linear in time, so a resumed run continues from the value saved in the
+# checkpoint (`base`) and adds what the solver accumulates after the restart.
+
+
+def monitor_frequencies(mon: dict) -> np.ndarray:
+    """Frequencies of a DFT monitor spec: "frequencies" [...], or "fcen", "df" and "nfreq"."""
+    if mon.get("frequencies") is not None:
+        freqs = np.asarray([float(f) for f in mon["frequencies"]])
+    elif mon.get("fcen") is not None:
+        fcen = float(mon["fcen"])
+        df = float(mon.get("df", 0.0))
+        nfreq = int(mon.get("nfreq", 1))
+        freqs = np.linspace(fcen - df / 2, fcen + df / 2, nfreq) if nfreq > 1 else np.array([fcen])
+    else:
+        raise ValueError(
+            f"DFT monitor {mon.get('id')!r} needs 'frequencies' or 'fcen'/'df'/'nfreq'"
+        )
+    if freqs.size == 0:
+        raise ValueError(f"DFT monitor {mon.get('id')!r} has no frequencies")
+    return freqs
+
+
+class DftMonitorSet:
+    """DFT monitors sharing their frequencies.
+
+    Values are complex, shaped (n_monitors, n_freq, n_components).
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        positions,
+        components: list[str],
+        freqs,
+        monitor_components: dict[str, list[str]] | None = None,
+    ) -> None:
+        self.ids = list(ids)
+        self.positions = np.asarray(positions, dtype=float).reshape(len(self.ids), 3)
+        # union of the components the monitors asked for, as for point monitor groups
+        self.components = list(components)
+        self.monitor_components = monitor_components or {i: self.components for i in self.ids}
+        self.freqs = np.asarray(freqs, dtype=float)
+        shape = (len(self.ids), self.freqs.size, len(self.components))
+        # value at the checkpoint resumed from, and what was accumulated here since
+        self.base = np.zeros(shape, dtype=complex)
+        self.values = np.zeros(shape, dtype=complex)
+        self.last_t: float | None = None
+        # solver-side DFT objects per monitor (Meep), or readers for accumulating here
+        self.native: list | None = None
+        self.readers: dict[str, Callable[[object], np.ndarray]] = {}
+
+    def accumulate(self, t: float, dt: float, samples: np.ndarray) -> None:
+        """Add the (n_monitors, n_components) field samples at time t, one time step dt long."""
+        phase = np.exp(2j * math.pi * self.freqs * t) * (dt / math.sqrt(2 * math.pi))
+        self.values += samples[:, None, :] * phase[None, :, None]
+        self.last_t = float(t)
+
+    def step(self, sim, t: float, dt: float) -> None:
+        samples = np.empty((len(self.ids), len(self.components)), dtype=complex)
+        for k, comp in enumerate(self.components):
+            samples[:, k] = self.readers[comp](sim)
+        self.accumulate(t, dt, samples)
+
+    def current(
+        self, read_native: Callable[[object, str, int], complex] | None = None
+    ) -> np.ndarray:
+        """The transforms so far.
+
+        read_native(dft_object, component, freq_index) reads solver-side DFTs.
+        """
+        if self.native is None:
+            return self.base + self.values
+        out = self.base.copy()
+        for m, obj in enumerate(self.native):
+            for k, comp in enumerate(self.components):
+                for j in range(self.freqs.size):
+                    out[m, j, k] += read_native(obj, comp, j)
+        return out
+
+    def write(self, out_dir: Path, values: np.ndarray) -> list[str]:
+        """Write outputs/spectra/<id>.npz per monitor.
+
+        Each holds freq (n_freq,), dft (n_freq, n_components) and components.
+        """
+        out_dir.mkdir(parents=True, exist_ok=True)
+        names = []
+        for m, mon_id in enumerate(self.ids):
+            comps = self.monitor_components[mon_id]
+            cols = [self.components.index(c) for c in comps]
+            np.savez(
+                out_dir / f"{mon_id}.npz",
+                freq=self.freqs,
+                dft=values[m][:, cols],
+                components=np.array(comps),
+                position=self.positions[m],
+            )
+            names.append(f"{mon_id}.npz")
+        return names
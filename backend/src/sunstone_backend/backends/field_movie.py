@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import zarr
+from zarr.storage import LocalStore
+
+from .zarr_stream import ZarrStreamWriter
+
+# Streaming field-movie output (outputs/fields/field_movie.zarr).
+#
+# One (n_frames, nx, ny) array per component plus `times`, written chunk by chunk while the run
+# progresses (see zarr_stream.py), so memory stays flat however many frames are recorded. Group
+# attribute "frames" counts the frames readable so far and "complete" marks a finished movie.
+
+
+class FieldMovieWriter(ZarrStreamWriter):
+    """Appends frames of a fixed set of components to a time-chunked Zarr movie at `path`."""
+
+    count_attr = "frames"
+
+    def __init__(
+        self,
+        path: Path,
+        components: list[str],
+        chunk_frames: int = 0,
+        flush_interval: float = 10.0,
+        attrs: dict | None = None,
+        write: bool = True,
+    ) -> None:
+        self.components = list(components)
+        super().__init__(
+            path,
+            ["times", *self.components],
+            time_name="times",
+            chunk_rows=chunk_frames,
+            flush_interval=flush_interval,
+            attrs={**(attrs or {}), "components": self.components},
+            write=write,
+        )
+
+    def open(self, frames: int = 0) -> None:
+        """Start a new movie, or (frames > 0) continue the one on disk after `frames` frames."""
+        super().open(frames)
+
+    def append(self, t: float, frames: dict[str, np.ndarray]) -> None:
+        """Add the frame of every component at time t."""
+        super().append({"times": t, **frames})
+
+
+def read_field_movie(path: Path) -> tuple[np.ndarray, dict[str, zarr.Array], dict]:
+    """(times, {component: array}, attrs) of a movie, possibly still being written.
+
+    Component arrays are lazy; slice them within [:len(times)].
+    """
+    group = zarr.open_group(store=LocalStore(str(path)), mode="r")
+    attrs = dict(group.attrs)
+    frames = int(attrs.get("frames", 0))
+    if frames == 0 or "times" not in group:
+        return np.empty(0), {}, attrs
+    arrays = {c: group[c] for c in attrs.get("components", []) if c in group}
+    return group["times"][:frames], arrays, attrs
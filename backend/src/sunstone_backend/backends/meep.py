@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-import csv
 import json
 from collections import defaultdict
 from pathlib import Path
 
+from .. import mpi
+from ..checkpoint import Checkpointer
+from ..monitor_data import write_monitor_csv
 from .base import Backend
+from .dft_monitors import DftMonitorSet, monitor_frequencies
+from .field_movie import FieldMovieWriter
+from .point_monitors import MAX_BOX_POINTS_PER_MONITOR, GridSampler, PointMonitorGroup, bounding_box
 
 # Use shared normalization util
 from ..util.materials import normalize_materials
@@ -82,9 +87,31 @@ class MeepBackend(Backend):
       The intended workflow is to run `sunstone-worker` under a separate Python
       interpreter/environment that has Meep installed.
     - This backend is intentionally minimal; it exists to prove out the run-dir contract.
+    - Under MPI (backend option mpi_ranks, see mpi.py) every rank runs this method and takes part
+      in Meep's collective field reads; only rank 0 writes outputs.
     """
 
     name = "meep"
+    supports_checkpoint = True
+
+    def preload(self) -> None:
+        # `import meep` takes seconds; a warm worker pays it once. Import errors surface on run.
+        try:
+            import meep  # noqa: F401
+            import numpy  # noqa: F401
+        except Exception:
+            pass
+
+    def version(self, python_executable: str | None = None) -> str:
+        # from package metadata: importing meep just to read its version costs seconds per submit
+        from importlib.metadata import PackageNotFoundError
+        from importlib.metadata import version as dist_version
+
+        try:
+            meep_version = dist_version("meep")
+        except PackageNotFoundError:
+            meep_version = "unknown"
+        return f"{super().version(python_executable)} meep {meep_version}"
 
     def run(self, run_dir: Path) -> None:
         import logging
@@ -102,6 +129,8 @@ class MeepBackend(Backend):
             ) from e
 
         spec = json.loads((run_dir / "spec.json").read_text())
+        # the rank that writes the run's files; the others compute the same values and drop them
+        root = mpi.is_root()
 
         domain = spec.get("domain", {})
         resolution = int(domain.get("resolution", 20))
@@ -251,12 +280,28 @@ class MeepBackend(Backend):
                 )
             )
 
+        # Monitor samples: float64 by default, float32 to halve the output; complex keeps the
+        # imaginary part too, which needs complex fields
+        outputs = spec.get("outputs", {})
+        if not isinstance(outputs, dict):
+            outputs = {}
+        monitor_dtype = str(outputs.get("monitor_dtype", "float64"))
+        if monitor_dtype not in ("float32", "float64"):
+            raise ValueError(
+                f"outputs.monitor_dtype must be 'float32' or 'float64', got {monitor_dtype!r}"
+            )
+        monitor_complex = bool(outputs.get("monitor_complex", False))
+        if monitor_complex:
+            monitor_dtype = "complex64" if monitor_dtype == "float32" else "complex128"
+        sim_kwargs = {"force_complex_fields": True} if monitor_complex else {}
+
         sim = mp.Simulation(
             cell_size=cell,
             resolution=resolution,
             boundary_layers=boundary_layers,
             geometry=geometry,
             sources=sources,
+            **sim_kwargs,
         )
 
         # Apply per-face (non-PML) boundary conditions where supported by Meep
@@ -288,8 +333,10 @@ class MeepBackend(Backend):
 
         monitors = spec.get("monitors", [])
         monitor_meta = {}
-        monitor_samples: dict[str, list[dict[str, float]]] = defaultdict(list)
         monitor_groups: dict[float, list[dict]] = defaultdict(list)
+        # DFT monitors ("type": "dft") by their frequencies
+        dft_meta = {}
+        dft_groups: dict[tuple, list[dict]] = defaultdict(list)
 
         def normalize_component(comp: str) -> str:
             return comp if hasattr(mp, comp) else "Ez"
@@ -300,35 +347,102 @@ class MeepBackend(Backend):
             if dim == 2:
                 pos = [pos[0], pos[1], 0.0]
             comps = [normalize_component(c) for c in mon.get("components", ["Ez"]) or ["Ez"]]
+            if mon.get("type") == "dft":
+                freqs = monitor_frequencies(mon)
+                entry = {"position": pos, "components": comps}
+                dft_meta[mon_id] = {**entry, "frequencies": freqs.tolist()}
+                dft_groups[tuple(freqs.tolist())].append({"id": mon_id, **entry})
+                continue
             dt = float(mon.get("dt", 1e-16))
             if dt <= 0:
                 dt = 1e-16
             monitor_meta[mon_id] = {"position": pos, "components": comps, "dt": dt}
             monitor_groups[dt].append({"id": mon_id, "position": pos, "components": comps})
 
+        # One PointMonitorGroup per sample interval (outputs/monitors/point_group_<n>.zarr)
+        monitors_dir = run_dir / "outputs" / "monitors"
+        point_groups: list[tuple[float, PointMonitorGroup]] = []
+        for gi, (dt, items) in enumerate(monitor_groups.items()):
+            point_groups.append((dt, PointMonitorGroup(
+                monitors_dir / f"point_group_{gi}.zarr",
+                [item["id"] for item in items],
+                [item["position"] for item in items],
+                list(dict.fromkeys(c for item in items for c in item["components"])),
+                monitor_components={item["id"]: item["components"] for item in items},
+                dtype=monitor_dtype,
+                flush_interval=float(outputs.get("monitor_flush_interval", 10.0)),
+                attrs={"dt": dt},
+                write=root,
+            )))
+        dft_sets = [
+            DftMonitorSet(
+                [item["id"] for item in items],
+                [item["position"] for item in items],
+                list(dict.fromkeys(c for item in items for c in item["components"])),
+                freqs,
+                monitor_components={item["id"]: item["components"] for item in items},
+            )
+            for freqs, items in dft_groups.items()
+        ]
+        # real part only unless complex samples were asked for
+        field_value = (lambda v: v) if monitor_complex else np.real
+
+        def point_readers(
+            sim, positions: np.ndarray, components: list[str], value=field_value
+        ) -> dict:
+            """Per component, a reader of the field at all of the positions.
+
+            One get_array over the positions' bounding box, interpolated at the positions, when the
+            box is small enough and this Meep build reports the array's grid; else get_field_point.
+            """
+            center, size = bounding_box(positions, 2.0 / resolution, dim)
+            box = {"center": mp.Vector3(*center), "size": mp.Vector3(*size)}
+            sampler = None
+            try:
+                meta = sim.get_array_metadata(**box)
+                xs, ys, zs = meta[0], meta[1], meta[2]
+                if len(xs) * len(ys) * len(zs) <= MAX_BOX_POINTS_PER_MONITOR * len(positions):
+                    probe = sim.get_array(component=getattr(mp, components[0]), **box)
+                    if np.size(probe) == len(xs) * len(ys) * len(zs):
+                        sampler = GridSampler(positions, xs, ys, zs)
+            except Exception as e:
+                logger.info(
+                    f"[MeepBackend] Batched monitor reads unavailable ({e}); sampling pointwise"
+                )
+            readers = {}
+            for comp in components:
+                field = getattr(mp, comp)
+                if sampler is not None:
+                    def read(sim, field=field):
+                        return sampler(value(sim.get_array(component=field, **box)))
+                else:
+                    points = [mp.Vector3(*p) for p in positions.tolist()]
+
+                    def read(sim, field=field, points=points):
+                        return np.array([value(sim.get_field_point(field, p)) for p in points])
+                readers[comp] = read
+            return readers
+
         callbacks = []
-        for dt, group in monitor_groups.items():
-            def make_cb(items):
+        for dt, group in point_groups:
+            def make_cb(group):
                 def _cb(sim):
                     t = float(sim.meep_time())
-                    for item in items:
-                        row = {"t": t}
-                        for comp in item["components"]:
-                            field = getattr(mp, comp)
-                            val = sim.get_field_point(field, mp.Vector3(*item["position"]))
-                            # Handle complex values: store real part only
-                            row[comp] = float(val.real) if hasattr(val, 'real') else float(val)
-                        monitor_samples[item["id"]].append(row)
+                    if group.n and t <= group.last_t:
+                        # already sampled before the checkpoint this run resumed from
+                        return
+                    if not group.readers:
+                        group.readers = point_readers(sim, group.positions, group.components)
+                    group.sample(sim, t)
 
                 return _cb
 
             callbacks.append(mp.at_every(dt, make_cb(group)))
 
-        outputs = spec.get("outputs", {})
-        field_movie = outputs.get("field_movie") if isinstance(outputs, dict) else None
-        field_snapshot = outputs.get("field_snapshot") if isinstance(outputs, dict) else None
-        field_frames: dict[str, list] = defaultdict(list)
-        field_times: list[float] = []
+        field_movie = outputs.get("field_movie")
+        field_snapshot = outputs.get("field_snapshot")
+        fields_dir = run_dir / "outputs" / "fields"
+        movie: FieldMovieWriter | None = None
 
         def normalize_component_list(items) -> list[str]:
             if not items:
@@ -351,6 +465,20 @@ class MeepBackend(Backend):
             size = list(field_movie.get("size", cell_size))
             center = [center[0], center[1], 0.0]
             size = [size[0], size[1], 0.0]
+            # frames stream to disk chunk by chunk (see field_movie.py), so memory stays flat
+            movie = FieldMovieWriter(
+                fields_dir / "field_movie.zarr",
+                components,
+                chunk_frames=int(field_movie.get("chunk_frames", 0) or 0),
+                flush_interval=float(field_movie.get("flush_interval", 10.0)),
+                attrs={
+                    "cell_size": list(cell_size),
+                    "resolution": resolution,
+                    "stride": stride,
+                    "dt": movie_dt,
+                },
+                write=root,
+            )
 
             def movie_cb(sim):
                 t = float(sim.meep_time())
@@ -358,9 +486,11 @@ class MeepBackend(Backend):
                     return
                 if stop_time_val is not None and t > stop_time_val:
                     return
-                if max_frames and len(field_times) >= max_frames:
+                if max_frames and movie.n >= max_frames:
+                    return
+                if movie.n and t <= movie.last_t:
                     return
-                field_times.append(t)
+                frames = {}
                 for comp in components:
                     field = getattr(mp, comp)
                     arr = sim.get_array(
@@ -370,17 +500,132 @@ class MeepBackend(Backend):
                     )
                     if stride > 1:
                         arr = arr[::stride, ::stride]
-                    field_frames[comp].append(arr)
+                    frames[comp] = arr
+                movie.append(t, frames)
 
             callbacks.append(mp.at_every(movie_dt, movie_cb))
 
-        if callbacks:
-            sim.run(*callbacks, until=max_time)
-        else:
-            sim.run(until=max_time)
+        # Checkpoint/restart: restore fields, time and buffers when resuming, then checkpoint
+        # periodically (run_control.checkpoint_interval, wall-clock seconds) and on pause/SIGTERM
+        interval = float(run_control.get("checkpoint_interval", 600.0) or 0.0)
+        checkpointer = Checkpointer(run_dir, interval=interval)
+        restored = checkpointer.start()
+        monitor_ids = [*monitor_meta, *dft_meta]
+        t_start = 0.0
+        if restored is not None:
+            ckpt_path, ckpt_state, ckpt_arrays = restored
+            if ckpt_state.get("monitors", monitor_ids) != monitor_ids:
+                raise RuntimeError(
+                    "Checkpoint does not match the run spec (monitors changed); "
+                    "submit a fresh run instead"
+                )
+            sim.load(str(ckpt_path / "sim"), load_structure=True, load_fields=True)
+            t_start = float(ckpt_state["t"])
+            for si, dft_set in enumerate(dft_sets):
+                if f"dft_{si}" in ckpt_arrays:
+                    dft_set.base = ckpt_arrays[f"dft_{si}"]
+                    dft_set.last_t = t_start
+            logger.info(f"[MeepBackend] Resuming from {ckpt_path.name} at t={t_start}")
+
+        # DFT monitors: Meep's own DFT fields where this build has them, else a running sum over
+        # point reads at every time step
+        def read_dft(obj, comp: str, j: int) -> complex:
+            return complex(np.mean(sim.get_dft_array(obj, getattr(mp, comp), j)))
+
+        for dft_set in dft_sets:
+            try:
+                dft_set.native = [
+                    sim.add_dft_fields(
+                        [getattr(mp, c) for c in dft_set.components],
+                        dft_set.freqs.tolist(),
+                        center=mp.Vector3(*pos),
+                        size=mp.Vector3(),
+                    )
+                    for pos in dft_set.positions.tolist()
+                ]
+                continue
+            except Exception as e:
+                logger.info(
+                    f"[MeepBackend] DFT fields unavailable ({e}); "
+                    f"accumulating DFT monitors {dft_set.ids} per time step"
+                )
 
-        fields_dir = run_dir / "outputs" / "fields"
-        fields_dir.mkdir(parents=True, exist_ok=True)
+            def make_dft_cb(dft_set):
+                def _cb(sim):
+                    t = float(sim.meep_time())
+                    if dft_set.last_t is not None and t <= dft_set.last_t:
+                        return
+                    if dft_set.last_t is not None:
+                        dt = t - dft_set.last_t
+                    else:
+                        dt = getattr(sim, "Courant", 0.5) / resolution
+                    if not dft_set.readers:
+                        dft_set.readers = point_readers(
+                            sim, dft_set.positions, dft_set.components, value=np.asarray
+                        )
+                    dft_set.step(sim, t, dt)
+
+                return _cb
+
+            callbacks.append(make_dft_cb(dft_set))
+
+        def checkpoint_buffers() -> tuple[dict, dict]:
+            # monitor samples and movie frames are already in their Zarr stores; record how many
+            # belong to this point
+            for _, group in point_groups:
+                group.flush()
+            meta = {
+                "monitors": monitor_ids,
+                "max_time": max_time,
+                "monitor_samples": [g.n for _, g in point_groups],
+            }
+            if movie is not None:
+                movie.flush()
+                meta["movie_frames"] = movie.n
+            # the running DFTs are small: (monitors, frequencies, components) each
+            arrays = {f"dft_{si}": dft_set.current(read_dft) for si, dft_set in enumerate(dft_sets)}
+            return arrays, meta
+
+        def dump(sim, path: Path) -> None:
+            path.mkdir(parents=True, exist_ok=True)
+            sim.dump(str(path), dump_structure=True, dump_fields=True)
+
+        if root:
+            monitors_dir.mkdir(parents=True, exist_ok=True)
+        restored_samples = ckpt_state.get("monitor_samples", []) if restored is not None else []
+        for gi, (_, group) in enumerate(point_groups):
+            group.open(int(restored_samples[gi]) if gi < len(restored_samples) else 0)
+        if movie is not None:
+            if root:
+                fields_dir.mkdir(parents=True, exist_ok=True)
+            movie.open(int(ckpt_state.get("movie_frames", 0)) if restored is not None else 0)
+        # the reads behind a sample are collective, so every rank must skip the times rank 0's
+        # stores already hold
+        writers = [group for _, group in point_groups] + ([movie] if movie is not None else [])
+        for writer, last_t in zip(writers, mpi.broadcast([w.last_t for w in writers]), strict=True):
+            writer.last_t = last_t
+
+        callbacks.append(
+            checkpointer.step_function(lambda sim: sim.meep_time(), dump, checkpoint_buffers)
+        )
+        checkpointer.install_signal_handler()
+        try:
+            # `until` counts from the current (restored) time
+            if max_time - t_start > 0:
+                sim.run(*callbacks, until=max_time - t_start)
+        finally:
+            checkpointer.close()
+            for _, group in point_groups:
+                group.flush()
+            if movie is not None:
+                movie.flush()
+        for _, group in point_groups:
+            group.close()
+        if movie is not None:
+            movie.close()
+
+        if root:
+            fields_dir.mkdir(parents=True, exist_ok=True)
 
         if field_snapshot and dim == 2:
             components = normalize_component_list(field_snapshot.get("components", ["Ez"]))
@@ -402,14 +647,15 @@ class MeepBackend(Backend):
                 if stride > 1:
                     arr = arr[::stride, ::stride]
                 snapshot[comp] = arr
-            np.savez_compressed(
-                fields_dir / "field_snapshot.npz",
-                **snapshot,
-                cell_size=np.array(cell_size),
-                resolution=resolution,
-            )
+            if root:
+                np.savez_compressed(
+                    fields_dir / "field_snapshot.npz",
+                    **snapshot,
+                    cell_size=np.array(cell_size),
+                    resolution=resolution,
+                )
 
-        field_snapshot_json = outputs.get("field_snapshot_json") if isinstance(outputs, dict) else None
+        field_snapshot_json = outputs.get("field_snapshot_json")
         if field_snapshot_json and dim == 2:
             component = normalize_component(str(field_snapshot_json.get("component", "Ez")))
             center = list(field_snapshot_json.get("center", [0.0, 0.0, 0.0]))
@@ -438,40 +684,41 @@ class MeepBackend(Backend):
                 "max": float(np.max(arr)),
                 "data": arr.astype(float).ravel().tolist(),
             }
-            (fields_dir / "field_snapshot.json").write_text(json.dumps(payload))
-
-        if field_movie and dim == 2 and field_times:
-            movie_payload = {
-                "times": np.array(field_times),
-                "cell_size": np.array(cell_size),
-                "resolution": resolution,
-            }
-            for comp, frames in field_frames.items():
-                movie_payload[comp] = np.stack(frames)
-            np.savez_compressed(fields_dir / "field_movie.npz", **movie_payload)
-
-        monitors_dir = run_dir / "outputs" / "monitors"
-        monitors_dir.mkdir(parents=True, exist_ok=True)
-        for mon_id, meta in monitor_meta.items():
-            rows = monitor_samples.get(mon_id, [])
-            if not rows:
-                continue
-            columns = ["t", *meta["components"]]
-            out_path = monitors_dir / f"{mon_id}.csv"
-            with out_path.open("w", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=columns)
-                writer.writeheader()
-                writer.writerows(rows)
+            if root:
+                (fields_dir / "field_snapshot.json").write_text(json.dumps(payload))
+
+        # reading Meep's DFT fields is collective as well
+        dft_values = [dft_set.current(read_dft) for dft_set in dft_sets]
+        if not root:
+            return
+
+        spectra = []
+        for dft_set, values in zip(dft_sets, dft_values, strict=True):
+            names = dft_set.write(run_dir / "outputs" / "spectra", values)
+            spectra.extend(f"outputs/spectra/{name}" for name in names)
+
+        # CSV tables (t and the monitor's own components) only as an optional export
+        monitor_arrays = [f"outputs/monitors/{g.path.name}" for _, g in point_groups if g.n]
+        if outputs.get("monitor_csv"):
+            for _, group in point_groups:
+                for mon_id in group.ids if group.n else []:
+                    write_monitor_csv(run_dir, mon_id, monitors_dir / f"{mon_id}.csv")
 
         summary_obj = {
             "backend": self.name,
             "dimension": dim,
             "notes": "Meep run completed.",
             "monitors": list(monitor_meta.keys()),
+            "dft_monitors": list(dft_meta.keys()),
+            "monitor_arrays": monitor_arrays,
+            "spectra": spectra,
             "field_movie": bool(field_movie and dim == 2),
+            "field_movie_frames": movie.n if movie is not None else 0,
             "field_snapshot": bool(field_snapshot and dim == 2),
             "field_snapshot_json": bool(field_snapshot_json and dim == 2),
         }
+        if restored is not None:
+            summary_obj["resumed_from"] = {"checkpoint": restored[0].name, "t": t_start}
         # Include any fitted dispersion parameters (material_id -> params)
         if fitted_dispersion:
             summary_obj["dispersion_fit"] = fitted_dispersion
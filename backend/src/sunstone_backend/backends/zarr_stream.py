@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import numpy as np
+import zarr
+from zarr.storage import LocalStore
+
+# Append-only Zarr output for results recorded while a solver runs (field movies, monitor series).
+#
+# A ZarrStreamWriter owns a Zarr group of arrays sharing a leading time axis, each chunked along
+# time only (optionally also across the rest of a row, see `row_chunks`): a chunk holds whole
+# consecutive rows, so appending never rewrites earlier chunks and reading a time window touches
+# only its chunks. Just the chunk being filled is kept in memory; it is written out when full and,
+# partially, every `flush_interval` seconds of wall time. The group attribute `count_attr` is
+# updated after the data, so a reader slicing [:count] sees consistent arrays while the run is
+# still going; "complete" is set at the end.
+
+# Aim for chunks of about this many bytes, while keeping the in-memory chunk of all arrays below
+# BUFFER_LIMIT_BYTES
+CHUNK_TARGET_BYTES = 4 * 1024 * 1024
+BUFFER_LIMIT_BYTES = 64 * 1024 * 1024
+
+
+class ZarrStreamWriter:
+    """Appends rows of the arrays `names` (one of them the time `time_name`) to the group at `path`.
+
+    Arrays are created on the first row, shaped (n, *row shape); `dtypes` overrides the dtype the
+    first row has, and `row_chunks` the chunking within a row (whole rows by default). With
+    write=False (MPI ranks other than 0) rows are only counted; the store belongs to rank 0.
+    """
+
+    count_attr = "rows"
+
+    def __init__(
+        self,
+        path: Path,
+        names: list[str],
+        time_name: str = "t",
+        chunk_rows: int = 0,
+        flush_interval: float = 10.0,
+        attrs: dict | None = None,
+        dtypes: dict | None = None,
+        row_chunks: dict | None = None,
+        write: bool = True,
+    ) -> None:
+        self.path = Path(path)
+        self.write = write
+        self.names = list(names)
+        self.time_name = time_name
+        self.chunk_rows = int(chunk_rows or 0)
+        self.flush_interval = float(flush_interval)
+        self.attrs = dict(attrs or {})
+        self.dtypes = {time_name: np.float64, **(dtypes or {})}
+        self.row_chunks = dict(row_chunks or {})
+        self.group: zarr.Group | None = None
+        # rows appended so far, rows on disk, and the first row held in the buffers
+        self.n = 0
+        self.flushed = 0
+        self._chunk_start = 0
+        self._buffers: dict[str, np.ndarray] = {}
+        self.last_t: float | None = None
+        self._last_flush = time.monotonic()
+
+    def open(self, rows: int = 0) -> None:
+        """Start new arrays, or (rows > 0) continue those on disk after their first `rows` rows."""
+        if not self.write:
+            self.n = self.flushed = max(0, rows)
+            return
+        if rows <= 0 or not self.path.exists():
+            self.group = zarr.open_group(store=LocalStore(str(self.path)), mode="w")
+            self.group.attrs.update({**self.attrs, self.count_attr: 0, "complete": False})
+            return
+        self.group = zarr.open_group(store=LocalStore(str(self.path)), mode="r+")
+        times = self.group[self.time_name]
+        rows = min(rows, times.shape[0])
+        # drop rows written after the checkpoint being resumed from; they are recorded again
+        for name in self.names:
+            arr = self.group[name]
+            arr.resize((rows, *arr.shape[1:]))
+        self.chunk_rows = times.chunks[0]
+        self.n = self.flushed = rows
+        self._chunk_start = rows - rows % self.chunk_rows
+        for name in self.names:
+            arr = self.group[name]
+            self._buffers[name] = np.empty((self.chunk_rows, *arr.shape[1:]), dtype=arr.dtype)
+            self._buffers[name][: rows - self._chunk_start] = arr[self._chunk_start : rows]
+        self.last_t = float(times[rows - 1]) if rows else None
+        self.group.attrs.update({self.count_attr: rows, "complete": False})
+
+    def _create_arrays(self, row: dict) -> None:
+        shapes = {name: np.shape(row[name]) for name in self.names}
+        dtypes = {n: np.dtype(self.dtypes.get(n, np.asarray(row[n]).dtype)) for n in self.names}
+        inner = {name: tuple(self.row_chunks.get(name, shapes[name])) for name in self.names}
+        if self.chunk_rows <= 0:
+            chunk_bytes = max(int(np.prod(inner[n])) * dtypes[n].itemsize for n in self.names)
+            row_bytes = sum(int(np.prod(shapes[n])) * dtypes[n].itemsize for n in self.names)
+            rows = min(CHUNK_TARGET_BYTES // chunk_bytes, BUFFER_LIMIT_BYTES // row_bytes)
+            self.chunk_rows = max(1, rows)
+        for name in self.names:
+            self.group.create_array(
+                name,
+                shape=(0, *shapes[name]),
+                chunks=(self.chunk_rows, *inner[name]),
+                dtype=dtypes[name],
+            )
+            self._buffers[name] = np.empty((self.chunk_rows, *shapes[name]), dtype=dtypes[name])
+
+    def append(self, row: dict) -> None:
+        """Add one row: a value for every array, the time included."""
+        if not self.write:
+            self.n += 1
+            self.last_t = float(row[self.time_name])
+            return
+        if self.group is None:
+            raise RuntimeError(f"{type(self).__name__}.open() has not been called")
+        if not self._buffers:
+            self._create_arrays(row)
+        k = self.n - self._chunk_start
+        for name in self.names:
+            self._buffers[name][k] = row[name]
+        self.n += 1
+        self.last_t = float(row[self.time_name])
+        if self.n - self._chunk_start == self.chunk_rows:
+            self.flush()
+            self._chunk_start = self.n
+        elif time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write rows appended since the last flush and publish the new row count."""
+        self._last_flush = time.monotonic()
+        if self.group is None or self.n == self.flushed:
+            return
+        lo, hi = self.flushed - self._chunk_start, self.n - self._chunk_start
+        # the time array last, so its length never runs ahead of the data
+        for name in sorted(self.names, key=lambda name: name == self.time_name):
+            arr = self.group[name]
+            arr.resize((self.n, *arr.shape[1:]))
+            arr[self.flushed : self.n] = self._buffers[name][lo:hi]
+        self.group.attrs[self.count_attr] = self.n
+        self.flushed = self.n
+
+    def close(self) -> None:
+        self.flush()
+        if self.group is not None:
+            self.group.attrs["complete"] = True
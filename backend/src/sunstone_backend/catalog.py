@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import base64
+import json
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .models.run import RunRecord, StatusFile
+
+# Embedded SQLite index of all runs in a data dir (data_dir/catalog.sqlite).
+#
+# The run directories stay the source of truth; the catalog mirrors project, backend, status and
+# timestamps so runs can be listed, filtered and paginated without walking runs/ and parsing JSON.
+# RunStore keeps it in sync on every write and workers update it when they change a run's status.
+# `rebuild` recreates it from disk for data dirs that predate it or were modified externally.
+
+CATALOG_NAME = "catalog.sqlite"
+SORT_COLUMNS = ("created_at", "updated_at", "status", "backend")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_project_created ON runs (project_id, created_at, id);
+CREATE INDEX IF NOT EXISTS runs_project_updated ON runs (project_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS runs_project_status ON runs (project_id, status, created_at, id);
+CREATE INDEX IF NOT EXISTS runs_project_backend ON runs (project_id, backend, created_at, id);
+"""
+
+_initialized: set[str] = set()
+_init_lock = threading.Lock()
+
+
+def _encode_cursor(sort_value: str, run_id: str) -> str:
+    raw = json.dumps([sort_value, run_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        value, run_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(value), str(run_id)
+    except Exception as err:
+        raise ValueError("invalid cursor") from err
+
+
+class RunCatalog:
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        key = str(self.path)
+        if key not in _initialized or not self.path.exists():
+            with _init_lock:
+                if key not in _initialized or not self.path.exists():
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with self._connect() as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                    _initialized.add(key)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert_run(
+        self, run: RunRecord, updated_at: str | None = None, detail: str | None = None
+    ) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO runs (id, project_id, backend, status, created_at, updated_at, detail)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    project_id = excluded.project_id,
+                    backend = excluded.backend,
+                    status = excluded.status,
+                    created_at = excluded.created_at,
+                    updated_at = MAX(runs.updated_at, excluded.updated_at)
+                """,
+                (
+                    run.id,
+                    run.project_id,
+                    run.backend,
+                    run.status,
+                    run.created_at,
+                    updated_at or run.created_at,
+                    detail,
+                ),
+            )
+
+    def upsert_runs(self, runs: list[tuple[RunRecord, str | None]]) -> None:
+        """`upsert_run` for many (run, updated_at) pairs in one transaction."""
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO runs (id, project_id, backend, status, created_at, updated_at, detail)
+                VALUES (?, ?, ?, ?, ?, ?, NULL)
+                ON CONFLICT(id) DO UPDATE SET
+                    project_id = excluded.project_id,
+                    backend = excluded.backend,
+                    status = excluded.status,
+                    created_at = excluded.created_at,
+                    updated_at = MAX(runs.updated_at, excluded.updated_at)
+                """,
+                [
+                    (r.id, r.project_id, r.backend, r.status, r.created_at, updated or r.created_at)
+                    for r, updated in runs
+                ],
+            )
+
+    def update_status(self, run_id: str, status: StatusFile) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ?, detail = ? WHERE id = ?",
+                (status.status, status.updated_at, status.detail, run_id),
+            )
+
+    def update_statuses(self, items: list[tuple[str, StatusFile]]) -> None:
+        """`update_status` for many (run_id, status) pairs in one transaction."""
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE runs SET status = ?, updated_at = ?, detail = ? WHERE id = ?",
+                [(s.status, s.updated_at, s.detail, run_id) for run_id, s in items],
+            )
+
+    def get(self, run_id: str) -> dict | None:
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return dict(row) if row else None
+
+    def get_many(self, run_ids: list[str]) -> dict[str, dict]:
+        """Catalog rows of run_ids, by id; unknown ids are left out."""
+        rows: dict[str, dict] = {}
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            # stay under SQLite's bound-parameter limit
+            for i in range(0, len(run_ids), 500):
+                chunk = list(run_ids[i : i + 500])
+                marks = ", ".join("?" * len(chunk))
+                for r in conn.execute(f"SELECT * FROM runs WHERE id IN ({marks})", chunk):
+                    rows[r["id"]] = dict(r)
+        return rows
+
+    def ids_with_status(self, statuses: list[str]) -> list[str]:
+        """Ids of runs (any project) whose status is one of statuses."""
+        if not statuses:
+            return []
+        with self._connect() as conn:
+            marks = ", ".join("?" * len(statuses))
+            rows = conn.execute(
+                f"SELECT id FROM runs WHERE status IN ({marks}) ORDER BY created_at",
+                list(statuses),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def list_runs(
+        self,
+        project_id: str,
+        status: list[str] | None = None,
+        backend: list[str] | None = None,
+        created_after: str | None = None,
+        created_before: str | None = None,
+        sort: str = "created_at",
+        order: str = "desc",
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Return (runs, next_cursor) for a project using keyset pagination on (sort, id)."""
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"unsupported sort column: {sort}")
+        desc = order == "desc"
+        where = ["project_id = ?"]
+        params: list = [project_id]
+        if status:
+            where.append(f"status IN ({', '.join('?' * len(status))})")
+            params.extend(status)
+        if backend:
+            where.append(f"backend IN ({', '.join('?' * len(backend))})")
+            params.extend(backend)
+        if created_after:
+            where.append("created_at >= ?")
+            params.append(created_after)
+        if created_before:
+            where.append("created_at < ?")
+            params.append(created_before)
+        if cursor:
+            value, last_id = _decode_cursor(cursor)
+            where.append(f"({sort}, id) {'<' if desc else '>'} (?, ?)")
+            params.extend([value, last_id])
+        direction = "DESC" if desc else "ASC"
+        query = (
+            f"SELECT * FROM runs WHERE {' AND '.join(where)} "
+            f"ORDER BY {sort} {direction}, id {direction} LIMIT ?"
+        )
+        params.append(int(limit) + 1)
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = [dict(r) for r in conn.execute(query, params).fetchall()]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1][sort], rows[-1]["id"])
+        return rows, next_cursor
+
+    def rebuild(self, runs_dir: Path) -> int:
+        """Replace the catalog contents with the runs found under runs_dir; returns how many."""
+        rows = []
+        for run_json in Path(runs_dir).glob("run_*/runtime/run.json"):
+            try:
+                run = RunRecord.model_validate_json(run_json.read_text())
+            except Exception:
+                continue
+            updated_at, detail = run.created_at, None
+            status_path = run_json.parent / "status.json"
+            if status_path.exists():
+                try:
+                    status = StatusFile.model_validate_json(status_path.read_text())
+                    run.status = status.status
+                    updated_at, detail = status.updated_at, status.detail
+                except Exception:
+                    pass
+            rows.append((
+                run.id, run.project_id, run.backend, run.status, run.created_at, updated_at, detail,
+            ))
+        with self._connect() as conn:
+            conn.execute("DELETE FROM runs")
+            conn.executemany(
+                "INSERT OR REPLACE INTO runs "
+                "(id, project_id, backend, status, created_at, updated_at, detail) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+
+def update_status_for_run_dir(run_dir: Path, status: StatusFile) -> None:
+    """Mirror a status change into the catalog of the data dir that owns run_dir, if it has one.
+
+    Used by workers, which only know their run directory (runs/run_<id> inside a data dir).
+    """
+    run_dir = Path(run_dir)
+    if not run_dir.name.startswith("run_") or run_dir.parent.name != "runs":
+        return
+    path = run_dir.parent.parent / CATALOG_NAME
+    if not path.exists():
+        return
+    RunCatalog(path).update_status(run_dir.name[len("run_"):], status)
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import shutil
+import signal
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from . import mpi
+from .util.time import utc_now_iso
+
+# Checkpoint/restart for long solver runs (run_dir/runtime/checkpoints).
+#
+# A backend that supports it (Backend.supports_checkpoint) hands its Checkpointer a step function
+# to call between solver steps. Every `interval` seconds of wall time the checkpointer dumps the
+# solver state (for Meep: sim.dump of structure and fields) together with the simulation time and
+# the backend's in-memory buffers (for outputs streamed to disk, such as monitor series and the
+# field movie, only how far they had got) into ckpt_<seq>/, then points latest.json at it; only
+# complete checkpoints are ever referenced and the newest `keep` are kept.
+#
+# The API pauses a run by dropping runtime/pause.request next to it; SIGTERM (scancel, preemption,
+# cancel) has the same effect. Either way the worker checkpoints once more and stops with
+# RunPaused, which it reports as status "paused". Resubmitting in "resume" mode writes
+# runtime/resume.json; the backend then restarts from the latest checkpoint instead of t=0.
+#
+# In an MPI run (see mpi.py) every rank calls the step function and takes part in the solver dump,
+# but rank 0 alone decides when to checkpoint or stop (broadcast every step, so all ranks dump at
+# the same step) and writes the checkpoint directory, state.json and latest.json.
+
+CHECKPOINT_DIR = "checkpoints"
+LATEST_NAME = "latest.json"
+PAUSE_FILE = "pause.request"
+RESUME_FILE = "resume.json"
+
+
+class RunPaused(Exception):
+    """Raised by a backend after checkpointing in response to a pause request or SIGTERM."""
+
+
+def checkpoint_root(run_dir: Path) -> Path:
+    return Path(run_dir) / "runtime" / CHECKPOINT_DIR
+
+
+def latest_checkpoint(run_dir: Path) -> dict | None:
+    """latest.json of run_dir ({"name", "seq", "t", "created_at"}), or None without a checkpoint."""
+    try:
+        return json.loads((checkpoint_root(run_dir) / LATEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def request_pause(run_dir: Path) -> None:
+    (Path(run_dir) / "runtime" / PAUSE_FILE).write_text(utc_now_iso())
+
+
+def request_resume(run_dir: Path) -> None:
+    request = json.dumps({"requested_at": utc_now_iso()})
+    (Path(run_dir) / "runtime" / RESUME_FILE).write_text(request)
+
+
+def clear_requests(run_dir: Path) -> None:
+    for name in (PAUSE_FILE, RESUME_FILE):
+        (Path(run_dir) / "runtime" / name).unlink(missing_ok=True)
+
+
+def _write_json(path: Path, obj: dict) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}")
+    tmp.write_text(json.dumps(obj, indent=2))
+    os.replace(tmp, path)
+
+
+class Checkpointer:
+    def __init__(
+        self, run_dir: Path, interval: float = 600.0, keep: int = 2, poll_interval: float = 1.0
+    ) -> None:
+        self.run_dir = Path(run_dir)
+        self.root = checkpoint_root(run_dir)
+        # wall-clock seconds between periodic checkpoints; 0 checkpoints only on pause/SIGTERM
+        self.interval = float(interval)
+        self.keep = max(1, int(keep))
+        self.poll_interval = poll_interval
+        self._last_save = time.monotonic()
+        self._last_poll = 0.0
+        self._terminated = False
+        self._prev_handler = None
+
+    # Starting
+
+    def resume_requested(self) -> bool:
+        return (self.run_dir / "runtime" / RESUME_FILE).exists()
+
+    def start(self) -> tuple[Path, dict, dict] | None:
+        """Prepare for a run: (checkpoint dir, state, arrays) to restart from, or None.
+
+        None means a fresh start, which drops checkpoints of earlier attempts so latest.json always
+        belongs to this one.
+        """
+        root = mpi.is_root()
+        resume = mpi.broadcast(self.resume_requested())
+        if root:
+            clear_requests(self.run_dir)
+        if not resume:
+            if root:
+                shutil.rmtree(self.root, ignore_errors=True)
+            mpi.barrier()
+            return None
+        latest = mpi.broadcast(latest_checkpoint(self.run_dir))
+        if latest is None:
+            raise RuntimeError("resume requested but the run has no checkpoint")
+        path = self.root / latest["name"]
+        state = json.loads((path / "state.json").read_text())
+        arrays: dict = {}
+        if (path / "buffers.npz").exists():
+            import numpy as np
+
+            with np.load(path / "buffers.npz", allow_pickle=False) as data:
+                arrays = {k: data[k] for k in data.files}
+        return path, state, arrays
+
+    def install_signal_handler(self) -> None:
+        """Turn SIGTERM into "checkpoint at the next step, then stop" (main thread only)."""
+
+        def handler(signum, frame):
+            self._terminated = True
+
+        try:
+            self._prev_handler = signal.signal(signal.SIGTERM, handler)
+        except ValueError:
+            self._prev_handler = None
+
+    def close(self) -> None:
+        if self._prev_handler is not None:
+            with contextlib.suppress(ValueError):
+                signal.signal(signal.SIGTERM, self._prev_handler)
+            self._prev_handler = None
+
+    # During the run
+
+    def stop_requested(self) -> bool:
+        if self._terminated:
+            return True
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval:
+            return False
+        self._last_poll = now
+        return (self.run_dir / "runtime" / PAUSE_FILE).exists()
+
+    def due(self) -> bool:
+        return self.interval > 0 and time.monotonic() - self._last_save >= self.interval
+
+    def save(
+        self,
+        dump: Callable[[Path], None],
+        t: float,
+        arrays: dict | None = None,
+        meta: dict | None = None,
+    ) -> Path:
+        """Write a complete checkpoint: dump(dir) for the solver state, then arrays and state.json.
+
+        Collective under MPI: every rank dumps its part of the solver state, rank 0 writes the rest.
+        """
+        root = mpi.is_root()
+        latest = latest_checkpoint(self.run_dir) if root else None
+        seq = mpi.broadcast((latest["seq"] + 1) if latest else 1)
+        name = f"ckpt_{seq:06d}"
+        tmp = self.root / f".{name}.tmp"
+        path = self.root / name
+        if root:
+            self.root.mkdir(parents=True, exist_ok=True)
+            shutil.rmtree(tmp, ignore_errors=True)
+            tmp.mkdir()
+        mpi.barrier()
+        dump(tmp / "sim")
+        self._last_save = time.monotonic()
+        # every rank's part is on disk before rank 0 publishes the checkpoint
+        mpi.barrier()
+        if not root:
+            return path
+        if arrays:
+            import numpy as np
+
+            np.savez(tmp / "buffers.npz", **arrays)
+        state = {"seq": seq, "t": float(t), "created_at": utc_now_iso(), **(meta or {})}
+        (tmp / "state.json").write_text(json.dumps(state, indent=2))
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+        _write_json(
+            self.root / LATEST_NAME,
+            {"name": name, "seq": seq, "t": float(t), "created_at": state["created_at"]},
+        )
+        for old in sorted(p for p in self.root.glob("ckpt_*") if p.is_dir())[: -self.keep]:
+            shutil.rmtree(old, ignore_errors=True)
+        return path
+
+    def step_function(
+        self,
+        sim_time: Callable[[object], float],
+        dump: Callable[[object, Path], None],
+        buffers: Callable[[], tuple[dict, dict]],
+    ):
+        """Solver step callback: checkpoint when due; checkpoint and raise RunPaused on a stop.
+
+        `buffers()` returns (arrays, meta) describing the backend's in-memory results at this point.
+        """
+
+        def _step(sim) -> None:
+            stop = self.stop_requested()
+            # rank 0's view of the files and the clock decides for every rank
+            stop, due, terminated = mpi.broadcast((stop, not stop and self.due(), self._terminated))
+            if not stop and not due:
+                return
+            t = float(sim_time(sim))
+            arrays, meta = buffers()
+            self.save(lambda d: dump(sim, d), t, arrays, meta)
+            if stop:
+                reason = "SIGTERM" if terminated else "pause request"
+                raise RunPaused(
+                    f"Paused at t={t:g} ({reason}); resume to continue from the checkpoint"
+                )
+
+        return _step
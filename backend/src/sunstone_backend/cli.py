@@ -39,6 +39,18 @@ def worker(run_dir: Path = typer.Option(...), backend: str = typer.Option("dummy
     worker_main(run_dir=run_dir, backend=backend)
 
 
+def catalog_rebuild(
+    data_dir: Path = typer.Option(None, help="Where projects/runs are stored"),
+) -> None:
+    """Recreate the run catalog (catalog.sqlite) from the run directories on disk."""
+    from .store import RunStore
+
+    s = Settings()
+    store = RunStore(data_dir if data_dir is not None else s.data_dir)
+    count = store.rebuild_catalog()
+    typer.echo(f"Indexed {count} runs into {store.catalog.path}")
+
+
 def api_entry() -> None:
     typer.run(api)
 
@@ -47,5 +59,9 @@ def worker_entry() -> None:
     typer.run(worker)
 
 
+def catalog_rebuild_entry() -> None:
+    typer.run(catalog_rebuild)
+
+
 if __name__ == "__main__":
     api_entry()
@@ -6,17 +6,26 @@ import subprocess
 import sys
 import json
 import logging
+import threading
+import time
 from pathlib import Path
 
-logger = logging.getLogger(__name__)
-
 from .models.run import JobFile, RunRecord
+from .mpi import mpi_command, mpi_ranks
 from .util.time import utc_now_iso
 
+logger = logging.getLogger(__name__)
+
 
 class LocalJobRunner:
-    def __init__(self) -> None:
-        pass
+    def __init__(
+        self, pool=None, mpirun: str | None = None, mpirun_args: list[str] | None = None
+    ) -> None:
+        # Optional warm WorkerPool (see worker_pool.py); runs start cold when it has no ready worker
+        self.pool = pool
+        # MPI launcher for runs with mpi_ranks > 1; defaults to settings.mpirun/mpirun_args
+        self.mpirun = mpirun
+        self.mpirun_args = mpirun_args
 
     def submit(
         self,
@@ -79,6 +88,19 @@ class LocalJobRunner:
         except Exception:
             pass
 
+        ranks = mpi_ranks(run_dir)
+        # an MPI run needs fresh processes started by the launcher, not a fork of a warm worker
+        if self.pool is not None and ranks <= 1:
+            try:
+                pid = self.pool.submit(py, backend, run_dir)
+            except Exception as e:
+                logger.warning(
+                    "Warm worker dispatch failed for backend=%s, starting cold: %s", backend, e
+                )
+                pid = None
+            if pid is not None:
+                return JobFile(pid=pid, started_at=utc_now_iso(), backend=backend, mode="local")
+
         cmd = [
             py,
             "-m",
@@ -88,6 +110,14 @@ class LocalJobRunner:
             "--backend",
             backend,
         ]
+        if ranks > 1:
+            from .settings import get_settings
+
+            settings = get_settings()
+            mpirun = self.mpirun or settings.mpirun
+            mpirun_args = self.mpirun_args if self.mpirun_args is not None else settings.mpirun_args
+            # the launcher leads the new session, so cancel's killpg reaches it and every local rank
+            cmd = mpi_command(cmd, ranks, mpirun, mpirun_args)
 
         with open(stdout_path, "ab", buffering=0) as stdout_f, open(
             stderr_path, "ab", buffering=0
@@ -103,6 +133,9 @@ class LocalJobRunner:
         return JobFile(pid=proc.pid, started_at=utc_now_iso(), backend=backend, mode="local")
 
     def cancel(self, job: JobFile) -> None:
+        # pid 0 (cache hits, launches that never happened) would make killpg signal our own group
+        if job.pid <= 0:
+            return
         # Kill the whole process group
         try:
             os.killpg(job.pid, signal.SIGTERM)
@@ -110,6 +143,101 @@ class LocalJobRunner:
             return
 
 
+class SSHConnectionManager:
+    """Keeps one multiplexed OpenSSH connection (ControlMaster) per host for SSHJobRunner.
+
+    Without it every mkdir, copy, launch, status probe and cancel pays a TCP and auth handshake.
+    `ensure` starts a background master (`ssh -M -N -f` with ControlPersist) for a set of
+    connection args the first time they are used, and `control_options` points ssh/scp at its
+    socket, so later commands for the host reuse the authenticated channel and take milliseconds.
+    If a master cannot be started the commands still work; they just connect directly.
+    """
+
+    def __init__(
+        self,
+        control_dir: Path | None = None,
+        persist: int = 600,
+        check_interval: float = 10.0,
+        connect_timeout: int = 30,
+    ) -> None:
+        import tempfile
+
+        default_dir = Path(tempfile.gettempdir()) / f"sunstone-ssh-{os.getuid()}"
+        self.control_dir = Path(control_dir) if control_dir else default_dir
+        self.persist = persist
+        self.check_interval = check_interval
+        self.connect_timeout = connect_timeout
+        self._checked: dict[tuple[str, ...], float] = {}
+        self._locks: dict[tuple[str, ...], threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def control_options(self) -> list[str]:
+        # %C is a hash of (local host, remote host, port, user): short enough for a unix socket path
+        return ["-o", f"ControlPath={self.control_dir}/%C"]
+
+    def ensure(self, base_args: list[str]) -> bool:
+        """Make sure a master is up for `base_args` (["ssh", *options, host]).
+
+        Returns False if none could be started.
+        """
+        key = tuple(base_args)
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            checked = self._checked.get(key)
+            if checked is not None and time.monotonic() - checked < self.check_interval:
+                return True
+            self.control_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            opts, host = list(base_args[1:-1]), base_args[-1]
+            res = subprocess.run(
+                [base_args[0], *opts, *self.control_options(), "-O", "check", host],
+                check=False, capture_output=True, text=True, timeout=10,
+            )
+            if res.returncode != 0:
+                # -f keeps the inherited stdio open in the background master, so it can't be a pipe
+                with open(self.control_dir / "master.log", "a") as log:
+                    res = subprocess.run(
+                        [base_args[0], "-M", "-N", "-f", *opts, *self.control_options(),
+                         "-o", f"ControlPersist={self.persist}", host],
+                        check=False, stdout=log, stderr=log, timeout=self.connect_timeout,
+                    )
+                if res.returncode != 0:
+                    logger.warning(
+                        "Could not start SSH control master for %s; connecting directly", host
+                    )
+                    self._checked.pop(key, None)
+                    return False
+            self._checked[key] = time.monotonic()
+            return True
+
+    def close(self, base_args: list[str]) -> None:
+        """Stop the master for `base_args`, if any."""
+        opts, host = list(base_args[1:-1]), base_args[-1]
+        self._checked.pop(tuple(base_args), None)
+        subprocess.run(
+            [base_args[0], *opts, *self.control_options(), "-O", "exit", host],
+            check=False, capture_output=True, text=True, timeout=10,
+        )
+
+
+_SSH_MANAGER: SSHConnectionManager | None = None
+
+
+def get_ssh_manager() -> SSHConnectionManager | None:
+    """Process-wide SSH connection manager, or None when `ssh_multiplexing` is disabled."""
+    global _SSH_MANAGER
+    from .settings import get_settings
+
+    settings = get_settings()
+    if not settings.ssh_multiplexing:
+        return None
+    if _SSH_MANAGER is None:
+        _SSH_MANAGER = SSHConnectionManager(
+            control_dir=settings.ssh_control_dir, persist=settings.ssh_control_persist
+        )
+    return _SSH_MANAGER
+
+
 class SSHJobRunner:
     """SSH runner with basic auth options, retries, and remote-status checks.
 
@@ -117,8 +245,33 @@ class SSHJobRunner:
     are executed with retries on transient failures.
     """
 
-    def __init__(self) -> None:
-        pass
+    def __init__(self, connections: SSHConnectionManager | None = None) -> None:
+        # Shared control-master connections; None (multiplexing disabled) means one connection
+        # per command
+        self.connections = connections if connections is not None else get_ssh_manager()
+
+    def _connect(
+        self,
+        host: str,
+        port: int | None = None,
+        identity_file: str | None = None,
+        extra: list[str] | None = None,
+    ) -> None:
+        """Bring up (or reuse) the multiplexed connection used by the following ssh/scp commands."""
+        if self.connections is None:
+            return
+        base = ["ssh"]
+        if identity_file:
+            base.extend(["-i", str(identity_file)])
+        if port:
+            base.extend(["-p", str(port)])
+        if extra:
+            base.extend(extra)
+        base.append(host)
+        try:
+            self.connections.ensure(base)
+        except Exception as e:
+            logger.warning("SSH control master setup failed for %s: %s", host, e)
 
     def _ssh_base_args(self, host: str, port: int | None = None, identity_file: str | None = None, extra: list[str] | None = None) -> list[str]:
         args: list[str] = ["ssh"]
@@ -128,6 +281,8 @@ class SSHJobRunner:
             args.extend(["-p", str(port)])
         if extra:
             args.extend(extra)
+        if self.connections is not None:
+            args.extend(self.connections.control_options())
         args.append(host)
         return args
 
@@ -139,6 +294,8 @@ class SSHJobRunner:
             args.extend(["-P", str(port)])
         if extra:
             args.extend(extra)
+        if self.connections is not None:
+            args.extend(self.connections.control_options())
         args.append("")  # placeholder for source
         args.append("")  # placeholder for dest
         return args
@@ -171,32 +328,70 @@ class SSHJobRunner:
 
     def check_remote_pid(self, ssh_target: str, pid: int, port: int | None = None, identity_file: str | None = None) -> bool:
         """Return True if PID is running on remote host, False otherwise."""
-        import shlex
-        import subprocess
-
-        if not ssh_target or '@' not in ssh_target:
-            return False
-        userhost = ssh_target.split(':', 1)[0]
-        # Use kill -0 for a lightweight check
-        cmd = self._ssh_base_args(userhost, port=port, identity_file=identity_file)[:-1] + [f"kill -0 {pid} || true"]
         try:
-            res = self._run_with_retries(cmd, attempts=2, timeout=10)
-            # If exit code 0, kill -0 succeeded; if non-zero, process missing
-            return res.returncode == 0
+            alive = self.check_remote_pids(
+                ssh_target, [pid], port=port, identity_file=identity_file
+            )
+            return alive.get(int(pid), False)
         except Exception:
             return False
 
-    def submit_ssh(self, run: RunRecord, run_dir: Path, backend: str, ssh_target: str, python_executable: str | None = None, ssh_options: dict | None = None) -> JobFile:
-        import shlex
-        import subprocess
-
-        port = ssh_options.get('port') if ssh_options else None
-        identity_file = ssh_options.get('identity_file') if ssh_options else None
-        extra_raw = ssh_options.get('extra') if ssh_options else None
+    def check_remote_pids(
+        self,
+        ssh_target: str,
+        pids: list[int],
+        port: int | None = None,
+        identity_file: str | None = None,
+    ) -> dict[int, bool]:
+        """Probe many PIDs on one host with a single remote command; returns {pid: running}.
+
+        Raises RuntimeError when the host cannot be reached, so callers can tell "gone" from
+        "unknown".
+        """
+        pids = sorted({int(p) for p in pids if int(p) > 0})
+        if not pids:
+            return {}
+        if not ssh_target or '@' not in ssh_target:
+            raise RuntimeError('ssh_target must be in user@host[:path] form')
+        userhost = ssh_target.split(':', 1)[0]
+        self._connect(userhost, port=port, identity_file=identity_file)
+        # The remote loop always exits 0, so a non-zero exit is an ssh failure; kill -0 results
+        # are in the output
+        script = (
+            f"for p in {' '.join(str(p) for p in pids)}; do "
+            "if kill -0 $p 2>/dev/null; then echo \"$p alive\"; else echo \"$p gone\"; fi; done"
+        )
+        cmd = self._ssh_base_args(userhost, port=port, identity_file=identity_file) + [script]
+        try:
+            res = self._run_with_retries(cmd, attempts=2, timeout=15)
+        except Exception as e:
+            raise RuntimeError(f"remote status check failed for {userhost}: {e}") from e
+        result: dict[int, bool] = {}
+        for line in (res.stdout or "").splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[0].isdigit() and parts[1] in ("alive", "gone"):
+                result[int(parts[0])] = parts[1] == "alive"
+        missing = [p for p in pids if p not in result]
+        if missing:
+            raise RuntimeError(
+                f"remote status check for {userhost} returned no result for pids {missing}"
+            )
+        return result
+
+    @staticmethod
+    def extra_args(ssh_options: dict | None) -> list[str]:
+        """Extra ssh arguments for the agent forwarding, host key and free-form ssh_options."""
+        if not ssh_options:
+            return []
+        extra_raw = ssh_options.get('extra')
         extra = extra_raw.split() if isinstance(extra_raw, str) and extra_raw.strip() else []
-        agent_forwarding = bool(ssh_options.get('agent_forwarding')) if ssh_options else False
-        strict_host_key = ssh_options.get('strict_host_key_checking') if ssh_options and 'strict_host_key_checking' in ssh_options else None
-        known_hosts_file = ssh_options.get('known_hosts_file') if ssh_options else None
+        agent_forwarding = bool(ssh_options.get('agent_forwarding'))
+        strict_host_key = (
+            ssh_options.get('strict_host_key_checking')
+            if 'strict_host_key_checking' in ssh_options
+            else None
+        )
+        known_hosts_file = ssh_options.get('known_hosts_file')
 
         # Build final extra args list
         extra_args: list[str] = list(extra)
@@ -207,6 +402,22 @@ class SSHJobRunner:
             extra_args.extend(['-o', 'StrictHostKeyChecking=no'])
         if known_hosts_file:
             extra_args.extend(['-o', f'UserKnownHostsFile={known_hosts_file}'])
+        return extra_args
+
+    def submit_ssh(
+        self,
+        run: RunRecord,
+        run_dir: Path,
+        backend: str,
+        ssh_target: str,
+        python_executable: str | None = None,
+        ssh_options: dict | None = None,
+    ) -> JobFile:
+        import shlex
+
+        port = ssh_options.get('port') if ssh_options else None
+        identity_file = ssh_options.get('identity_file') if ssh_options else None
+        extra_args = self.extra_args(ssh_options)
 
         if not ssh_target or '@' not in ssh_target:
             raise RuntimeError('ssh_target must be in user@host[:path] form')
@@ -216,30 +427,74 @@ class SSHJobRunner:
         py = python_executable or 'python'
 
         # Step 1: ensure remote path exists
+        self._connect(userhost, port=port, identity_file=identity_file, extra=extra_args)
         try:
-            mkdir_cmd = self._ssh_base_args(userhost, port=port, identity_file=identity_file, extra=extra_args)[:-1] + [f"mkdir -p {shlex.quote(remote_path)}"]
+            base = self._ssh_base_args(
+                userhost, port=port, identity_file=identity_file, extra=extra_args
+            )
+            mkdir_cmd = base + [f"mkdir -p {shlex.quote(remote_path)}"]
             self._run_with_retries(mkdir_cmd, attempts=3, timeout=10)
         except Exception as e:
             raise RuntimeError(f"Failed to create remote directory {remote_path}: {e}") from e
 
-        # Step 2: copy run dir to remote (copy directory contents)
+        # Step 2: sync the run inputs to remote (only what changed when rsync or the remote helper
+        # is available; otherwise a full copy of the directory contents)
+        from .remote_sync import RemoteSync
+
+        sync = RemoteSync(
+            self,
+            userhost,
+            remote_path,
+            port=port,
+            identity_file=identity_file,
+            extra=extra_args,
+            python=py,
+            include=(ssh_options or {}).get('sync_include'),
+            exclude=(ssh_options or {}).get('sync_exclude'),
+        )
         try:
-            scp_cmd = self._scp_args(userhost, port=port, identity_file=identity_file, extra=extra_args)
-            scp_cmd[-2] = str(run_dir) + "/"
-            scp_cmd[-1] = f"{userhost}:{remote_path}/"
-            self._run_with_retries(scp_cmd, attempts=3, timeout=300)
+            method = sync.push(run_dir)
         except Exception as e:
-            raise RuntimeError(f"Failed to copy run directory to remote: {e}") from e
+            logger.info(
+                "Incremental sync to %s unavailable (%s); copying the run directory", userhost, e
+            )
+            method = None
+        if method is None:
+            try:
+                scp_cmd = self._scp_args(
+                    userhost, port=port, identity_file=identity_file, extra=extra_args
+                )
+                scp_cmd[-2] = str(run_dir) + "/."
+                scp_cmd[-1] = f"{userhost}:{remote_path}/"
+                self._run_with_retries(scp_cmd, attempts=3, timeout=300)
+            except Exception as e:
+                raise RuntimeError(f"Failed to copy run directory to remote: {e}") from e
 
         # Step 3: construct remote command and start with nohup
-        remote_cmd = f"{shlex.quote(py)} -m sunstone_backend.worker --run-dir {shlex.quote(remote_path)} --backend {shlex.quote(backend)}"
+        cmd = [py, "-m", "sunstone_backend.worker", "--run-dir", remote_path, "--backend", backend]
+        ranks = mpi_ranks(run_dir)
+        if ranks > 1:
+            from .settings import get_settings
+
+            settings = get_settings()
+            # $! is then the launcher's pid, and the TERM sent by cancel is forwarded to every rank
+            cmd = mpi_command(
+                cmd,
+                ranks,
+                (ssh_options or {}).get('mpirun') or settings.mpirun,
+                (ssh_options or {}).get('mpirun_args', settings.mpirun_args),
+            )
+        remote_cmd = " ".join(shlex.quote(str(part)) for part in cmd)
         remote_launch = (
             f"nohup {remote_cmd} > {shlex.quote(remote_path + '/remote_stdout.log')} "
             f"2> {shlex.quote(remote_path + '/remote_stderr.log')} < /dev/null & echo $!"
         )
 
         try:
-            ssh_cmd = self._ssh_base_args(userhost, port=port, identity_file=identity_file, extra=extra_args)[:-1] + [remote_launch]
+            base = self._ssh_base_args(
+                userhost, port=port, identity_file=identity_file, extra=extra_args
+            )
+            ssh_cmd = base + [remote_launch]
             res = self._run_with_retries(ssh_cmd, attempts=3, timeout=30)
             out = res.stdout.strip()
             try:
@@ -257,10 +512,35 @@ class SSHJobRunner:
             job._ssh_port = port
             job._identity_file = identity_file
             job._ssh_options = ssh_options
+            job._python = py
         except Exception:
             pass
         return job
 
+    def request_pause(self, job: dict) -> None:
+        """Ask a remote worker to checkpoint and stop.
+
+        Creates runtime/pause.request in its run dir.
+        """
+        import shlex
+
+        from .checkpoint import PAUSE_FILE
+
+        ssh_target = job.get("ssh_target") or ""
+        target_path = ssh_target.split(":", 1)[1] if ":" in ssh_target else ""
+        remote_path = job.get("remote_path") or target_path
+        if "@" not in ssh_target or not remote_path:
+            raise RuntimeError("SSH pause requires 'ssh_target' and 'remote_path' in job metadata")
+        userhost = ssh_target.split(":", 1)[0]
+        port = job.get("ssh_port")
+        identity_file = job.get("identity_file")
+        extra = self.extra_args(job.get("ssh_options"))
+        self._connect(userhost, port=port, identity_file=identity_file, extra=extra)
+        cmd = self._ssh_base_args(userhost, port=port, identity_file=identity_file, extra=extra) + [
+            f"touch {shlex.quote(f'{remote_path}/runtime/{PAUSE_FILE}')}"
+        ]
+        self._run_with_retries(cmd, attempts=2, timeout=15)
+
     def cancel(self, job: JobFile | dict) -> None:
         """Cancel a remote SSH-launched job.
 
@@ -268,8 +548,6 @@ class SSHJobRunner:
         or a JobFile (which will not contain ssh metadata). In the latter case, cancellation cannot
         be performed and a RuntimeError is raised.
         """
-        import subprocess
-
         # Normalize job to dict
         if isinstance(job, JobFile):
             raise RuntimeError("SSH cancel requires job metadata (ssh_target) in job.json")
@@ -299,14 +577,287 @@ class SSHJobRunner:
                     port = None
 
         # Attempt graceful TERM then KILL
+        self._connect(userhost, port=port)
         try:
-            ssh_cmd = self._ssh_base_args(userhost, port=port)[:-1] + [f"kill -TERM {pid}"]
+            ssh_cmd = self._ssh_base_args(userhost, port=port) + [f"kill -TERM {pid}"]
             self._run_with_retries(ssh_cmd, attempts=2, timeout=10)
         except Exception:
             # If TERM fails, try hard kill
-            ssh_cmd = self._ssh_base_args(userhost, port=port)[:-1] + [f"kill -9 {pid}"]
+            ssh_cmd = self._ssh_base_args(userhost, port=port) + [f"kill -9 {pid}"]
             try:
                 self._run_with_retries(ssh_cmd, attempts=1, timeout=10)
             except Exception:
                 # If that fails, bubble up
                 raise
+
+
+# SLURM job state -> run status. Anything not listed (e.g. SUSPENDED, RESIZING) counts as running.
+SLURM_STATES = {
+    "PENDING": "submitted",
+    "CONFIGURING": "submitted",
+    "REQUEUED": "submitted",
+    "REQUEUE_HOLD": "submitted",
+    "REQUEUE_FED": "submitted",
+    "RUNNING": "running",
+    "COMPLETING": "running",
+    "STAGE_OUT": "running",
+    "COMPLETED": "succeeded",
+    "FAILED": "failed",
+    "TIMEOUT": "failed",
+    "NODE_FAIL": "failed",
+    "OUT_OF_MEMORY": "failed",
+    "BOOT_FAIL": "failed",
+    "DEADLINE": "failed",
+    "PREEMPTED": "failed",
+    "CANCELLED": "canceled",
+}
+
+
+class SlurmJobRunner:
+    """Submit runs as SLURM batch jobs via sbatch and track them with squeue/sacct/scancel.
+
+    Assumes the data dir is on a filesystem shared with the compute nodes (the usual login-node
+    setup): the batch script runs the worker directly on the run directory, which writes
+    status.json as it goes. Resource hints come from `options` (partition, account, qos, time,
+    nodes, ntasks, cpus_per_task, mem, gres, setup lines and extra #SBATCH flags); a run with the
+    mpi_ranks backend option gets one task per rank, started by srun or options["mpi_launcher"].
+    Many runs can be packed into one job array, one task per run. Job ids are strings: "123" or
+    "123_4" for task 4 of array 123. Commands default to the ones on PATH so tests can substitute
+    stand-in scripts.
+    """
+
+    def __init__(
+        self,
+        sbatch: str = "sbatch",
+        squeue: str = "squeue",
+        sacct: str = "sacct",
+        scancel: str = "scancel",
+    ) -> None:
+        self.sbatch = sbatch
+        self.squeue = squeue
+        self.sacct = sacct
+        self.scancel = scancel
+
+    @staticmethod
+    def _directives(
+        options: dict, cores: int = 1, memory_bytes: int = 0, mpi_ranks: int = 1
+    ) -> list[str]:
+        opts = dict(options or {})
+        if mpi_ranks > 1:
+            # one task per rank, the run's cores shared between them
+            if opts.get("ntasks") in (None, ""):
+                opts["ntasks"] = mpi_ranks
+            if opts.get("cpus_per_task") in (None, ""):
+                opts["cpus_per_task"] = max(1, int(cores or 1) // mpi_ranks)
+        lines: list[str] = []
+        for key, flag in (
+            ("partition", "partition"),
+            ("account", "account"),
+            ("qos", "qos"),
+            ("time", "time"),
+            ("nodes", "nodes"),
+            ("ntasks", "ntasks"),
+            ("gres", "gres"),
+            ("constraint", "constraint"),
+        ):
+            if opts.get(key) not in (None, ""):
+                lines.append(f"#SBATCH --{flag}={opts[key]}")
+        lines.append(f"#SBATCH --cpus-per-task={int(opts.get('cpus_per_task') or cores or 1)}")
+        mem = opts.get("mem")
+        if mem in (None, "") and memory_bytes:
+            mem = f"{max(1, -(-int(memory_bytes) // (1024 * 1024)))}M"
+        if mem not in (None, ""):
+            lines.append(f"#SBATCH --mem={mem}")
+        for extra in opts.get("extra") or []:
+            extra = str(extra).strip()
+            lines.append(extra if extra.startswith("#SBATCH") else f"#SBATCH {extra}")
+        return lines
+
+    def render_script(
+        self,
+        run_dirs: list[Path],
+        backend: str,
+        python_executable: str | None = None,
+        options: dict | None = None,
+        cores: int = 1,
+        memory_bytes: int = 0,
+        job_name: str = "sunstone",
+        output: str | None = None,
+        mpi_ranks: int = 1,
+    ) -> str:
+        """Batch script for one run, or a job array with one task per entry of run_dirs.
+
+        With mpi_ranks > 1 the worker is started as that many tasks by `options["mpi_launcher"]`
+        (srun by default).
+        """
+        import shlex
+
+        py = python_executable or sys.executable
+        opts = options or {}
+        lines = ["#!/bin/bash", f"#SBATCH --job-name={job_name}"]
+        if output:
+            lines.append(f"#SBATCH --output={output}")
+        if len(run_dirs) > 1:
+            lines.append(f"#SBATCH --array=0-{len(run_dirs) - 1}")
+        lines.extend(
+            self._directives(opts, cores=cores, memory_bytes=memory_bytes, mpi_ranks=mpi_ranks)
+        )
+        lines.append("")
+        lines.extend(str(s) for s in opts.get("setup") or [])
+        if len(run_dirs) > 1:
+            lines.append("RUN_DIRS=(")
+            lines.extend(f"  {shlex.quote(str(d))}" for d in run_dirs)
+            lines.append(")")
+            lines.append('RUN_DIR="${RUN_DIRS[$SLURM_ARRAY_TASK_ID]}"')
+        else:
+            lines.append(f"RUN_DIR={shlex.quote(str(run_dirs[0]))}")
+        launch_cmd = mpi_command([py], mpi_ranks, opts.get("mpi_launcher") or "srun")
+        launch = " ".join(shlex.quote(part) for part in launch_cmd)
+        lines.extend([
+            'mkdir -p "$RUN_DIR/logs"',
+            'cd "$RUN_DIR"',
+            f'exec {launch} -m sunstone_backend.worker --run-dir "$RUN_DIR" '
+            f'--backend {shlex.quote(backend)} '
+            '>> "$RUN_DIR/logs/stdout.log" 2>> "$RUN_DIR/logs/stderr.log"',
+            "",
+        ])
+        return "\n".join(lines)
+
+    def _sbatch(self, script_path: Path) -> str:
+        res = subprocess.run(
+            [self.sbatch, "--parsable", str(script_path)],
+            check=False, capture_output=True, text=True, timeout=60,
+        )
+        if res.returncode != 0:
+            raise RuntimeError(f"sbatch failed: {res.stderr.strip() or res.stdout.strip()}")
+        # --parsable prints "<jobid>" or "<jobid>;<cluster>"
+        out = res.stdout.strip().splitlines()
+        job_id = out[-1].split(";", 1)[0].strip() if out else ""
+        if not job_id.isdigit():
+            raise RuntimeError(f"unexpected sbatch output: {res.stdout.strip()!r}")
+        return job_id
+
+    def submit(
+        self,
+        run: RunRecord,
+        run_dir: Path,
+        backend: str,
+        python_executable: str | None = None,
+        options: dict | None = None,
+        cores: int = 1,
+        memory_bytes: int = 0,
+    ) -> dict:
+        """Submit one run; returns job.json metadata with the SLURM job id."""
+        script_path = run_dir / "runtime" / "slurm.sh"
+        script_path.write_text(self.render_script(
+            [run_dir], backend, python_executable, options, cores, memory_bytes,
+            job_name=f"sunstone_{run.id[:8]}", output=str(run_dir / "logs" / "slurm-%j.out"),
+            mpi_ranks=mpi_ranks(run_dir),
+        ))
+        (run_dir / "logs").mkdir(parents=True, exist_ok=True)
+        job_id = self._sbatch(script_path)
+        job = JobFile(pid=0, started_at=utc_now_iso(), backend=backend, mode="slurm").model_dump()
+        job.update(slurm_job_id=job_id, slurm_script=str(script_path))
+        return job
+
+    def submit_array(
+        self,
+        runs: list[tuple[RunRecord, Path]],
+        backend: str,
+        script_dir: Path,
+        python_executable: str | None = None,
+        options: dict | None = None,
+        cores: int = 1,
+        memory_bytes: int = 0,
+        job_name: str = "sunstone_array",
+    ) -> list[dict]:
+        """Submit many runs as one job array; returns job.json metadata per run, in order."""
+        if not runs:
+            return []
+        if len(runs) == 1:
+            run, run_dir = runs[0]
+            return [
+                self.submit(run, run_dir, backend, python_executable, options, cores, memory_bytes)
+            ]
+        script_dir.mkdir(parents=True, exist_ok=True)
+        script_path = script_dir / "slurm_array.sh"
+        run_dirs = [d for _, d in runs]
+        script_path.write_text(self.render_script(
+            run_dirs, backend, python_executable, options, cores, memory_bytes,
+            job_name=job_name, output=str(script_dir / "slurm-%A_%a.out"),
+            # the runs of an array share their backend options
+            mpi_ranks=mpi_ranks(run_dirs[0]),
+        ))
+        array_id = self._sbatch(script_path)
+        jobs = []
+        for i, _ in enumerate(runs):
+            started_at = utc_now_iso()
+            job = JobFile(pid=0, started_at=started_at, backend=backend, mode="slurm").model_dump()
+            job.update(
+                slurm_job_id=f"{array_id}_{i}",
+                slurm_array_id=array_id,
+                slurm_array_task=i,
+                slurm_script=str(script_path),
+            )
+            jobs.append(job)
+        return jobs
+
+    def poll(self, job_ids: list[str]) -> dict[str, str]:
+        """SLURM state (e.g. PENDING, COMPLETED) per job id.
+
+        Costs one squeue and at most one sacct call.
+
+        Jobs unknown to both (purged from accounting, or sacct unavailable) are left out.
+        """
+        wanted = {str(j) for j in job_ids if j}
+        if not wanted:
+            return {}
+        bases = sorted({j.split("_", 1)[0] for j in wanted})
+        states: dict[str, str] = {}
+        # -r lists each array task on its own line instead of collapsing pending tasks to 123_[0-9]
+        try:
+            res = subprocess.run(
+                [self.squeue, "-h", "-r", "-o", "%i|%T", "-j", ",".join(bases)],
+                check=False, capture_output=True, text=True, timeout=30,
+            )
+            states.update(self._parse_states(res.stdout, wanted))
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning("squeue failed: %s", e)
+        if wanted - states.keys():
+            try:
+                res = subprocess.run(
+                    [self.sacct, "-n", "-P", "-X", "-o", "JobID,State", "-j", ",".join(bases)],
+                    check=False, capture_output=True, text=True, timeout=30,
+                )
+                for job_id, state in self._parse_states(res.stdout, wanted).items():
+                    states.setdefault(job_id, state)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logger.warning("sacct failed: %s", e)
+        return states
+
+    @staticmethod
+    def _parse_states(text: str, wanted: set[str]) -> dict[str, str]:
+        states = {}
+        for line in text.splitlines():
+            if "|" not in line:
+                continue
+            job_id, state = (part.strip() for part in line.split("|", 1))
+            # sacct reports e.g. "CANCELLED by 1000"
+            state = state.split()[0].rstrip("+") if state else ""
+            if job_id in wanted and state:
+                states[job_id] = state
+        return states
+
+    @staticmethod
+    def run_status(state: str | None) -> str | None:
+        return SLURM_STATES.get(state, "running") if state else None
+
+    def cancel(self, job: dict) -> None:
+        job_id = job.get("slurm_job_id")
+        if not job_id:
+            raise RuntimeError("SLURM cancel requires 'slurm_job_id' in job metadata")
+        res = subprocess.run(
+            [self.scancel, str(job_id)], check=False, capture_output=True, text=True, timeout=30
+        )
+        if res.returncode != 0:
+            raise RuntimeError(f"scancel failed: {res.stderr.strip() or res.stdout.strip()}")
@@ -15,12 +15,34 @@ class ProjectRecord(BaseModel):
     created_at: str
 
 
+class RunSummary(BaseModel):
+    id: str
+    project_id: str
+    backend: str
+    status: str
+    created_at: str
+    updated_at: str
+    detail: str | None = None
+
+
+class RunList(BaseModel):
+    project_id: str
+    items: list[RunSummary]
+    next_cursor: str | None = None
+
+
 class CreateRunRequest(BaseModel):
     spec: dict
 
 
 class SubmitRunRequest(BaseModel):
-    mode: Literal["local", "ssh", "slurm"] = "local"
+    mode: Literal["local", "ssh", "slurm", "resume"] = Field(
+        default="local",
+        description=(
+            "Where to run. 'resume' restarts a paused or interrupted run from its latest "
+            "checkpoint, where it ran before."
+        ),
+    )
     backend: str | None = None
     python_executable: str | None = Field(
         default=None,
@@ -35,7 +57,11 @@ class SubmitRunRequest(BaseModel):
     )
     ssh_options: dict | None = Field(
         default=None,
-        description=("Optional SSH options such as {'port': 22, 'identity_file': '/path/to/key'}"),
+        description=(
+            "Optional SSH options such as {'port': 22, 'identity_file': '/path/to/key'}. "
+            "'sync_exclude' / 'sync_include' (globs relative to the run dir) choose which outputs "
+            "are synced back."
+        ),
     )
     backend_options: dict | None = Field(
         default=None,
@@ -45,6 +71,35 @@ class SubmitRunRequest(BaseModel):
         default=None,
         description=("Optional run spec override (pre-translated or expanded) to persist before submission and validation"),
     )
+    slurm_options: dict | None = Field(
+        default=None,
+        description=(
+            "Optional SLURM resource hints for mode 'slurm': partition, account, qos, time, nodes, "
+            "ntasks, cpus_per_task, mem, gres, constraint, setup (shell lines) and extra (#SBATCH "
+            "flags)."
+        ),
+    )
+    priority: int = Field(
+        default=0,
+        description=(
+            "Local queue priority; higher runs start first, equal priorities in submission order."
+        ),
+    )
+    cores: int = Field(
+        default=1, ge=1, description=("Cores reserved for a local run in the queue's core budget.")
+    )
+    memory_bytes: int = Field(
+        default=0,
+        ge=0,
+        description=("Memory reserved for a local run in the queue's memory budget."),
+    )
+    use_cache: bool = Field(
+        default=True,
+        description=(
+            "Reuse the outputs of an earlier successful run with identical inputs instead of "
+            "running; false forces a fresh run."
+        ),
+    )
 
 
 class SubmitRunResponse(BaseModel):
@@ -52,6 +107,66 @@ class SubmitRunResponse(BaseModel):
     status: str
 
 
+class SweepAxis(BaseModel):
+    path: str = Field(
+        description=("JSON pointer (RFC 6901) into the spec, e.g. '/sources/0/frequency'.")
+    )
+    values: list = Field(min_length=1)
+
+
+class CreateSweepRequest(BaseModel):
+    spec: dict = Field(description=("Base spec every point of the sweep starts from."))
+    axes: list[SweepAxis] = Field(min_length=1)
+    combine: Literal["product", "zip"] = Field(
+        default="product",
+        description=(
+            "'product' runs every combination of axis values; 'zip' pairs the i-th values of "
+            "equally long axes."
+        ),
+    )
+    name: str | None = None
+    backend: str | None = None
+    submit: SubmitRunRequest | None = Field(
+        default=None,
+        description=(
+            "Submit every point with these settings ('local' or 'slurm'); omitted, the runs are "
+            "only created."
+        ),
+    )
+
+
+class SweepPoint(BaseModel):
+    run_id: str
+    params: dict
+    status: str
+
+
+class SweepRecord(BaseModel):
+    id: str
+    project_id: str
+    created_at: str
+    name: str | None = None
+    backend: str
+    combine: str
+    axes: list[SweepAxis]
+    mode: str | None = None
+    size: int
+
+
+class SweepResult(BaseModel):
+    run_id: str
+    params: dict
+    status: str
+    detail: str | None = None
+    outputs: list[str]
+
+
+class SweepStatus(BaseModel):
+    sweep: SweepRecord
+    counts: dict[str, int]
+    points: list[SweepPoint]
+
+
 class ArtifactEntry(BaseModel):
     path: str
     size_bytes: int
@@ -4,7 +4,9 @@ from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
-RunStatus = Literal["created", "submitted", "running", "succeeded", "failed", "canceled"]
+RunStatus = Literal[
+    "created", "queued", "submitted", "running", "paused", "succeeded", "failed", "canceled"
+]
 
 
 class RunRecord(BaseModel):
@@ -13,6 +15,7 @@ class RunRecord(BaseModel):
     created_at: str
     status: RunStatus
     backend: str
+    sweep_id: str | None = None
 
 
 class StatusFile(BaseModel):
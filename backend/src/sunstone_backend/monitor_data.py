@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import zarr
+from zarr.storage import LocalStore
+
+# Reading monitor time series from a run's outputs/monitors.
+#
+# Two Zarr layouts exist:
+# - point groups (MeepBackend): <name>.zarr holding `t` (n,) and a dense `values` array
+#   (n, monitors, components) chunked per monitor and component, with the monitor ids, the
+#   components and each monitor's own components in the group attributes; "samples" counts the
+#   samples readable so far (the run may still be writing);
+# - one group per monitor (DummyBackend): <monitor id>.zarr holding `t` and one array per component.
+# Either way a series is read as a slice of Zarr chunks, never the whole store.
+
+MONITORS_DIR = ("outputs", "monitors")
+CSV_BLOCK = 65536
+
+
+def _open(path: Path) -> zarr.Group | None:
+    try:
+        return zarr.open_group(store=LocalStore(str(path)), mode="r")
+    except Exception:
+        return None
+
+
+def list_monitors(run_dir: Path) -> list[dict]:
+    """[{id, path, components, samples, dtype, complete}] for every monitor series of a run."""
+    base = Path(run_dir).joinpath(*MONITORS_DIR)
+    out: list[dict] = []
+    for path in sorted(base.glob("*.zarr")) if base.exists() else []:
+        group = _open(path)
+        if group is None or "t" not in group:
+            continue
+        rel = str(path.relative_to(run_dir))
+        attrs = dict(group.attrs)
+        if "values" in group and "ids" in attrs:
+            own = attrs.get("monitor_components", {})
+            for mon_id in attrs["ids"]:
+                out.append({
+                    "id": mon_id,
+                    "path": rel,
+                    "components": own.get(mon_id, attrs.get("components", [])),
+                    "samples": int(attrs.get("samples", group["t"].shape[0])),
+                    "dtype": str(group["values"].dtype),
+                    "complete": bool(attrs.get("complete", True)),
+                })
+        else:
+            comps = sorted(name for name in group.array_keys() if name != "t")
+            out.append({
+                "id": path.stem,
+                "path": rel,
+                "components": comps,
+                "samples": int(group["t"].shape[0]),
+                "dtype": str(group[comps[0]].dtype) if comps else "float64",
+                "complete": bool(attrs.get("complete", True)),
+            })
+    return out
+
+
+def read_monitor_series(
+    run_dir: Path,
+    monitor_id: str,
+    components: list[str] | None = None,
+    start: int | None = None,
+    stop: int | None = None,
+    step: int | None = None,
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """(t, {component: values}) of one monitor, for samples[start:stop:step].
+
+    Only the chunks covering the slice are read. Raises KeyError for an unknown monitor or
+    component.
+    """
+    entry = next((m for m in list_monitors(run_dir) if m["id"] == monitor_id), None)
+    if entry is None:
+        raise KeyError(f"monitor {monitor_id!r} not found")
+    comps = list(components or entry["components"])
+    missing = [c for c in comps if c not in entry["components"]]
+    if missing:
+        raise KeyError(f"monitor {monitor_id!r} has no component {missing[0]!r}")
+    group = _open(Path(run_dir) / entry["path"])
+    window = slice(*slice(start, stop, step).indices(entry["samples"]))
+    t = group["t"][window]
+    if "values" in group and "ids" in group.attrs:
+        m = list(group.attrs["ids"]).index(monitor_id)
+        all_comps = list(group.attrs["components"])
+        return t, {c: group["values"][window, m, all_comps.index(c)] for c in comps}
+    return t, {c: group[c][window] for c in comps}
+
+
+def _format(values: np.ndarray) -> list[str]:
+    if np.iscomplexobj(values):
+        return [f"{v.real!r}{v.imag:+}j" for v in values.tolist()]
+    return [repr(v) for v in values.tolist()]
+
+
+def iter_monitor_csv(
+    run_dir: Path, monitor_id: str, components: list[str] | None = None
+) -> Iterator[str]:
+    """CSV export of a monitor (header t,<components>), produced a block of samples at a time."""
+    entry = next((m for m in list_monitors(run_dir) if m["id"] == monitor_id), None)
+    if entry is None:
+        raise KeyError(f"monitor {monitor_id!r} not found")
+    comps = list(components or entry["components"])
+    yield ",".join(["t", *comps]) + "\n"
+    for lo in range(0, entry["samples"], CSV_BLOCK):
+        hi = min(lo + CSV_BLOCK, entry["samples"])
+        t, cols = read_monitor_series(run_dir, monitor_id, comps, lo, hi)
+        columns = [_format(t)] + [_format(cols[c]) for c in comps]
+        yield "".join(",".join(row) + "\n" for row in zip(*columns, strict=True))
+
+
+def write_monitor_csv(run_dir: Path, monitor_id: str, out_path: Path) -> None:
+    with Path(out_path).open("w") as f:
+        for block in iter_monitor_csv(run_dir, monitor_id):
+            f.write(block)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+# MPI-parallel runs (backend option "mpi_ranks", declared by backends that can use it).
+#
+# A run with mpi_ranks > 1 starts its worker under the MPI launcher: `mpirun -np N python -m
+# sunstone_backend.worker ...` locally and over SSH, srun (or a configured launcher) inside SLURM
+# batch scripts. Every rank executes the same worker and backend. Meep splits the cell into chunks
+# across the ranks and its field reads, DFT reads, dumps and loads are collective, so all ranks take
+# part in those; only rank 0 writes the run's files (status.json, monitor and movie stores,
+# snapshots, spectra, summary.json, checkpoint metadata). Decisions that depend on wall time or on
+# files (a checkpoint is due, a pause was requested) are made on rank 0 and broadcast, so that every
+# rank enters a collective dump together.
+#
+# The rank and world size come from the environment the common launchers set (Open MPI, MPICH/Hydra,
+# MVAPICH, PMIx, srun with PMI), so the worker does not initialize MPI just to find out it is
+# alone. Broadcasts use mpi4py, which parallel Meep builds install alongside pymeep.
+
+MPI_RANKS_OPTION = "mpi_ranks"
+RANK_ENV_VARS = ("OMPI_COMM_WORLD_RANK", "PMIX_RANK", "PMI_RANK", "MV2_COMM_WORLD_RANK")
+SIZE_ENV_VARS = ("OMPI_COMM_WORLD_SIZE", "PMI_SIZE", "MV2_COMM_WORLD_SIZE")
+
+
+def _env_int(names: tuple[str, ...], default: int) -> int:
+    for name in names:
+        value = os.environ.get(name)
+        if value not in (None, ""):
+            try:
+                return int(value)
+            except ValueError:
+                continue
+    return default
+
+
+def rank() -> int:
+    """MPI rank of this process; 0 when not started by an MPI launcher."""
+    return _env_int(RANK_ENV_VARS, 0)
+
+
+def size() -> int:
+    """Number of ranks in this run; 1 when not started by an MPI launcher."""
+    return max(1, _env_int(SIZE_ENV_VARS, 1))
+
+
+def is_root() -> bool:
+    """True for the process that writes the run's files (rank 0)."""
+    return rank() == 0
+
+
+def _comm():
+    from mpi4py import MPI
+
+    return MPI.COMM_WORLD
+
+
+def broadcast(value):
+    """Rank 0's `value` on every rank (collective: every rank must call it)."""
+    if size() <= 1:
+        return value
+    return _comm().bcast(value if is_root() else None, root=0)
+
+
+def barrier() -> None:
+    if size() > 1:
+        _comm().Barrier()
+
+
+def option_ranks(options: dict | None) -> int:
+    """Rank count asked for in backend options; 1 (no MPI) when absent or invalid."""
+    try:
+        return max(1, int((options or {}).get(MPI_RANKS_OPTION) or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def mpi_ranks(run_dir: Path) -> int:
+    """Rank count a run was submitted with, from runtime/backend_options.json."""
+    try:
+        options = json.loads((Path(run_dir) / "runtime" / "backend_options.json").read_text())
+    except (OSError, ValueError):
+        return 1
+    return option_ranks(options if isinstance(options, dict) else None)
+
+
+def mpi_command(
+    cmd: list[str], ranks: int, launcher: str = "mpirun", launcher_args: list[str] | None = None
+) -> list[str]:
+    """`cmd` run as `ranks` MPI processes ([launcher, *launcher_args, -np, N, *cmd]).
+
+    Unchanged for a single rank.
+    """
+    if ranks <= 1:
+        return list(cmd)
+    # srun takes its task count as -n; mpirun/mpiexec accept -np
+    flag = "-n" if Path(launcher).name == "srun" else "-np"
+    return [launcher, *(launcher_args or []), flag, str(int(ranks)), *cmd]
@@ -0,0 +1,494 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import BinaryIO
+
+import typer
+
+from .result_cache import unshare_file
+from .util.paths import safe_join
+
+logger = logging.getLogger(__name__)
+
+# Incremental run-directory sync between the API host and an SSH host.
+#
+# Inputs are pushed before launch and outputs/logs/worker status are pulled back while the run is
+# active and once it ends, transferring only what changed. rsync is used when it is installed
+# (compressed, --partial so interrupted files resume). Otherwise the same module runs on the remote
+# side (`python -m sunstone_backend.remote_sync`, which the remote worker already needs) and the two
+# ends compare per-file lists of CHUNK_SIZE block hashes over the ssh channel: only differing blocks
+# are sent, zlib-compressed, and written in place, so an interrupted transfer resumes from the
+# blocks that already match. Files are selected with ordered (include, glob) rules, first match
+# wins, so large dumps can be kept remote with an exclude like "outputs/fields/".
+
+CHUNK_SIZE = 1024 * 1024
+
+Rule = tuple[bool, str]
+
+# Everything except what the worker writes and the API's own bookkeeping goes to the remote host
+PUSH_RULES: list[Rule] = [
+    (False, "outputs/"),
+    (False, "logs/"),
+    (False, "runtime/status.json"),
+    (False, "runtime/job.json"),
+    (False, "runtime/resource.json"),
+    (False, "runtime/sync_state.json"),
+    (False, "runtime/cache_key.json"),
+    (False, "remote_std*.log"),
+]
+# Worker outputs, logs and worker-written runtime files come back
+PULL_RULES: list[Rule] = [
+    (True, "outputs/"),
+    (True, "logs/"),
+    (True, "runtime/status.json"),
+    (True, "runtime/resource.json"),
+    (True, "runtime/checkpoints/latest.json"),
+    (True, "remote_std*.log"),
+    (False, "*"),
+]
+
+
+def _matches(rel: str, pattern: str) -> bool:
+    pattern = pattern.lstrip("/")
+    if pattern.endswith("/"):
+        return rel.startswith(pattern) or fnmatch(rel, pattern + "*")
+    if "/" not in pattern:
+        return fnmatch(rel.rsplit("/", 1)[-1], pattern)
+    return fnmatch(rel, pattern)
+
+
+def selected(rel: str, rules: list[Rule]) -> bool:
+    for include, pattern in rules:
+        if _matches(rel, pattern):
+            return include
+    return True
+
+
+def rsync_filters(rules: list[Rule]) -> list[str]:
+    """The rules as rsync --include/--exclude arguments (same first-match semantics)."""
+    args: list[str] = []
+    for include, pattern in rules:
+        flag = "--include" if include else "--exclude"
+        if pattern == "*" and not include:
+            # descend into every directory so nested includes are reachable (-m prunes empty ones)
+            args.extend(["--include=*/", "--exclude=*"])
+        elif pattern.endswith("/"):
+            args.append(f"{flag}=/{pattern.strip('/')}/***")
+        elif "/" in pattern:
+            args.append(f"{flag}=/{pattern.lstrip('/')}")
+        else:
+            args.append(f"{flag}={pattern}")
+    return args
+
+
+def file_chunks(path: Path) -> list[str]:
+    hashes = []
+    with path.open("rb") as f:
+        while block := f.read(CHUNK_SIZE):
+            hashes.append(hashlib.blake2b(block, digest_size=16).hexdigest())
+    return hashes
+
+
+def build_manifest(root: Path, rules: list[Rule], known: dict | None = None) -> dict[str, dict]:
+    """{rel: {"size", "mtime", "chunks"}} for the selected files under root.
+
+    With `known` ({rel: [size, mtime]} from a previous manifest), files whose size and mtime are
+    unchanged are listed without "chunks", so an unchanged multi-GB output is not re-read.
+    """
+    out: dict[str, dict] = {}
+    if not root.is_dir():
+        return out
+    for dirpath, _, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root)
+        for name in filenames:
+            rel = name if rel_dir == "." else f"{rel_dir}/{name}".replace(os.sep, "/")
+            if not selected(rel, rules):
+                continue
+            st = os.stat(os.path.join(dirpath, name))
+            entry = {"size": st.st_size, "mtime": st.st_mtime_ns}
+            if known is None or known.get(rel) != [st.st_size, st.st_mtime_ns]:
+                entry["chunks"] = file_chunks(root / rel)
+            out[rel] = entry
+    return out
+
+
+def hash_files(root: Path, rels) -> dict[str, dict]:
+    out: dict[str, dict] = {}
+    for rel in rels:
+        path = root / rel
+        if path.is_file():
+            out[rel] = {"size": path.stat().st_size, "chunks": file_chunks(path)}
+    return out
+
+
+def diff_manifests(src: dict[str, dict], dst: dict[str, dict]) -> dict[str, list[int]]:
+    """{rel: [chunk indices]} that must be sent for dst to match the hashed entries of src."""
+    wanted: dict[str, list[int]] = {}
+    for rel, entry in src.items():
+        if "chunks" not in entry:
+            continue
+        have = dst.get(rel)
+        if have is None:
+            wanted[rel] = list(range(len(entry["chunks"])))
+            continue
+        indices = [
+            i
+            for i, h in enumerate(entry["chunks"])
+            if i >= len(have["chunks"]) or have["chunks"][i] != h
+        ]
+        if indices or have["size"] != entry["size"]:
+            wanted[rel] = indices
+    return wanted
+
+
+def _write_record(out: BinaryIO, rel: str, size: int, offset: int, data: bytes) -> None:
+    out.write(
+        json.dumps({"path": rel, "size": size, "offset": offset, "zlen": len(data)}).encode()
+        + b"\n"
+    )
+    out.write(data)
+
+
+def write_patch(out: BinaryIO, root: Path, wanted: dict[str, list[int]]) -> None:
+    """Stream the wanted chunks of files under root as (JSON header line, zlib block) records."""
+    for rel, indices in wanted.items():
+        path = root / rel
+        if not path.is_file():
+            continue
+        with path.open("rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if not indices:
+                # same blocks, different length: just truncate on the other side
+                _write_record(out, rel, size, size, b"")
+            for i in indices:
+                f.seek(i * CHUNK_SIZE)
+                block = f.read(CHUNK_SIZE)
+                if block:
+                    _write_record(out, rel, size, i * CHUNK_SIZE, zlib.compress(block, 1))
+    out.flush()
+
+
+def apply_patch(inp: BinaryIO, root: Path) -> int:
+    """Apply a write_patch stream to files under root in place; returns the number of records."""
+    count = 0
+    while line := inp.readline():
+        header = json.loads(line)
+        data = inp.read(header["zlen"])
+        if len(data) != header["zlen"]:
+            raise RuntimeError("truncated sync stream")
+        path = safe_join(root, header["path"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # a pulled output may be linked into the result cache; patch a copy of its own
+        unshare_file(path)
+        with path.open("r+b" if path.exists() else "w+b") as f:
+            if data:
+                f.seek(header["offset"])
+                f.write(zlib.decompress(data))
+            f.truncate(header["size"])
+        count += 1
+    return count
+
+
+class RemoteSync:
+    """Push a run directory's inputs to, and pull its results from, `userhost:remote_path`."""
+
+    def __init__(
+        self,
+        runner,
+        userhost: str,
+        remote_path: str,
+        port: int | None = None,
+        identity_file: str | None = None,
+        extra: list[str] | None = None,
+        python: str = "python",
+        include=None,
+        exclude=None,
+        use_rsync: bool | None = None,
+        timeout: float = 3600.0,
+    ) -> None:
+        from .settings import get_settings
+
+        settings = get_settings()
+        self.runner = runner
+        self.userhost = userhost
+        self.remote_path = remote_path
+        self.port = port
+        self.identity_file = identity_file
+        self.extra = list(extra or [])
+        self.python = python
+        self.include = _patterns(include)
+        self.exclude = _patterns(exclude) + list(settings.ssh_sync_exclude)
+        self.use_rsync = settings.ssh_sync_rsync if use_rsync is None else use_rsync
+        self.timeout = timeout
+
+    @classmethod
+    def for_job(cls, job_meta: dict, runner=None) -> RemoteSync:
+        """RemoteSync for an SSH job from its job.json metadata."""
+        from .jobs import SSHJobRunner
+
+        runner = runner or SSHJobRunner()
+        options = job_meta.get("ssh_options") or {}
+        return cls(
+            runner,
+            (job_meta.get("ssh_target") or "").split(":", 1)[0],
+            job_meta["remote_path"],
+            port=job_meta.get("ssh_port"),
+            identity_file=job_meta.get("identity_file"),
+            extra=runner.extra_args(options),
+            python=job_meta.get("remote_python") or "python",
+            include=options.get("sync_include"),
+            exclude=options.get("sync_exclude"),
+        )
+
+    def rules(self, base: list[Rule]) -> list[Rule]:
+        return [(True, p) for p in self.include] + [(False, p) for p in self.exclude] + base
+
+    def _ssh_args(self) -> list[str]:
+        self.runner._connect(
+            self.userhost, port=self.port, identity_file=self.identity_file, extra=self.extra
+        )
+        return self.runner._ssh_base_args(
+            self.userhost, port=self.port, identity_file=self.identity_file, extra=self.extra
+        )
+
+    def _helper_cmd(self, action: str) -> list[str]:
+        python, path = shlex.quote(self.python), shlex.quote(self.remote_path)
+        return self._ssh_args() + [f"{python} -m sunstone_backend.remote_sync {action} {path}"]
+
+    def _helper(self, action: str, data: bytes) -> bytes:
+        res = subprocess.run(
+            self._helper_cmd(action), input=data, capture_output=True, timeout=self.timeout
+        )
+        if res.returncode != 0:
+            err = res.stderr.decode(errors="replace").strip()
+            raise RuntimeError(f"remote sync helper '{action}' failed on {self.userhost}: {err}")
+        return res.stdout
+
+    def _remote_manifest(self, rules: list[Rule], known: dict | None) -> dict[str, dict]:
+        out = self._helper("manifest", json.dumps({"rules": rules, "known": known}).encode())
+        try:
+            manifest = json.loads(out)
+        except ValueError:
+            manifest = None
+        if not isinstance(manifest, dict):
+            raise RuntimeError(f"remote sync helper is not available on {self.userhost}")
+        return manifest
+
+    def _rsync(self, src: str, dst: str, rules: list[Rule]) -> bool:
+        if not self.use_rsync or shutil.which("rsync") is None:
+            return False
+        cmd = [
+            "rsync",
+            "-rtzm",
+            "--partial",
+            "--partial-dir=.rsync-partial",
+            "-e",
+            shlex.join(self._ssh_args()[:-1]),
+            *rsync_filters(rules),
+            src,
+            dst,
+        ]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, timeout=self.timeout)
+        except (subprocess.SubprocessError, OSError) as e:
+            # e.g. rsync missing on the remote host: use the chunk protocol instead
+            logger.info(
+                "rsync with %s failed, using chunked sync: %s",
+                self.userhost,
+                getattr(e, "stderr", None) or e,
+            )
+            return False
+        return True
+
+    def push(self, run_dir: Path) -> str:
+        """Bring the remote copy of run_dir's inputs up to date; returns the method used."""
+        rules = self.rules(PUSH_RULES)
+        if self._rsync(f"{run_dir}/", f"{self.userhost}:{self.remote_path}/", rules):
+            return "rsync"
+        remote = self._remote_manifest(rules, None)
+        wanted = diff_manifests(build_manifest(run_dir, rules), remote)
+        if wanted:
+            buf = io.BytesIO()
+            write_patch(buf, run_dir, wanted)
+            self._helper("apply", buf.getvalue())
+        return "chunks"
+
+    def pull(self, run_dir: Path) -> str:
+        """Bring run_dir's outputs, logs and worker status up to date from the remote copy."""
+        rules = self.rules(PULL_RULES)
+        state = load_sync_state(run_dir)
+        if self._rsync(f"{self.userhost}:{self.remote_path}/", f"{run_dir}/", rules):
+            method = "rsync"
+        else:
+            remote = self._remote_manifest(rules, state.get("remote"))
+            changed = {rel: entry for rel, entry in remote.items() if "chunks" in entry}
+            wanted = diff_manifests(changed, hash_files(run_dir, changed))
+            if wanted:
+                # streamed: a pull can be much larger than memory
+                proc = subprocess.Popen(
+                    self._helper_cmd("send"),
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                )
+                try:
+                    proc.stdin.write(json.dumps({"wanted": wanted}).encode())
+                    proc.stdin.close()
+                    apply_patch(proc.stdout, run_dir)
+                    err = proc.stderr.read()
+                    proc.wait(timeout=self.timeout)
+                finally:
+                    if proc.poll() is None:
+                        proc.kill()
+                        proc.wait()
+                if proc.returncode != 0:
+                    detail = err.decode(errors="replace").strip()
+                    raise RuntimeError(
+                        f"remote sync helper 'send' failed on {self.userhost}: {detail}"
+                    )
+            # only recorded once everything arrived, so an interrupted pull re-checks those files
+            state["remote"] = {
+                rel: [entry["size"], entry["mtime"]] for rel, entry in remote.items()
+            }
+            method = "chunks"
+        state["synced_at"] = time.time()
+        save_sync_state(run_dir, state)
+        return method
+
+
+def _patterns(value) -> list[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [str(p).strip() for p in value if str(p).strip()]
+
+
+def load_sync_state(run_dir: Path) -> dict:
+    try:
+        return json.loads((run_dir / "runtime" / "sync_state.json").read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_sync_state(run_dir: Path, state: dict) -> None:
+    path = run_dir / "runtime" / "sync_state.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state))
+
+
+_RUN_LOCKS: dict[str, threading.Lock] = {}
+_RUN_LOCKS_GUARD = threading.Lock()
+
+
+def sync_remote_run(
+    store, run_id: str, job_meta: dict | None = None, final: bool = False, max_age: float = 0.0
+) -> bool:
+    """Pull an SSH run's results into its local run directory.
+
+    Skipped (returns False) for non-SSH runs and when the last pull is younger than max_age. With
+    `final` (the remote process has exited) a run whose worker never reported an outcome is failed.
+    """
+    from .models.run import StatusFile
+    from .util.time import utc_now_iso
+
+    run_dir = store.run_dir(run_id)
+    if job_meta is None:
+        try:
+            job_meta = json.loads((run_dir / "runtime" / "job.json").read_text())
+        except (OSError, ValueError):
+            return False
+    if (
+        job_meta.get("mode") != "ssh"
+        or not job_meta.get("remote_path")
+        or "@" not in (job_meta.get("ssh_target") or "")
+    ):
+        return False
+    if (
+        not final
+        and max_age > 0
+        and time.time() - load_sync_state(run_dir).get("synced_at", 0.0) < max_age
+    ):
+        return False
+    with _RUN_LOCKS_GUARD:
+        lock = _RUN_LOCKS.setdefault(run_id, threading.Lock())
+    with lock:
+        try:
+            before = store.load_status(run_id)
+        except FileNotFoundError:
+            before = None
+        RemoteSync.for_job(job_meta).pull(run_dir)
+        try:
+            status = store.load_status(run_id)
+        except FileNotFoundError:
+            return True
+        if before is not None and before.status == "canceled":
+            # a canceled worker never gets to say so; keep the local verdict
+            status = before
+        elif final and status.status not in ("succeeded", "failed", "canceled", "paused"):
+            status = StatusFile(
+                status="failed",
+                updated_at=utc_now_iso(),
+                detail="remote worker exited without reporting a final status",
+            )
+        store.save_status(run_id, status)
+        if final and status.status == "succeeded":
+            from .result_cache import record_for_run_dir
+
+            record_for_run_dir(run_dir)
+        if status.status in ("succeeded", "failed", "canceled", "paused"):
+            run = store.load_run(run_id)
+            if run.status != status.status:
+                run.status = status.status
+                store.save_run(run)
+    return True
+
+
+app = typer.Typer(add_completion=False)
+
+
+def _request() -> dict:
+    return json.loads(sys.stdin.buffer.read() or b"{}")
+
+
+@app.command()
+def manifest(root: str) -> None:
+    """Print the manifest of ROOT for the rules/known stamps read as JSON from stdin."""
+    req = _request()
+    rules = [(bool(inc), str(pat)) for inc, pat in req.get("rules") or []]
+    sys.stdout.write(json.dumps(build_manifest(Path(root).expanduser(), rules, req.get("known"))))
+
+
+@app.command()
+def send(root: str) -> None:
+    """Write the chunks requested as JSON on stdin ({"wanted": {rel: [indices]}}) to stdout."""
+    req = _request()
+    base = Path(root).expanduser()
+    wanted = {rel: idx for rel, idx in (req.get("wanted") or {}).items() if safe_join(base, rel)}
+    write_patch(sys.stdout.buffer, base, wanted)
+
+
+@app.command()
+def apply(root: str) -> None:
+    """Apply a chunk stream from stdin to files under ROOT."""
+    base = Path(root).expanduser()
+    base.mkdir(parents=True, exist_ok=True)
+    count = apply_patch(sys.stdin.buffer, base)
+    sys.stdout.write(json.dumps({"applied": count}))
+
+
+if __name__ == "__main__":
+    app()
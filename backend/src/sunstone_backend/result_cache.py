@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Content-addressed cache of run results (data_dir/result_cache).
+#
+# At submit the API hashes what determines a run's outputs: the normalized spec, the input files
+# under geometry/ and materials/, the backend, its options and the backend version. If a run with
+# the same key has succeeded before, the new run gets that run's outputs/ hard-linked in (copied
+# where linking is impossible) and is marked succeeded without starting a solver. Otherwise the key
+# is left in runtime/cache_key.json and the worker files the outputs under it once the run succeeds.
+# Entries are hard links too, so they cost no space while the source run still exists and survive
+# its deletion. The cache is bounded by entry count and total bytes and evicts least recently used
+# entries first.
+#
+# A shared inode must never be written in place, or the entry and every run restored from it would
+# change with it. Cached files are therefore read-only, and before a run (re)starts the worker
+# detaches its outputs/ (detach_outputs): a fresh start drops its names for shared files, a resumed
+# run gets private copies of the ones it may append to. The SSH sync patches files only after
+# unshare_file.
+
+CACHE_DIR = "result_cache"
+INDEX_NAME = "index.sqlite"
+KEY_FILE = "cache_key.json"
+KEY_INPUT_DIRS = ("geometry", "materials")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+"""
+
+
+def _normalize(value):
+    # 1 and 1.0 describe the same simulation
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        while block := f.read(1024 * 1024):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_key(
+    run_dir: Path, backend: str, backend_options: dict | None, backend_version: str
+) -> str:
+    """Canonical hash of everything that determines the outputs of the run in run_dir."""
+    try:
+        spec = json.loads((run_dir / "spec.json").read_text())
+    except (OSError, ValueError):
+        spec = None
+    h = hashlib.sha256()
+    h.update(
+        json.dumps(
+            {
+                "spec": _normalize(spec),
+                "backend": backend,
+                "backend_options": _normalize(backend_options or {}),
+                "backend_version": backend_version,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        ).encode("utf-8")
+    )
+    for sub in KEY_INPUT_DIRS:
+        base = run_dir / sub
+        if not base.is_dir():
+            continue
+        for path in sorted(p for p in base.rglob("*") if p.is_file()):
+            h.update(f"\0{path.relative_to(run_dir).as_posix()}\0{_file_digest(path)}".encode())
+    return h.hexdigest()
+
+
+def _link_tree(src: Path, dst: Path, read_only: bool = False) -> int:
+    """Mirror the files of src into dst as hard links (copies across filesystems); returns bytes.
+
+    With read_only the files (and so every name linked to them) lose their write permission.
+    """
+    total = 0
+    for path in src.rglob("*"):
+        if not path.is_file():
+            continue
+        target = dst / path.relative_to(src)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.exists() or target.is_symlink():
+            target.unlink()
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copy2(path, target)
+        if read_only:
+            os.chmod(target, target.stat().st_mode & ~0o222)
+        total += path.stat().st_size
+    return total
+
+
+def unshare_file(path: Path) -> None:
+    """Give path an inode of its own (a writable copy) if it is a hard link shared with others."""
+    try:
+        if path.stat().st_nlink <= 1:
+            return
+    except FileNotFoundError:
+        return
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.unshare")
+    shutil.copyfile(path, tmp)
+    os.replace(tmp, path)
+
+
+def detach_outputs(run_dir: Path, resuming: bool = False) -> None:
+    """Stop run_dir/outputs from sharing inodes with cache entries and other runs.
+
+    Called before a run starts.
+
+    A fresh start unlinks the shared files (they are the previous results and get rewritten);
+    resuming from a checkpoint continues writing into its outputs, so those become private copies.
+    """
+    base = Path(run_dir) / "outputs"
+    if not base.is_dir():
+        return
+    for path in base.rglob("*"):
+        if path.is_file() and path.stat().st_nlink > 1:
+            if resuming:
+                unshare_file(path)
+            else:
+                path.unlink()
+
+
+class ResultCache:
+    def __init__(
+        self, data_dir: Path, max_entries: int = 1000, max_bytes: int = 20 * 1024**3
+    ) -> None:
+        self.root = Path(data_dir) / CACHE_DIR
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.root / INDEX_NAME, timeout=30.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def entry_dir(self, key: str) -> Path:
+        return self.root / key
+
+    def lookup(self, key: str) -> dict | None:
+        """The entry for key (marked as used), or None."""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if not self.entry_dir(key).is_dir():
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+        return dict(row)
+
+    def restore(self, key: str, run_dir: Path) -> int:
+        """Link the cached outputs of key into run_dir/outputs; returns their size in bytes."""
+        return _link_tree(self.entry_dir(key) / "outputs", run_dir / "outputs")
+
+    def store(self, key: str, run_id: str, backend: str, run_dir: Path) -> bool:
+        """File run_dir/outputs under key; False if already cached or too large to keep."""
+        if self.lookup(key) is not None:
+            return False
+        staging = self.root / f".{key}.{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        size = _link_tree(run_dir / "outputs", staging / "outputs", read_only=True)
+        if size > self.max_bytes:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        try:
+            os.rename(staging, self.entry_dir(key))
+        except OSError:
+            # another process filed the same key first
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries"
+                " (key, run_id, backend, size_bytes, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, run_id, backend, size, now, now),
+            )
+        self.evict()
+        return True
+
+    def evict(self) -> list[str]:
+        """Drop least recently used entries until the count and size limits hold.
+
+        Returns the evicted keys.
+        """
+        evicted: list[str] = []
+        with self._connect() as conn:
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM entries"
+            ).fetchone()
+            rows = conn.execute(
+                "SELECT key, size_bytes FROM entries ORDER BY last_used, created_at"
+            ).fetchall()
+            for key, size in rows:
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                evicted.append(key)
+                count -= 1
+                total -= size
+        for key in evicted:
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+        return evicted
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM entries"
+            ).fetchone()
+        return {
+            "entries": count,
+            "size_bytes": total,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def get_result_cache(settings) -> ResultCache:
+    return ResultCache(
+        settings.data_dir,
+        max_entries=settings.result_cache_max_entries,
+        max_bytes=settings.result_cache_max_bytes,
+    )
+
+
+def write_pending_key(run_dir: Path, key: str | None, backend: str = "") -> None:
+    path = run_dir / "runtime" / KEY_FILE
+    if key is None:
+        path.unlink(missing_ok=True)
+    else:
+        path.write_text(json.dumps({"key": key, "backend": backend}))
+
+
+def record_for_run_dir(run_dir: Path) -> bool:
+    """File the outputs of a succeeded run under the key chosen at submit, if it has one.
+
+    Used by workers and the SSH sync, which only know their run directory (runs/run_<id> inside a
+    data dir); a data dir without a result cache is left alone.
+    """
+    from .settings import get_settings
+
+    run_dir = Path(run_dir)
+    try:
+        pending = json.loads((run_dir / "runtime" / KEY_FILE).read_text())
+        key = pending["key"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+    if not run_dir.name.startswith("run_") or run_dir.parent.name != "runs":
+        return False
+    data_dir = run_dir.parent.parent
+    if not (data_dir / CACHE_DIR / INDEX_NAME).exists():
+        return False
+    settings = get_settings()
+    limits = (settings.result_cache_max_entries, settings.result_cache_max_bytes)
+    cache = ResultCache(data_dir, *limits)
+    return cache.store(key, run_dir.name[len("run_"):], pending.get("backend", ""), run_dir)
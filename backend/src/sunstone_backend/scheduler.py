@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import psutil
+
+from .hardware import detect_cpu
+from .jobs import LocalJobRunner
+from .models.run import StatusFile
+from .store import RunStore
+from .util.time import utc_now_iso
+
+logger = logging.getLogger(__name__)
+
+# Persistent queue for local runs (data_dir/queue/<run_id>.json).
+#
+# Submitting a local run enqueues it instead of spawning a worker straight away; the scheduler
+# starts queued runs in (priority desc, submission order) as long as the host's limits on concurrent
+# runs, cores and memory allow, and reaps running entries once their worker exits. Entries are plain
+# files guarded by a lock file, so the queue survives API restarts and any process sharing the data
+# dir sees the same state. Scheduling is strict head-of-line: a large run waiting for cores is not
+# starved by smaller runs submitted after it.
+
+TERMINAL_STATUSES = ("succeeded", "failed", "canceled")
+
+
+@dataclass(frozen=True)
+class QueueLimits:
+    max_runs: int
+    cores: int
+    memory_bytes: int
+
+    @classmethod
+    def from_settings(cls, settings) -> QueueLimits:
+        """Limits from settings, where 0 means "what detect_cpu reports for this host"."""
+        cpu = detect_cpu()
+        cores = settings.local_cores_budget or cpu.logical_cores
+        return cls(
+            max_runs=settings.local_max_concurrent_runs or cores,
+            cores=cores,
+            memory_bytes=settings.local_memory_budget_bytes or cpu.ram_bytes,
+        )
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        # reap the worker if it is our child so it does not linger as a zombie
+        done, _ = os.waitpid(pid, os.WNOHANG)
+        if done == pid:
+            return False
+    except ChildProcessError:
+        pass
+    except OSError:
+        return False
+    try:
+        return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+    except psutil.Error:
+        return False
+
+
+class LocalScheduler:
+    def __init__(self, data_dir: Path, pool=None) -> None:
+        self.data_dir = Path(data_dir)
+        # warm WorkerPool used to start runs, or None for cold worker processes
+        self.pool = pool
+        self.root = self.data_dir / "queue"
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "a+") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _path(self, run_id: str) -> Path:
+        return self.root / f"{run_id}.json"
+
+    def _write(self, entry: dict) -> None:
+        path = self._path(entry["run_id"])
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, indent=2))
+        os.replace(tmp, path)
+
+    def _entries(self) -> list[dict]:
+        entries = []
+        if not self.root.exists():
+            return entries
+        for p in self.root.glob("*.json"):
+            try:
+                entries.append(json.loads(p.read_text()))
+            except (OSError, ValueError):
+                continue
+        entries.sort(key=lambda e: (-int(e.get("priority", 0)), int(e.get("seq", 0))))
+        return entries
+
+    def entries(self) -> list[dict]:
+        """Queued and running entries in scheduling order."""
+        with self._locked():
+            return self._entries()
+
+    def get(self, run_id: str) -> dict | None:
+        try:
+            return json.loads(self._path(run_id).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def enqueue(
+        self,
+        run_id: str,
+        backend: str,
+        python_executable: str | None = None,
+        priority: int = 0,
+        cores: int = 1,
+        memory_bytes: int = 0,
+    ) -> dict:
+        entries = self.enqueue_many(
+            [run_id], backend, python_executable, priority, cores, memory_bytes
+        )
+        return entries[0]
+
+    def enqueue_many(
+        self,
+        run_ids: list[str],
+        backend: str,
+        python_executable: str | None = None,
+        priority: int = 0,
+        cores: int = 1,
+        memory_bytes: int = 0,
+    ) -> list[dict]:
+        """Queue run_ids with the same settings, keeping their order.
+
+        Takes the queue lock and writes the catalog once for all of them.
+        """
+        store = RunStore(self.data_dir)
+        runs = [store.load_run(run_id) for run_id in run_ids]
+        seq = time.time_ns()
+        enqueued_at = utc_now_iso()
+        entries = [
+            {
+                "run_id": run_id,
+                "backend": backend,
+                "python_executable": python_executable,
+                "priority": int(priority),
+                "cores": max(1, int(cores)),
+                "memory_bytes": max(0, int(memory_bytes or 0)),
+                "seq": seq + i,
+                "enqueued_at": enqueued_at,
+                "state": "queued",
+                "pid": 0,
+            }
+            for i, run_id in enumerate(run_ids)
+        ]
+        with self._locked():
+            for entry in entries:
+                self._write(entry)
+        store.save_statuses(runs, "queued")
+        return entries
+
+    def remove(self, run_id: str) -> dict | None:
+        with self._locked():
+            entry = self.get(run_id)
+            self._path(run_id).unlink(missing_ok=True)
+            return entry
+
+    def _finished(self, store: RunStore, entry: dict) -> bool:
+        run_id = entry["run_id"]
+        try:
+            if store.load_status(run_id).status in TERMINAL_STATUSES:
+                return True
+        except Exception:
+            return True
+        if _pid_alive(int(entry.get("pid") or 0)):
+            return False
+        # the worker may have written its final status just before exiting
+        try:
+            if store.load_status(run_id).status in TERMINAL_STATUSES:
+                return True
+        except Exception:
+            return True
+        # killed (SIGKILL, OOM) or crashed before it could report; don't leave the run "running"
+        self._mark_failed(store, run_id, "Worker exited without reporting a status")
+        logger.warning("Worker for run %s exited without reporting a status", run_id)
+        return True
+
+    @staticmethod
+    def _mark_failed(store: RunStore, run_id: str, detail: str) -> None:
+        try:
+            run = store.load_run(run_id)
+            run.status = "failed"
+            store.save_run(run)
+            store.save_status(
+                run_id, StatusFile(status="failed", updated_at=utc_now_iso(), detail=detail)
+            )
+        except FileNotFoundError:
+            pass
+
+    def tick(self, limits: QueueLimits) -> dict[str, str | None]:
+        """Reap finished runs and start queued ones that fit.
+
+        Returns {run_id: launch error or None} for the runs started.
+        """
+        store = RunStore(self.data_dir)
+        started: dict[str, str | None] = {}
+        with self._locked():
+            entries = self._entries()
+            running = []
+            for entry in entries:
+                if entry["state"] != "running":
+                    continue
+                if self._finished(store, entry):
+                    self._path(entry["run_id"]).unlink(missing_ok=True)
+                else:
+                    running.append(entry)
+            used_cores = sum(e["cores"] for e in running)
+            used_memory = sum(e["memory_bytes"] for e in running)
+            for entry in entries:
+                if entry["state"] != "queued":
+                    continue
+                # a run never needs more than the whole budget, or it would block the queue forever
+                cores = min(entry["cores"], limits.cores)
+                memory = min(entry["memory_bytes"], limits.memory_bytes)
+                if (
+                    len(running) >= limits.max_runs
+                    or used_cores + cores > limits.cores
+                    or used_memory + memory > limits.memory_bytes
+                ):
+                    break
+                error = self._launch(store, entry)
+                started[entry["run_id"]] = error
+                if error is not None:
+                    self._path(entry["run_id"]).unlink(missing_ok=True)
+                    continue
+                entry.update(cores=cores, memory_bytes=memory)
+                self._write(entry)
+                running.append(entry)
+                used_cores += cores
+                used_memory += memory
+        return started
+
+    def _launch(self, store: RunStore, entry: dict) -> str | None:
+        run_id = entry["run_id"]
+        run_dir = store.run_dir(run_id)
+        try:
+            run = store.load_run(run_id)
+            # before the worker starts: written afterwards it could overwrite the worker's own
+            # "running" or even final status
+            run.status = "submitted"
+            store.save_run(run)
+            store.save_status(run_id, StatusFile(status="submitted", updated_at=utc_now_iso()))
+            job = LocalJobRunner(pool=self.pool).submit(
+                run=run,
+                run_dir=run_dir,
+                backend=entry["backend"],
+                python_executable=entry.get("python_executable"),
+            )
+            (run_dir / "runtime" / "job.json").write_text(job.model_dump_json(indent=2))
+        except Exception as e:
+            log_path = run_dir / "logs" / "stderr.log"
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(log_path, "a") as f:
+                f.write(f"[scheduler] Worker launch failed: {e}\n")
+            self._mark_failed(store, run_id, f"Worker launch failed: {e}")
+            logger.warning("Worker launch failed for run %s: %s", run_id, e)
+            return str(e)
+        entry.update(
+            state="running", pid=int(getattr(job, "pid", 0) or 0), started_at=utc_now_iso()
+        )
+        return None
+
+    def start_daemon(self, settings, interval: float | None = None) -> None:
+        """Tick in a background thread until `stop_daemon`.
+
+        Also picks up runs queued before a restart.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        interval = settings.local_queue_poll_interval if interval is None else interval
+        self._stop.clear()
+
+        def loop() -> None:
+            while not self._stop.is_set():
+                try:
+                    self.tick(QueueLimits.from_settings(settings))
+                except Exception:
+                    logger.exception("Local queue tick failed")
+                self._stop.wait(interval)
+
+        self._thread = threading.Thread(target=loop, name="sunstone-local-queue", daemon=True)
+        self._thread.start()
+
+    def stop_daemon(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+
+_SCHEDULERS: dict[str, LocalScheduler] = {}
+
+
+def get_scheduler(data_dir: Path, pool=None) -> LocalScheduler:
+    """Return the process-wide scheduler for data_dir, starting runs through `pool` if given."""
+    key = str(Path(data_dir))
+    sched = _SCHEDULERS.get(key)
+    if sched is None:
+        sched = LocalScheduler(Path(data_dir))
+        _SCHEDULERS[key] = sched
+    sched.pool = pool
+    return sched
@@ -26,6 +26,62 @@ class Settings(BaseSettings):
     allow_local_execution: bool = True
     default_backend: str = "dummy"
 
+    # Local run queue: concurrent runs, cores and memory (0 = taken from hardware.detect_cpu)
+    local_max_concurrent_runs: int = 0
+    local_cores_budget: int = 0
+    local_memory_budget_bytes: int = 0
+    local_queue_poll_interval: float = 2.0
+
+    # Warm worker pool: pre-imported worker per (python, backend) that forks runs; recycled after
+    # max_runs forks or RSS growth. Backends listed in prewarm are started with the API.
+    local_worker_pool: bool = True
+    local_worker_pool_max_runs: int = 100
+    local_worker_pool_max_rss_growth_bytes: int = 256 * 1024 * 1024
+    local_worker_pool_prewarm: list[str] = Field(default_factory=list)
+
+    # MPI runs (backend option mpi_ranks > 1) start the worker as
+    # `<mpirun> <mpirun_args> -np N ...`, locally and over SSH (where ssh_options "mpirun"
+    # overrides the launcher)
+    mpirun: str = "mpirun"
+    mpirun_args: list[str] = Field(default_factory=list)
+
+    # SSH runs: share one OpenSSH ControlMaster connection per host (sockets in ssh_control_dir,
+    # default a per-user temp dir) kept open for ssh_control_persist seconds after last use
+    ssh_multiplexing: bool = True
+    ssh_control_dir: Path | None = None
+    ssh_control_persist: int = 600
+    # SSH run liveness is probed in one batched command per host at most every this many seconds
+    ssh_status_poll_interval: float = 5.0
+    # SSH run directories are synced incrementally (rsync when installed on both ends, else a
+    # chunk-hash protocol over ssh). Outputs are pulled back at most every ssh_sync_interval seconds
+    # while a run is active and once more when it ends; ssh_sync_exclude globs (relative to the run
+    # dir, e.g. "outputs/fields/") stay on the remote host.
+    ssh_sync_rsync: bool = True
+    ssh_sync_interval: float = 30.0
+    ssh_sync_exclude: list[str] = []
+
+    # Submits whose spec, inputs, backend, options and backend version match an earlier successful
+    # run reuse its outputs (hard links) instead of running; bounded by entries and bytes with LRU
+    # eviction
+    result_cache_enabled: bool = True
+    result_cache_max_entries: int = 1000
+    result_cache_max_bytes: int = 20 * 1024 * 1024 * 1024
+
+    # Largest number of points (child runs) one parameter sweep may expand to
+    sweep_max_points: int = 10000
+
+    # Disk budget for precomputed ULF constitutive-tensor grids (data_dir/ulf/grids)
+    ulf_grid_cache_bytes: int = 256 * 1024 * 1024
+
+    # ULF trace jobs: worker processes (0 = one per CPU core) and rays per shard
+    ulf_trace_workers: int = 0
+    ulf_trace_shard_rays: int = 64
+
+    # Per-ray ULF trace cache (memory LRU + disk tier under data_dir/ulf/cache)
+    ulf_trace_cache: bool = True
+    ulf_trace_cache_bytes: int = 512 * 1024 * 1024
+    ulf_trace_cache_memory_bytes: int = 64 * 1024 * 1024
+
 
 # Use a module-level cached Settings so tests can mutate the same instance
 _GLOBAL_SETTINGS: Settings | None = None
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+from .jobs import SSHJobRunner
+from .util.time import utc_now_iso
+
+logger = logging.getLogger(__name__)
+
+# In-process cache of remote SSH job liveness.
+#
+# Probing one PID per request costs an SSH session per run per client per poll. The poller instead
+# groups the active SSH jobs it knows about by host and checks all of a host's PIDs with one remote
+# command (SSHJobRunner.check_remote_pids) per interval, in a background thread. The status and
+# stream endpoints read the cache; a run they ask about before it has been probed triggers a probe
+# of its host, and concurrent requests for the same host wait for that one probe instead of each
+# starting their own. Remote load is therefore O(hosts) per interval, whatever the number of runs
+# and clients. Jobs found gone stay cached but are no longer probed.
+#
+# The same loop keeps the local copies of SSH run directories current (remote_sync.sync_remote_run):
+# active runs are pulled at most every `sync_interval` seconds and a run gets a final pull once its
+# remote process is found gone.
+
+HostKey = tuple[str, int | None, str | None]
+
+
+def _host_key(job_meta: dict) -> HostKey | None:
+    target = job_meta.get("ssh_target") or ""
+    if "@" not in target:
+        return None
+    return (target.split(":", 1)[0], job_meta.get("ssh_port"), job_meta.get("identity_file"))
+
+
+class SSHStatusPoller:
+    def __init__(
+        self, interval: float = 5.0, runner: SSHJobRunner | None = None, sync_interval: float = 0.0
+    ) -> None:
+        self.interval = interval
+        self.sync_interval = sync_interval
+        self.data_dir: Path | None = None
+        self._runner = runner
+        self._finished: set[str] = set()
+        self._jobs: dict[str, tuple[HostKey, int]] = {}
+        self._cache: dict[str, dict] = {}
+        self._polled_at: dict[HostKey, float] = {}
+        self._host_locks: dict[HostKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.probes = 0
+
+    @property
+    def runner(self) -> SSHJobRunner:
+        # created lazily so tests can patch SSHJobRunner before the first probe
+        return self._runner if self._runner is not None else SSHJobRunner()
+
+    def watch(self, run_id: str, job_meta: dict) -> HostKey | None:
+        """Track an SSH job so background polls include it.
+
+        Returns its host key, or None if the job cannot be probed.
+        """
+        key = _host_key(job_meta)
+        pid = int(job_meta.get("pid") or 0)
+        if key is None or pid <= 0:
+            return None
+        with self._lock:
+            cached = self._cache.get(run_id)
+            if cached is None or cached.get("pid") != pid or cached.get("running") is not False:
+                self._jobs[run_id] = (key, pid)
+        return key
+
+    def status(self, run_id: str, job_meta: dict) -> dict:
+        """Cached {"running", "checked_at", "error"} for an SSH job.
+
+        Probes its host only if the cached result is stale.
+        """
+        key = self.watch(run_id, job_meta)
+        if key is None:
+            return {"running": False, "checked_at": None, "error": None}
+        with self._lock:
+            cached = self._cache.get(run_id)
+            fresh = cached is not None and (
+                cached["running"] is False
+                or time.monotonic() - self._polled_at.get(key, 0.0) < self.interval
+            )
+        if not fresh:
+            self.refresh_host(key)
+        with self._lock:
+            cached = self._cache.get(run_id)
+        return dict(cached or {"running": None, "checked_at": None, "error": "not probed"})
+
+    def refresh_host(self, key: HostKey) -> None:
+        requested = time.monotonic()
+        with self._lock:
+            host_lock = self._host_locks.setdefault(key, threading.Lock())
+        with host_lock:
+            with self._lock:
+                # another caller probed this host while we waited for the lock
+                if self._polled_at.get(key, 0.0) >= requested:
+                    return
+                jobs = {rid: pid for rid, (k, pid) in self._jobs.items() if k == key}
+            if not jobs:
+                return
+            userhost, port, identity_file = key
+            checked_at = utc_now_iso()
+            try:
+                alive = self.runner.check_remote_pids(
+                    userhost, list(jobs.values()), port=port, identity_file=identity_file
+                )
+                error = None
+            except Exception as e:
+                alive, error = None, str(e)
+            with self._lock:
+                self.probes += 1
+                self._polled_at[key] = time.monotonic()
+                for rid, pid in jobs.items():
+                    if alive is None:
+                        prev = self._cache.get(rid, {})
+                        self._cache[rid] = {
+                            "pid": pid,
+                            "running": prev.get("running"),
+                            "checked_at": prev.get("checked_at"),
+                            "error": error,
+                        }
+                        continue
+                    running = bool(alive.get(pid, False))
+                    self._cache[rid] = {
+                        "pid": pid,
+                        "running": running,
+                        "checked_at": checked_at,
+                        "error": None,
+                    }
+                    if not running:
+                        self._jobs.pop(rid, None)
+                        self._finished.add(rid)
+
+    def refresh(self) -> None:
+        """Probe every host that has active jobs, one remote command each."""
+        with self._lock:
+            keys = {k for k, _ in self._jobs.values()}
+        for key in keys:
+            self.refresh_host(key)
+
+    def sync(self) -> None:
+        """Pull results of active SSH runs that are due, and a final time for runs that ended."""
+        if self.data_dir is None or self.sync_interval <= 0:
+            return
+        from .remote_sync import sync_remote_run
+        from .store import RunStore
+
+        store = RunStore(self.data_dir)
+        with self._lock:
+            active = list(self._jobs)
+            finished = list(self._finished)
+            self._finished.clear()
+        for run_id in active:
+            try:
+                sync_remote_run(store, run_id, max_age=self.sync_interval)
+            except Exception as e:
+                logger.warning("Sync of SSH run %s failed: %s", run_id, e)
+        for run_id in finished:
+            try:
+                sync_remote_run(store, run_id, final=True)
+            except Exception as e:
+                logger.warning("Final sync of SSH run %s failed, will retry: %s", run_id, e)
+                with self._lock:
+                    self._finished.add(run_id)
+
+    def watch_active_runs(self, data_dir: Path) -> int:
+        """Track SSH jobs of runs still submitted/running in data_dir.
+
+        Used e.g. after an API restart.
+        """
+        from .store import RunStore
+
+        store = RunStore(data_dir)
+        count = 0
+        for run_id in store.catalog.ids_with_status(["submitted", "running"]):
+            try:
+                meta = json.loads((store.run_dir(run_id) / "runtime" / "job.json").read_text())
+            except (OSError, ValueError):
+                continue
+            if meta.get("mode") == "ssh" and self.watch(run_id, meta) is not None:
+                count += 1
+        return count
+
+    def start(self, data_dir: Path | None = None) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        if data_dir is not None:
+            self.data_dir = data_dir
+
+        def loop() -> None:
+            if data_dir is not None:
+                try:
+                    self.watch_active_runs(data_dir)
+                except Exception:
+                    logger.exception("Could not load active SSH runs")
+            while not self._stop.wait(self.interval):
+                try:
+                    self.refresh()
+                    self.sync()
+                except Exception:
+                    logger.exception("SSH status poll failed")
+
+        self._thread = threading.Thread(target=loop, name="sunstone-ssh-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+
+_POLLER: SSHStatusPoller | None = None
+
+
+def get_ssh_poller(settings) -> SSHStatusPoller:
+    """Process-wide SSH status poller."""
+    global _POLLER
+    if _POLLER is None:
+        _POLLER = SSHStatusPoller(interval=settings.ssh_status_poll_interval)
+    _POLLER.interval = settings.ssh_status_poll_interval
+    _POLLER.sync_interval = settings.ssh_sync_interval
+    return _POLLER
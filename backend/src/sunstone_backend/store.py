@@ -1,6 +1,17 @@
 
 from __future__ import annotations
+
+import json
 import logging
+import os
+import uuid
+from pathlib import Path
+
+from .catalog import CATALOG_NAME, RunCatalog
+from .models.run import RunRecord, StatusFile
+from .util.time import utc_now_iso
+
+
 def get_logger(data_dir: Path):
     log_dir = data_dir / "logs"
     log_dir.mkdir(parents=True, exist_ok=True)
@@ -14,12 +25,23 @@ def get_logger(data_dir: Path):
         logger.setLevel(logging.INFO)
     return logger
 
-import json
-import uuid
-from pathlib import Path
 
-from .models.run import RunRecord, StatusFile
-from .util.time import utc_now_iso
+# Run directory layout, parents first (created with plain os.mkdir, which is cheap in bulk)
+RUN_LAYOUT = (
+    "geometry",
+    "geometry/sources",
+    "geometry/normalized",
+    "materials",
+    "runtime",
+    "logs",
+    "outputs",
+    "outputs/monitors",
+    "outputs/spectra",
+    "outputs/farfield",
+    "outputs/movies",
+    "postprocess",
+    "postprocess/results",
+)
 
 
 class RunStore:
@@ -29,6 +51,13 @@ class RunStore:
         self.runs_dir = self.data_dir / "runs"
         self.logger = get_logger(self.data_dir)
         self.logger.info(f"RunStore initialized with data_dir: {self.data_dir}")
+        catalog_path = self.data_dir / CATALOG_NAME
+        fresh = not catalog_path.exists()
+        self.catalog = RunCatalog(catalog_path)
+        if fresh and self.runs_dir.exists():
+            # first use on an existing data dir: index the runs already on disk
+            count = self.catalog.rebuild(self.runs_dir)
+            self.logger.info(f"Indexed {count} existing runs into {catalog_path}")
 
     def ensure(self) -> None:
         self.projects_dir.mkdir(parents=True, exist_ok=True)
@@ -54,23 +83,32 @@ class RunStore:
     def create_run(self, project_id: str, spec: dict, backend: str) -> RunRecord:
         self.ensure()
         _ = self.get_project(project_id)
+        rec, updated_at = self._init_run(project_id, spec, backend)
+        self._index(self.catalog.upsert_run, rec, updated_at)
+        self.logger.info(f"Created run {rec.id} for project {project_id} at {self.run_dir(rec.id)}")
+        return rec
 
+    def create_runs(
+        self, project_id: str, specs: list[dict], backend: str, sweep_id: str | None = None
+    ) -> list[RunRecord]:
+        """Create one run per spec, indexing them all in a single catalog transaction."""
+        self.ensure()
+        _ = self.get_project(project_id)
+        created = [self._init_run(project_id, spec, backend, sweep_id) for spec in specs]
+        self._index(self.catalog.upsert_runs, created)
+        self.logger.info(f"Created {len(created)} runs for project {project_id}")
+        return [rec for rec, _ in created]
+
+    def _init_run(
+        self, project_id: str, spec: dict, backend: str, sweep_id: str | None = None
+    ) -> tuple[RunRecord, str]:
         run_id = uuid.uuid4().hex
         run_dir = self.run_dir(run_id)
         run_dir.mkdir(parents=True, exist_ok=False)
 
         # Layout
-        (run_dir / "geometry" / "sources").mkdir(parents=True)
-        (run_dir / "geometry" / "normalized").mkdir(parents=True)
-        (run_dir / "materials").mkdir(parents=True)
-        (run_dir / "runtime").mkdir(parents=True)
-        (run_dir / "logs").mkdir(parents=True)
-        (run_dir / "outputs").mkdir(parents=True)
-        (run_dir / "outputs" / "monitors").mkdir(parents=True)
-        (run_dir / "outputs" / "spectra").mkdir(parents=True)
-        (run_dir / "outputs" / "farfield").mkdir(parents=True)
-        (run_dir / "outputs" / "movies").mkdir(parents=True)
-        (run_dir / "postprocess" / "results").mkdir(parents=True)
+        for sub in RUN_LAYOUT:
+            os.mkdir(f"{run_dir}/{sub}")
 
         (run_dir / "spec.json").write_text(json.dumps(spec, indent=2))
         (run_dir / "runtime" / "backend.json").write_text(
@@ -83,15 +121,13 @@ class RunStore:
             created_at=utc_now_iso(),
             status="created",
             backend=backend,
+            sweep_id=sweep_id,
         )
         (run_dir / "runtime" / "run.json").write_text(rec.model_dump_json(indent=2))
 
         status = StatusFile(status="created", updated_at=utc_now_iso())
         (run_dir / "runtime" / "status.json").write_text(status.model_dump_json(indent=2))
-
-        self.logger.info(f"Created run {run_id} for project {project_id} at {run_dir}")
-
-        return rec
+        return rec, status.updated_at
 
     def run_dir(self, run_id: str) -> Path:
         return self.runs_dir / f"run_{run_id}"
@@ -109,6 +145,7 @@ class RunStore:
 
     def save_run(self, run: RunRecord) -> None:
         (self.run_dir(run.id) / "runtime" / "run.json").write_text(run.model_dump_json(indent=2))
+        self._index(self.catalog.upsert_run, run)
 
     def load_status(self, run_id: str) -> StatusFile:
         path = self.run_dir(run_id) / "runtime" / "status.json"
@@ -120,3 +157,64 @@ class RunStore:
         (self.run_dir(run_id) / "runtime" / "status.json").write_text(
             status.model_dump_json(indent=2)
         )
+        self._index(self.catalog.update_status, run_id, status)
+
+    def save_statuses(self, runs: list[RunRecord], status: str, detail: str | None = None) -> None:
+        """Move many runs to `status` at once, with one catalog transaction."""
+        now = utc_now_iso()
+        items = []
+        for run in runs:
+            run.status = status
+            runtime = self.run_dir(run.id) / "runtime"
+            (runtime / "run.json").write_text(run.model_dump_json(indent=2))
+            st = StatusFile(status=status, updated_at=now, detail=detail)
+            (runtime / "status.json").write_text(st.model_dump_json(indent=2))
+            items.append((run.id, st))
+        self._index(self.catalog.update_statuses, items)
+
+    def _index(self, fn, *args) -> None:
+        # The run directory is the source of truth; a catalog failure must not fail the write.
+        try:
+            fn(*args)
+        except Exception as e:
+            self.logger.warning(f"Run catalog update failed ({fn.__name__}): {e}")
+
+    # Sweeps
+    def create_sweep(self, project_id: str, record: dict) -> dict:
+        sweep_id = uuid.uuid4().hex
+        rec = {"id": sweep_id, "project_id": project_id, "created_at": utc_now_iso(), **record}
+        sweep_dir = self.sweep_dir(sweep_id)
+        sweep_dir.mkdir(parents=True, exist_ok=False)
+        self.save_sweep(rec)
+        return rec
+
+    def sweep_dir(self, sweep_id: str) -> Path:
+        return self.data_dir / "sweeps" / f"sweep_{sweep_id}"
+
+    def save_sweep(self, rec: dict) -> None:
+        (self.sweep_dir(rec["id"]) / "sweep.json").write_text(json.dumps(rec, indent=2))
+
+    def load_sweep(self, sweep_id: str) -> dict:
+        path = self.sweep_dir(sweep_id) / "sweep.json"
+        if not path.exists():
+            raise FileNotFoundError(sweep_id)
+        return json.loads(path.read_text())
+
+    def list_sweeps(self, project_id: str) -> list[dict]:
+        sweeps = []
+        for path in (self.data_dir / "sweeps").glob("sweep_*/sweep.json"):
+            try:
+                rec = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            if rec.get("project_id") == project_id:
+                sweeps.append(rec)
+        sweeps.sort(key=lambda r: r.get("created_at", ""), reverse=True)
+        return sweeps
+
+    def list_runs(self, project_id: str, **filters) -> tuple[list[dict], str | None]:
+        return self.catalog.list_runs(project_id, **filters)
+
+    def rebuild_catalog(self) -> int:
+        self.ensure()
+        return self.catalog.rebuild(self.runs_dir)
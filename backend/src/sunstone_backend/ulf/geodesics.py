@@ -3,6 +3,10 @@ from __future__ import annotations
 import math
 from typing import List, Tuple
 
+import numpy as _np
+
+from .kerr import kerr_metric_cartesian, kerr_metric_cartesian_batch
+
 # Simple Schwarzschild null-orbit integrator using the orbit equation
 # du/dphi = v, dv/dphi = 3 M u^2 - u
 # where u = 1/r, phi is angular coordinate, M is mass (geometric units G=c=1)
@@ -106,6 +110,288 @@ def integrate_ray_from_cartesian(x0: float, y0: float, dx: float, dy: float, M:
     return out, r_values
 
 
+def _fan_initial_conditions(
+    x0: _np.ndarray, y0: _np.ndarray, dx: _np.ndarray, dy: _np.ndarray
+) -> tuple[_np.ndarray, _np.ndarray, _np.ndarray, _np.ndarray]:
+    """Vectorized `orbit_initial_conditions_from_cartesian`: (u0, v0, phi0, direction of dφ)."""
+    x0, y0, dx, dy = _np.broadcast_arrays(
+        *(_np.atleast_1d(_np.asarray(c, dtype=float)) for c in (x0, y0, dx, dy))
+    )
+    r0 = _np.maximum(_np.hypot(x0, y0), 1e-12)
+    phi0 = _np.arctan2(y0, x0)
+    rx = x0 / r0
+    ry = y0 / r0
+    dr_dl = dx * rx + dy * ry
+    r_dphi_dl = dx * -ry + dy * rx
+    # purely radial rays get a small tangential component to avoid the singularity, as in the
+    # scalar path
+    r_dphi_dl = _np.where(_np.abs(r_dphi_dl) < 1e-12, 1e-6, r_dphi_dl)
+    u0 = 1.0 / r0
+    v0 = (-(1.0 / (r0 * r0)) * dr_dl) / (r_dphi_dl / r0)
+    return u0, v0, phi0, _np.sign(r_dphi_dl)
+
+
+# Adaptive Dormand–Prince RK5(4) integration of the same orbit equation. Each ray is integrated in
+# s = |φ - φ0| with its own step size; accepted steps keep their stages so the trajectory can be
+# resampled afterwards from the 4th-order continuous extension, which makes the number of output
+# samples independent of the number of integration steps.
+
+_DP_C = _np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0])
+_DP_A = [
+    _np.array([]),
+    _np.array([1 / 5]),
+    _np.array([3 / 40, 9 / 40]),
+    _np.array([44 / 45, -56 / 15, 32 / 9]),
+    _np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+    _np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]),
+]
+_DP_B = _np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+# error estimate weights (5th minus 4th order solution), including the FSAL stage
+_DP_E = _np.array([-71 / 57600, 0.0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40])
+# dense-output polynomial coefficients: y(θ) = y0 + h Σ_k K_k (P_k · [θ, θ², θ³, θ⁴])
+_DP_P = _np.array([
+    [1.0, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+    [0.0, 0.0, 0.0, 0.0],
+    [0.0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+    [0.0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+    [0.0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+    [0.0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+    [0.0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+])
+
+
+def _dense_eval(y0: _np.ndarray, h: _np.ndarray, Q: _np.ndarray, theta: _np.ndarray) -> _np.ndarray:
+    """Evaluate the continuous extension for rows (y0 (n, 2), h (n,), Q (n, 2, 4)) at theta (n,)."""
+    powers = _np.stack([theta, theta ** 2, theta ** 3, theta ** 4], axis=-1)
+    return y0 + h[:, None] * _np.einsum('nij,nj->ni', Q, powers)
+
+
+def _resample_dense(
+    rec_ray: list, rec_s: list, rec_h: list, rec_y: list, rec_Q: list,
+    s_stop: _np.ndarray, samples: int, y_init: _np.ndarray,
+) -> tuple[_np.ndarray, _np.ndarray]:
+    """Evaluate recorded accepted steps (ray index, start, length, start state, dense coefficients)
+    at `samples` uniform points over [0, s_stop] per ray; returns (states (N, samples, dim),
+    s (N, samples)). Rays without recorded steps keep their initial state."""
+    n, dim = y_init.shape
+    rays = _np.concatenate(rec_ray) if rec_ray else _np.zeros(0, dtype=int)
+    st = _np.concatenate(rec_s) if rec_s else _np.zeros(0)
+    hs = _np.concatenate(rec_h) if rec_h else _np.zeros(0)
+    ys = _np.concatenate(rec_y) if rec_y else _np.zeros((0, dim))
+    Qs = _np.concatenate(rec_Q) if rec_Q else _np.zeros((0, dim, 4))
+    # sort steps by (ray, start) and search them with a single combined key
+    span_key = 2.0 * float(max(_np.max(s_stop, initial=0.0), _np.max(st + hs, initial=0.0))) + 1.0
+    order = _np.lexsort((st, rays))
+    rays, st, hs, ys, Qs = rays[order], st[order], hs[order], ys[order], Qs[order]
+    keys = rays * span_key + st
+
+    s_q = _np.linspace(0.0, 1.0, samples)[None, :] * s_stop[:, None]
+    ray_q = _np.repeat(_np.arange(n), samples)
+    s_flat = s_q.ravel()
+    out = _np.repeat(y_init, samples, axis=0)
+    if keys.size:
+        j = _np.clip(
+            _np.searchsorted(keys, ray_q * span_key + s_flat, side='right') - 1, 0, keys.size - 1
+        )
+        valid = rays[j] == ray_q
+        theta = _np.clip((s_flat - st[j]) / _np.where(hs[j] > 0, hs[j], 1.0), 0.0, 1.0)
+        dense = _dense_eval(ys[j], hs[j], Qs[j], theta)
+        out = _np.where(valid[:, None] & ~_np.isnan(dense), dense, out)
+    return out.reshape(n, samples, dim), s_q
+
+
+def integrate_schwarzschild_orbits_adaptive(
+    u0: _np.ndarray,
+    v0: _np.ndarray,
+    M: float,
+    phi0: _np.ndarray,
+    direction: _np.ndarray,
+    phi_span: float,
+    samples: int,
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+    u_escape: float | _np.ndarray = 0.0,
+    max_step: float = 0.1,
+    obstacles: _np.ndarray | None = None,
+    max_iter: int = 100000,
+) -> tuple[_np.ndarray, _np.ndarray, _np.ndarray, _np.ndarray, _np.ndarray]:
+    """Integrate N orbits u(φ) with adaptive Dormand–Prince steps, event detection and dense output.
+
+    Parameters
+    ----------
+    u0, v0: initial u = 1/r and du/dφ, shape (N,)
+    M: mass parameter (in geometric units)
+    phi0: starting angle per ray, shape (N,)
+    direction: +1/-1 per ray, the sign of dφ along the ray
+    phi_span: maximum |Δφ| to integrate
+    samples: number of output points per ray, spread uniformly over the integrated range
+    rtol, atol: local error tolerances
+    u_escape: the ray leaves the domain when u <= u_escape (r >= 1/u_escape); scalar or per ray (N,)
+    max_step: largest |Δφ| per step (bounds how far an obstacle crossing can be missed)
+    obstacles: optional (K, 3) array of (x, y, radius) discs that terminate rays on contact
+
+    Returns
+    -------
+    (r, phi, captured, escaped, hit) with r and phi of shape (N, samples); captured and escaped are
+    boolean masks and hit holds the index of the obstacle a ray ran into (-1 for none).
+    """
+    y = _np.stack([_np.asarray(u0, dtype=float), _np.asarray(v0, dtype=float)], axis=-1)
+    y = y.reshape(-1, 2)
+    n = y.shape[0]
+    y0_init = y.copy()
+    phi0 = _np.broadcast_to(_np.asarray(phi0, dtype=float), (n,))
+    sigma = _np.broadcast_to(_np.sign(_np.asarray(direction, dtype=float)), (n,))
+    sigma = _np.where(sigma == 0, 1.0, sigma)
+    u_escape = _np.broadcast_to(_np.asarray(u_escape, dtype=float), (n,))
+    obstacles = (
+        _np.zeros((0, 3))
+        if obstacles is None
+        else _np.asarray(obstacles, dtype=float).reshape(-1, 3)
+    )
+    u_horizon = 1.0 / (2.0 * M) if M > 0 else _np.inf
+
+    def f(s: _np.ndarray, sg: _np.ndarray) -> _np.ndarray:
+        u = s[:, 0]
+        return sg[:, None] * _np.stack([s[:, 1], 3.0 * M * u * u - u], axis=-1)
+
+    def events(
+        yy: _np.ndarray, ss: _np.ndarray, sg: _np.ndarray, ph0: _np.ndarray, ue: _np.ndarray
+    ) -> _np.ndarray:
+        """Event functions, shape (n, 2 + K); an event fires when a value becomes >= 0."""
+        u = yy[:, 0]
+        cols = [u - u_horizon, ue - u]
+        if len(obstacles):
+            with _np.errstate(divide='ignore'):
+                r = _np.where(u > 0, 1.0 / _np.maximum(u, 1e-300), _np.inf)
+            ph = ph0 + sg * ss
+            x = r * _np.cos(ph)
+            yv = r * _np.sin(ph)
+            for ox, oy, orad in obstacles:
+                cols.append(orad * orad - ((x - ox) ** 2 + (yv - oy) ** 2))
+        return _np.stack(cols, axis=-1)
+
+    s = _np.zeros(n)
+    h = _np.full(n, min(max_step, phi_span / 100.0 if phi_span > 0 else max_step))
+    s_stop = _np.full(n, float(phi_span))
+    active = _np.ones(n, dtype=bool)
+    event = _np.full(n, -1, dtype=int)
+    k1 = f(y, sigma)
+    # accepted steps: ray index, step start, step length, start state, dense coefficients
+    rec_ray, rec_s, rec_h, rec_y, rec_Q = [], [], [], [], []
+
+    for _ in range(max_iter):
+        idx = _np.flatnonzero(active)
+        if idx.size == 0:
+            break
+        ya, ha, sa, sg = y[idx], _np.minimum(h[idx], phi_span - s[idx]), s[idx], sigma[idx]
+        K = _np.empty((idx.size, 7, 2))
+        K[:, 0] = k1[idx]
+        for i in range(1, 6):
+            dy = _np.einsum('j,njk->nk', _DP_A[i], K[:, :i])
+            K[:, i] = f(ya + ha[:, None] * dy, sg)
+        y_new = ya + ha[:, None] * _np.einsum('j,njk->nk', _DP_B, K[:, :6])
+        K[:, 6] = f(y_new, sg)
+        scale = atol + _np.maximum(_np.abs(ya), _np.abs(y_new)) * rtol
+        err = _np.sqrt(
+            _np.mean((ha[:, None] * _np.einsum('j,njk->nk', _DP_E, K) / scale) ** 2, axis=-1)
+        )
+        ok = err <= 1.0
+        with _np.errstate(divide='ignore'):
+            factor = _np.where(err == 0, 10.0, 0.9 * err ** -0.2)
+        factor = _np.clip(factor, 0.2, 10.0)
+        factor = _np.where(ok, factor, _np.minimum(factor, 1.0))
+        h[idx] = _np.minimum(ha * factor, max_step)
+        if not ok.any():
+            continue
+
+        acc = idx[ok]
+        ya, ha, sa, sg, K, y_new = ya[ok], ha[ok], sa[ok], sg[ok], K[ok], y_new[ok]
+        Q = _np.einsum('nkj,kp->njp', K, _DP_P)
+        s_new = sa + ha
+        g_old = events(ya, sa, sg, phi0[acc], u_escape[acc])
+        g_new = events(y_new, s_new, sg, phi0[acc], u_escape[acc])
+        fired = (g_new >= 0) & (g_old < 0)
+        has_event = fired.any(axis=1)
+        if has_event.any():
+            # locate the earliest crossing inside the step by bisection on the dense output
+            rows = _np.flatnonzero(has_event)
+            which = _np.where(fired[rows], _np.arange(fired.shape[1]), fired.shape[1]).min(axis=1)
+            lo = _np.zeros(rows.size)
+            hi = _np.ones(rows.size)
+            for _b in range(40):
+                mid = 0.5 * (lo + hi)
+                ym = _dense_eval(ya[rows], ha[rows], Q[rows], mid)
+                gm = events(
+                    ym, sa[rows] + mid * ha[rows], sg[rows], phi0[acc[rows]], u_escape[acc[rows]]
+                )
+                crossed = gm[_np.arange(rows.size), which] >= 0
+                hi = _np.where(crossed, mid, hi)
+                lo = _np.where(crossed, lo, mid)
+            event[acc[rows]] = which
+            active[acc[rows]] = False
+            s_stop[acc[rows]] = sa[rows] + hi * ha[rows]
+
+        rec_ray.append(acc)
+        rec_s.append(sa)
+        rec_h.append(ha)
+        rec_y.append(ya)
+        rec_Q.append(Q)
+        y[acc] = y_new
+        k1[acc] = K[:, 6]
+        s[acc] = s_new
+        done = s_new >= phi_span * (1.0 - 1e-12)
+        active[acc[done & ~has_event]] = False
+
+    # Resample every ray uniformly over the range it actually covered.
+    y_q, s_q = _resample_dense(rec_ray, rec_s, rec_h, rec_y, rec_Q, s_stop, samples, y0_init)
+    u_q = y_q[..., 0]
+    # pin terminal samples exactly onto the event surface
+    captured = event == 0
+    escaped = event == 1
+    u_q[captured, -1] = u_horizon
+    pin = escaped & (u_escape > 0)
+    u_q[pin, -1] = u_escape[pin]
+    with _np.errstate(divide='ignore'):
+        r = _np.where(u_q > 0, 1.0 / _np.maximum(u_q, 1e-300), _np.inf)
+    phi = phi0[:, None] + sigma[:, None] * s_q
+    hit = _np.where(event >= 2, event - 2, -1)
+    return r, phi, captured, escaped, hit
+
+
+def integrate_rays_from_cartesian_adaptive(
+    x0: _np.ndarray,
+    y0: _np.ndarray,
+    dx: _np.ndarray,
+    dy: _np.ndarray,
+    M: float,
+    samples: int = 200,
+    phi_span: float = 6.283185307179586,
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+    r_max: float | None = None,
+    obstacles: _np.ndarray | None = None,
+) -> tuple[_np.ndarray, _np.ndarray, _np.ndarray, _np.ndarray, _np.ndarray]:
+    """Integrate a fan of rays from cartesian positions/directions in one vectorized call.
+
+    Each ray starts at its own position angle and is integrated forward along its direction of
+    travel for up to `phi_span` radians, with adaptive steps and `samples` resampled points.
+
+    - r_max: radius of the domain; by default each ray escapes at twice its own starting radius, so
+      a ray's path does not depend on which other rays share the batch
+    - obstacles: optional (K, 3) array of (x, y, radius) discs relative to the mass
+
+    Returns (xy, r, captured, escaped, hit) with xy of shape (N, samples, 2); see
+    `integrate_schwarzschild_orbits_adaptive` for the masks.
+    """
+    u0, v0, phi0, direction = _fan_initial_conditions(x0, y0, dx, dy)
+    u_escape = 1.0 / float(r_max) if r_max else 0.5 * u0
+    r, phi, captured, escaped, hit = integrate_schwarzschild_orbits_adaptive(
+        u0, v0, M, phi0, direction, phi_span, samples,
+        rtol=rtol, atol=atol, u_escape=u_escape, obstacles=obstacles,
+    )
+    xy = _np.stack([r * _np.cos(phi), r * _np.sin(phi)], axis=-1)
+    return xy, r, captured, escaped, hit
+
 # Plebanski-style constitutive mapping (weak-field isotropic approximation)
 # For metric in isotropic weak field: g_{00} = -(1+2Phi), g_{ij} = (1-2Phi) delta_{ij}
 # with Phi = -GM/r (Newtonian potential). We use first-order mapping:
@@ -129,10 +415,6 @@ def plebanski_tensor_from_r(r: float, M: float, G: float = 1.0) -> Tuple[List[Li
     return eps, mu
 
 
-import numpy as _np
-from .kerr import kerr_metric_cartesian
-
-
 def plebanski_tensor_from_metric(x: float, y: float, z: float, M: float) -> Tuple[List[List[float]], List[List[float]]]:
     """Compute constitutive (eps, mu, xi, zeta) tensors at cartesian position (x,y,z) for a Schwarzschild mass M
 
@@ -140,26 +422,49 @@ def plebanski_tensor_from_metric(x: float, y: float, z: float, M: float) -> Tupl
     the general `plebanski_from_metric` routine to compute the full constitutive mapping including
     magneto-electric couplings.
     """
-    rho = max((x * x + y * y + z * z) ** 0.5, 1e-12)
-    m = float(M)
-    half = m / (2.0 * rho)
+    eps, mu, xi, zeta = plebanski_tensor_from_metric_batch([x], [y], [z], M)
+    return eps[0].tolist(), mu[0].tolist(), xi[0].tolist(), zeta[0].tolist()
+
+
+def schwarzschild_isotropic_metric_batch(
+    x: _np.ndarray, y: _np.ndarray, z: _np.ndarray, M: float
+) -> _np.ndarray:
+    """Isotropic Schwarzschild metric diag(-A^2, B, B, B) at N cartesian points, shape (N, 4, 4)."""
+    x, y, z = _np.broadcast_arrays(
+        *(_np.atleast_1d(_np.asarray(c, dtype=float)) for c in (x, y, z))
+    )
+    rho = _np.maximum(_np.sqrt(x * x + y * y + z * z), 1e-12)
+    half = float(M) / (2.0 * rho)
     denom = 1.0 + half
-    if denom == 0:
-        denom = 1e-12
     A = (1.0 - half) / denom
     B = denom * denom
-    # construct 4x4 metric in isotropic coordinates: diag(-A^2, B, B, B)
-    g = _np.zeros((4, 4), dtype=float)
-    g[0, 0] = -A * A
+    g = _np.zeros(rho.shape + (4, 4), dtype=float)
+    g[..., 0, 0] = -A * A
     for i in range(1, 4):
-        g[i, i] = B
-    # get full Plebanski mapping
-    res = plebanski_from_metric(g)
-    eps = res['eps']
-    mu = res['mu']
-    xi = res['xi']
-    zeta = res['zeta']
-    return eps, mu, xi, zeta
+        g[..., i, i] = B
+    return g
+
+
+def plebanski_tensor_from_metric_batch(
+    x: _np.ndarray, y: _np.ndarray, z: _np.ndarray, M: float
+) -> tuple[_np.ndarray, _np.ndarray, _np.ndarray, _np.ndarray]:
+    """Vectorized `plebanski_tensor_from_metric` over coordinate arrays; four (N, 3, 3) arrays."""
+    res = plebanski_from_metric_batch(schwarzschild_isotropic_metric_batch(x, y, z, M))
+    return res['eps'], res['mu'], res['xi'], res['zeta']
+
+
+# 3D Levi-Civita (epsilon_{ijk}) with indices 0..2
+_EPS3 = _np.zeros((3, 3, 3), dtype=float)
+_EPS3[0, 1, 2] = _EPS3[1, 2, 0] = _EPS3[2, 0, 1] = 1.0
+_EPS3[0, 2, 1] = _EPS3[2, 1, 0] = _EPS3[1, 0, 2] = -1.0
+
+# Basis field strengths F_{αβ}: rows 0..2 are unit E_j (F_{0j} = E_j), rows 3..5 are unit
+# magnetic inputs b_j (F_{kl} = -epsilon_{klj}).
+_F_BASIS = _np.zeros((6, 4, 4), dtype=float)
+for _j in range(3):
+    _F_BASIS[_j, 0, _j + 1] = 1.0
+    _F_BASIS[_j, _j + 1, 0] = -1.0
+    _F_BASIS[3 + _j, 1:, 1:] = -_EPS3[:, :, _j]
 
 
 def plebanski_from_metric(g4: _np.ndarray) -> dict:
@@ -171,78 +476,32 @@ def plebanski_from_metric(g4: _np.ndarray) -> dict:
     compute H^{μν} = sqrt(-g) g^{μα} g^{νβ} F_{αβ}, then extract D^i = H^{0i} and B^i = 1/2 ε^{ijk} H_{jk}.
     Columns give the constitutive matrices.
     """
-    g4 = _np.asarray(g4, dtype=float)
-    detg = _np.linalg.det(g4)
-    if detg >= 0:
-        # In non-Lorentzian inputs, proceed but warn
-        detg = float(detg)
-    sqrt_neg_g = _np.sqrt(abs(-detg))
-    invg = _np.linalg.inv(g4)
+    res = plebanski_from_metric_batch(_np.asarray(g4, dtype=float)[None])
+    return {k: v[0].tolist() for k, v in res.items()}
 
-    # 3D Levi-Civita (epsilon_{ijk}) with indices 0..2
-    eps3 = _np.zeros((3, 3, 3), dtype=float)
-    eps3[0, 1, 2] = 1.0
-    eps3[0, 2, 1] = -1.0
-    eps3[1, 0, 2] = -1.0
-    eps3[1, 2, 0] = 1.0
-    eps3[2, 0, 1] = 1.0
-    eps3[2, 1, 0] = -1.0
-
-    eps_mat = _np.zeros((3, 3), dtype=float)
-    mu_mat = _np.zeros((3, 3), dtype=float)
-    xi_mat = _np.zeros((3, 3), dtype=float)
-    zeta_mat = _np.zeros((3, 3), dtype=float)
-
-    # Helper to compute H^{μν} = sqrt(-g) * invg @ F @ invg.T
-    def compute_H_from_F(F):
-        return sqrt_neg_g * (invg @ F @ invg.T)
-
-    # For each basis vector in E (unit vector along axis j)
-    for j in range(3):
-        F = _np.zeros((4, 4), dtype=float)
-        # F_{0j} = E_j, indices offset by 1 for spatial
-        F[0, j + 1] = 1.0
-        F[j + 1, 0] = -1.0
-        H = compute_H_from_F(F)
-        # D^i = H^{0i}
-        D = H[0, 1:4].copy()
-        # B^i = 1/2 epsilon^{ijk} H_{jk}
-        B = _np.zeros(3, dtype=float)
-        for i in range(3):
-            s = 0.0
-            for p in range(3):
-                for q in range(3):
-                    s += 0.5 * eps3[i, p, q] * H[p + 1, q + 1]
-            B[i] = s
-        eps_mat[:, j] = D
-        zeta_mat[:, j] = B
-
-    # For each basis vector in H (magnetic basis b_j = 1)
-    for j in range(3):
-        F = _np.zeros((4, 4), dtype=float)
-        # F_{kl} = -epsilon_{klj}
-        for k in range(3):
-            for l in range(3):
-                F[k + 1, l + 1] = -eps3[k, l, j]
-        # ensure antisymmetry
-        F = 0.5 * (F - F.T)
-        H = compute_H_from_F(F)
-        D = H[0, 1:4].copy()
-        B = _np.zeros(3, dtype=float)
-        for i in range(3):
-            s = 0.0
-            for p in range(3):
-                for q in range(3):
-                    s += 0.5 * eps3[i, p, q] * H[p + 1, q + 1]
-            B[i] = s
-        xi_mat[:, j] = D
-        mu_mat[:, j] = B
 
+def plebanski_from_metric_batch(g4: _np.ndarray) -> dict:
+    """Batched `plebanski_from_metric` over a stack of metrics g4 with shape (N, 4, 4).
+
+    Returns dict with (N, 3, 3) arrays 'eps', 'mu', 'xi', 'zeta'. All N points are handled with one
+    stacked det/inv and two einsum contractions over the six basis field strengths.
+    """
+    g4 = _np.asarray(g4, dtype=float)
+    sqrt_neg_g = _np.sqrt(_np.abs(_np.linalg.det(g4)))
+    invg = _np.linalg.inv(g4)
+    # H^{μν} = sqrt(-g) g^{μα} F_{αβ} g^{νβ} for every point n and basis input b
+    H = sqrt_neg_g[:, None, None, None] * _np.einsum(
+        'nma,bak,nlk->nbml', invg, _F_BASIS, invg, optimize=True
+    )
+    # D^i = H^{0i}, B^i = 1/2 epsilon^{ipq} H_{pq}; shapes (N, 6, 3)
+    D = H[:, :, 0, 1:]
+    B = 0.5 * _np.einsum('ipq,nbpq->nbi', _EPS3, H[:, :, 1:, 1:])
+    # Responses to basis input j form column j of each constitutive matrix.
     return {
-        'eps': _np.array(eps_mat).tolist(),
-        'mu': _np.array(mu_mat).tolist(),
-        'xi': _np.array(xi_mat).tolist(),
-        'zeta': _np.array(zeta_mat).tolist(),
+        'eps': D[:, :3].transpose(0, 2, 1).copy(),
+        'mu': B[:, 3:].transpose(0, 2, 1).copy(),
+        'xi': D[:, 3:].transpose(0, 2, 1).copy(),
+        'zeta': B[:, :3].transpose(0, 2, 1).copy(),
     }
 
 
@@ -252,3 +511,10 @@ def plebanski_tensor_from_kerr(x: float, y: float, z: float, M: float, a: float)
     res = plebanski_from_metric(g)
     return res['eps'], res['mu'], res['xi'], res['zeta']
 
+
+def plebanski_tensor_from_kerr_batch(
+    x: _np.ndarray, y: _np.ndarray, z: _np.ndarray, M: float, a: float
+) -> tuple[_np.ndarray, _np.ndarray, _np.ndarray, _np.ndarray]:
+    """Vectorized `plebanski_tensor_from_kerr` over coordinate arrays; four (N, 3, 3) arrays."""
+    res = plebanski_from_metric_batch(kerr_metric_cartesian_batch(x, y, z, M, a))
+    return res['eps'], res['mu'], res['xi'], res['zeta']
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .geodesics import plebanski_from_metric_batch, schwarzschild_isotropic_metric_batch
+from .kerr import kerr_metric_cartesian_batch
+
+# Precomputed constitutive-tensor grids for ULF scene objects.
+#
+# The Plebanski tensors of a Schwarzschild or Kerr object only depend on the object parameters, so
+# we tabulate eps/mu/xi/zeta once per (kind, M, a, center) and answer point queries by
+# interpolation:
+# - schwarzschild: isotropic, so a 1D log-radial grid in rho is exact up to interpolation error;
+# - kerr: a 3D Cartesian grid around the center with trilinear interpolation, sized from M and a.
+# Points outside the tabulated region are computed directly, and so are points whose grid cell
+# touches a node in the strong-field core (nodes there are stored as NaN, e.g. the origin, where
+# the a = 0 metric is singular).
+# Grids are stored as .npz files under data_dir/ulf/grids and evicted least-recently-used once the
+# directory exceeds its byte budget.
+
+TENSOR_NAMES = ('eps', 'mu', 'xi', 'zeta')
+
+
+def _direct(kind: str, M: float, a: float, pts: np.ndarray) -> np.ndarray:
+    """Tensors for pts (relative to the object center) computed without a grid; (N, 4, 3, 3)."""
+    if kind == 'kerr':
+        g = kerr_metric_cartesian_batch(pts[:, 0], pts[:, 1], pts[:, 2], M, a)
+    else:
+        g = schwarzschild_isotropic_metric_batch(pts[:, 0], pts[:, 1], pts[:, 2], M)
+    res = plebanski_from_metric_batch(g)
+    return np.stack([res[k] for k in TENSOR_NAMES], axis=1)
+
+
+@dataclass
+class ConstitutiveGrid:
+    """Tabulated tensors for one object; `values` has shape grid_shape + (4, 3, 3)."""
+
+    kind: str
+    M: float
+    a: float
+    center: tuple[float, float, float]
+    axes: tuple[np.ndarray, ...]
+    values: np.ndarray
+    # Cartesian grids: nodes closer than this to the center are NaN, so cells touching them are
+    # treated as outside the grid
+    r_core: float = 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.values.nbytes + sum(ax.nbytes for ax in self.axes))
+
+    def interpolate(self, pts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Interpolate at pts (N, 3) relative to the center: (values (N, 4, 3, 3), inside mask)."""
+        if len(self.axes) == 1:
+            log_r = np.log(np.maximum(np.linalg.norm(pts, axis=1), 1e-300))
+            ax = self.axes[0]
+            inside = (log_r >= ax[0]) & (log_r <= ax[-1])
+            i = np.clip(np.searchsorted(ax, log_r) - 1, 0, len(ax) - 2)
+            w = np.clip((log_r - ax[i]) / (ax[i + 1] - ax[i]), 0.0, 1.0)[:, None, None, None]
+            return (1.0 - w) * self.values[i] + w * self.values[i + 1], inside
+
+        inside = np.linalg.norm(pts, axis=1) >= self.r_core
+        idx = []
+        frac = []
+        for d, ax in enumerate(self.axes):
+            inside &= (pts[:, d] >= ax[0]) & (pts[:, d] <= ax[-1])
+            step = ax[1] - ax[0]
+            f = np.clip((pts[:, d] - ax[0]) / step, 0.0, len(ax) - 1.0)
+            i = np.minimum(f.astype(int), len(ax) - 2)
+            idx.append(i)
+            frac.append((f - i)[:, None, None, None])
+        out = np.zeros((len(pts),) + self.values.shape[3:])
+        for ox in (0, 1):
+            wx = frac[0] if ox else 1.0 - frac[0]
+            for oy in (0, 1):
+                wy = frac[1] if oy else 1.0 - frac[1]
+                for oz in (0, 1):
+                    wz = frac[2] if oz else 1.0 - frac[2]
+                    out += wx * wy * wz * self.values[idx[0] + ox, idx[1] + oy, idx[2] + oz]
+        # a NaN corner (core or singular node) poisons the cell even at zero weight
+        inside &= np.isfinite(out).all(axis=(1, 2, 3))
+        return out, inside
+
+
+def build_grid(
+    kind: str,
+    M: float,
+    a: float = 0.0,
+    center: tuple[float, float, float] = (0.0, 0.0, 0.0),
+    radial_points: int = 4096,
+    r_min: float | None = None,
+    r_max: float | None = None,
+    cartesian_points: int = 49,
+    half_extent: float | None = None,
+) -> ConstitutiveGrid:
+    """Tabulate tensors for an object.
+
+    - schwarzschild: `radial_points` log-spaced radii in [r_min, r_max] (defaults: 2M to
+      1e4 * max(M, 1)); the lower bound keeps the grid away from the isotropic horizon at
+      rho = M/2 where eps/mu diverge.
+    - kerr: `cartesian_points`^3 grid on [-half_extent, half_extent]^3 (default 12 * s with
+      s = max(M, |a|), so the spacing follows the hole's size); nodes within 3 * s of the center
+      (horizon and ring singularity) are not tabulated and points near them are computed directly.
+    """
+    if kind == 'kerr':
+        scale = max(float(M), abs(float(a))) or 1.0
+        L = float(half_extent) if half_extent else 12.0 * scale
+        ax = np.linspace(-L, L, cartesian_points)
+        X, Y, Z = np.meshgrid(ax, ax, ax, indexing='ij')
+        pts = np.stack([X.ravel(), Y.ravel(), Z.ravel()], axis=-1)
+        r_core = 3.0 * scale
+        core = np.linalg.norm(pts, axis=1) < r_core
+        values = np.full((len(pts), 4, 3, 3), np.nan)
+        values[~core] = _direct(kind, M, a, pts[~core])
+        values = values.reshape((cartesian_points,) * 3 + (4, 3, 3))
+        axes: tuple[np.ndarray, ...] = (ax, ax.copy(), ax.copy())
+    elif kind == 'schwarzschild':
+        lo = float(r_min) if r_min else 2.0 * max(float(M), 1e-12)
+        hi = float(r_max) if r_max else 1e4 * max(float(M), 1.0)
+        log_r = np.linspace(np.log(lo), np.log(hi), radial_points)
+        pts = np.zeros((radial_points, 3))
+        pts[:, 0] = np.exp(log_r)
+        values = _direct(kind, M, a, pts)
+        axes = (log_r,)
+        r_core = 0.0
+    else:
+        raise ValueError(f"Unsupported object kind for constitutive grid: {kind}")
+    return ConstitutiveGrid(
+        kind=kind,
+        M=float(M),
+        a=float(a),
+        center=tuple(float(c) for c in center),
+        axes=axes,
+        values=values,
+        r_core=r_core,
+    )
+
+
+def grid_key(
+    kind: str, M: float, a: float = 0.0, center: tuple[float, float, float] = (0.0, 0.0, 0.0)
+) -> str:
+    """Stable cache key for an object's grid."""
+    # 'v' is bumped whenever the tabulated tensors change so stale grids on disk are not reused
+    payload = {
+        'v': 3, 'kind': kind, 'M': float(M), 'a': float(a) if kind == 'kerr' else 0.0,
+        'center': [float(c) for c in center],
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ConstitutiveGridCache:
+    """Two-tier (memory + disk) LRU cache of ConstitutiveGrids keyed by (kind, M, a, center)."""
+
+    def __init__(self, root: Path, max_bytes: int = 256 * 1024 * 1024, max_loaded: int = 8) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.max_loaded = int(max_loaded)
+        self._loaded: OrderedDict[str, ConstitutiveGrid] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.npz"
+
+    def _save(self, key: str, grid: ConstitutiveGrid) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        # unique temp name: several worker processes may build the same grid concurrently
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npz")
+        np.savez(
+            tmp,
+            meta=np.array(json.dumps({
+                'kind': grid.kind, 'M': grid.M, 'a': grid.a, 'center': list(grid.center),
+                'r_core': grid.r_core,
+            })),
+            values=grid.values,
+            **{f'axis{i}': ax for i, ax in enumerate(grid.axes)},
+        )
+        os.replace(tmp, path)
+        self.evict(keep=key)
+
+    def _load(self, key: str) -> ConstitutiveGrid | None:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data['meta']))
+                n_axes = sum(1 for name in data.files if name.startswith('axis'))
+                axes = tuple(data[f'axis{i}'] for i in range(n_axes))
+                values = data['values']
+        except Exception:
+            path.unlink(missing_ok=True)
+            return None
+        # mark as recently used for the on-disk LRU
+        os.utime(path, None)
+        return ConstitutiveGrid(
+            kind=meta['kind'],
+            M=meta['M'],
+            a=meta['a'],
+            center=tuple(meta['center']),
+            axes=axes,
+            values=values,
+            r_core=meta.get('r_core', 0.0),
+        )
+
+    def get(
+        self,
+        kind: str,
+        M: float,
+        a: float = 0.0,
+        center: tuple[float, float, float] = (0.0, 0.0, 0.0),
+    ) -> ConstitutiveGrid:
+        """Return the grid for an object, loading it from disk or building it on a miss."""
+        key = grid_key(kind, M, a, center)
+        with self._lock:
+            grid = self._loaded.get(key)
+            if grid is not None:
+                self._loaded.move_to_end(key)
+                return grid
+            grid = self._load(key)
+            if grid is None:
+                grid = build_grid(kind, M, a, center)
+                self._save(key, grid)
+            self._loaded[key] = grid
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+            return grid
+
+    def query(
+        self,
+        kind: str,
+        M: float,
+        a: float,
+        center: tuple[float, float, float],
+        points: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Tensors at absolute points (N, 3); returns four (N, 3, 3) arrays (eps, mu, xi, zeta)."""
+        grid = self.get(kind, M, a, center)
+        pts = np.atleast_2d(np.asarray(points, dtype=float)) - np.asarray(grid.center)
+        values, inside = grid.interpolate(pts)
+        if not inside.all():
+            values[~inside] = _direct(kind, M, a, pts[~inside])
+        return values[:, 0], values[:, 1], values[:, 2], values[:, 3]
+
+    def evict(self, keep: str | None = None) -> None:
+        """Delete least-recently-used grid files (but `keep`) until the directory fits max_bytes."""
+        if not self.root.exists():
+            return
+        entries = []
+        total = 0
+        for p in self.root.glob('*.npz'):
+            if p.name.endswith('.tmp.npz'):
+                continue
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                # removed by another process sharing the directory
+                continue
+            total += st.st_size
+            if p.stem != keep:
+                entries.append((st.st_mtime, st.st_size, p))
+        entries.sort(key=lambda e: e[0])
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            self._loaded.pop(path.stem, None)
+            total -= size
+
+
+_CACHES: dict[str, ConstitutiveGridCache] = {}
+
+
+def get_grid_cache(data_dir: Path, max_bytes: int = 256 * 1024 * 1024) -> ConstitutiveGridCache:
+    """Return the process-wide grid cache rooted at data_dir/ulf/grids."""
+    root = Path(data_dir) / 'ulf' / 'grids'
+    cache = _CACHES.get(str(root))
+    if cache is None:
+        cache = ConstitutiveGridCache(root, max_bytes=max_bytes)
+        _CACHES[str(root)] = cache
+    cache.max_bytes = int(max_bytes)
+    return cache
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import re
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+# Status index for background ULF trace jobs.
+#
+# Every job has its own small status file (<root>/<job_id>.status.json) that is replaced atomically,
+# so polling a job is a single file read regardless of how many jobs exist. Read-modify-write
+# transitions (e.g. marking one shard done while another worker finishes) hold an exclusive flock on
+# a per-job lock file, which serializes updates across threads and processes for that job only.
+
+_JOB_ID_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+LEGACY_INDEX_NAME = 'jobs_index.json'
+
+
+class TraceJobIndex:
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def _status_path(self, job_id: str) -> Path:
+        if not _JOB_ID_RE.match(job_id):
+            raise KeyError(job_id)
+        return self.root / f"{job_id}.status.json"
+
+    @contextmanager
+    def _locked(self, job_id: str) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / f"{job_id}.lock", 'a') as lf:
+            fcntl.flock(lf, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lf, fcntl.LOCK_UN)
+
+    def _write(self, path: Path, info: dict) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(info))
+        os.replace(tmp, path)
+
+    def get(self, job_id: str) -> dict | None:
+        """Return a job's status dict, or None if unknown."""
+        try:
+            path = self._status_path(job_id)
+        except KeyError:
+            return None
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return self._legacy_get(job_id)
+        except ValueError:
+            return None
+
+    def _legacy_get(self, job_id: str) -> dict | None:
+        # Jobs started before per-job status files were recorded in a single shared index.
+        legacy = self.root / LEGACY_INDEX_NAME
+        if not legacy.exists():
+            return None
+        try:
+            return json.loads(legacy.read_text()).get(job_id)
+        except Exception:
+            return None
+
+    def create(self, job_id: str, info: dict) -> None:
+        path = self._status_path(job_id)
+        with self._locked(job_id):
+            self._write(path, info)
+
+    def update(
+        self, job_id: str, fn: Callable[[dict], None] | None = None, **fields
+    ) -> dict | None:
+        """Atomically apply `fields` (and/or `fn`, mutating the dict in place) to a job's status."""
+        path = self._status_path(job_id)
+        with self._locked(job_id):
+            try:
+                info = json.loads(path.read_text())
+            except (FileNotFoundError, ValueError):
+                return None
+            info.update(fields)
+            if fn is not None:
+                fn(info)
+            self._write(path, info)
+            return info
+
+    def mark_shard(self, job_id: str, index: int, state: str) -> dict | None:
+        def _apply(info: dict) -> None:
+            info['shards'][index] = state
+            info['shards_done'] = sum(1 for st in info['shards'] if st == 'done')
+
+        return self.update(job_id, _apply)
+
+
+_INDEXES: dict[str, TraceJobIndex] = {}
+
+
+def get_job_index(data_dir: Path) -> TraceJobIndex:
+    """Return the process-wide job index rooted at data_dir/ulf/jobs."""
+    root = Path(data_dir) / 'ulf' / 'jobs'
+    index = _INDEXES.get(str(root))
+    if index is None:
+        index = TraceJobIndex(root)
+        _INDEXES[str(root)] = index
+    return index
@@ -15,10 +15,8 @@ def kerr_metric_cartesian(x: float, y: float, z: float, M: float, a: float) -> n
     """
     # convert to numpy arrays
     r = _solve_r(x, y, z, a)
-    # compute coordinates
-    rho2 = r * r + a * a * (z * z) / (r * r + a * a)
-    # compute H and k_mu
-    denom = r * r + a * a * (z * z) / (r * r + a * a)
+    # compute H = M r^3 / (r^4 + a^2 z^2) and k_mu
+    denom = r * r + (a * a * (z * z) / (r * r) if r != 0 else 0.0)
     if denom == 0:
         denom = 1e-12
     H = M * r / denom
@@ -56,3 +54,32 @@ def _solve_r(x: float, y: float, z: float, a: float) -> float:
     if u < 0:
         u = 0.0
     return math.sqrt(u)
+
+
+def kerr_metric_cartesian_batch(
+    x: np.ndarray, y: np.ndarray, z: np.ndarray, M: float, a: float
+) -> np.ndarray:
+    """Vectorized `kerr_metric_cartesian` over coordinate arrays, returning shape (N, 4, 4)."""
+    x, y, z = np.broadcast_arrays(*(np.atleast_1d(np.asarray(c, dtype=float)) for c in (x, y, z)))
+    r = _solve_r_batch(x, y, z, a)
+    r2a2 = r * r + a * a
+    safe_r = np.where(r != 0, r, 1.0)
+    denom = r * r + np.where(r != 0, a * a * (z * z) / (safe_r * safe_r), 0.0)
+    denom = np.where(denom == 0, 1e-12, denom)
+    H = M * r / denom
+    k = np.stack([
+        np.ones_like(r),
+        (r * x + a * y) / r2a2,
+        (r * y - a * x) / r2a2,
+        np.where(r != 0, z / safe_r, 0.0),
+    ], axis=-1)
+    eta = np.diag([-1.0, 1.0, 1.0, 1.0])
+    return eta + 2.0 * H[..., None, None] * k[..., :, None] * k[..., None, :]
+
+
+def _solve_r_batch(x: np.ndarray, y: np.ndarray, z: np.ndarray, a: float) -> np.ndarray:
+    """Vectorized `_solve_r`: positive root of r^4 - (x^2 + y^2 + z^2 - a^2) r^2 - a^2 z^2 = 0."""
+    s = x * x + y * y + z * z - a * a
+    disc = np.maximum(s * s + 4.0 * a * a * z * z, 0.0)
+    u = np.maximum((s + np.sqrt(disc)) / 2.0, 0.0)
+    return np.sqrt(u)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+
+# Compact trace result format.
+#
+# A trace result is a list of rays; each ray has S_i points and optionally S_i metric samples.
+# Packed, all rays are concatenated into flat float32 arrays:
+#   offsets        (n_rays + 1,) int64  ray i owns points[offsets[i]:offsets[i+1]]
+#   metric_offsets (n_rays + 1,) int64  ray i owns r/eps/...[metric_offsets[i]:metric_offsets[i+1]]
+#                                       (an empty range for rays without metric samples)
+#   points            (T, 3)     float32
+#   r                 (Tm,)      float32
+#   eps, mu, xi, zeta (Tm, 3, 3) float32 (NaN for tensors a sample did not include)
+# The same arrays are stored as .npz in the job directory and sent as application/octet-stream:
+#   MAGIC | uint32 header length | JSON header | data
+# where the header is {"fields": [{name, dtype, shape, offset, nbytes}]} and every field starts on
+# an 8-byte boundary of the data section (little endian).
+
+MAGIC = b'SSULFTR1'
+MEDIA_TYPE = 'application/octet-stream'
+TENSOR_FIELDS = ('eps', 'mu', 'xi', 'zeta')
+FIELDS = ('offsets', 'metric_offsets', 'points', 'r') + TENSOR_FIELDS
+
+
+def pack_rays(rays: list[dict]) -> dict:
+    """Pack per-ray arrays ({'points': (S, 3), 'r': (S,) | None, 'eps'...: (S, 3, 3) | None})."""
+    offsets = np.zeros(len(rays) + 1, dtype=np.int64)
+    np.cumsum([len(ray['points']) for ray in rays], out=offsets[1:])
+    metric_offsets = np.zeros(len(rays) + 1, dtype=np.int64)
+    np.cumsum(
+        [len(ray['r']) if ray.get('r') is not None else 0 for ray in rays], out=metric_offsets[1:]
+    )
+    out = {
+        'offsets': offsets,
+        'metric_offsets': metric_offsets,
+        'points': np.zeros((int(offsets[-1]), 3), dtype=np.float32),
+        'r': np.zeros(int(metric_offsets[-1]), dtype=np.float32),
+    }
+    for name in TENSOR_FIELDS:
+        out[name] = np.full((int(metric_offsets[-1]), 3, 3), np.nan, dtype=np.float32)
+    for i, ray in enumerate(rays):
+        points = np.asarray(ray['points'], dtype=float).reshape(-1, 3)
+        out['points'][offsets[i]:offsets[i + 1]] = points
+        if ray.get('r') is not None:
+            sl = slice(metric_offsets[i], metric_offsets[i + 1])
+            out['r'][sl] = ray['r']
+            for name in TENSOR_FIELDS:
+                out[name][sl] = ray[name]
+    return out
+
+
+def concat_packed(parts: list[dict]) -> dict:
+    """Join packed results (e.g. the shards of a trace job) into one, keeping ray order."""
+    out = {}
+    for name in ('offsets', 'metric_offsets'):
+        merged = [np.zeros(1, dtype=np.int64)]
+        base = 0
+        for part in parts:
+            merged.append(np.asarray(part[name][1:], dtype=np.int64) + base)
+            base += int(part[name][-1])
+        out[name] = np.concatenate(merged)
+    for name in FIELDS[2:]:
+        out[name] = np.concatenate([part[name] for part in parts])
+    return out
+
+
+def pack_traces(traces: list[dict]) -> dict:
+    """Pack JSON-style trace dicts ({'points': [{x, y, z}], 'metric_samples': [...] | None})."""
+    rays = []
+    for t in traces:
+        ray = {'points': [[p['x'], p['y'], p.get('z') or 0.0] for p in t['points']]}
+        ms = t.get('metric_samples')
+        if ms:
+            ray['r'] = [m['r'] for m in ms]
+            for name in TENSOR_FIELDS:
+                ray[name] = [
+                    m[name] if m.get(name) is not None else np.full((3, 3), np.nan) for m in ms
+                ]
+        rays.append(ray)
+    return pack_rays(rays)
+
+
+def _header(packed: dict) -> tuple[bytes, list]:
+    fields = []
+    offset = 0
+    for name in FIELDS:
+        arr = np.ascontiguousarray(packed[name])
+        fields.append({
+            'name': name, 'dtype': arr.dtype.newbyteorder('<').str, 'shape': list(arr.shape),
+            'offset': offset, 'nbytes': int(arr.nbytes),
+        })
+        offset += -(-arr.nbytes // 8) * 8
+    header = json.dumps({'fields': fields}).encode('utf-8')
+    return MAGIC + struct.pack('<I', len(header)) + header, fields
+
+
+def iter_binary(packed: dict, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    """Yield the octet-stream encoding of `packed` in chunks of at most `chunk_size` bytes."""
+    head, fields = _header(packed)
+    yield head
+    for field in fields:
+        data = memoryview(
+            np.ascontiguousarray(packed[field['name']]).astype(field['dtype'], copy=False)
+        ).cast('B')
+        for start in range(0, len(data), chunk_size):
+            yield bytes(data[start:start + chunk_size])
+        pad = -len(data) % 8
+        if pad:
+            yield b'\0' * pad
+
+
+def encode_binary(packed: dict) -> bytes:
+    return b''.join(iter_binary(packed))
+
+
+def decode_binary(buf: bytes) -> dict:
+    """Inverse of `encode_binary`."""
+    if buf[:len(MAGIC)] != MAGIC:
+        raise ValueError('not a packed ULF trace result')
+    (hlen,) = struct.unpack_from('<I', buf, len(MAGIC))
+    start = len(MAGIC) + 4
+    header = json.loads(buf[start:start + hlen].decode('utf-8'))
+    data = start + hlen
+    out = {}
+    for field in header['fields']:
+        lo = data + field['offset']
+        arr = np.frombuffer(buf[lo:lo + field['nbytes']], dtype=np.dtype(field['dtype']))
+        out[field['name']] = arr.reshape(field['shape'])
+    return out
+
+
+def write_npz(path: Path, packed: dict) -> None:
+    """Atomically write packed arrays to an uncompressed .npz file."""
+    path = Path(path)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez(tmp, **packed)
+    os.replace(tmp, path)
+
+
+def read_npz(path: Path) -> dict:
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
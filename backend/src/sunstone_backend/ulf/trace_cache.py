@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Content-addressed cache of traced rays.
+#
+# A ray only depends on its source, the objects that influence it (the lensing object and any
+# obstacles) and the integration settings, so each ray is cached under a hash of exactly those
+# inputs: editing one source or an unrelated object leaves every other ray's key unchanged.
+# Entries live in an in-memory LRU bounded by bytes and in .npz files under data_dir/ulf/cache,
+# which are shared between processes (API and trace pool workers) and evicted least-recently-used.
+
+# bump when traced rays change for the same inputs so stale entries are not served
+CACHE_VERSION = 1
+
+
+def ray_key(**parts: Any) -> str:
+    """Stable key for a ray from JSON-serializable inputs."""
+    payload = json.dumps({'v': CACHE_VERSION, **parts}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _nbytes(ray: dict) -> int:
+    return int(sum(v.nbytes for v in ray.values()))
+
+
+class TraceCache:
+    def __init__(
+        self, root: Path, max_bytes: int = 512 * 1024 * 1024, memory_bytes: int = 64 * 1024 * 1024
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.memory_bytes = int(memory_bytes)
+        self._mem: OrderedDict[str, dict] = OrderedDict()
+        self._mem_size = 0
+        self._since_evict = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.npz"
+
+    def _remember(self, key: str, ray: dict) -> None:
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            return
+        self._mem[key] = ray
+        self._mem_size += _nbytes(ray)
+        while self._mem_size > self.memory_bytes and len(self._mem) > 1:
+            _, old = self._mem.popitem(last=False)
+            self._mem_size -= _nbytes(old)
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            ray = self._mem.get(key)
+            if ray is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return ray
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                ray = {name: data[name] for name in data.files}
+            os.utime(path, None)
+        except (FileNotFoundError, OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, ray)
+        return ray
+
+    def put(self, key: str, ray: dict) -> None:
+        # copy: engines hand in slices of whole-batch arrays, and a cached view would keep the
+        # entire batch alive while only its own bytes count against memory_bytes
+        ray = {name: np.array(value, copy=True) for name, value in ray.items() if value is not None}
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp.npz")
+        np.savez(tmp, **ray)
+        os.replace(tmp, path)
+        with self._lock:
+            self._remember(key, ray)
+            # scanning the disk tier is O(entries); do it once per max_bytes // 16 bytes stored
+            self._since_evict += _nbytes(ray)
+            due = self._since_evict > self.max_bytes // 16
+            if due:
+                self._since_evict = 0
+        if due:
+            self.evict()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'memory_entries': len(self._mem),
+                'memory_bytes': self._mem_size,
+            }
+
+    def disk_usage(self) -> tuple[int, int]:
+        """(number of entries, bytes) on disk."""
+        if not self.root.exists():
+            return 0, 0
+        files = [p for p in self.root.glob('*/*.npz') if not p.name.endswith('.tmp.npz')]
+        total = 0
+        for p in files:
+            try:
+                total += p.stat().st_size
+            except FileNotFoundError:
+                continue
+        return len(files), total
+
+    def evict(self) -> int:
+        """Delete least-recently-used entries until the disk tier fits in `max_bytes`.
+
+        Returns the number of entries removed.
+        """
+        if not self.root.exists():
+            return 0
+        entries = []
+        total = 0
+        for p in self.root.glob('*/*.npz'):
+            if p.name.endswith('.tmp.npz'):
+                continue
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            total += st.st_size
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort(key=lambda e: e[0])
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._mem.clear()
+            self._mem_size = 0
+            self.hits = self.memory_hits = self.disk_hits = self.misses = 0
+        if self.root.exists():
+            for p in self.root.glob('*/*.npz'):
+                p.unlink(missing_ok=True)
+
+
+_CACHES: dict[str, TraceCache] = {}
+
+
+def get_trace_cache(
+    data_dir: Path, max_bytes: int = 512 * 1024 * 1024, memory_bytes: int = 64 * 1024 * 1024
+) -> TraceCache:
+    """Return the process-wide trace cache rooted at data_dir/ulf/cache."""
+    root = Path(data_dir) / 'ulf' / 'cache'
+    cache = _CACHES.get(str(root))
+    if cache is None:
+        cache = TraceCache(root, max_bytes=max_bytes, memory_bytes=memory_bytes)
+        _CACHES[str(root)] = cache
+    cache.max_bytes = int(max_bytes)
+    cache.memory_bytes = int(memory_bytes)
+    return cache
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """Split an RFC 6901 JSON pointer ("/sources/0/frequency") into unescaped tokens."""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise ValueError(f"JSON pointer must start with '/': {pointer!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def set_pointer(doc, pointer: str | list[str], value) -> None:
+    """Set the value at `pointer` inside doc in place.
+
+    Intermediate objects and lists must already exist; the last token may add a new object key,
+    or append to a list when it is "-" (or the list's length).
+    """
+    tokens = parse_pointer(pointer) if isinstance(pointer, str) else pointer
+    if not tokens:
+        raise ValueError("cannot replace the whole document")
+    target = doc
+    for token in tokens[:-1]:
+        target = _child(target, token)
+    last = tokens[-1]
+    if isinstance(target, dict):
+        target[last] = value
+    elif isinstance(target, list):
+        index = len(target) if last == "-" else _index(last)
+        if index == len(target):
+            target.append(value)
+        elif index < len(target):
+            target[index] = value
+        else:
+            raise ValueError(f"list index {index} out of range")
+    else:
+        raise ValueError(f"cannot set {last!r} on a {type(target).__name__}")
+
+
+def _child(node, token: str):
+    if isinstance(node, dict):
+        if token not in node:
+            raise ValueError(f"no member {token!r}")
+        return node[token]
+    if isinstance(node, list):
+        index = _index(token)
+        if index >= len(node):
+            raise ValueError(f"list index {index} out of range")
+        return node[index]
+    raise ValueError(f"cannot descend into a {type(node).__name__} with {token!r}")
+
+
+def _index(token: str) -> int:
+    # RFC 6901: decimal digits without leading zeros
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise ValueError(f"invalid list index {token!r}")
+    return int(token)
@@ -12,12 +12,18 @@ except Exception:
     _HAS_GPU = False
 
 
-def _aggregate_process_tree(proc: psutil.Process):
-    """Aggregate cpu and memory across a process and its children."""
+def _aggregate_process_tree(proc: psutil.Process, known: dict | None = None):
+    """Aggregate cpu and memory across a process and its children.
+
+    `known` (pid -> Process) keeps the Process objects between samples: cpu_percent measures
+    from the previous call on the same object, so a fresh object always reports 0.
+    """
     cpu = proc.cpu_percent(interval=None)
     mem = proc.memory_info().rss
     for child in proc.children(recursive=True):
         try:
+            if known is not None:
+                child = known.setdefault(child.pid, child)
             cpu += child.cpu_percent(interval=None)
             mem += child.memory_info().rss
         except Exception:
@@ -25,16 +31,35 @@ def _aggregate_process_tree(proc: psutil.Process):
     return cpu, mem
 
 
-def monitor_resources(run_dir: Path, interval: float = 1.0):
+def _rank_processes(process: psutil.Process, ranks: int) -> list[psutil.Process]:
+    """This worker and, for an MPI run (ranks > 1), the other ranks on this host.
+
+    The local ranks are the children of the launcher (mpirun, or the per-host proxy/daemon of
+    multi-node launchers) that started this process, i.e. its siblings.
+    """
+    if ranks <= 1:
+        return [process]
+    try:
+        parent = process.parent()
+        siblings = parent.children() if parent is not None else []
+    except psutil.Error:
+        siblings = []
+    return siblings if any(p.pid == process.pid for p in siblings) else [process]
+
+
+def monitor_resources(run_dir: Path, interval: float = 1.0, ranks: int = 1):
     """Background thread to monitor and log resource usage.
 
-    Writes a rolling window of the most recent samples to runtime/resource.json (max 200).
+    Writes a rolling window of the most recent samples to runtime/resource.json (max 200). For an
+    MPI run of `ranks` processes, process cpu, memory and threads are summed over the ranks running
+    on this host ("mpi_ranks" counts them); ranks on other nodes are not visible from here.
     """
     import logging
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger("resource_monitor")
     resource_path = run_dir / "runtime" / "resource.json"
     process = psutil.Process()
+    known: dict[int, psutil.Process] = {process.pid: process}
     samples = []
     logger.info(f"[ResourceMonitor] Starting resource monitor thread for {run_dir}")
     # Prime CPU counters
@@ -45,12 +70,22 @@ def monitor_resources(run_dir: Path, interval: float = 1.0):
         try:
             cpu_system = psutil.cpu_percent(interval=None)
             cpu_per_core = psutil.cpu_percent(interval=None, percpu=True)
-            proc_cpu, proc_mem = _aggregate_process_tree(process)
+            rank_procs = [known.setdefault(p.pid, p) for p in _rank_processes(process, ranks)]
+            proc_cpu, proc_mem, threads = 0.0, 0, 0
+            for proc in rank_procs:
+                try:
+                    cpu, mem = _aggregate_process_tree(proc, known)
+                    proc_cpu += cpu
+                    proc_mem += mem
+                    threads += proc.num_threads()
+                except psutil.Error:
+                    continue
+            for pid in [pid for pid, p in known.items() if not p.is_running()]:
+                del known[pid]
             mem_total = psutil.virtual_memory().total
             mem_available = psutil.virtual_memory().available
             io_counters = psutil.disk_io_counters()
             net_counters = psutil.net_io_counters()
-            threads = process.num_threads()
             open_files = len(process.open_files())
 
             gpu_info = None
@@ -84,6 +119,7 @@ def monitor_resources(run_dir: Path, interval: float = 1.0):
                 "net_bytes_sent": getattr(net_counters, "bytes_sent", None),
                 "net_bytes_recv": getattr(net_counters, "bytes_recv", None),
                 "threads": threads,
+                "mpi_ranks": len(rank_procs),
                 "open_files": open_files,
                 "gpus": gpu_info,
             }
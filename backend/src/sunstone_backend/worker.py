@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import contextlib
+import os
 from pathlib import Path
 
 import typer
 
+from . import mpi
 from .backends.registry import get_backend
+from .catalog import update_status_for_run_dir
+from .checkpoint import RESUME_FILE, RunPaused
 from .models.run import RunStatus, StatusFile
+from .result_cache import detach_outputs, record_for_run_dir
 
 from .util.time import utc_now_iso
 from .util.resource_monitor import monitor_resources
@@ -17,7 +23,21 @@ app = typer.Typer(add_completion=False)
 def _write_status(run_dir: Path, status: RunStatus, detail: str | None = None) -> None:
     status_path = run_dir / "runtime" / "status.json"
     obj = StatusFile(status=status, updated_at=utc_now_iso(), detail=detail)
-    status_path.write_text(obj.model_dump_json(indent=2))
+    # replace rather than rewrite in place so pollers never read a half-written file
+    tmp_path = status_path.with_name(f".status.json.{os.getpid()}")
+    tmp_path.write_text(obj.model_dump_json(indent=2))
+    os.replace(tmp_path, status_path)
+    # the catalog is only an index; status.json above is authoritative
+    with contextlib.suppress(Exception):
+        update_status_for_run_dir(run_dir, obj)
+
+
+def _current_status(run_dir: Path) -> str | None:
+    try:
+        text = (run_dir / "runtime" / "status.json").read_text()
+        return StatusFile.model_validate_json(text).status
+    except Exception:
+        return None
 
 
 @app.command()
@@ -26,15 +46,35 @@ def main(
     run_dir: Path = typer.Option(..., exists=True, file_okay=False),
     backend: str = "dummy",
 ) -> None:
-    resource_thread = threading.Thread(target=monitor_resources, args=(run_dir,), daemon=True)
+    # Under MPI every rank runs this; rank 0 alone reports status and samples resources (for all
+    # the ranks on its host), the others only take part in the solve.
+    root = mpi.is_root()
+    resource_thread = threading.Thread(
+        target=monitor_resources, args=(run_dir,), kwargs={"ranks": mpi.size()}, daemon=True
+    )
     try:
-        resource_thread.start()
-        _write_status(run_dir, "running")
+        if root:
+            resource_thread.start()
+            resuming = (run_dir / "runtime" / RESUME_FILE).exists()
+            _write_status(
+                run_dir, "running", detail="Resuming from checkpoint" if resuming else None
+            )
+            # outputs of an earlier attempt may be shared with the result cache: never write to them
+            detach_outputs(run_dir, resuming=resuming)
         be = get_backend(backend)
         be.run(run_dir)
-        _write_status(run_dir, "succeeded")
+        if root:
+            _write_status(run_dir, "succeeded")
+            # a run that cannot be cached still succeeded
+            with contextlib.suppress(Exception):
+                record_for_run_dir(run_dir)
+    except RunPaused as e:
+        # checkpointed and stopped on request; a cancel that arrived as SIGTERM stays canceled
+        if root and _current_status(run_dir) != "canceled":
+            _write_status(run_dir, "paused", detail=str(e))
     except Exception as e:
-        _write_status(run_dir, "failed", detail=str(e))
+        if root:
+            _write_status(run_dir, "failed", detail=str(e))
         raise
     finally:
         # The thread is daemon, so it will exit when the process exits
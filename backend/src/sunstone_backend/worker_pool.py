@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import select
+import signal
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+
+import psutil
+import typer
+
+logger = logging.getLogger(__name__)
+
+# Warm worker pool for local runs.
+#
+# Starting a worker costs an interpreter, typer, the backend registry (numpy, zarr and every backend
+# module) and often the solver itself (`import meep` takes seconds), which dominates short runs. For
+# each (python_executable, backend) the API keeps one long-lived process that has already done all
+# of that. It reads run directories as JSON lines on stdin and forks a child per run, so every run
+# still gets its own process, session (cancel kills its group), working directory and log files, and
+# reports the child pid back on stdout. A warm process retires after `max_runs` forks or once its
+# own RSS has grown by `max_rss_growth` bytes, and the pool starts a replacement straight away.
+# Until a warm process is ready, submits fall back to the usual cold worker start.
+
+app = typer.Typer(add_completion=False)
+
+
+# replies to the pool; stdout goes to stderr so stray prints (meep's banner) cannot corrupt them
+_reply = None
+
+
+def _send(obj: dict) -> None:
+    _reply.write(json.dumps(obj) + "\n")
+    _reply.flush()
+
+
+def _rss() -> int:
+    return psutil.Process().memory_info().rss
+
+
+def _fork_run(run_dir: Path, backend: str, worker_main) -> int:
+    sys.stdout.flush()
+    sys.stderr.flush()
+    # the pid is only reported once the child leads its own session, so a cancel can kill the group
+    started_r, started_w = os.pipe()
+    pid = os.fork()
+    if pid:
+        os.close(started_w)
+        os.read(started_r, 1)
+        os.close(started_r)
+        return pid
+    code = 0
+    try:
+        os.close(started_r)
+        os.setsid()
+        os.write(started_w, b"1")
+        os.close(started_w)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        os.close(_reply.fileno())
+        logs_dir = run_dir / "logs"
+        logs_dir.mkdir(parents=True, exist_ok=True)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        os.dup2(os.open(os.devnull, os.O_RDONLY), 0)
+        os.dup2(os.open(logs_dir / "stdout.log", flags, 0o644), 1)
+        os.dup2(os.open(logs_dir / "stderr.log", flags, 0o644), 2)
+        os.chdir(run_dir)
+        worker_main(run_dir=run_dir, backend=backend)
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+@app.command()
+def serve(
+    backend: str = typer.Option(...),
+    max_runs: int = typer.Option(100),
+    max_rss_growth: int = typer.Option(256 * 1024 * 1024),
+) -> None:
+    """Pre-import `backend`, then fork one worker per run directory received on stdin."""
+    global _reply
+    sys.stdout.flush()
+    _reply = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+    from .backends.registry import get_backend
+    from .worker import main as worker_main
+
+    get_backend(backend).preload()
+    # children are never waited on here; let the kernel reap them
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    baseline = _rss()
+    _send({"ready": True, "pid": os.getpid()})
+    runs = 0
+    for line in sys.stdin:
+        try:
+            req = json.loads(line)
+            pid = _fork_run(Path(req["run_dir"]), backend, worker_main)
+        except Exception as e:
+            _send({"error": str(e)})
+            continue
+        runs += 1
+        retire = runs >= max_runs or (max_rss_growth > 0 and _rss() - baseline > max_rss_growth)
+        _send({"pid": pid, "retire": retire})
+        if retire:
+            break
+
+
+class _WarmWorker:
+    def __init__(self, proc: subprocess.Popen) -> None:
+        self.proc = proc
+        self.ready = threading.Event()
+        self.lock = threading.Lock()
+        # bytes read from stdout past the last complete reply line
+        self.buf = b""
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def close(self) -> None:
+        try:
+            if self.proc.stdin:
+                self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class WorkerPool:
+    def __init__(
+        self,
+        max_runs: int = 100,
+        max_rss_growth: int = 256 * 1024 * 1024,
+        ready_timeout: float = 300.0,
+        reply_timeout: float = 10.0,
+    ) -> None:
+        self.max_runs = max_runs
+        self.max_rss_growth = max_rss_growth
+        self.ready_timeout = ready_timeout
+        self.reply_timeout = reply_timeout
+        self.retry_after = 60.0
+        self._workers: dict[tuple[str, str], _WarmWorker] = {}
+        self._failed: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def _spawn(self, python: str, backend: str) -> _WarmWorker:
+        cmd = [
+            python,
+            "-m",
+            "sunstone_backend.worker_pool",
+            "--backend",
+            backend,
+            "--max-runs",
+            str(self.max_runs),
+            "--max-rss-growth",
+            str(self.max_rss_growth),
+        ]
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+            start_new_session=True,
+        )
+        worker = _WarmWorker(proc)
+
+        def wait_ready() -> None:
+            try:
+                line = self._readline(worker, self.ready_timeout)
+                ready = bool(line and json.loads(line).get("ready"))
+            except Exception:
+                logger.exception("Warm worker for %s (%s) could not be read", backend, python)
+                ready = False
+            if ready:
+                worker.ready.set()
+                return
+            logger.warning("Warm worker for %s (%s) failed to start", backend, python)
+            with self._lock:
+                self._failed[(python, backend)] = time.monotonic()
+            try:
+                self._discard((python, backend), worker)
+            except Exception:
+                logger.exception("Could not stop warm worker for %s (%s)", backend, python)
+
+        threading.Thread(target=wait_ready, name=f"sunstone-warm-{backend}", daemon=True).start()
+        return worker
+
+    @staticmethod
+    def _readline(worker: _WarmWorker, timeout: float) -> str | None:
+        """Next reply line from the worker, or None on timeout or EOF.
+
+        Reads the raw pipe and splits lines here: select() on a buffered file object would not see a
+        second reply already sitting in its buffer and would time out waiting for it.
+        """
+        stdout = worker.proc.stdout
+        if stdout is None:
+            return None
+        fd = stdout.fileno()
+        deadline = time.monotonic() + timeout
+        while b"\n" not in worker.buf:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                return None
+            worker.buf += chunk
+        line, _, worker.buf = worker.buf.partition(b"\n")
+        return line.decode()
+
+    def _discard(self, key: tuple[str, str], worker: _WarmWorker) -> None:
+        with self._lock:
+            if self._workers.get(key) is worker:
+                del self._workers[key]
+        if worker.alive():
+            worker.proc.kill()
+            worker.proc.wait()
+
+    def warm(self, python: str, backend: str) -> _WarmWorker | None:
+        """Start a warm worker for (python, backend) in the background unless one is already up.
+
+        Returns None while a recent start for the same key has failed (e.g. an interpreter without
+        sunstone_backend installed), so such runs keep using cold starts without respawning each
+        time.
+        """
+        key = (python, backend)
+        with self._lock:
+            worker = self._workers.get(key)
+            if worker is None or not worker.alive():
+                failed_at = self._failed.get(key)
+                if failed_at is not None and time.monotonic() - failed_at < self.retry_after:
+                    return None
+                worker = self._spawn(python, backend)
+                self._workers[key] = worker
+            return worker
+
+    def submit(self, python: str, backend: str, run_dir: Path) -> int | None:
+        """Fork a run from the warm worker and return its pid, or None if no worker is ready yet."""
+        key = (python, backend)
+        worker = self.warm(python, backend)
+        if worker is None or not worker.ready.is_set():
+            return None
+        with worker.lock:
+            try:
+                assert worker.proc.stdin is not None
+                worker.proc.stdin.write((json.dumps({"run_dir": str(run_dir)}) + "\n").encode())
+                worker.proc.stdin.flush()
+                line = self._readline(worker, self.reply_timeout)
+                reply = json.loads(line) if line is not None else None
+            except (OSError, ValueError):
+                reply = None
+            if not isinstance(reply, dict):
+                self._discard(key, worker)
+                return None
+        if reply.get("retire"):
+            with self._lock:
+                if self._workers.get(key) is worker:
+                    del self._workers[key]
+            threading.Thread(target=worker.close, daemon=True).start()
+            self.warm(python, backend)
+        if "error" in reply:
+            raise RuntimeError(f"warm worker could not start run: {reply['error']}")
+        return int(reply["pid"])
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    "python": py,
+                    "backend": be,
+                    "pid": w.proc.pid,
+                    "ready": w.ready.is_set(),
+                    "alive": w.alive(),
+                }
+                for (py, be), w in self._workers.items()
+            ]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            worker.close()
+
+
+_POOL: WorkerPool | None = None
+
+
+def get_worker_pool(settings) -> WorkerPool | None:
+    """Return the process-wide warm worker pool, or None when `local_worker_pool` is disabled."""
+    global _POOL
+    if not settings.local_worker_pool:
+        return None
+    if _POOL is None:
+        _POOL = WorkerPool()
+    _POOL.max_runs = settings.local_worker_pool_max_runs
+    _POOL.max_rss_growth = settings.local_worker_pool_max_rss_growth_bytes
+    return _POOL
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import signal
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sunstone_backend.backends.dft_monitors import DftMonitorSet, monitor_frequencies
+from sunstone_backend.backends.meep import MeepBackend
+from sunstone_backend.checkpoint import RunPaused, request_resume
+
+F0 = 0.3
+FREQS = [0.1, 0.3, 0.5]
+
+
+def _signal(t, x):
+    return np.cos(2 * math.pi * F0 * t) * (1.0 + x)
+
+
+def _expected(times, x, freqs=FREQS):
+    freqs = np.asarray(freqs)
+    kernel = np.exp(2j * math.pi * np.outer(times, freqs))
+    return (_signal(times, x)[:, None] * kernel).sum(axis=0) * 0.1 / math.sqrt(2 * math.pi)
+
+
+class StepSim:
+    """Steps time by 0.1 (Courant 1 at resolution 10); point reads only, no DFT fields."""
+
+    Courant = 1.0
+    sigterm_at: float | None = None
+
+    def __init__(self, **kwargs) -> None:
+        self.t = 0.0
+        self.reads = 0
+
+    def meep_time(self) -> float:
+        return self.t
+
+    def get_field_point(self, component, pos):
+        if StepSim.sigterm_at is not None and self.t >= StepSim.sigterm_at - 1e-9:
+            StepSim.sigterm_at = None
+            os.kill(os.getpid(), signal.SIGTERM)
+        self.reads += 1
+        return complex(_signal(self.t, pos[0]))
+
+    def dump(self, dirname, dump_structure=True, dump_fields=True) -> None:
+        (Path(dirname) / "fields.json").write_text(json.dumps({"t": self.t}))
+
+    def load(self, dirname, load_structure=True, load_fields=True) -> None:
+        self.t = json.loads((Path(dirname) / "fields.json").read_text())["t"]
+
+    def run(self, *step_funcs, until) -> None:
+        StepSim.last = self
+        n = int(round(until / 0.1))
+        start = self.t
+        for i in range(n):
+            for f in step_funcs:
+                f(self)
+            self.t = round(start + (i + 1) * 0.1, 10)
+
+
+class DftSim(StepSim):
+    """As StepSim, plus Meep-style DFT fields with a fixed value per component and frequency."""
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.dft_regions = []
+
+    def add_dft_fields(self, components, freqs, center=None, size=None):
+        self.dft_regions.append((list(components), list(freqs), center))
+        return len(self.dft_regions) - 1
+
+    def get_dft_array(self, obj, component, num_freq):
+        return np.full((1,), (obj + 1) * (num_freq + 1j) * (2.0 if component == "Hz" else 1.0))
+
+
+def _fake_meep(monkeypatch, sim_cls) -> None:
+    m = types.ModuleType("meep")
+    m.Simulation = sim_cls
+    m.Vector3 = lambda *a, **k: tuple(a)
+    m.PML = lambda *a, **k: None
+    m.at_every = lambda dt, f: f
+    m.Ez = "Ez"
+    m.Hz = "Hz"
+    monkeypatch.setitem(sys.modules, "meep", m)
+
+
+def _write_spec(run_dir: Path, monitors: list[dict], max_time: float = 4.0) -> None:
+    spec = {
+        "domain": {"cell_size": [2.0, 2.0, 0.0], "resolution": 10},
+        "monitors": monitors,
+        "run_control": {"max_time": max_time, "checkpoint_interval": 0},
+    }
+    (run_dir / "runtime").mkdir(parents=True, exist_ok=True)
+    (run_dir / "spec.json").write_text(json.dumps(spec))
+
+
+def test_monitor_frequencies() -> None:
+    assert monitor_frequencies({"frequencies": [0.2, 0.4]}).tolist() == [0.2, 0.4]
+    assert monitor_frequencies({"fcen": 1.0, "df": 0.5, "nfreq": 3}).tolist() == [0.75, 1.0, 1.25]
+    with pytest.raises(ValueError):
+        monitor_frequencies({"id": "D"})
+
+
+def test_accumulation_picks_out_the_signal_frequency() -> None:
+    dft = DftMonitorSet(["D"], [[0, 0, 0]], ["Ez"], FREQS)
+    times = np.arange(0, 100, 0.1)
+    for t in times:
+        dft.accumulate(t, 0.1, np.array([[_signal(t, 0.0)]]))
+    power = np.abs(dft.current()[0, :, 0])
+    assert power.argmax() == 1
+    np.testing.assert_allclose(power[1], len(times) * 0.1 / 2 / math.sqrt(2 * math.pi), rtol=1e-3)
+
+
+def test_meep_dft_monitor_accumulates_per_step_and_survives_a_pause(
+    tmp_path: Path, monkeypatch
+) -> None:
+    _fake_meep(monkeypatch, StepSim)
+    run_dir = tmp_path / "run"
+    dft = {"type": "dft", "components": ["Ez"], "frequencies": FREQS}
+    monitors = [
+        {**dft, "id": "D0", "position": [0.0, 0.0, 0.0]},
+        {**dft, "id": "D1", "position": [0.5, 0.0, 0.0]},
+    ]
+    _write_spec(run_dir, monitors)
+
+    StepSim.sigterm_at = 1.5
+    with pytest.raises(RunPaused):
+        MeepBackend().run(run_dir)
+    request_resume(run_dir)
+    MeepBackend().run(run_dir)
+
+    times = np.round(np.arange(0, 40) * 0.1, 10)
+    for mon_id, x in (("D0", 0.0), ("D1", 0.5)):
+        data = np.load(run_dir / "outputs" / "spectra" / f"{mon_id}.npz")
+        assert data["dft"].shape == (3, 1) and data["dft"].dtype == np.complex128
+        assert data["freq"].tolist() == FREQS and data["components"].tolist() == ["Ez"]
+        np.testing.assert_allclose(data["dft"][:, 0], _expected(times, x))
+    summary = json.loads((run_dir / "outputs" / "summary.json").read_text())
+    assert summary["spectra"] == ["outputs/spectra/D0.npz", "outputs/spectra/D1.npz"]
+    assert summary["dft_monitors"] == ["D0", "D1"] and summary["monitors"] == []
+    # no time series was stored
+    assert not list((run_dir / "outputs" / "monitors").glob("*.zarr"))
+
+
+def test_meep_dft_monitor_uses_meep_dft_fields(tmp_path: Path, monkeypatch) -> None:
+    _fake_meep(monkeypatch, DftSim)
+    run_dir = tmp_path / "run"
+    monitor = {"type": "dft", "id": "D", "position": [0.3, 0.2, 0.0], "components": ["Ez", "Hz"]}
+    _write_spec(run_dir, [{**monitor, "fcen": 0.3, "df": 0.2, "nfreq": 3}])
+    MeepBackend().run(run_dir)
+
+    sim = DftSim.last
+    assert sim.reads == 0
+    assert sim.dft_regions == [(["Ez", "Hz"], pytest.approx([0.2, 0.3, 0.4]), (0.3, 0.2, 0.0))]
+    data = np.load(run_dir / "outputs" / "spectra" / "D.npz")
+    assert data["dft"].shape == (3, 2)
+    np.testing.assert_allclose(data["dft"][:, 0], [1j, 1 + 1j, 2 + 1j])
+    np.testing.assert_allclose(data["dft"][:, 1], [2j, 2 + 2j, 4 + 2j])
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from sunstone_backend.backends.field_movie import FieldMovieWriter, read_field_movie
+from sunstone_backend.backends.meep import MeepBackend
+from sunstone_backend.checkpoint import RunPaused, request_resume
+
+
+def test_writer_streams_time_chunks_and_publishes_partial_movies(tmp_path: Path) -> None:
+    path = tmp_path / "movie.zarr"
+    writer = FieldMovieWriter(
+        path, ["Ez", "Hz"], chunk_frames=4, flush_interval=3600.0, attrs={"resolution": 10}
+    )
+    writer.open()
+    for i in range(6):
+        writer.append(0.5 * i, {"Ez": np.full((3, 2), i), "Hz": np.full((3, 2), -i)})
+
+    # the full chunk is on disk, the next one only in memory
+    times, arrays, attrs = read_field_movie(path)
+    assert times.tolist() == [0.0, 0.5, 1.0, 1.5]
+    assert attrs["complete"] is False and attrs["resolution"] == 10
+    assert arrays["Ez"].chunks == (4, 3, 2)
+    writer.flush()
+    times, arrays, _ = read_field_movie(path)
+    assert len(times) == 6 and arrays["Hz"][5, 0, 0] == -5
+
+    writer.close()
+    times, arrays, attrs = read_field_movie(path)
+    assert attrs["complete"] is True
+    assert arrays["Ez"][: len(times)][:, 0, 0].tolist() == [0, 1, 2, 3, 4, 5]
+    # never more than one chunk of frames held in memory
+    assert writer._buffers["Ez"].shape[0] == 4
+
+
+def test_writer_resumes_after_a_given_frame(tmp_path: Path) -> None:
+    path = tmp_path / "movie.zarr"
+    writer = FieldMovieWriter(path, ["Ez"], chunk_frames=4)
+    writer.open()
+    for i in range(7):
+        writer.append(float(i), {"Ez": np.full((2, 2), i)})
+    writer.close()
+
+    # a checkpoint was taken after 6 frames; the 7th is recorded again by the resumed run
+    resumed = FieldMovieWriter(path, ["Ez"])
+    resumed.open(frames=6)
+    assert resumed.last_t == 5.0 and read_field_movie(path)[0].tolist() == [0, 1, 2, 3, 4, 5]
+    for i in range(6, 10):
+        resumed.append(float(i), {"Ez": np.full((2, 2), 10 * i)})
+    resumed.close()
+    times, arrays, _ = read_field_movie(path)
+    assert times.tolist() == list(range(10))
+    assert arrays["Ez"][:, 1, 1].tolist() == [0, 1, 2, 3, 4, 5, 60, 70, 80, 90]
+
+
+class MovieSim:
+    sigterm_at: float | None = None
+
+    def __init__(self, **kwargs) -> None:
+        self.t = 0.0
+
+    def meep_time(self) -> float:
+        return self.t
+
+    def get_array(self, component, center, size):
+        if MovieSim.sigterm_at is not None and self.t >= MovieSim.sigterm_at:
+            MovieSim.sigterm_at = None
+            os.kill(os.getpid(), signal.SIGTERM)
+        return np.full((5, 4), self.t)
+
+    def dump(self, dirname, dump_structure=True, dump_fields=True) -> None:
+        (Path(dirname) / "fields.json").write_text(json.dumps({"t": self.t}))
+
+    def load(self, dirname, load_structure=True, load_fields=True) -> None:
+        self.t = json.loads((Path(dirname) / "fields.json").read_text())["t"]
+
+    def run(self, *step_funcs, until) -> None:
+        stop = self.t + until
+        while self.t < stop - 1e-9:
+            for f in step_funcs:
+                f(self)
+            self.t += 1.0
+
+
+def test_meep_movie_streams_to_zarr_across_a_pause(tmp_path: Path, monkeypatch) -> None:
+    m = types.ModuleType("meep")
+    m.Simulation = MovieSim
+    m.Vector3 = lambda *a, **k: tuple(a)
+    m.PML = lambda *a, **k: None
+    m.at_every = lambda dt, f: f
+    m.Ez = "Ez"
+    monkeypatch.setitem(sys.modules, "meep", m)
+
+    spec = {
+        "domain": {"cell_size": [1.0, 1.0, 0.0], "resolution": 4},
+        "outputs": {"field_movie": {"dt": 1.0, "components": ["Ez"], "chunk_frames": 3}},
+        "run_control": {"max_time": 10.0, "checkpoint_interval": 0},
+    }
+    run_dir = tmp_path / "run"
+    (run_dir / "runtime").mkdir(parents=True)
+    (run_dir / "spec.json").write_text(json.dumps(spec))
+
+    MovieSim.sigterm_at = 4.0
+    with pytest.raises(RunPaused):
+        MeepBackend().run(run_dir)
+    movie = run_dir / "outputs" / "fields" / "field_movie.zarr"
+    # the paused run's frames are already viewable
+    assert read_field_movie(movie)[0].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    request_resume(run_dir)
+    MeepBackend().run(run_dir)
+    times, arrays, attrs = read_field_movie(movie)
+    assert times.tolist() == [float(t) for t in range(10)] and attrs["complete"] is True
+    assert arrays["Ez"][:, 0, 0].tolist() == times.tolist()
+    assert not (run_dir / "outputs" / "fields" / "field_movie.npz").exists()
+    summary = json.loads((run_dir / "outputs" / "summary.json").read_text())
+    assert summary["field_movie_frames"] == 10
@@ -23,3 +23,36 @@ def test_schwarzschild_weak_deflection():
     # Compare within factor (numerical crude integrator): assert order-of-magnitude and sign
     assert deflection > 0
     assert abs(deflection - predicted) / max(1e-12, predicted) < 1.5  # allow 150% relative error for crude integrator
+
+
+def test_adaptive_rays_deflection_events_and_dense_output():
+    import numpy as np
+
+    from sunstone_backend.ulf.geodesics import integrate_rays_from_cartesian_adaptive
+
+    M = 0.001
+    b = 1.5
+    xy, r, captured, escaped, hit = integrate_rays_from_cartesian_adaptive(
+        [-50.0, -5.0, -10.0], [b, 0.0, 3.0], [1.0, 1.0, 1.0], [0.0, 0.0, 0.0], M,
+        samples=64, obstacles=[[0.0, 3.0, 0.5]],
+    )
+    assert xy.shape == (3, 64, 2)
+    # ray 0 leaves the domain, ray 1 falls into the hole, ray 2 stops on the obstacle
+    assert escaped[0] and captured[1] and hit[2] == 0
+    assert hit[0] == -1 and hit[1] == -1
+    # by default each ray escapes where u = 1/r drops to half its own initial u0, i.e. at twice
+    # its own starting radius whatever the other rays in the batch start from
+    u0 = 1.0 / np.hypot(50.0, b)
+    assert np.isclose(1.0 / r[0, -1], 0.5 * u0)
+    assert np.isclose(r[1, -1], 2.0 * M)
+    assert np.isclose(np.hypot(xy[2, -1, 0], xy[2, -1, 1] - 3.0), 0.5, atol=1e-6)
+
+    (xa, ya), (xb, yb) = xy[0, -2], xy[0, -1]
+    deflection = -math.atan2(yb - ya, xb - xa)
+    assert abs(deflection - 4.0 * M / b) / (4.0 * M / b) < 0.02
+
+    # output density does not change the trajectory itself
+    xy_fine, _, _, _, _ = integrate_rays_from_cartesian_adaptive(
+        [-50.0], [b], [1.0], [0.0], M, samples=127
+    )
+    assert np.allclose(xy_fine[0, ::2], xy[0], atol=1e-6)
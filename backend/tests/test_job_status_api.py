@@ -26,14 +26,15 @@ def test_job_status_api_reports_remote_running(tmp_path: Path, monkeypatch):
     job = {'pid': 4242, 'ssh_target': 'alice@remote:/tmp/sr', 'mode': 'ssh'}
     (runtime / 'job.json').write_text(json.dumps(job))
 
-    # Monkeypatch SSHJobRunner.check_remote_pid
-    def fake_check(ssh_target, pid, port=None, identity_file=None):
-        assert ssh_target == 'alice@remote:/tmp/sr'
-        assert pid == 4242
-        return True
+    # Monkeypatch SSHJobRunner.check_remote_pids (the SSH status poller probes PIDs per host in
+    # one batch)
+    def fake_check(ssh_target, pids, port=None, identity_file=None):
+        assert ssh_target == 'alice@remote'
+        assert list(pids) == [4242]
+        return {4242: True}
 
     from sunstone_backend.jobs import SSHJobRunner
-    monkeypatch.setattr(SSHJobRunner, 'check_remote_pid', staticmethod(fake_check))
+    monkeypatch.setattr(SSHJobRunner, 'check_remote_pids', staticmethod(fake_check))
 
     res = client.get(f"/runs/{run_id}/job/status")
     assert res.status_code == 200
@@ -26,13 +26,14 @@ def test_job_stream_emits_events(tmp_path: Path, monkeypatch):
     (runtime / 'job.json').write_text(json.dumps(job))
     (runtime / 'resource.json').write_text(json.dumps({'cpu': {'percent': 10}}))
 
-    # Monkeypatch check_remote_pid to return True
+    # Monkeypatch check_remote_pids (the SSH status poller probes PIDs per host in one batch)
+    # to report it running
     from sunstone_backend.jobs import SSHJobRunner
 
-    def fake_check(ssh_target, pid, port=None, identity_file=None):
-        return True
+    def fake_check(ssh_target, pids, port=None, identity_file=None):
+        return {p: True for p in pids}
 
-    monkeypatch.setattr(SSHJobRunner, 'check_remote_pid', staticmethod(fake_check))
+    monkeypatch.setattr(SSHJobRunner, 'check_remote_pids', staticmethod(fake_check))
 
     # Stream a few events at short interval and request a small bounded number of events
     with client.stream("GET", f"/runs/{run_id}/job/stream", params={'interval': 0.05, 'max_events': 2}) as resp:
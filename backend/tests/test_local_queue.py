@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from sunstone_backend.api.app import create_app
+from sunstone_backend.jobs import LocalJobRunner
+from sunstone_backend.models.run import JobFile
+from sunstone_backend.scheduler import LocalScheduler, QueueLimits, get_scheduler
+from sunstone_backend.settings import get_settings
+from sunstone_backend.store import RunStore
+from sunstone_backend.util.time import utc_now_iso
+
+
+def _fake_workers(monkeypatch) -> dict[str, subprocess.Popen]:
+    """Replace worker launches with sleeping processes the test can stop."""
+    procs: dict[str, subprocess.Popen] = {}
+
+    def fake_submit(self, run, run_dir, backend, python_executable=None):
+        proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        procs[run.id] = proc
+        return JobFile(pid=proc.pid, started_at=utc_now_iso(), backend=backend, mode="local")
+
+    monkeypatch.setattr(LocalJobRunner, "submit", fake_submit)
+    return procs
+
+
+def _finish(proc: subprocess.Popen) -> None:
+    proc.kill()
+    proc.wait()
+
+
+def _client(tmp_path: Path, monkeypatch, **limits) -> TestClient:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    for name, value in limits.items():
+        monkeypatch.setattr(settings, name, value)
+    # the environment snapshot taken on submit is slow and irrelevant here
+    from sunstone_backend.api.routes import runs
+
+    monkeypatch.setattr(runs, "detect_environment", lambda: {})
+    return TestClient(create_app())
+
+
+def _new_run(client: TestClient, project_id: str) -> str:
+    spec = {"domain": {"cell_size": [1.0, 1.0, 0], "resolution": 10}}
+    return client.post(f"/projects/{project_id}/runs", json={"spec": spec}).json()["id"]
+
+
+def test_queue_limits_priority_and_cancel(tmp_path: Path, monkeypatch) -> None:
+    procs = _fake_workers(monkeypatch)
+    client = _client(tmp_path, monkeypatch, local_max_concurrent_runs=2, local_cores_budget=8)
+    project = client.post("/projects", json={"name": "queue"}).json()
+    try:
+        ids = [_new_run(client, project["id"]) for _ in range(4)]
+        statuses = [
+            client.post(f"/runs/{rid}/submit", json={"mode": "local"}).json()["status"]
+            for rid in ids[:3]
+        ]
+        assert statuses == ["submitted", "submitted", "queued"]
+        assert set(procs) == set(ids[:2])
+
+        # a later, higher-priority run jumps ahead of the queued one
+        res = client.post(f"/runs/{ids[3]}/submit", json={"mode": "local", "priority": 5})
+        assert res.json()["status"] == "queued"
+        queue = client.get("/queue").json()
+        assert [e["run_id"] for e in queue["queued"]] == [ids[3], ids[2]]
+        assert queue["usage"]["runs"] == 2
+
+        _finish(procs[ids[0]])
+        queue = client.get("/queue").json()
+        assert {e["run_id"] for e in queue["running"]} == {ids[1], ids[3]}
+        assert [e["run_id"] for e in queue["queued"]] == [ids[2]]
+        assert client.get(f"/runs/{ids[3]}").json()["status"] == "submitted"
+
+        # canceling a queued run just drops it from the queue
+        assert client.post(f"/runs/{ids[2]}/cancel").json() == {"ok": True}
+        assert client.get(f"/runs/{ids[2]}").json()["status"] == "canceled"
+        assert client.get("/queue").json()["queued"] == []
+        assert ids[2] not in procs
+    finally:
+        for proc in procs.values():
+            _finish(proc)
+
+
+def test_core_budget_is_head_of_line(tmp_path: Path, monkeypatch) -> None:
+    procs = _fake_workers(monkeypatch)
+    client = _client(tmp_path, monkeypatch, local_max_concurrent_runs=10, local_cores_budget=4)
+    project = client.post("/projects", json={"name": "cores"}).json()
+    try:
+        big, bigger, small = (_new_run(client, project["id"]) for _ in range(3))
+
+        def submit(rid: str, cores: int) -> str:
+            body = {"mode": "local", "cores": cores}
+            return client.post(f"/runs/{rid}/submit", json=body).json()["status"]
+
+        assert submit(big, 3) == "submitted"
+        assert submit(bigger, 2) == "queued"
+        # would fit in the remaining core, but must not overtake the run waiting ahead of it
+        assert submit(small, 1) == "queued"
+
+        _finish(procs[big])
+        running = {e["run_id"] for e in client.get("/queue").json()["running"]}
+        assert running == {bigger, small}
+    finally:
+        for proc in procs.values():
+            _finish(proc)
+
+
+def test_queue_survives_restart(tmp_path: Path, monkeypatch) -> None:
+    procs = _fake_workers(monkeypatch)
+    client = _client(tmp_path, monkeypatch, local_max_concurrent_runs=1)
+    project = client.post("/projects", json={"name": "restart"}).json()
+    try:
+        first, second = (_new_run(client, project["id"]) for _ in range(2))
+        client.post(f"/runs/{first}/submit", json={"mode": "local"})
+        client.post(f"/runs/{second}/submit", json={"mode": "local"})
+        entry = json.loads((tmp_path / "queue" / f"{second}.json").read_text())
+        assert entry["state"] == "queued"
+
+        # a fresh scheduler (new API process) picks the queue up from disk
+        _finish(procs[first])
+        restarted = LocalScheduler(tmp_path)
+        started = restarted.tick(QueueLimits(max_runs=1, cores=1, memory_bytes=1 << 30))
+        assert started == {second: None}
+        assert [e["run_id"] for e in restarted.entries()] == [second]
+    finally:
+        for proc in procs.values():
+            _finish(proc)
+
+
+def test_daemon_starts_runs_as_slots_free(tmp_path: Path, monkeypatch) -> None:
+    procs = _fake_workers(monkeypatch)
+    client = _client(
+        tmp_path, monkeypatch, local_max_concurrent_runs=1, local_queue_poll_interval=0.05
+    )
+    project = client.post("/projects", json={"name": "daemon"}).json()
+    scheduler = get_scheduler(tmp_path)
+    try:
+        first, second = (_new_run(client, project["id"]) for _ in range(2))
+        client.post(f"/runs/{first}/submit", json={"mode": "local"})
+        client.post(f"/runs/{second}/submit", json={"mode": "local"})
+        scheduler.start_daemon(get_settings())
+        _finish(procs[first])
+        deadline = time.time() + 10
+        while second not in procs and time.time() < deadline:
+            time.sleep(0.05)
+        assert second in procs
+    finally:
+        scheduler.stop_daemon()
+        for proc in procs.values():
+            _finish(proc)
+
+
+def test_launch_keeps_worker_status_and_fails_silent_deaths(tmp_path: Path, monkeypatch) -> None:
+    procs: dict[str, subprocess.Popen] = {}
+
+    def fake_submit(self, run, run_dir, backend, python_executable=None):
+        # a warm-pool child can report "running" before submit even returns
+        status = {"status": "running", "updated_at": utc_now_iso()}
+        (run_dir / "runtime" / "status.json").write_text(json.dumps(status))
+        proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        procs[run.id] = proc
+        return JobFile(pid=proc.pid, started_at=utc_now_iso(), backend=backend, mode="local")
+
+    monkeypatch.setattr(LocalJobRunner, "submit", fake_submit)
+    client = _client(tmp_path, monkeypatch, local_max_concurrent_runs=1)
+    project = client.post("/projects", json={"name": "status"}).json()
+    try:
+        rid = _new_run(client, project["id"])
+        client.post(f"/runs/{rid}/submit", json={"mode": "local"})
+        assert client.get(f"/runs/{rid}").json()["status"] == "running"
+
+        # killed without writing a final status: the next tick fails the run and frees its slot
+        _finish(procs[rid])
+        LocalScheduler(tmp_path).tick(QueueLimits(max_runs=1, cores=1, memory_bytes=1 << 30))
+        assert client.get(f"/runs/{rid}").json()["status"] == "failed"
+        detail = RunStore(tmp_path).load_status(rid).detail
+        assert detail == "Worker exited without reporting a status"
+        assert client.get("/queue").json()["running"] == []
+    finally:
+        for proc in procs.values():
+            _finish(proc)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from sunstone_backend.api.app import create_app
+from sunstone_backend.checkpoint import (
+    PAUSE_FILE,
+    RESUME_FILE,
+    Checkpointer,
+    RunPaused,
+    latest_checkpoint,
+    request_resume,
+)
+from sunstone_backend.jobs import LocalJobRunner
+from sunstone_backend.models.run import JobFile, StatusFile
+from sunstone_backend.monitor_data import read_monitor_series
+from sunstone_backend.settings import get_settings
+from sunstone_backend.store import RunStore
+from sunstone_backend.util.time import utc_now_iso
+from sunstone_backend.worker import main as worker_main
+
+
+class FakeSim:
+    """Steps time by 0.5 and dumps/loads just the time, like sim.dump/sim.load do for the fields."""
+
+    dt = 0.5
+    sigterm_at: float | None = None
+
+    def __init__(self, **kwargs) -> None:
+        self.t = 0.0
+
+    def meep_time(self) -> float:
+        return self.t
+
+    def get_field_point(self, component, pos) -> float:
+        if FakeSim.sigterm_at is not None and self.t >= FakeSim.sigterm_at:
+            FakeSim.sigterm_at = None
+            os.kill(os.getpid(), signal.SIGTERM)
+        return 2.0 * self.t
+
+    def set_boundary(self, *args) -> None:
+        pass
+
+    def dump(self, dirname, dump_structure=True, dump_fields=True) -> None:
+        Path(dirname).mkdir(parents=True, exist_ok=True)
+        (Path(dirname) / "fields.json").write_text(json.dumps({"t": self.t}))
+
+    def load(self, dirname, load_structure=True, load_fields=True) -> None:
+        self.t = json.loads((Path(dirname) / "fields.json").read_text())["t"]
+
+    def run(self, *step_funcs, until) -> None:
+        stop = self.t + until
+        while self.t < stop - 1e-9:
+            for f in step_funcs:
+                f(self)
+            self.t += self.dt
+
+
+def _at_every(dt, func):
+    state = {"next": 0.0}
+
+    def _step(sim):
+        if sim.t >= state["next"] - 1e-9:
+            func(sim)
+            state["next"] = sim.t + dt
+
+    return _step
+
+
+@pytest.fixture
+def fake_meep(monkeypatch):
+    m = types.ModuleType("meep")
+    m.Simulation = FakeSim
+    m.Vector3 = lambda *a, **k: tuple(a)
+    m.PML = lambda *a, **k: None
+    m.at_every = _at_every
+    m.Ez = "Ez"
+    monkeypatch.setitem(sys.modules, "meep", m)
+    FakeSim.sigterm_at = None
+    return m
+
+
+def _meep_run(tmp_path: Path) -> tuple[RunStore, str, Path]:
+    store = RunStore(tmp_path)
+    project = store.create_project("ckpt")
+    spec = {
+        "domain": {"cell_size": [1.0, 1.0, 0.0], "resolution": 10},
+        "monitors": [{"id": "E0", "position": [0, 0, 0], "components": ["Ez"], "dt": 1.0}],
+        "run_control": {"max_time": 20.0, "checkpoint_interval": 0},
+    }
+    run = store.create_run(project_id=project["id"], spec=spec, backend="meep")
+    return store, run.id, store.run_dir(run.id)
+
+
+def test_sigterm_checkpoints_and_resume_continues(tmp_path: Path, fake_meep) -> None:
+    store, run_id, run_dir = _meep_run(tmp_path)
+    FakeSim.sigterm_at = 5.0
+    worker_main(run_dir=run_dir, backend="meep")
+
+    status = store.load_status(run_id)
+    assert status.status == "paused" and "t=5" in status.detail
+    assert latest_checkpoint(run_dir)["t"] == 5.0
+    assert not (run_dir / "outputs" / "summary.json").exists()
+    assert signal.getsignal(signal.SIGTERM) == signal.SIG_DFL  # handler removed again
+
+    request_resume(run_dir)
+    worker_main(run_dir=run_dir, backend="meep")
+    assert store.load_status(run_id).status == "succeeded"
+    assert not (run_dir / "runtime" / RESUME_FILE).exists()
+    t, values = read_monitor_series(run_dir, "E0")
+    # every sample exactly once, across the pause
+    assert t.tolist() == [float(t) for t in range(20)]
+    assert (values["Ez"] == 2.0 * t).all()
+    summary = json.loads((run_dir / "outputs" / "summary.json").read_text())
+    assert summary["resumed_from"]["t"] == 5.0
+
+
+def test_checkpointer_pause_request_and_rotation(tmp_path: Path) -> None:
+    (tmp_path / "runtime").mkdir()
+    ckpt = Checkpointer(tmp_path, interval=0.0, keep=2, poll_interval=0.0)
+    assert ckpt.start() is None
+    sim = types.SimpleNamespace(t=1.0)
+    step = ckpt.step_function(lambda s: s.t, lambda s, d: d.mkdir(), lambda: ({}, {}))
+    step(sim)
+    assert latest_checkpoint(tmp_path) is None
+
+    for t in (1.0, 2.0, 3.0):
+        ckpt.save(lambda d: d.mkdir(), t)
+    assert sorted(p.name for p in ckpt.root.glob("ckpt_*")) == ["ckpt_000002", "ckpt_000003"]
+
+    (tmp_path / "runtime" / PAUSE_FILE).write_text("")
+    sim.t = 4.0
+    with pytest.raises(RunPaused):
+        step(sim)
+    assert latest_checkpoint(tmp_path)["seq"] == 4
+
+    # a fresh (non-resume) start forgets earlier attempts
+    assert Checkpointer(tmp_path).start() is None
+    assert latest_checkpoint(tmp_path) is None and not (tmp_path / "runtime" / PAUSE_FILE).exists()
+
+
+def test_pause_and_resume_endpoints(tmp_path: Path, monkeypatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    from sunstone_backend.api.routes import runs
+
+    monkeypatch.setattr(runs, "detect_environment", lambda: {})
+    launched: list[str] = []
+
+    def fake_submit(self, run, run_dir, backend, python_executable=None):
+        launched.append(run.id)
+        return JobFile(pid=os.getpid(), started_at=utc_now_iso(), backend=backend, mode="local")
+
+    monkeypatch.setattr(LocalJobRunner, "submit", fake_submit)
+    store, run_id, run_dir = _meep_run(tmp_path)
+    client = TestClient(create_app())
+
+    assert client.post(f"/runs/{run_id}/pause").status_code == 409
+    store.save_status(run_id, StatusFile(status="running", updated_at=utc_now_iso()))
+    job = {"pid": 0, "started_at": utc_now_iso(), "backend": "meep", "mode": "local"}
+    (run_dir / "runtime" / "job.json").write_text(json.dumps(job))
+    assert client.post(f"/runs/{run_id}/pause").json() == {"ok": True, "status": "pausing"}
+    assert (run_dir / "runtime" / PAUSE_FILE).exists()
+
+    # what the worker does on seeing the request
+    Checkpointer(run_dir).save(lambda d: d.mkdir(), 7.5)
+    store.save_status(run_id, StatusFile(status="paused", updated_at=utc_now_iso()))
+    res = client.post(f"/runs/{run_id}/resume", json={"backend": "meep"})
+    assert res.status_code == 200, res.text
+    assert launched == [run_id]
+    assert (run_dir / "runtime" / RESUME_FILE).exists()
+    assert not (run_dir / "runtime" / PAUSE_FILE).exists()
+
+    # backends without checkpoint support, and runs without a checkpoint, cannot resume
+    other = store.create_run(project_id=store.load_run(run_id).project_id, spec={}, backend="dummy")
+    assert client.post(f"/runs/{other.id}/submit", json={"mode": "resume"}).status_code == 400
+    _, fresh_id, _ = _meep_run(tmp_path)
+    res = client.post(f"/runs/{fresh_id}/submit", json={"mode": "resume", "backend": "meep"})
+    assert res.status_code == 409
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from sunstone_backend import mpi, worker
+from sunstone_backend.api.app import create_app
+from sunstone_backend.backends.meep import MeepBackend
+from sunstone_backend.checkpoint import RunPaused, request_resume
+from sunstone_backend.jobs import LocalJobRunner, SlurmJobRunner, SSHJobRunner
+from sunstone_backend.models.run import JobFile, RunRecord
+from sunstone_backend.settings import get_settings
+from sunstone_backend.util.resource_monitor import _rank_processes
+from sunstone_backend.util.time import utc_now_iso
+
+
+def _as_rank(monkeypatch, rank: int, size: int = 2) -> None:
+    monkeypatch.setenv("OMPI_COMM_WORLD_RANK", str(rank))
+    monkeypatch.setenv("OMPI_COMM_WORLD_SIZE", str(size))
+
+
+def _options(run_dir: Path, **options) -> None:
+    (run_dir / "runtime").mkdir(parents=True, exist_ok=True)
+    (run_dir / "runtime" / "backend_options.json").write_text(json.dumps(options))
+
+
+def _record(run_id: str = "mpi1", backend: str = "meep") -> RunRecord:
+    return RunRecord(
+        id=run_id, project_id="p", created_at=utc_now_iso(), status="created", backend=backend
+    )
+
+
+def test_rank_size_and_commands(tmp_path: Path, monkeypatch) -> None:
+    for name in (*mpi.RANK_ENV_VARS, *mpi.SIZE_ENV_VARS):
+        monkeypatch.delenv(name, raising=False)
+    assert (mpi.rank(), mpi.size(), mpi.is_root()) == (0, 1, True)
+    # one process: broadcasts are the identity and MPI is never initialized
+    assert mpi.broadcast({"a": 1}) == {"a": 1}
+    monkeypatch.setenv("PMI_RANK", "3")
+    monkeypatch.setenv("PMI_SIZE", "4")
+    assert (mpi.rank(), mpi.size(), mpi.is_root()) == (3, 4, False)
+
+    assert mpi.option_ranks(None) == 1 and mpi.option_ranks({"mpi_ranks": 8}) == 8
+    assert mpi.option_ranks({"mpi_ranks": "x"}) == 1
+    assert mpi.mpi_ranks(tmp_path) == 1
+    _options(tmp_path, mpi_ranks=6)
+    assert mpi.mpi_ranks(tmp_path) == 6
+
+    cmd = ["python", "-m", "sunstone_backend.worker"]
+    assert mpi.mpi_command(cmd, 1) == cmd
+    wrapped = mpi.mpi_command(cmd, 4, "mpirun", ["--oversubscribe"])
+    assert wrapped == ["mpirun", "--oversubscribe", "-np", "4", *cmd]
+    assert mpi.mpi_command(cmd, 4, "/usr/bin/srun") == ["/usr/bin/srun", "-n", "4", *cmd]
+
+
+def test_local_runner_starts_mpi_runs_under_the_launcher(tmp_path: Path) -> None:
+    launcher = tmp_path / "mpirun"
+    launcher.write_text(f'#!/bin/sh\necho "$@" > {tmp_path / "args.txt"}\n')
+    launcher.chmod(0o755)
+    run_dir = tmp_path / "run"
+    _options(run_dir, mpi_ranks=3)
+    pool = MagicMock()
+
+    runner = LocalJobRunner(pool=pool, mpirun=str(launcher), mpirun_args=["--bind-to", "core"])
+    job = runner.submit(_record(), run_dir, "meep", python_executable=sys.executable)
+    # never dispatched to a warm (single-process) worker
+    pool.submit.assert_not_called()
+    assert job.pid > 0
+    args_path = tmp_path / "args.txt"
+    deadline = time.monotonic() + 10
+    while not args_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert args_path.read_text().split() == [
+        "--bind-to", "core", "-np", "3",
+        sys.executable, "-m", "sunstone_backend.worker",
+        "--run-dir", str(run_dir), "--backend", "meep",
+    ]
+
+
+def test_ssh_launch_wraps_the_remote_worker(tmp_path: Path, monkeypatch) -> None:
+    run_dir = tmp_path / "run"
+    _options(run_dir, mpi_ranks=2)
+    calls = []
+
+    def fake_run(cmd, check, stdout, stderr, text=False, timeout=None):
+        calls.append(cmd)
+        if cmd[0] == "scp":
+            return MagicMock(stdout="", stderr="", returncode=0)
+        if cmd[0] == "ssh":
+            mkdir = any("mkdir -p" in str(c) for c in cmd)
+            return MagicMock(stdout="" if mkdir else "999\n", returncode=0)
+        raise RuntimeError("unexpected command")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    job = SSHJobRunner().submit_ssh(
+        _record(), run_dir, "meep", "alice@remote:/scratch/r1",
+        python_executable="python3", ssh_options={"mpirun": "/opt/mpi/bin/mpirun"},
+    )
+    assert job.pid == 999
+    launch = next(str(call[-1]) for call in calls if call[0] == "ssh" and "nohup" in str(call[-1]))
+    assert (
+        "nohup /opt/mpi/bin/mpirun -np 2 python3 -m sunstone_backend.worker"
+        " --run-dir /scratch/r1 --backend meep >"
+    ) in launch
+
+
+def test_slurm_script_runs_one_task_per_rank(tmp_path: Path) -> None:
+    runner = SlurmJobRunner()
+    script = runner.render_script(
+        [tmp_path], "meep", "python3", {"partition": "cpu"}, cores=8, mpi_ranks=4
+    )
+    assert "#SBATCH --ntasks=4" in script and "#SBATCH --cpus-per-task=2" in script
+    assert "exec srun -n 4 python3 -m sunstone_backend.worker" in script
+    script = runner.render_script(
+        [tmp_path], "meep", "python3", {"mpi_launcher": "mpirun", "ntasks": 16}, mpi_ranks=4
+    )
+    assert "#SBATCH --ntasks=16" in script and "exec mpirun -np 4 python3 -m" in script
+    # without MPI the script is unchanged
+    script = runner.render_script([tmp_path], "meep", "python3")
+    assert "exec python3 -m sunstone_backend.worker" in script
+
+
+def test_submit_validates_ranks_and_reserves_a_core_per_rank(tmp_path: Path, monkeypatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    monkeypatch.setattr(settings, "local_cores_budget", 8)
+    from sunstone_backend.api.routes import runs
+
+    monkeypatch.setattr(runs, "detect_environment", lambda: {})
+
+    def fake_submit(self, run, run_dir, backend, python_executable=None):
+        return JobFile(pid=os.getpid(), started_at=utc_now_iso(), backend=backend, mode="local")
+
+    monkeypatch.setattr(LocalJobRunner, "submit", fake_submit)
+    client = TestClient(create_app())
+    project = client.post("/projects", json={"name": "mpi"}).json()
+    spec = {"domain": {"cell_size": [1.0, 1.0, 0], "resolution": 10}}
+
+    def submit(options):
+        run_id = client.post(f"/projects/{project['id']}/runs", json={"spec": spec}).json()["id"]
+        body = {"mode": "local", "backend": "meep", "backend_options": options, "use_cache": False}
+        return client.post(f"/runs/{run_id}/submit", json=body)
+
+    assert submit({"mpi_ranks": 0}).status_code == 400
+    assert submit({"mpi_ranks": 2.5}).status_code == 400
+    res = submit({"mpi_ranks": 4})
+    assert res.status_code == 200, res.text
+    assert [e["cores"] for e in client.get("/queue").json()["running"]] == [4]
+
+
+def test_worker_leaves_status_to_rank_0(tmp_path: Path, monkeypatch) -> None:
+    run_dir = tmp_path / "run"
+    (run_dir / "runtime").mkdir(parents=True)
+    ran = []
+    monkeypatch.setattr(worker, "get_backend", lambda name: types.SimpleNamespace(run=ran.append))
+    _as_rank(monkeypatch, 1)
+    worker.main(run_dir=run_dir, backend="meep")
+    assert ran == [run_dir] and not (run_dir / "runtime" / "status.json").exists()
+    _as_rank(monkeypatch, 0)
+    worker.main(run_dir=run_dir, backend="meep")
+    assert json.loads((run_dir / "runtime" / "status.json").read_text())["status"] == "succeeded"
+
+
+class FakeProc:
+    def __init__(self, pid: int, parent=None) -> None:
+        self.pid = pid
+        self._parent = parent
+        self._children: list[FakeProc] = []
+        if parent is not None:
+            parent._children.append(self)
+
+    def parent(self):
+        return self._parent
+
+    def children(self, recursive: bool = False):
+        return list(self._children)
+
+
+def test_resource_monitor_counts_sibling_ranks() -> None:
+    launcher = FakeProc(10)
+    ranks = [FakeProc(11, launcher), FakeProc(12, launcher), FakeProc(13, launcher)]
+    assert _rank_processes(ranks[0], 3) == ranks
+    assert _rank_processes(ranks[0], 1) == [ranks[0]]
+    # not started by a launcher after all: only this process
+    assert _rank_processes(FakeProc(20), 2)[0].pid == 20
+
+
+class FakeComm:
+    """Rank 0 records what it broadcasts; another rank replays it, as if they ran side by side."""
+
+    def __init__(self, log: list) -> None:
+        self.log = log
+
+    def bcast(self, value, root=0):
+        if mpi.is_root():
+            self.log.append(value)
+            return value
+        return self.log.pop(0)
+
+    def Barrier(self) -> None:
+        pass
+
+
+class RankSim:
+    """2D sim stepping t by 0.1; counts the (collective, under MPI) field reads of each run."""
+
+    sigterm_at: float | None = None
+    reads: list[int] = []
+
+    Courant = 1.0
+
+    def __init__(self, **kwargs) -> None:
+        self.t = 0.0
+        RankSim.reads.append(0)
+
+    def meep_time(self) -> float:
+        return self.t
+
+    def get_field_point(self, component, pos):
+        if RankSim.sigterm_at is not None and self.t >= RankSim.sigterm_at - 1e-9:
+            RankSim.sigterm_at = None
+            os.kill(os.getpid(), signal.SIGTERM)
+        RankSim.reads[-1] += 1
+        return complex(self.t + pos[0])
+
+    def get_array(self, component, center, size):
+        RankSim.reads[-1] += 1
+        return np.full((4, 4), self.t)
+
+    def dump(self, dirname, dump_structure=True, dump_fields=True) -> None:
+        (Path(dirname) / "fields.json").write_text(json.dumps({"t": self.t}))
+
+    def load(self, dirname, load_structure=True, load_fields=True) -> None:
+        self.t = json.loads((Path(dirname) / "fields.json").read_text())["t"]
+
+    def run(self, *step_funcs, until) -> None:
+        start = self.t
+        for i in range(int(round(until / 0.1))):
+            for f in step_funcs:
+                f(self)
+            self.t = round(start + (i + 1) * 0.1, 10)
+
+
+def _files(run_dir: Path) -> dict[str, bytes]:
+    # solver dumps are collective (every rank writes its part); everything else is rank 0's
+    return {
+        str(p.relative_to(run_dir)): p.read_bytes()
+        for p in run_dir.rglob("*")
+        if p.is_file() and not any(part.startswith(".ckpt_") for part in p.parts)
+    }
+
+
+def test_meep_only_rank_0_writes_and_ranks_stay_in_step(tmp_path: Path, monkeypatch) -> None:
+    m = types.ModuleType("meep")
+    m.Simulation = RankSim
+    m.Vector3 = lambda *a, **k: tuple(a)
+    m.PML = lambda *a, **k: None
+    m.at_every = lambda dt, f: f
+    m.Ez = "Ez"
+    monkeypatch.setitem(sys.modules, "meep", m)
+    run_dir = tmp_path / "run"
+    (run_dir / "runtime").mkdir(parents=True)
+    (run_dir / "spec.json").write_text(json.dumps({
+        "domain": {"cell_size": [2.0, 2.0, 0.0], "resolution": 10},
+        "monitors": [
+            {"id": "P", "position": [0.5, 0.0, 0.0], "components": ["Ez"], "dt": 0.1},
+            {"type": "dft", "id": "D", "position": [0.0, 0.0, 0.0], "components": ["Ez"],
+             "frequencies": [0.2, 0.4]},
+        ],
+        "outputs": {
+            "field_movie": {"dt": 0.1, "components": ["Ez"]},
+            "field_snapshot": {"components": ["Ez"]},
+        },
+        "run_control": {"max_time": 2.0, "checkpoint_interval": 0},
+    }))
+    log: list = []
+    monkeypatch.setattr(mpi, "_comm", lambda: FakeComm(log))
+
+    def run_both(paused: bool) -> None:
+        RankSim.reads = []
+        for rank in (0, 1):
+            _as_rank(monkeypatch, rank)
+            before = _files(run_dir)
+            if paused:
+                RankSim.sigterm_at = 1.0 if rank == 0 else None
+                # rank 1 stops because rank 0 broadcast the stop, not because of its own signal
+                with pytest.raises(RunPaused):
+                    MeepBackend().run(run_dir)
+            else:
+                MeepBackend().run(run_dir)
+            if rank == 1:
+                assert _files(run_dir) == before
+        assert log == []
+        assert RankSim.reads[0] == RankSim.reads[1] > 0
+
+    run_both(paused=True)
+    request_resume(run_dir)
+    run_both(paused=False)
+
+    summary = json.loads((run_dir / "outputs" / "summary.json").read_text())
+    assert summary["field_movie_frames"] == 20 and summary["spectra"] == ["outputs/spectra/D.npz"]
+    assert summary["resumed_from"]["checkpoint"] == "ckpt_000001"
@@ -56,3 +56,27 @@ def test_plebanski_tensor_from_metric_consistency():
     # They should be close (xi/zeta should be near zero)
     assert np.allclose(eps1, eps2, atol=1e-8)
     assert np.allclose(mu1, mu2, atol=1e-8)
+
+
+def test_plebanski_batch_matches_pointwise():
+    from sunstone_backend.ulf.geodesics import (
+        plebanski_from_metric_batch,
+        plebanski_tensor_from_metric_batch,
+    )
+
+    rng = np.random.default_rng(0)
+    g = np.diag([-1.0, 1.0, 1.0, 1.0]) + 0.1 * rng.normal(size=(8, 4, 4))
+    g = 0.5 * (g + g.transpose(0, 2, 1))
+    res = plebanski_from_metric_batch(g)
+    for n in range(len(g)):
+        single = plebanski_from_metric(g[n])
+        for key in ('eps', 'mu', 'xi', 'zeta'):
+            assert res[key].shape == (8, 3, 3)
+            assert np.allclose(res[key][n], single[key], atol=1e-12)
+
+    pts = rng.normal(size=(5, 3)) * 2.0
+    eps, mu, xi, zeta = plebanski_tensor_from_metric_batch(pts[:, 0], pts[:, 1], pts[:, 2], 0.5)
+    for n, (x, y, z) in enumerate(pts):
+        e1, m1, _, _ = plebanski_tensor_from_metric(x, y, z, 0.5)
+        assert np.allclose(eps[n], e1, atol=1e-12)
+        assert np.allclose(mu[n], m1, atol=1e-12)
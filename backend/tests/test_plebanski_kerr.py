@@ -29,3 +29,14 @@ def test_plebanski_from_metric_matches_kerr_helper():
     e2 = np.array(e2)
     assert e1.shape == e2.shape
     assert np.allclose(e1, e2, atol=1e-8)
+
+
+def test_plebanski_kerr_batch_matches_pointwise():
+    from sunstone_backend.ulf.geodesics import plebanski_tensor_from_kerr_batch
+
+    pts = np.array([[3.0, 1.0, 0.2], [2.0, 0.5, 0.1], [0.0, 0.0, 4.0], [-1.5, 2.5, -0.7]])
+    batch = plebanski_tensor_from_kerr_batch(pts[:, 0], pts[:, 1], pts[:, 2], 1.0, 0.8)
+    for n, (x, y, z) in enumerate(pts):
+        single = plebanski_tensor_from_kerr(x, y, z, 1.0, 0.8)
+        for b, s in zip(batch, single, strict=True):
+            assert np.allclose(b[n], s, atol=1e-12)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import zarr
+from fastapi.testclient import TestClient
+
+from sunstone_backend.api.app import create_app
+from sunstone_backend.backends.dummy import DummyBackend
+from sunstone_backend.backends.meep import MeepBackend
+from sunstone_backend.backends.point_monitors import GridSampler, PointMonitorGroup
+from sunstone_backend.monitor_data import list_monitors, read_monitor_series
+from sunstone_backend.settings import get_settings
+from sunstone_backend.store import RunStore
+
+
+def _field(x, y, t):
+    # linear in space, so trilinear interpolation reproduces it exactly
+    return t * (1.0 + x + 2.0 * y)
+
+
+class GridSim:
+    """2D fake with a grid of spacing 0.1: get_array over a box and its metadata, no point reads."""
+
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+        self.t = 0.0
+        self.array_calls = 0
+
+    def meep_time(self) -> float:
+        return self.t
+
+    def _tics(self, center, size):
+        xs = np.round(np.arange(center[0] - size[0] / 2, center[0] + size[0] / 2 + 1e-9, 0.1), 10)
+        ys = np.round(np.arange(center[1] - size[1] / 2, center[1] + size[1] / 2 + 1e-9, 0.1), 10)
+        return xs, ys, np.array([0.0])
+
+    def get_array_metadata(self, center, size):
+        xs, ys, zs = self._tics(center, size)
+        return xs, ys, zs, np.ones((len(xs), len(ys)))
+
+    def get_array(self, component, center, size):
+        self.array_calls += 1
+        xs, ys, _ = self._tics(center, size)
+        value = _field(xs[:, None], ys[None, :], self.t) * (2.0 if component == "Hz" else 1.0)
+        return value * (1 + 1j) if self.kwargs.get("force_complex_fields") else value
+
+    def get_field_point(self, component, pos):
+        raise AssertionError("point reads should be batched")
+
+    def run(self, *step_funcs, until) -> None:
+        GridSim.last = self
+        while self.t < until - 1e-9:
+            for f in step_funcs:
+                f(self)
+            self.t += 0.5
+
+
+def test_grid_sampler_interpolates_between_grid_points() -> None:
+    xs = np.linspace(0.0, 1.0, 11)
+    ys = np.linspace(-1.0, 1.0, 21)
+    zs = np.array([0.0])
+    arr = 3.0 + xs[:, None] - 4.0 * ys[None, :]
+    points = np.array([[0.05, 0.33, 0.0], [0.97, -0.99, 0.0], [0.5, 0.0, 0.0]])
+    sampled = GridSampler(points, xs, ys, zs)(arr)
+    np.testing.assert_allclose(sampled, 3.0 + points[:, 0] - 4.0 * points[:, 1])
+
+
+def test_group_streams_dense_rows_and_resumes(tmp_path: Path) -> None:
+    path = tmp_path / "group.zarr"
+    group = PointMonitorGroup(
+        path,
+        ["a", "b"],
+        [[0, 0, 0], [1, 0, 0]],
+        ["Ez", "Hz"],
+        monitor_components={"a": ["Ez"], "b": ["Ez", "Hz"]},
+    )
+    group.readers = {"Ez": lambda s: np.array([s, -s]), "Hz": lambda s: np.array([10 * s, 0])}
+    group.open()
+    for i in range(5):
+        group.sample(float(i), float(i))
+    group.flush()
+    values = zarr.open_group(str(path), mode="r")["values"]
+    assert values.shape == (5, 2, 2) and values.chunks[1:] == (1, 1) and values[3, 1, 0] == -3
+
+    # a checkpoint after 3 samples: the rest is recorded again
+    resumed = PointMonitorGroup(path, ["a", "b"], [[0, 0, 0], [1, 0, 0]], ["Ez", "Hz"])
+    resumed.readers = group.readers
+    resumed.open(3)
+    assert resumed.last_t == 2.0
+    resumed.sample(7.0, 3.0)
+    resumed.close()
+    values = zarr.open_group(str(path), mode="r")["values"]
+    assert values[:, 0, 0].tolist() == [0, 1, 2, 7] and values[:, 0, 1].tolist() == [0, 10, 20, 70]
+
+
+def _fake_meep(monkeypatch) -> None:
+    m = types.ModuleType("meep")
+    m.Simulation = GridSim
+    m.Vector3 = lambda *a, **k: tuple(a)
+    m.PML = lambda *a, **k: None
+    m.at_every = lambda dt, f: f
+    m.Ez = "Ez"
+    m.Hz = "Hz"
+    monkeypatch.setitem(sys.modules, "meep", m)
+
+
+def _run(run_dir: Path, monitors: list[dict], outputs: dict | None = None) -> None:
+    spec = {
+        "domain": {"cell_size": [2.0, 2.0, 0.0], "resolution": 10},
+        "monitors": monitors,
+        "outputs": outputs or {},
+        "run_control": {"max_time": 2.0, "checkpoint_interval": 0},
+    }
+    (run_dir / "runtime").mkdir(parents=True, exist_ok=True)
+    (run_dir / "spec.json").write_text(json.dumps(spec))
+    MeepBackend().run(run_dir)
+
+
+def test_meep_monitors_read_each_component_once_per_tick(tmp_path: Path, monkeypatch) -> None:
+    _fake_meep(monkeypatch)
+    positions = [[0.13, 0.27, 0.0], [-0.31, 0.05, 0.0], [0.4, -0.42, 0.0]]
+    monitors = [
+        {"id": f"P{i}", "position": p, "components": ["Ez", "Hz"], "dt": 0.5}
+        for i, p in enumerate(positions)
+    ]
+    monitors.append({"id": "Q", "position": [0.0, 0.0, 0.0], "components": ["Ez"], "dt": 0.5})
+    run_dir = tmp_path / "run"
+    _run(run_dir, monitors, {"monitor_csv": True})
+
+    # 4 ticks x 2 components (+1 probe while setting up), regardless of the 4 monitors
+    assert GridSim.last.array_calls == 4 * 2 + 1
+    group = zarr.open_group(str(run_dir / "outputs" / "monitors" / "point_group_0.zarr"), mode="r")
+    assert group["values"].shape == (4, 4, 2) and group.attrs["complete"] is True
+    assert group.attrs["ids"] == ["P0", "P1", "P2", "Q"]
+    assert group.attrs["components"] == ["Ez", "Hz"]
+    for i, (x, y, _) in enumerate(positions):
+        t, values = read_monitor_series(run_dir, f"P{i}")
+        np.testing.assert_allclose(values["Ez"], _field(x, y, t))
+        np.testing.assert_allclose(values["Hz"], 2.0 * _field(x, y, t))
+    # the optional CSV export has just the monitor's own components
+    table = np.genfromtxt(run_dir / "outputs" / "monitors" / "Q.csv", delimiter=",", names=True)
+    assert table.dtype.names == ("t", "Ez")
+    np.testing.assert_allclose(table["Ez"], _field(0.0, 0.0, table["t"]))
+    summary = json.loads((run_dir / "outputs" / "summary.json").read_text())
+    assert summary["monitor_arrays"] == ["outputs/monitors/point_group_0.zarr"]
+
+
+def test_monitor_dtypes_and_api(tmp_path: Path, monkeypatch) -> None:
+    _fake_meep(monkeypatch)
+    settings = get_settings()
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    store = RunStore(tmp_path)
+    project = store.create_project("monitors")
+    run = store.create_run(project_id=project["id"], spec={}, backend="meep")
+    monitor = {"id": "E0", "position": [0.2, 0.1, 0.0], "components": ["Ez"], "dt": 0.5}
+    _run(store.run_dir(run.id), [monitor], {"monitor_dtype": "float32", "monitor_complex": True})
+    assert GridSim.last.kwargs["force_complex_fields"] is True
+
+    client = TestClient(create_app())
+    listed = client.get(f"/runs/{run.id}/monitors").json()
+    assert [(m["id"], m["dtype"], m["samples"]) for m in listed] == [("E0", "complex64", 4)]
+    res = client.get(f"/runs/{run.id}/monitors/E0", params={"start": 1, "step": 2})
+    assert res.json()["t"] == [0.5, 1.5]
+    expected = _field(0.2, 0.1, np.array([0.5, 1.5]))
+    np.testing.assert_allclose(res.json()["values"]["Ez"]["im"], expected, rtol=1e-6)
+    csv_rows = client.get(f"/runs/{run.id}/monitors/E0", params={"format": "csv"}).text.splitlines()
+    assert csv_rows[0] == "t,Ez" and len(csv_rows) == 5
+    assert complex(csv_rows[2].split(",")[1]).imag > 0
+    assert client.get(f"/runs/{run.id}/monitors/nope").status_code == 404
+    assert client.get(f"/runs/{run.id}/monitors/E0", params={"component": "Hz"}).status_code == 404
+
+
+def test_per_monitor_stores_of_the_dummy_backend_read_the_same_way(tmp_path: Path) -> None:
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    (run_dir / "spec.json").write_text(json.dumps({"monitors": [{"type": "point", "id": "E0"}]}))
+    DummyBackend().run(run_dir)
+    listed = [(m["id"], m["components"], m["samples"]) for m in list_monitors(run_dir)]
+    assert listed == [("E0", ["Ez"], 2000)]
+    t, values = read_monitor_series(run_dir, "E0", start=1000, stop=1010)
+    assert t.shape == values["Ez"].shape == (10,)
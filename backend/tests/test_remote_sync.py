@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import sunstone_backend
+from sunstone_backend import remote_sync
+from sunstone_backend.api.app import create_app
+from sunstone_backend.jobs import SSHJobRunner
+from sunstone_backend.remote_sync import (
+    CHUNK_SIZE,
+    PULL_RULES,
+    RemoteSync,
+    rsync_filters,
+    selected,
+    sync_remote_run,
+)
+from sunstone_backend.settings import get_settings
+from sunstone_backend.store import RunStore
+
+# Stand-in for ssh: drop the options and the host, run the remote command locally
+FAKE_SSH = """#!/bin/sh
+while [ $# -gt 0 ]; do
+  case "$1" in
+    -o|-p|-i|-O|-l|-F) shift 2 ;;
+    -*) shift ;;
+    *) shift; break ;;
+  esac
+done
+exec sh -c "$*"
+"""
+
+
+@pytest.fixture
+def fake_ssh(tmp_path: Path, monkeypatch) -> None:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (bin_dir / "ssh").write_text(FAKE_SSH)
+    (bin_dir / "ssh").chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    # the "remote" helper is this checkout, by absolute path
+    package_root = str(Path(sunstone_backend.__file__).resolve().parents[1])
+    monkeypatch.setenv(
+        "PYTHONPATH", os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")]))
+    )
+    settings = get_settings()
+    monkeypatch.setattr(settings, "ssh_multiplexing", False)
+    monkeypatch.setattr(settings, "ssh_sync_rsync", False)
+
+
+@pytest.fixture
+def sent(monkeypatch) -> list[dict]:
+    calls: list[dict] = []
+    real = remote_sync.diff_manifests
+
+    def spy(src, dst):
+        wanted = real(src, dst)
+        calls.append(wanted)
+        return wanted
+
+    monkeypatch.setattr(remote_sync, "diff_manifests", spy)
+    return calls
+
+
+def _sync(remote: Path, **kwargs) -> RemoteSync:
+    return RemoteSync(SSHJobRunner(), "alice@remote", str(remote), python=sys.executable, **kwargs)
+
+
+def test_rules_and_rsync_filters() -> None:
+    rules = [(False, "outputs/fields/")] + PULL_RULES
+    assert selected("outputs/monitors/E0.csv", rules)
+    assert not selected("outputs/fields/ez.h5", rules)
+    assert selected("runtime/status.json", rules)
+    assert not selected("runtime/job.json", rules)
+    assert not selected("spec.json", rules)
+    assert rsync_filters(rules)[:3] == [
+        "--exclude=/outputs/fields/***",
+        "--include=/outputs/***",
+        "--include=/logs/***",
+    ]
+    assert rsync_filters(rules)[-2:] == ["--include=*/", "--exclude=*"]
+
+
+def test_push_sends_only_changed_blocks(tmp_path: Path, fake_ssh, sent) -> None:
+    run_dir = tmp_path / "run_a"
+    (run_dir / "runtime").mkdir(parents=True)
+    (run_dir / "spec.json").write_text("{}")
+    (run_dir / "runtime" / "run.json").write_text("{}")
+    (run_dir / "runtime" / "status.json").write_text("{}")
+    (run_dir / "outputs").mkdir()
+    (run_dir / "outputs" / "old.csv").write_text("t,v\n")
+    geometry = bytearray(os.urandom(3 * CHUNK_SIZE + 100))
+    (run_dir / "geometry.bin").write_bytes(geometry)
+    remote = tmp_path / "remote" / "run_a"
+
+    assert _sync(remote).push(run_dir) == "chunks"
+    assert (remote / "geometry.bin").read_bytes() == geometry
+    assert (remote / "spec.json").exists() and (remote / "runtime" / "run.json").exists()
+    assert not (remote / "outputs").exists() and not (remote / "runtime" / "status.json").exists()
+
+    geometry[CHUNK_SIZE + 5] ^= 0xFF
+    (run_dir / "geometry.bin").write_bytes(geometry)
+    _sync(remote).push(run_dir)
+    assert sent[-1] == {"geometry.bin": [1]}
+    assert (remote / "geometry.bin").read_bytes() == geometry
+
+
+def test_pull_is_incremental_and_honours_excludes(tmp_path: Path, fake_ssh, sent) -> None:
+    remote = tmp_path / "remote"
+    (remote / "outputs" / "fields").mkdir(parents=True)
+    (remote / "runtime").mkdir()
+    data = bytearray(os.urandom(2 * CHUNK_SIZE + 7))
+    (remote / "outputs" / "flux.bin").write_bytes(data)
+    (remote / "outputs" / "fields" / "ez.h5").write_bytes(b"x" * 1000)
+    (remote / "runtime" / "status.json").write_text('{"status": "running"}')
+    (remote / "runtime" / "job.json").write_text('{"pid": 1}')
+    run_dir = tmp_path / "local"
+    (run_dir / "runtime").mkdir(parents=True)
+    (run_dir / "runtime" / "job.json").write_text('{"mode": "ssh"}')
+
+    sync = _sync(remote, exclude=["outputs/fields/"])
+    sync.pull(run_dir)
+    assert (run_dir / "outputs" / "flux.bin").read_bytes() == data
+    assert not (run_dir / "outputs" / "fields").exists()
+    assert (run_dir / "runtime" / "status.json").read_text() == '{"status": "running"}'
+    assert (run_dir / "runtime" / "job.json").read_text() == '{"mode": "ssh"}'
+
+    # the run appends to its output: only the last block moves, and unchanged files are not rehashed
+    data += b"more"
+    (remote / "outputs" / "flux.bin").write_bytes(data)
+    sync.pull(run_dir)
+    assert sent[-1] == {"outputs/flux.bin": [2]}
+    assert (run_dir / "outputs" / "flux.bin").read_bytes() == data
+    sync.pull(run_dir)
+    assert sent[-1] == {}
+
+
+def test_artifacts_api_serves_remote_runs(tmp_path: Path, fake_ssh, monkeypatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "data_dir", tmp_path / "data")
+    store = RunStore(tmp_path / "data")
+    proj = store.create_project("remote")
+    run = store.create_run(project_id=proj["id"], spec={}, backend="dummy")
+    remote = tmp_path / "remote"
+    (remote / "outputs" / "monitors").mkdir(parents=True)
+    (remote / "runtime").mkdir()
+    (remote / "outputs" / "monitors" / "E0.csv").write_text("t,Ez\n0,1\n")
+    (remote / "runtime" / "status.json").write_text(
+        json.dumps({"status": "succeeded", "updated_at": "2026-01-01T00:00:00Z"})
+    )
+    job = {
+        "mode": "ssh",
+        "pid": 7,
+        "ssh_target": f"alice@remote:{remote}",
+        "remote_path": str(remote),
+        "remote_python": sys.executable,
+    }
+    (store.run_dir(run.id) / "runtime" / "job.json").write_text(json.dumps(job))
+
+    client = TestClient(create_app())
+    listed = [a["path"] for a in client.get(f"/runs/{run.id}/artifacts").json()["artifacts"]]
+    assert "outputs/monitors/E0.csv" in listed
+    assert client.get(f"/runs/{run.id}/artifacts/outputs/monitors/E0.csv").text == "t,Ez\n0,1\n"
+    assert client.get(f"/runs/{run.id}").json()["status"] == "succeeded"
+    assert store.catalog.get(run.id)["status"] == "succeeded"
+
+
+def test_final_sync_fails_runs_that_never_reported(tmp_path: Path, fake_ssh) -> None:
+    store = RunStore(tmp_path / "data")
+    proj = store.create_project("remote")
+    run = store.create_run(project_id=proj["id"], spec={}, backend="dummy")
+    remote = tmp_path / "remote"
+    (remote / "runtime").mkdir(parents=True)
+    (remote / "runtime" / "status.json").write_text(
+        json.dumps({"status": "running", "updated_at": "2026-01-01T00:00:00Z"})
+    )
+    job = {
+        "mode": "ssh",
+        "pid": 7,
+        "ssh_target": f"alice@remote:{remote}",
+        "remote_path": str(remote),
+        "remote_python": sys.executable,
+    }
+
+    assert sync_remote_run(store, run.id, job) is True
+    assert store.load_status(run.id).status == "running"
+    assert sync_remote_run(store, run.id, job, max_age=60.0) is False
+    sync_remote_run(store, run.id, job, final=True)
+    status = store.load_status(run.id)
+    assert status.status == "failed" and "final status" in status.detail
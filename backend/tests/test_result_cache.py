@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from sunstone_backend.api.app import create_app
+from sunstone_backend.jobs import LocalJobRunner
+from sunstone_backend.models.run import JobFile
+from sunstone_backend.result_cache import ResultCache, detach_outputs
+from sunstone_backend.settings import get_settings
+from sunstone_backend.util.time import utc_now_iso
+from sunstone_backend.worker import main as worker_main
+
+SPEC = {
+    "domain": {"cell_size": [1.0, 1.0, 0], "resolution": 10},
+    "monitors": [{"type": "point", "id": "E0"}],
+}
+
+
+def _client(tmp_path: Path, monkeypatch) -> tuple[TestClient, list[str]]:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    # the fake launches below never finish; keep the local queue from holding later runs back
+    monkeypatch.setattr(settings, "local_max_concurrent_runs", 10)
+    monkeypatch.setattr(settings, "local_cores_budget", 10)
+    from sunstone_backend.api.routes import runs
+
+    monkeypatch.setattr(runs, "detect_environment", lambda: {})
+    launched: list[str] = []
+
+    # the worker is run by the test itself, in-process, after the launch is recorded
+    def fake_submit(self, run, run_dir, backend, python_executable=None):
+        launched.append(run.id)
+        return JobFile(pid=os.getpid(), started_at=utc_now_iso(), backend=backend, mode="local")
+
+    monkeypatch.setattr(LocalJobRunner, "submit", fake_submit)
+    return TestClient(create_app()), launched
+
+
+def _new_run(client: TestClient, project_id: str, spec: dict) -> str:
+    return client.post(f"/projects/{project_id}/runs", json={"spec": spec}).json()["id"]
+
+
+def _submit(client: TestClient, run_id: str) -> str:
+    return client.post(f"/runs/{run_id}/submit", json={"backend": "dummy"}).json()["status"]
+
+
+def test_identical_resubmit_reuses_outputs(tmp_path: Path, monkeypatch) -> None:
+    client, launched = _client(tmp_path, monkeypatch)
+    project = client.post("/projects", json={"name": "cache"}).json()
+
+    first = _new_run(client, project["id"], SPEC)
+    assert _submit(client, first) != "succeeded"
+    first_dir = tmp_path / "runs" / f"run_{first}"
+    worker_main(run_dir=first_dir, backend="dummy")
+    assert client.get("/cache").json()["entries"] == 1
+
+    # same simulation, written differently (10.0 vs 10, key order)
+    same = {
+        "monitors": [{"id": "E0", "type": "point"}],
+        "domain": {"resolution": 10.0, "cell_size": [1, 1, 0]},
+    }
+    second = _new_run(client, project["id"], same)
+    res = client.post(f"/runs/{second}/submit", json={"backend": "dummy"})
+    assert res.json()["status"] == "succeeded"
+    assert launched == [first]
+    second_dir = tmp_path / "runs" / f"run_{second}"
+    job = json.loads((second_dir / "runtime" / "job.json").read_text())
+    assert job["mode"] == "cache" and job["cached_from"] == first
+    src = next(p for p in (first_dir / "outputs").rglob("*") if p.is_file())
+    copy = second_dir / src.relative_to(first_dir)
+    assert copy.stat().st_ino == src.stat().st_ino
+    assert client.get(f"/runs/{second}").json()["status"] == "succeeded"
+
+    # opting out, or a different spec, runs for real
+    third = _new_run(client, project["id"], SPEC)
+    client.post(f"/runs/{third}/submit", json={"backend": "dummy", "use_cache": False})
+    finer = {**SPEC, "domain": {"cell_size": [1.0, 1.0, 0], "resolution": 20}}
+    fourth = _new_run(client, project["id"], finer)
+    client.post(f"/runs/{fourth}/submit", json={"backend": "dummy"})
+    assert launched == [first, third, fourth]
+
+
+def _tree(root: Path) -> dict[str, bytes]:
+    return {str(p.relative_to(root)): p.read_bytes() for p in root.rglob("*") if p.is_file()}
+
+
+def test_rerunning_the_source_run_leaves_cached_results_alone(tmp_path: Path, monkeypatch) -> None:
+    client, _ = _client(tmp_path, monkeypatch)
+    project = client.post("/projects", json={"name": "cache"}).json()
+    first = _new_run(client, project["id"], SPEC)
+    first_dir = tmp_path / "runs" / f"run_{first}"
+    client.post(f"/runs/{first}/submit", json={"backend": "dummy"})
+    worker_main(run_dir=first_dir, backend="dummy")
+    second = _new_run(client, project["id"], SPEC)
+    assert _submit(client, second) == "succeeded"
+    second_dir = tmp_path / "runs" / f"run_{second}"
+    entry = next(p for p in (tmp_path / "result_cache").iterdir() if p.is_dir())
+    restored, cached = _tree(second_dir / "outputs"), _tree(entry)
+    assert restored and all(p.stat().st_mode & 0o222 == 0 for p in entry.rglob("*") if p.is_file())
+
+    # the source run is rerun with a different spec, writing its outputs again
+    changed = {**SPEC, "domain": {"cell_size": [2.0, 1.0, 0], "resolution": 10}}
+    res = client.post(f"/runs/{first}/submit", json={"backend": "dummy", "spec_override": changed})
+    assert res.status_code == 200, res.text
+    worker_main(run_dir=first_dir, backend="dummy")
+
+    assert _tree(second_dir / "outputs") == restored and _tree(entry) == cached
+    summary = first_dir / "outputs" / "summary.json"
+    assert summary.stat().st_nlink == 2
+    assert summary.stat().st_ino != (entry / "outputs" / "summary.json").stat().st_ino
+    assert client.get("/cache").json()["entries"] == 2
+
+
+def test_detach_outputs_keeps_private_copies_when_resuming(tmp_path: Path) -> None:
+    outputs = tmp_path / "outputs"
+    outputs.mkdir()
+    (outputs / "own.txt").write_text("own")
+    (tmp_path / "shared.txt").write_text("shared")
+    os.link(tmp_path / "shared.txt", outputs / "shared.txt")
+    detach_outputs(tmp_path, resuming=True)
+    assert (outputs / "shared.txt").read_text() == "shared"
+    assert (outputs / "shared.txt").stat().st_nlink == 1
+    (outputs / "shared.txt").write_text("appended")
+    assert (tmp_path / "shared.txt").read_text() == "shared"
+    os.link(tmp_path / "shared.txt", outputs / "again.txt")
+    detach_outputs(tmp_path)
+    assert sorted(p.name for p in outputs.iterdir()) == ["own.txt", "shared.txt"]
+
+
+def test_cancel_is_refused_for_cache_hits_and_finished_runs(tmp_path: Path, monkeypatch) -> None:
+    client, _ = _client(tmp_path, monkeypatch)
+    # a cache hit has pid 0, and killpg(0) would signal the API's own process group
+    killed: list[int] = []
+    monkeypatch.setattr(os, "killpg", lambda pid, sig: killed.append(pid))
+    project = client.post("/projects", json={"name": "cache"}).json()
+    first = _new_run(client, project["id"], SPEC)
+    client.post(f"/runs/{first}/submit", json={"backend": "dummy"})
+    worker_main(run_dir=tmp_path / "runs" / f"run_{first}", backend="dummy")
+    second = _new_run(client, project["id"], SPEC)
+    assert _submit(client, second) == "succeeded"
+
+    for run_id in (first, second):
+        for route in ("cancel", "job/cancel"):
+            res = client.post(f"/runs/{run_id}/{route}")
+            assert res.status_code == 409 and "already succeeded" in res.json()["detail"]
+    # even if its status were not terminal, a cache hit has no process to signal
+    status_path = tmp_path / "runs" / f"run_{second}" / "runtime" / "status.json"
+    status_path.write_text(json.dumps({"status": "running", "updated_at": utc_now_iso()}))
+    res = client.post(f"/runs/{second}/cancel")
+    assert res.status_code == 409 and "result cache" in res.json()["detail"]
+    LocalJobRunner().cancel(JobFile(pid=0, started_at=utc_now_iso(), backend="dummy", mode="cache"))
+    assert killed == []
+    assert client.get(f"/runs/{second}").json()["status"] != "canceled"
+
+
+def test_lru_eviction_by_count_and_size(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path, max_entries=2, max_bytes=250)
+    runs = {}
+    for name, size in (("a", 100), ("b", 100), ("c", 100), ("d", 400)):
+        run_dir = tmp_path / "runs" / f"run_{name}"
+        (run_dir / "outputs").mkdir(parents=True)
+        (run_dir / "outputs" / "data.bin").write_bytes(b"x" * size)
+        runs[name] = run_dir
+
+    assert cache.store("ka", "a", "dummy", runs["a"])
+    assert cache.store("kb", "b", "dummy", runs["b"])
+    assert cache.lookup("ka") is not None  # a is now more recently used than b
+    assert cache.store("kc", "c", "dummy", runs["c"])
+    assert cache.lookup("kb") is None and not (tmp_path / "result_cache" / "kb").exists()
+    assert cache.lookup("ka") is not None and cache.lookup("kc") is not None
+    # larger than the whole cache: not kept
+    assert cache.store("kd", "d", "dummy", runs["d"]) is False
+    assert cache.stats()["entries"] == 2
+
+    # entries outlive the run they came from
+    (runs["a"] / "outputs" / "data.bin").unlink()
+    target = tmp_path / "runs" / "run_e"
+    cache.restore("ka", target)
+    assert (target / "outputs" / "data.bin").read_bytes() == b"x" * 100
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from sunstone_backend.api.app import create_app
+from sunstone_backend.catalog import CATALOG_NAME, RunCatalog
+from sunstone_backend.models.run import StatusFile
+from sunstone_backend.settings import get_settings
+from sunstone_backend.store import RunStore
+from sunstone_backend.worker import _write_status
+
+SPEC = {"version": "0.1"}
+
+
+def _make_runs(store: RunStore, project_id: str, n: int) -> list[str]:
+    ids = []
+    for i in range(n):
+        run = store.create_run(
+            project_id=project_id, spec=SPEC, backend="dummy" if i % 2 else "meep"
+        )
+        # distinct, ordered creation times so sorting is deterministic
+        run.created_at = f"2026-01-01T00:00:{i:02d}+00:00"
+        store.save_run(run)
+        ids.append(run.id)
+    return ids
+
+
+def test_store_keeps_catalog_in_sync(tmp_path: Path) -> None:
+    store = RunStore(tmp_path)
+    proj = store.create_project("p")
+    run = store.create_run(project_id=proj["id"], spec=SPEC, backend="dummy")
+    assert store.catalog.get(run.id)["status"] == "created"
+
+    store.save_status(run.id, StatusFile(status="running", updated_at="2030-01-01T00:00:00+00:00"))
+    row = store.catalog.get(run.id)
+    assert row["status"] == "running"
+    assert row["updated_at"] == "2030-01-01T00:00:00+00:00"
+
+    # workers only know the run dir but still update the catalog
+    _write_status(store.run_dir(run.id), "failed", detail="boom")
+    row = store.catalog.get(run.id)
+    assert row["status"] == "failed"
+    assert row["detail"] == "boom"
+
+
+def test_list_runs_filters_and_paginates(tmp_path: Path) -> None:
+    store = RunStore(tmp_path)
+    proj = store.create_project("p")
+    other = store.create_project("q")
+    ids = _make_runs(store, proj["id"], 7)
+    _make_runs(store, other["id"], 2)
+    store.save_status(
+        ids[3], StatusFile(status="succeeded", updated_at="2030-01-01T00:00:00+00:00")
+    )
+
+    rows, cursor = store.list_runs(proj["id"], limit=3)
+    seen = [r["id"] for r in rows]
+    while cursor:
+        rows, cursor = store.list_runs(proj["id"], limit=3, cursor=cursor)
+        seen.extend(r["id"] for r in rows)
+    assert seen == list(reversed(ids))
+
+    rows, _ = store.list_runs(proj["id"], sort="created_at", order="asc", backend=["meep"])
+    assert [r["id"] for r in rows] == ids[0::2]
+
+    rows, _ = store.list_runs(proj["id"], status=["succeeded"])
+    assert [r["id"] for r in rows] == [ids[3]]
+
+    rows, _ = store.list_runs(
+        proj["id"],
+        created_after="2026-01-01T00:00:02+00:00",
+        created_before="2026-01-01T00:00:05+00:00",
+        order="asc",
+    )
+    assert [r["id"] for r in rows] == ids[2:5]
+
+
+def test_rebuild_from_disk(tmp_path: Path) -> None:
+    store = RunStore(tmp_path)
+    proj = store.create_project("p")
+    ids = _make_runs(store, proj["id"], 3)
+    # simulate a status change made without the catalog, then lose the catalog entirely
+    status_path = store.run_dir(ids[0]) / "runtime" / "status.json"
+    status_path.write_text(
+        json.dumps({"status": "canceled", "updated_at": "2030-01-01T00:00:00+00:00"})
+    )
+    (tmp_path / CATALOG_NAME).unlink()
+
+    # a fresh store on a data dir with runs but no catalog indexes what is on disk
+    store = RunStore(tmp_path)
+    assert store.catalog.get(ids[0])["status"] == "canceled"
+    assert store.rebuild_catalog() == 3
+    rows, _ = RunCatalog(tmp_path / CATALOG_NAME).list_runs(proj["id"])
+    assert {r["id"] for r in rows} == set(ids)
+
+
+def test_list_project_runs_endpoint(tmp_path: Path) -> None:
+    settings = get_settings()
+    settings.data_dir = tmp_path
+    client = TestClient(create_app())
+
+    project = client.post("/projects", json={"name": "catalog"}).json()
+    run_ids = [
+        client.post(f"/projects/{project['id']}/runs", json={"spec": SPEC}).json()["id"]
+        for _ in range(3)
+    ]
+
+    res = client.get(f"/projects/{project['id']}/runs", params={"limit": 2, "order": "asc"})
+    assert res.status_code == 200
+    body = res.json()
+    assert len(body["items"]) == 2
+    assert body["next_cursor"]
+    res = client.get(
+        f"/projects/{project['id']}/runs",
+        params={"limit": 2, "order": "asc", "cursor": body["next_cursor"]},
+    )
+    rest = res.json()
+    assert rest["next_cursor"] is None
+    assert {r["id"] for r in body["items"] + rest["items"]} == set(run_ids)
+
+    res = client.get(f"/projects/{project['id']}/runs", params={"status": ["running"]})
+    assert res.json()["items"] == []
+
+    assert client.get("/projects/missing/runs").status_code == 404
+    assert client.get(f"/projects/{project['id']}/runs", params={"cursor": "@@"}).status_code == 400
+    res = client.get(f"/projects/{project['id']}/runs", params={"sort": "id; DROP"})
+    assert res.status_code == 400
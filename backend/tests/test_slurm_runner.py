@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import sunstone_backend
+from sunstone_backend.api.app import create_app
+from sunstone_backend.jobs import SlurmJobRunner
+from sunstone_backend.settings import get_settings
+from sunstone_backend.store import RunStore
+
+# Stand-ins for the SLURM CLI: every call is appended to calls.log, sbatch prints a fixed job id (or
+# fails when sbatch.fail exists) and squeue/sacct print whatever the test wrote to their .txt file.
+FAKE_TOOLS = {
+    "sbatch": (
+        'echo "sbatch $*" >> "$FAKE_SLURM/calls.log"\n'
+        'if [ -e "$FAKE_SLURM/sbatch.fail" ]; then echo "no partition" >&2; exit 1; fi\n'
+        'echo "4242;cluster"\n'
+    ),
+    "squeue": (
+        'echo "squeue $*" >> "$FAKE_SLURM/calls.log"\n'
+        'cat "$FAKE_SLURM/squeue.txt" 2>/dev/null\n'
+    ),
+    "sacct": (
+        'echo "sacct $*" >> "$FAKE_SLURM/calls.log"\n'
+        'cat "$FAKE_SLURM/sacct.txt" 2>/dev/null\n'
+    ),
+    "scancel": 'echo "scancel $*" >> "$FAKE_SLURM/calls.log"\n',
+}
+
+
+@pytest.fixture
+def fake_slurm(tmp_path: Path, monkeypatch) -> Path:
+    root = tmp_path / "fake_slurm"
+    bin_dir = root / "bin"
+    bin_dir.mkdir(parents=True)
+    for name, body in FAKE_TOOLS.items():
+        path = bin_dir / name
+        path.write_text("#!/bin/sh\n" + body)
+        path.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_SLURM", str(root))
+    return root
+
+
+def _calls(root: Path, tool: str) -> list[str]:
+    log = root / "calls.log"
+    if not log.exists():
+        return []
+    return [line for line in log.read_text().splitlines() if line.startswith(tool)]
+
+
+def _client(tmp_path: Path, monkeypatch) -> TestClient:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "data_dir", tmp_path / "data")
+    from sunstone_backend.api.routes import runs
+
+    monkeypatch.setattr(runs, "detect_environment", lambda: {})
+    return TestClient(create_app())
+
+
+def _new_run(client: TestClient) -> str:
+    project = client.post("/projects", json={"name": "slurm"}).json()
+    spec = {"domain": {"cell_size": [1.0, 1.0, 0], "resolution": 10}}
+    return client.post(f"/projects/{project['id']}/runs", json={"spec": spec}).json()["id"]
+
+
+def test_submit_status_and_cancel(tmp_path: Path, monkeypatch, fake_slurm: Path) -> None:
+    client = _client(tmp_path, monkeypatch)
+    run_id = _new_run(client)
+    res = client.post(f"/runs/{run_id}/submit", json={
+        "mode": "slurm",
+        "cores": 4,
+        "memory_bytes": 2 * 1024 ** 3,
+        "slurm_options": {"partition": "debug", "time": "00:10:00", "setup": ["module load meep"]},
+    })
+    assert res.status_code == 200
+    assert res.json()["status"] == "submitted"
+
+    job = client.get(f"/runs/{run_id}/job").json()
+    assert job["mode"] == "slurm" and job["slurm_job_id"] == "4242"
+    script = Path(job["slurm_script"]).read_text()
+    for line in (
+        "#SBATCH --partition=debug",
+        "#SBATCH --time=00:10:00",
+        "#SBATCH --cpus-per-task=4",
+        "#SBATCH --mem=2048M",
+        "module load meep",
+    ):
+        assert line in script
+    assert "-m sunstone_backend.worker" in script and "--array" not in script
+
+    (fake_slurm / "squeue.txt").write_text("4242|RUNNING\n")
+    status = client.get(f"/runs/{run_id}/job/status").json()
+    assert status["state"] == "RUNNING" and status["running"] is True
+    assert _calls(fake_slurm, "sacct") == []
+
+    assert client.post(f"/runs/{run_id}/cancel").json() == {"ok": True}
+    assert _calls(fake_slurm, "scancel") == ["scancel 4242"]
+    assert client.get(f"/runs/{run_id}").json()["status"] == "canceled"
+
+
+def test_scheduler_side_failures_are_recorded(
+    tmp_path: Path, monkeypatch, fake_slurm: Path
+) -> None:
+    client = _client(tmp_path, monkeypatch)
+    run_id = _new_run(client)
+    client.post(f"/runs/{run_id}/submit", json={"mode": "slurm"})
+
+    # gone from squeue; sacct knows it hit its time limit before the worker could say so
+    (fake_slurm / "sacct.txt").write_text("4242|TIMEOUT\n")
+    status = client.get(f"/runs/{run_id}/job/status").json()
+    assert status["state"] == "TIMEOUT" and status["running"] is False
+    status_path = tmp_path / "data" / "runs" / f"run_{run_id}" / "runtime" / "status.json"
+    run_status = json.loads(status_path.read_text())
+    assert run_status["status"] == "failed"
+    assert "TIMEOUT" in run_status["detail"]
+
+
+def test_sbatch_failure_fails_the_run(tmp_path: Path, monkeypatch, fake_slurm: Path) -> None:
+    client = _client(tmp_path, monkeypatch)
+    run_id = _new_run(client)
+    (fake_slurm / "sbatch.fail").touch()
+    res = client.post(f"/runs/{run_id}/submit", json={"mode": "slurm"})
+    assert res.status_code == 500
+    assert "no partition" in res.json()["detail"]
+    assert client.get(f"/runs/{run_id}").json()["status"] == "failed"
+
+
+def test_job_array_packs_runs_and_polls_in_one_batch(tmp_path: Path, fake_slurm: Path) -> None:
+    store = RunStore(tmp_path / "data")
+    proj = store.create_project("sweep")
+    runs = []
+    for _ in range(3):
+        run = store.create_run(
+            project_id=proj["id"],
+            spec={"version": "0.1", "monitors": [{"type": "point", "id": "E0"}]},
+            backend="dummy",
+        )
+        runs.append((run, store.run_dir(run.id)))
+
+    runner = SlurmJobRunner()
+    script_dir = tmp_path / "data" / "sweeps" / "s1"
+    jobs = runner.submit_array(runs, backend="dummy", script_dir=script_dir)
+    assert [j["slurm_job_id"] for j in jobs] == ["4242_0", "4242_1", "4242_2"]
+    assert len(_calls(fake_slurm, "sbatch")) == 1
+    script_path = Path(jobs[0]["slurm_script"])
+    assert "#SBATCH --array=0-2" in script_path.read_text()
+
+    (fake_slurm / "squeue.txt").write_text("4242_0|RUNNING\n4242_1|PENDING\n")
+    (fake_slurm / "sacct.txt").write_text("4242_2|CANCELLED by 1000\n4242_0|RUNNING\n")
+    states = runner.poll([j["slurm_job_id"] for j in jobs])
+    assert states == {"4242_0": "RUNNING", "4242_1": "PENDING", "4242_2": "CANCELLED"}
+    assert _calls(fake_slurm, "squeue") == ["squeue -h -r -o %i|%T -j 4242"]
+    assert len(_calls(fake_slurm, "sacct")) == 1
+    run_statuses = [SlurmJobRunner.run_status(states[j["slurm_job_id"]]) for j in jobs]
+    assert run_statuses == ["running", "submitted", "canceled"]
+
+    # the generated script runs the worker for its array task; it cd's into the run dir, so make
+    # the package importable by absolute path
+    package_root = str(Path(sunstone_backend.__file__).resolve().parents[1])
+    env = dict(
+        os.environ,
+        SLURM_ARRAY_TASK_ID="1",
+        PYTHONPATH=os.pathsep.join(filter(None, [package_root, os.environ.get("PYTHONPATH")])),
+    )
+    subprocess.run(["bash", str(script_path)], check=True, env=env, timeout=120)
+    run, run_dir = runs[1]
+    assert store.load_status(run.id).status == "succeeded"
+    assert (run_dir / "outputs" / "monitors" / "E0.zarr").exists()
+    assert store.load_status(runs[0][0].id).status == "created"
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from sunstone_backend.jobs import SSHConnectionManager, SSHJobRunner
+from sunstone_backend.models.run import RunRecord
+from sunstone_backend.util.time import utc_now_iso
+
+# A stand-in for OpenSSH that understands just enough of ControlMaster: `-M` creates the control
+# "socket" (a plain file), `-O check`/`-O exit` test/remove it, and any other invocation runs the
+# remote command locally and logs whether it went through an existing master ("mux") or not.
+SSH_SHIM = r'''
+import os, subprocess, sys
+args = sys.argv[1:]
+takes_value = set("oOpilFEcbDLRWJ")
+opts, flags, control, host, i = {}, set(), None, None, 0
+while i < len(args):
+    a = args[i]
+    if host is None and a.startswith("-") and len(a) == 2:
+        if a[1] in takes_value:
+            i += 1
+            if a == "-o" and args[i].startswith("ControlPath="):
+                control = args[i].split("=", 1)[1]
+            opts[a] = args[i]
+        else:
+            flags.add(a)
+        i += 1
+        continue
+    host = a
+    i += 1
+    break
+command = " ".join(args[i:])
+if control:
+    control = control.replace("%C", "fake-" + host.replace("@", "_"))
+log = open(os.environ["FAKE_SSH_LOG"], "a")
+if "-O" in opts:
+    if opts["-O"] == "check":
+        sys.exit(0 if control and os.path.exists(control) else 255)
+    if opts["-O"] == "exit" and control and os.path.exists(control):
+        os.unlink(control)
+    sys.exit(0)
+if "-M" in flags:
+    log.write("master %s\n" % host)
+    open(control, "w").close()
+    sys.exit(0)
+mode = "mux" if control and os.path.exists(control) else "direct"
+log.write("%s %s %s\n" % (mode, host, command))
+log.close()
+sys.exit(subprocess.run(["sh", "-c", command]).returncode)
+'''
+
+
+@pytest.fixture
+def fake_ssh(tmp_path: Path, monkeypatch) -> Path:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    shim = bin_dir / "ssh"
+    shim.write_text(f"#!{sys.executable}\n{SSH_SHIM}")
+    shim.chmod(0o755)
+    log = tmp_path / "ssh.log"
+    log.touch()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_SSH_LOG", str(log))
+    return log
+
+
+def test_status_probes_and_cancel_share_one_master(tmp_path: Path, fake_ssh: Path) -> None:
+    manager = SSHConnectionManager(control_dir=tmp_path / "cm")
+    runner = SSHJobRunner(connections=manager)
+    proc = subprocess.Popen(["sleep", "30"])
+    try:
+        for _ in range(5):
+            assert runner.check_remote_pid("alice@remote:/tmp/sr", proc.pid) is True
+        runner.cancel({"pid": proc.pid, "ssh_target": "alice@remote:/tmp/sr", "mode": "ssh"})
+        proc.wait(timeout=10)
+    finally:
+        proc.kill()
+    assert runner.check_remote_pid("alice@remote:/tmp/sr", proc.pid) is False
+
+    lines = fake_ssh.read_text().splitlines()
+    assert lines[0] == "master alice@remote"
+    assert len([line for line in lines if line.startswith("master")]) == 1
+    assert len(lines) == 8
+    assert all(line.startswith("mux alice@remote") for line in lines[1:])
+    assert lines[-2].endswith(f"kill -TERM {proc.pid}")
+
+
+def test_master_is_restarted_after_it_goes_away(tmp_path: Path, fake_ssh: Path) -> None:
+    manager = SSHConnectionManager(control_dir=tmp_path / "cm", check_interval=0.0)
+    runner = SSHJobRunner(connections=manager)
+    assert runner.check_remote_pid("bob@hpc:/x", os.getpid()) is True
+    manager.close(["ssh", "bob@hpc"])
+    assert runner.check_remote_pid("bob@hpc:/x", os.getpid()) is True
+    lines = fake_ssh.read_text().splitlines()
+    assert [line.split()[0] for line in lines] == ["master", "mux", "master", "mux"]
+
+
+def test_commands_fall_back_to_direct_connections(
+    tmp_path: Path, fake_ssh: Path, monkeypatch
+) -> None:
+    # a master that cannot be started (e.g. the server disallows it) must not break commands
+    manager = SSHConnectionManager(control_dir=tmp_path / "cm")
+    monkeypatch.setattr(manager, "ensure", lambda base_args: False)
+    runner = SSHJobRunner(connections=manager)
+    assert runner.check_remote_pid("carol@hpc:/x", os.getpid()) is True
+    assert fake_ssh.read_text().splitlines()[0].startswith("direct carol@hpc")
+
+
+def test_submit_reuses_the_master_for_mkdir_copy_and_launch(
+    tmp_path: Path, fake_ssh: Path, monkeypatch
+) -> None:
+    manager = SSHConnectionManager(control_dir=tmp_path / "cm")
+    runner = SSHJobRunner(connections=manager)
+    run_dir = tmp_path / "run_mux1"
+    run_dir.mkdir()
+    (run_dir / "spec.json").write_text("{}")
+    run = RunRecord(
+        id="mux1", project_id="p", created_at=utc_now_iso(), status="created", backend="dummy"
+    )
+
+    real_run = subprocess.run
+    scp_calls = []
+
+    def fake_run(cmd, *args, **kwargs):
+        if cmd[0] == "scp":
+            scp_calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+        return real_run(cmd, *args, **kwargs)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    remote = tmp_path / "remote"
+    job = runner.submit_ssh(
+        run=run,
+        run_dir=run_dir,
+        backend="dummy",
+        ssh_target=f"alice@remote:{remote}",
+        python_executable="true",
+    )
+    assert job.pid > 0
+    assert any(f"ControlPath={tmp_path / 'cm'}/%C" in c for c in scp_calls[0])
+    lines = fake_ssh.read_text().splitlines()
+    assert lines[0] == "master alice@remote"
+    # mkdir, the incremental-sync manifest probe ("true" is no helper, so it falls back to scp)
+    # and launch
+    assert [line.split()[0] for line in lines[1:]] == ["mux", "mux", "mux"]
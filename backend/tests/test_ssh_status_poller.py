@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import threading
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from sunstone_backend.api.app import create_app
+from sunstone_backend.jobs import SSHJobRunner
+from sunstone_backend.settings import get_settings
+from sunstone_backend.ssh_poller import SSHStatusPoller
+from sunstone_backend.store import RunStore
+
+
+class FakeRunner:
+    def __init__(self, alive: dict[str, set[int]]) -> None:
+        self.alive = alive
+        self.calls: list[tuple[str, list[int]]] = []
+        self.lock = threading.Lock()
+
+    def check_remote_pids(self, ssh_target, pids, port=None, identity_file=None):
+        with self.lock:
+            self.calls.append((ssh_target, sorted(pids)))
+        return {p: p in self.alive[ssh_target] for p in pids}
+
+
+def _job(host: str, pid: int) -> dict:
+    return {"mode": "ssh", "pid": pid, "ssh_target": f"{host}:/scratch/r{pid}"}
+
+
+def test_many_runs_and_clients_cost_one_probe_per_host() -> None:
+    runner = FakeRunner({"alice@a": set(range(100, 110)), "alice@b": set(range(200, 210))})
+    poller = SSHStatusPoller(interval=60.0, runner=runner)
+    jobs = {
+        f"r{pid}": _job("alice@a" if pid < 200 else "alice@b", pid)
+        for pid in [*range(100, 110), *range(200, 210)]
+    }
+    for run_id, meta in jobs.items():
+        poller.watch(run_id, meta)
+
+    # several clients polling every run concurrently
+    def client() -> None:
+        for _ in range(3):
+            for run_id, meta in jobs.items():
+                assert poller.status(run_id, meta)["running"] is True
+
+    threads = [threading.Thread(target=client) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(runner.calls) == [
+        ("alice@a", list(range(100, 110))),
+        ("alice@b", list(range(200, 210))),
+    ]
+
+
+def test_refresh_picks_up_finished_jobs_and_stops_probing_them() -> None:
+    runner = FakeRunner({"bob@hpc": {1, 2}})
+    poller = SSHStatusPoller(interval=0.0, runner=runner)
+    poller.watch("r1", _job("bob@hpc", 1))
+    poller.watch("r2", _job("bob@hpc", 2))
+    poller.refresh()
+    runner.alive["bob@hpc"].discard(2)
+    poller.refresh()
+    assert poller.status("r2", _job("bob@hpc", 2))["running"] is False
+    poller.refresh()
+    assert runner.calls == [("bob@hpc", [1, 2]), ("bob@hpc", [1, 2]), ("bob@hpc", [1])]
+
+
+def test_unreachable_host_keeps_last_known_state() -> None:
+    runner = FakeRunner({"bob@hpc": {1}})
+    poller = SSHStatusPoller(interval=0.0, runner=runner)
+    assert poller.status("r1", _job("bob@hpc", 1))["running"] is True
+
+    def down(*args, **kwargs):
+        raise RuntimeError("connection refused")
+
+    runner.check_remote_pids = down
+    probe = poller.status("r1", _job("bob@hpc", 1))
+    assert probe["running"] is True and "connection refused" in probe["error"]
+
+
+def test_check_remote_pids_is_one_ssh_command(monkeypatch) -> None:
+    calls = []
+
+    def fake_run(cmd, check=False, stdout=None, stderr=None, text=False, timeout=None):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "11 alive\n12 gone\n13 alive\n", "")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    monkeypatch.setattr(get_settings(), "ssh_multiplexing", False)
+    runner = SSHJobRunner()
+    alive = runner.check_remote_pids("carol@hpc:/x", [13, 11, 12], port=2222)
+    assert alive == {11: True, 12: False, 13: True}
+    assert len(calls) == 1
+    assert calls[0][:4] == ["ssh", "-p", "2222", "carol@hpc"]
+    assert "for p in 11 12 13;" in calls[0][-1]
+
+
+def test_status_endpoint_reads_the_shared_cache(tmp_path: Path, monkeypatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    monkeypatch.setattr(settings, "ssh_status_poll_interval", 60.0)
+    calls = []
+
+    def fake_check(ssh_target, pids, port=None, identity_file=None):
+        calls.append(sorted(pids))
+        return {p: True for p in pids}
+
+    monkeypatch.setattr(SSHJobRunner, "check_remote_pids", staticmethod(fake_check))
+    store = RunStore(tmp_path)
+    proj = store.create_project("poll")
+    client = TestClient(create_app())
+    run_ids = []
+    for pid in (501, 502, 503):
+        run = store.create_run(project_id=proj["id"], spec={}, backend="dummy")
+        job_path = store.run_dir(run.id) / "runtime" / "job.json"
+        job_path.write_text(json.dumps(_job("dave@cluster", pid)))
+        run_ids.append(run.id)
+
+    from sunstone_backend.ssh_poller import get_ssh_poller
+
+    poller = get_ssh_poller(settings)
+    for run_id in run_ids:
+        job_path = store.run_dir(run_id) / "runtime" / "job.json"
+        poller.watch(run_id, json.loads(job_path.read_text()))
+    for _ in range(3):
+        for run_id in run_ids:
+            data = client.get(f"/runs/{run_id}/job/status").json()
+            assert data["running"] is True and data["checked_at"]
+    assert calls == [[501, 502, 503]]
@@ -50,8 +50,10 @@ def test_submit_injects_translator_fragments(tmp_path: Path, monkeypatch):
 
     run_dir = Path(settings.data_dir) / 'runs' / f'run_{run_id}'
 
-    # Patch subprocess.Popen in jobs to prevent actually launching a worker process
+    # Patch subprocess.Popen in jobs to prevent actually launching a worker process; the warm worker
+    # pool would hand FakePopen to its reader thread, so run this submit without it
     monkeypatch.setattr('sunstone_backend.jobs.subprocess.Popen', FakePopen)
+    monkeypatch.setattr(settings, 'local_worker_pool', False)
 
     # Also patch the server translate helper to return a predictable native fragment
     def fake_translate(name, s):
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from sunstone_backend.api.app import create_app
+from sunstone_backend.catalog import RunCatalog
+from sunstone_backend.jobs import LocalJobRunner, SlurmJobRunner
+from sunstone_backend.models.run import JobFile, StatusFile
+from sunstone_backend.scheduler import LocalScheduler
+from sunstone_backend.settings import get_settings
+from sunstone_backend.store import RunStore
+from sunstone_backend.util.json_pointer import set_pointer
+from sunstone_backend.util.time import utc_now_iso
+
+BASE = {
+    "domain": {"cell_size": [1.0, 1.0, 0], "resolution": 10},
+    "sources": [{"type": "gaussian_pulse", "center_freq": 1.0}],
+    "monitors": [{"type": "point", "id": "E0"}],
+}
+
+
+@pytest.fixture
+def client(tmp_path: Path, monkeypatch) -> TestClient:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "data_dir", tmp_path)
+    from sunstone_backend.api.routes import sweeps
+
+    monkeypatch.setattr(sweeps, "detect_environment", lambda: {})
+    return TestClient(create_app())
+
+
+def _project(client: TestClient) -> str:
+    return client.post("/projects", json={"name": "sweep"}).json()["id"]
+
+
+def _create(client: TestClient, project: str, **body):
+    return client.post(f"/projects/{project}/sweeps", json={"spec": BASE, **body})
+
+
+def test_set_pointer() -> None:
+    doc = {"a/b": {"~x": [1, 2]}, "list": []}
+    set_pointer(doc, "/a~1b/~0x/1", 5)
+    set_pointer(doc, "/list/-", "end")
+    set_pointer(doc, "/new", True)
+    assert doc == {"a/b": {"~x": [1, 5]}, "list": ["end"], "new": True}
+    for bad in ("no-slash", "/missing/x", "/list/7", "/list/01"):
+        with pytest.raises(ValueError):
+            set_pointer(doc, bad, 0)
+
+
+def test_product_and_zip_expand_into_runs(client: TestClient, tmp_path: Path) -> None:
+    project = _project(client)
+    axes = [
+        {"path": "/domain/resolution", "values": [10, 20, 40]},
+        {"path": "/sources/0/center_freq", "values": [0.5, 1.5]},
+    ]
+    res = _create(client, project, axes=axes, name="res x freq")
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert data["sweep"]["size"] == 6 and data["counts"] == {"created": 6}
+    assert [p["params"] for p in data["points"]][:3] == [
+        {"/domain/resolution": 10, "/sources/0/center_freq": 0.5},
+        {"/domain/resolution": 10, "/sources/0/center_freq": 1.5},
+        {"/domain/resolution": 20, "/sources/0/center_freq": 0.5},
+    ]
+    last = data["points"][-1]
+    spec = json.loads((tmp_path / "runs" / f"run_{last['run_id']}" / "spec.json").read_text())
+    assert spec["domain"]["resolution"] == 40 and spec["sources"][0]["center_freq"] == 1.5
+    assert spec["monitors"] == BASE["monitors"]
+    run = client.get(f"/runs/{last['run_id']}").json()
+    assert run["sweep_id"] == data["sweep"]["id"]
+    listed = client.get(f"/projects/{project}/runs", params={"limit": 500}).json()["items"]
+    assert len(listed) == 6
+
+    zipped = _create(
+        client, project, axes=[axes[0], {**axes[1], "values": [0.5, 1.0, 1.5]}], combine="zip"
+    )
+    freqs = [p["params"]["/sources/0/center_freq"] for p in zipped.json()["points"]]
+    assert freqs == [0.5, 1.0, 1.5]
+    assert [s["size"] for s in client.get(f"/projects/{project}/sweeps").json()] == [3, 6]
+
+    # bad requests create nothing
+    assert _create(client, project, axes=axes, combine="zip").status_code == 400
+    assert _create(client, project, axes=[{"path": "/nope/x", "values": [1]}]).status_code == 400
+    assert _create(client, "missing", axes=axes).status_code == 404
+    assert len(client.get(f"/projects/{project}/runs", params={"limit": 500}).json()["items"]) == 9
+
+
+def test_thousand_point_sweep_is_indexed_and_queued_in_bulk(
+    client: TestClient, monkeypatch
+) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "local_max_concurrent_runs", 2)
+    monkeypatch.setattr(settings, "local_cores_budget", 2)
+    launched: list[str] = []
+
+    def fake_submit(self, run, run_dir, backend, python_executable=None):
+        launched.append(run.id)
+        return JobFile(pid=os.getpid(), started_at=utc_now_iso(), backend=backend, mode="local")
+
+    monkeypatch.setattr(LocalJobRunner, "submit", fake_submit)
+    calls: Counter[str] = Counter()
+
+    def count_calls(cls, name: str) -> None:
+        real = getattr(cls, name)
+
+        def counted(self, *args, **kwargs):
+            calls[name] += 1
+            return real(self, *args, **kwargs)
+
+        monkeypatch.setattr(cls, name, counted)
+
+    count_calls(RunCatalog, "upsert_run")
+    count_calls(RunCatalog, "upsert_runs")
+    count_calls(LocalScheduler, "enqueue_many")
+
+    project = _project(client)
+    axes = [
+        {"path": "/domain/resolution", "values": list(range(10, 50))},
+        {"path": "/sources/0/center_freq", "values": [0.1 * i for i in range(1, 26)]},
+    ]
+    res = _create(client, project, axes=axes, submit={"backend": "dummy"})
+    assert res.status_code == 200, res.text
+    data = res.json()
+    assert data["sweep"]["size"] == 1000
+    assert data["counts"] == {"submitted": 2, "queued": 998}
+    # one catalog transaction for all the runs and one queue write for all the points; only the
+    # runs the queue starts straight away are re-indexed one by one
+    assert calls["upsert_runs"] == 1
+    assert calls["enqueue_many"] == 1
+    assert calls["upsert_run"] == len(launched) == 2
+
+
+def test_local_submit_goes_through_the_queue_in_one_call(
+    client: TestClient, tmp_path: Path, monkeypatch
+) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "local_max_concurrent_runs", 2)
+    monkeypatch.setattr(settings, "local_cores_budget", 2)
+    launched: list[str] = []
+
+    def fake_submit(self, run, run_dir, backend, python_executable=None):
+        launched.append(run.id)
+        return JobFile(pid=os.getpid(), started_at=utc_now_iso(), backend=backend, mode="local")
+
+    monkeypatch.setattr(LocalJobRunner, "submit", fake_submit)
+    project = _project(client)
+    axes = [{"path": "/domain/resolution", "values": [10, 20, 30, 40]}]
+    res = _create(client, project, axes=axes, submit={"backend": "dummy"})
+    assert res.status_code == 200, res.text
+    data = res.json()
+    run_ids = [p["run_id"] for p in data["points"]]
+    # the first two fill the host's slots, in sweep order; the rest wait in the queue
+    assert launched == run_ids[:2]
+    assert data["counts"] == {"submitted": 2, "queued": 2}
+    assert (tmp_path / "sweeps" / f"sweep_{data['sweep']['id']}" / "environment.json").exists()
+
+    # a finished point shows up in the aggregate and its outputs in the results
+    done = tmp_path / "runs" / f"run_{run_ids[0]}"
+    (done / "outputs" / "monitors" / "E0.csv").write_text("t,Ez\n")
+    succeeded = StatusFile(status="succeeded", updated_at=utc_now_iso())
+    RunStore(tmp_path).save_status(run_ids[0], succeeded)
+    status = client.get(f"/sweeps/{data['sweep']['id']}").json()
+    assert status["counts"]["succeeded"] == 1
+    results = client.get(f"/sweeps/{data['sweep']['id']}/results").json()
+    assert results[0]["params"] == {"/domain/resolution": 10}
+    assert results[0]["outputs"] == ["outputs/monitors/E0.csv"]
+    assert client.get("/sweeps/missing").status_code == 404
+
+
+def test_slurm_submit_is_one_job_array(client: TestClient, tmp_path: Path, monkeypatch) -> None:
+    arrays = []
+
+    def fake_array(self, runs, backend, script_dir, **kwargs):
+        arrays.append([run.id for run, _ in runs])
+        return [
+            {
+                "pid": 0,
+                "started_at": utc_now_iso(),
+                "backend": backend,
+                "mode": "slurm",
+                "slurm_job_id": f"77_{i}",
+                "slurm_array_id": "77",
+            }
+            for i in range(len(runs))
+        ]
+
+    monkeypatch.setattr(SlurmJobRunner, "submit_array", fake_array)
+    monkeypatch.setattr(SlurmJobRunner, "poll", lambda self, ids: {j: "PENDING" for j in ids})
+    project = _project(client)
+    axes = [{"path": "/domain/resolution", "values": [10, 20, 30]}]
+    res = _create(client, project, axes=axes, submit={"mode": "slurm", "backend": "dummy"})
+    data = res.json()
+    assert arrays == [[p["run_id"] for p in data["points"]]]
+    assert data["counts"] == {"submitted": 3}
+    job_path = tmp_path / "runs" / f"run_{data['points'][2]['run_id']}" / "runtime" / "job.json"
+    assert json.loads(job_path.read_text())["slurm_job_id"] == "77_2"
+    ssh_axes = [{"path": "/domain/resolution", "values": [10]}]
+    res = _create(client, project, axes=ssh_axes, submit={"mode": "ssh"})
+    assert res.status_code == 400
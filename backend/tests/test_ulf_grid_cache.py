@@ -0,0 +1,96 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from sunstone_backend.api.app import create_app
+from sunstone_backend.settings import get_settings
+from sunstone_backend.ulf.geodesics import (
+    plebanski_tensor_from_kerr_batch,
+    plebanski_tensor_from_metric_batch,
+)
+from sunstone_backend.ulf.grid_cache import ConstitutiveGridCache, grid_key
+
+
+def test_grid_cache_matches_direct_and_persists(tmp_path):
+    cache = ConstitutiveGridCache(tmp_path / 'grids')
+    rng = np.random.default_rng(0)
+    pts = rng.normal(size=(200, 3)) * 5.0 + np.array([1.0, 2.0, 0.0])
+
+    eps, mu, xi, zeta = cache.query('schwarzschild', 0.5, 0.0, (1.0, 2.0, 0.0), pts)
+    rel = pts - np.array([1.0, 2.0, 0.0])
+    eps_d, mu_d, _, _ = plebanski_tensor_from_metric_batch(rel[:, 0], rel[:, 1], rel[:, 2], 0.5)
+    assert np.allclose(eps, eps_d, rtol=1e-5, atol=1e-8)
+    assert np.allclose(mu, mu_d, rtol=1e-5, atol=1e-8)
+    assert (
+        tmp_path / 'grids' / f"{grid_key('schwarzschild', 0.5, 0.0, (1.0, 2.0, 0.0))}.npz"
+    ).exists()
+
+    # a fresh cache instance reloads the grid from disk instead of rebuilding it
+    fresh = ConstitutiveGridCache(tmp_path / 'grids')
+    eps2, _, _, _ = fresh.query('schwarzschild', 0.5, 0.0, (1.0, 2.0, 0.0), pts)
+    assert np.allclose(eps, eps2)
+
+    k_eps, _, k_xi, _ = cache.query('kerr', 1.0, 0.7, (0.0, 0.0, 0.0), pts)
+    d_eps, _, d_xi, _ = plebanski_tensor_from_kerr_batch(pts[:, 0], pts[:, 1], pts[:, 2], 1.0, 0.7)
+    assert np.allclose(k_eps, d_eps, atol=2e-2)
+    assert np.allclose(k_xi, d_xi, atol=2e-2)
+
+
+def test_kerr_grid_scales_with_small_holes_and_skips_the_singular_core(tmp_path):
+    cache = ConstitutiveGridCache(tmp_path / 'grids')
+    rng = np.random.default_rng(1)
+    for M, a in ((0.01, 0.005), (0.1, 0.0)):
+        # shell from just outside the core to the grid edge, where the grid answers most points
+        dirs = rng.normal(size=(500, 3))
+        dirs /= np.linalg.norm(dirs, axis=1)[:, None]
+        pts = dirs * rng.uniform(2.5 * M, 11.0 * M, size=(500, 1))
+        eps, _, xi, _ = cache.query('kerr', M, a, (0.0, 0.0, 0.0), pts)
+        d_eps, _, d_xi, _ = plebanski_tensor_from_kerr_batch(
+            pts[:, 0], pts[:, 1], pts[:, 2], M, a
+        )
+        assert np.isfinite(eps).all() and np.isfinite(xi).all()
+        assert np.allclose(eps, d_eps, rtol=1e-2, atol=1e-2)
+        assert np.allclose(xi, d_xi, rtol=1e-2, atol=1e-2)
+
+
+def test_grid_cache_evicts_least_recently_used(tmp_path):
+    cache = ConstitutiveGridCache(tmp_path / 'grids', max_bytes=10**9)
+    pts = np.array([[3.0, 0.0, 0.0]])
+    cache.query('schwarzschild', 0.1, 0.0, (0.0, 0.0, 0.0), pts)
+    cache.query('schwarzschild', 0.2, 0.0, (0.0, 0.0, 0.0), pts)
+    files = sorted((tmp_path / 'grids').glob('*.npz'))
+    assert len(files) == 2
+    # shrink the budget to a single grid: the oldest one goes
+    cache.max_bytes = max(p.stat().st_size for p in files)
+    cache.query('schwarzschild', 0.3, 0.0, (0.0, 0.0, 0.0), pts)
+    remaining = {p.stem for p in (tmp_path / 'grids').glob('*.npz')}
+    assert remaining == {grid_key('schwarzschild', 0.3)}
+
+
+def test_ulf_metric_endpoint_uses_grid_cache(tmp_path):
+    settings = get_settings()
+    settings.data_dir = tmp_path
+    client = TestClient(create_app())
+    body = {
+        'object': {
+            'id': 'k1',
+            'kind': 'kerr',
+            'params': {'M': 1.0, 'a': 0.5},
+            'center': {'x': 0.0, 'y': 0.0, 'z': 0.0},
+        },
+        'points': [{'x': 3.0, 'y': 1.0, 'z': 0.2}, {'x': 8.0, 'y': -2.0, 'z': 1.0}],
+    }
+    res = client.post('/ulf/metric', json=body)
+    assert res.status_code == 200
+    samples = res.json()['samples']
+    assert len(samples) == 2
+    assert np.isclose(samples[0]['r'], np.sqrt(9.0 + 1.0 + 0.04))
+    assert list((tmp_path / 'ulf' / 'grids').glob('*.npz'))
+
+    # a point whose grid cell touches the singular origin node of an a = 0 hole
+    body['object']['params'] = {'M': 0.1}
+    body['points'] = [{'x': 0.35, 'y': 0.0, 'z': 0.0}]
+    sample = client.post('/ulf/metric', json=body).json()['samples'][0]
+    assert np.isfinite(np.array([sample[k] for k in ('eps', 'mu', 'xi', 'zeta')])).all()
+
+    body['object']['kind'] = 'cosmic_string'
+    assert client.post('/ulf/metric', json=body).status_code == 400
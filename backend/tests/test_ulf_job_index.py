@@ -0,0 +1,44 @@
+import json
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+from sunstone_backend.ulf.job_index import TraceJobIndex
+
+
+def _mark_all(root, job_id, indices):
+    index = TraceJobIndex(root)
+    for i in indices:
+        index.mark_shard(job_id, i, 'done')
+
+
+def test_concurrent_shard_updates_are_not_lost(tmp_path):
+    index = TraceJobIndex(tmp_path)
+    n = 64
+    index.create(
+        'job1',
+        {'status': 'running', 'shards': ['pending'] * n, 'shards_done': 0, 'shards_total': n},
+    )
+
+    # half the shards from threads, half from another process
+    proc = multiprocessing.get_context('spawn').Process(
+        target=_mark_all, args=(tmp_path, 'job1', range(0, n, 2))
+    )
+    proc.start()
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        list(ex.map(lambda i: index.mark_shard('job1', i, 'done'), range(1, n, 2)))
+    proc.join(60)
+    assert proc.exitcode == 0
+
+    info = index.get('job1')
+    assert info['shards'] == ['done'] * n
+    assert info['shards_done'] == n
+
+
+def test_get_unknown_invalid_and_legacy(tmp_path):
+    index = TraceJobIndex(tmp_path)
+    assert index.get('missing') is None
+    assert index.get('../etc/passwd') is None
+    assert index.update('missing', status='done') is None
+
+    (tmp_path / 'jobs_index.json').write_text(json.dumps({'old': {'status': 'done', 'path': None}}))
+    assert index.get('old') == {'status': 'done', 'path': None}
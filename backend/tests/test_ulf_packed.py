@@ -0,0 +1,129 @@
+import io
+import time
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from sunstone_backend.api.app import create_app
+from sunstone_backend.settings import get_settings
+from sunstone_backend.ulf.packed import (
+    MAGIC,
+    concat_packed,
+    decode_binary,
+    encode_binary,
+    pack_traces,
+)
+
+BODY = {
+    "objects": [
+        {
+            "id": "bh1",
+            "kind": "schwarzschild",
+            "params": {"M": 0.01},
+            "center": {"x": 0.0, "y": 0.0, "z": 0.0},
+        }
+    ],
+    "sources": [
+        {
+            "kind": "point",
+            "position": {"x": -10.0, "y": 1.0, "z": 0.0},
+            "direction": {"x": 1.0, "y": 0.0, "z": 0.0},
+        },
+        {"kind": "point", "position": {"x": 0.0, "y": 0.0, "z": 0.0}},
+    ],
+    "samples": 25,
+    "model": "schwarzschild",
+}
+
+
+def _check_against_json(packed, traces):
+    off = packed['offsets']
+    moff = packed['metric_offsets']
+    assert len(off) == len(traces) + 1
+    for i, t in enumerate(traces):
+        pts = packed['points'][off[i]:off[i + 1]]
+        want = np.array([[p['x'], p['y'], p['z']] for p in t['points']])
+        assert np.allclose(pts, want, rtol=1e-6, atol=1e-6)
+        if t['metric_samples']:
+            eps = packed['eps'][moff[i]:moff[i + 1]]
+            assert np.allclose(eps, [m['eps'] for m in t['metric_samples']], rtol=1e-6)
+        else:
+            assert moff[i] == moff[i + 1]
+
+
+def test_binary_roundtrip():
+    traces = [
+        {'points': [{'x': 1.0, 'y': 2.0, 'z': 0.0}], 'metric_samples': None},
+        {
+            'points': [{'x': 0.0, 'y': 0.0, 'z': 0.0}, {'x': 1.0, 'y': 1.0, 'z': 0.0}],
+            'metric_samples': [
+                {'r': 1.0, 'eps': np.eye(3).tolist(), 'mu': np.eye(3).tolist(),
+                 'xi': None, 'zeta': None},
+            ] * 2,
+        },
+    ]
+    packed = pack_traces(traces)
+    buf = encode_binary(packed)
+    assert buf.startswith(MAGIC)
+    out = decode_binary(buf)
+    for name, arr in packed.items():
+        assert out[name].dtype == arr.dtype
+        assert np.array_equal(out[name], arr, equal_nan=True)
+    assert out['points'].dtype == np.float32
+    assert np.isnan(out['xi']).all()
+    assert list(out['metric_offsets']) == [0, 0, 2]
+
+
+def test_concat_packed_keeps_ray_order():
+    metric = {'r': 1.0, 'eps': np.eye(3).tolist(), 'mu': None, 'xi': None, 'zeta': None}
+    traces = [
+        {'points': [{'x': 1.0, 'y': 2.0, 'z': 0.0}], 'metric_samples': [metric]},
+        {'points': [{'x': 0.0, 'y': 0.0, 'z': 0.0}] * 3, 'metric_samples': None},
+        {'points': [{'x': 5.0, 'y': 5.0, 'z': 1.0}] * 2, 'metric_samples': [metric] * 2},
+    ]
+    joined = concat_packed([pack_traces(traces[:1]), pack_traces(traces[1:])])
+    whole = pack_traces(traces)
+    for name, arr in whole.items():
+        assert np.array_equal(joined[name], arr, equal_nan=True), name
+
+
+def test_trace_binary_matches_json(tmp_path):
+    get_settings().data_dir = tmp_path
+    client = TestClient(create_app())
+    traces = client.post('/ulf/trace', json=BODY).json()['traces']
+    res = client.post('/ulf/trace?format=binary', json=BODY)
+    assert res.status_code == 200
+    assert res.headers['content-type'] == 'application/octet-stream'
+    packed = decode_binary(res.content)
+    _check_against_json(packed, traces)
+    # compact: float32 arrays instead of nested JSON lists
+    assert len(res.content) < len(client.post('/ulf/trace', json=BODY).content) / 2
+
+    assert client.post('/ulf/trace?format=xml', json=BODY).status_code == 422
+
+
+def test_trace_job_download(tmp_path):
+    get_settings().data_dir = tmp_path
+    client = TestClient(create_app())
+    job_id = client.post('/ulf/trace_job', json=BODY).json()['job_id']
+    for _ in range(50):
+        info = client.get(f'/ulf/trace_job/{job_id}').json()
+        if info['status'] == 'done':
+            break
+        time.sleep(0.1)
+    assert info['status'] == 'done'
+    traces = info['result']['traces']
+
+    res = client.get(f'/ulf/trace_job/{job_id}/download')
+    assert res.status_code == 200
+    _check_against_json(decode_binary(res.content), traces)
+
+    res = client.get(f'/ulf/trace_job/{job_id}/download?format=npz')
+    assert res.status_code == 200
+    with np.load(io.BytesIO(res.content)) as data:
+        _check_against_json({k: data[k] for k in data.files}, traces)
+
+    res = client.get(f'/ulf/trace_job/{job_id}/download?format=json')
+    assert res.json()['traces'] == traces
+
+    assert client.get('/ulf/trace_job/nope/download').status_code == 404
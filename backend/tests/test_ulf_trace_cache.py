@@ -0,0 +1,97 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from sunstone_backend.api.app import create_app
+from sunstone_backend.settings import get_settings
+from sunstone_backend.ulf.trace_cache import TraceCache
+
+
+def _source(y):
+    return {
+        "kind": "point",
+        "position": {"x": -10.0, "y": y, "z": 0.0},
+        "direction": {"x": 1.0, "y": 0.0, "z": 0.0},
+    }
+
+
+def _body(ys, extra_objects=()):
+    return {
+        "objects": [
+            {
+                "id": "bh1",
+                "kind": "schwarzschild",
+                "params": {"M": 0.05},
+                "center": {"x": 0.0, "y": 0.0, "z": 0.0},
+            },
+            *extra_objects,
+        ],
+        "sources": [_source(y) for y in ys],
+        "samples": 20,
+        "model": "schwarzschild",
+    }
+
+
+def test_trace_cache_reuses_unchanged_rays(tmp_path):
+    get_settings().data_dir = tmp_path
+    client = TestClient(create_app())
+    client.delete('/ulf/cache')
+
+    first = client.post('/ulf/trace', json=_body([1.0, 2.0, 3.0])).json()['traces']
+    stats = client.get('/ulf/cache').json()
+    assert stats['misses'] == 3 and stats['hits'] == 0
+    assert stats['disk_entries'] == 3
+
+    # identical request: all hits, identical results
+    again = client.post('/ulf/trace', json=_body([1.0, 2.0, 3.0])).json()['traces']
+    assert again == first
+    assert client.get('/ulf/cache').json()['hits'] == 3
+
+    # edited scene: one source moved, an unrelated object without a radius added
+    label = {
+        "id": "label",
+        "kind": "cylinder",
+        "params": {"height": 1.0},
+        "center": {"x": 5.0, "y": 5.0, "z": 0.0},
+    }
+    edited = client.post('/ulf/trace', json=_body([1.0, 2.5, 3.0], [label])).json()['traces']
+    stats = client.get('/ulf/cache').json()
+    assert stats['hits'] == 5 and stats['misses'] == 4
+    assert edited[0] == first[0] and edited[2] == first[2]
+
+    # an obstacle does change every ray's inputs
+    wall = {
+        "id": "wall",
+        "kind": "cylinder",
+        "params": {"radius": 0.5},
+        "center": {"x": 5.0, "y": 2.0, "z": 0.0},
+    }
+    client.post('/ulf/trace', json=_body([1.0, 2.0, 3.0], [wall]))
+    assert client.get('/ulf/cache').json()['misses'] == 7
+
+
+def test_trace_cache_disk_tier_and_eviction(tmp_path):
+    ray = {'points': np.zeros((100, 3)), 'r': np.ones(100)}
+    cache = TraceCache(tmp_path, max_bytes=10 ** 9, memory_bytes=1)
+    for k in range(4):
+        cache.put(f'{k:02x}' * 32, ray)
+    # the memory tier holds a single entry; older ones come back from disk
+    got = TraceCache(tmp_path).get('00' * 32)
+    assert np.array_equal(got['r'], ray['r'])
+    assert cache.get('00' * 32) is not None
+    assert cache.stats()['disk_hits'] == 1
+    assert cache.get('ff' * 32) is None and cache.stats()['misses'] == 1
+
+    per_entry = cache.disk_usage()[1] // 4
+    cache.max_bytes = 2 * per_entry
+    assert cache.evict() == 2
+    assert cache.disk_usage()[0] == 2
+
+
+def test_trace_cache_entries_own_their_arrays(tmp_path):
+    # engines cache per-ray slices of whole-batch arrays
+    batch = np.zeros((1000, 50, 3))
+    cache = TraceCache(tmp_path)
+    cache.put('ab' * 32, {'points': batch[3]})
+    got = cache.get('ab' * 32)
+    assert got['points'].base is None and not np.shares_memory(got['points'], batch)
+    assert cache.stats()['memory_bytes'] == batch[3].nbytes
@@ -1,3 +1,4 @@
+import json
 import time
 from fastapi.testclient import TestClient
 from sunstone_backend.api.app import create_app
@@ -32,4 +33,181 @@ def test_ulf_trace_job_flow(tmp_path):
             assert len(result['traces'][0]['metric_samples']) == 30
             return
         time.sleep(0.1)
-    assert False, 'job did not finish in time'
\ No newline at end of file
+    raise AssertionError('job did not finish in time')
+
+def test_ulf_trace_job_sharded_process_pool(tmp_path):
+    from sunstone_backend.settings import get_settings
+    from sunstone_backend.ulf.job_index import get_job_index
+
+    settings = get_settings()
+    settings.data_dir = tmp_path
+    old = (settings.ulf_trace_workers, settings.ulf_trace_shard_rays)
+    settings.ulf_trace_workers = 2
+    settings.ulf_trace_shard_rays = 2
+    try:
+        client = TestClient(create_app())
+        body = {
+            "objects": [
+                {
+                    "id": "bh1",
+                    "kind": "schwarzschild",
+                    "params": {"M": 0.01},
+                    "center": {"x": 0.0, "y": 0.0, "z": 0.0},
+                }
+            ],
+            "sources": [
+                {
+                    "kind": "point",
+                    "position": {"x": -10.0, "y": 1.0 + 0.5 * k, "z": 0.0},
+                    "direction": {"x": 1.0, "y": 0.0, "z": 0.0},
+                }
+                for k in range(5)
+            ],
+            "samples": 20,
+            "model": "schwarzschild",
+        }
+        job_id = client.post('/ulf/trace_job', json=body).json()['job_id']
+
+        info = client.get(f'/ulf/trace_job/{job_id}').json()
+        if info['status'] != 'done':
+            assert info['progress']['shards_total'] == 3
+
+        for _ in range(600):
+            info = client.get(f'/ulf/trace_job/{job_id}').json()
+            if info['status'] == 'done':
+                break
+            assert info['status'] == 'running', info
+            time.sleep(0.1)
+        assert info['status'] == 'done', 'job did not finish in time'
+
+        # every shard was persisted before the job was marked done
+        index_info = get_job_index(tmp_path).get(job_id)
+        assert index_info['shards'] == ['done'] * 3 and index_info['shards_done'] == 3
+
+        traces = info['result']['traces']
+        # shards are reassembled in source order and match a direct trace
+        direct = client.post('/ulf/trace', json=body).json()['traces']
+        assert len(traces) == 5
+        for got, want in zip(traces, direct, strict=True):
+            assert got['points'] == want['points']
+    finally:
+        settings.ulf_trace_workers, settings.ulf_trace_shard_rays = old
+
+
+def test_single_shard_trace_job_runs_in_the_pool(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from sunstone_backend.api.routes import ulf
+    from sunstone_backend.settings import get_settings
+    from sunstone_backend.ulf.job_index import get_job_index
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'data_dir', tmp_path)
+    pools = []
+
+    def fake_pool(s):
+        pools.append(ThreadPoolExecutor(max_workers=1))
+        return pools[-1]
+
+    monkeypatch.setattr(ulf, '_get_trace_pool', fake_pool)
+    client = TestClient(create_app())
+    body = {
+        "objects": [
+            {
+                "id": "bh1",
+                "kind": "schwarzschild",
+                "params": {"M": 0.01},
+                "center": {"x": 0.0, "y": 0.0, "z": 0.0},
+            }
+        ],
+        "sources": [
+            {
+                "kind": "point",
+                "position": {"x": -10.0, "y": 1.0, "z": 0.0},
+                "direction": {"x": 1.0, "y": 0.0, "z": 0.0},
+            }
+        ],
+        "samples": 10,
+        "model": "schwarzschild",
+    }
+    job_id = client.post('/ulf/trace_job', json=body).json()['job_id']
+    for _ in range(100):
+        info = get_job_index(tmp_path).get(job_id)
+        if info['status'] != 'running':
+            break
+        time.sleep(0.05)
+    assert info['status'] == 'done'
+    assert info['shards'] == ['done']
+    assert len(pools) == 1
+    pools[0].shutdown()
+
+
+def test_trace_job_workers_write_results_and_report_failures(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from sunstone_backend.api.routes import ulf
+    from sunstone_backend.settings import get_settings
+    from sunstone_backend.ulf.job_index import get_job_index
+    from sunstone_backend.ulf.packed import read_npz
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'data_dir', tmp_path)
+    monkeypatch.setattr(settings, 'ulf_trace_shard_rays', 2)
+    pool = ThreadPoolExecutor(max_workers=2)
+    futures = []
+
+    class RecordingPool:
+        def submit(self, *args):
+            futures.append(pool.submit(*args))
+            return futures[-1]
+
+    monkeypatch.setattr(ulf, '_get_trace_pool', lambda s: RecordingPool())
+    client = TestClient(create_app())
+    body = {
+        "objects": [
+            {
+                "id": "bh1",
+                "kind": "schwarzschild",
+                "params": {"M": 0.01},
+                "center": {"x": 0.0, "y": 0.0, "z": 0.0},
+            }
+        ],
+        "sources": [
+            {
+                "kind": "point",
+                "position": {"x": -10.0, "y": 1.0 + 0.5 * k, "z": 0.0},
+                "direction": {"x": 1.0, "y": 0.0, "z": 0.0},
+            }
+            for k in range(5)
+        ],
+        "samples": 10,
+        "model": "schwarzschild",
+    }
+    try:
+        job_id = client.post('/ulf/trace_job', json=body).json()['job_id']
+        # the workers persist everything themselves; no rays come back to the API process
+        assert [fut.result(timeout=60) for fut in futures] == [None] * 3
+        info = get_job_index(tmp_path).get(job_id)
+        assert info['status'] == 'done' and info['shards'] == ['done'] * 3
+        with open(info['path']) as f:
+            traces = json.load(f)['traces']
+        direct = client.post('/ulf/trace', json=body).json()['traces']
+        assert traces == direct
+        assert list(read_npz(info['packed_path'])['offsets']) == [10 * k for k in range(6)]
+
+        def broken(payload):
+            raise RuntimeError('engine exploded')
+
+        monkeypatch.setattr(ulf, '_trace_rays', broken)
+        futures.clear()
+        job_id = client.post('/ulf/trace_job', json=body).json()['job_id']
+        # the failure is recorded by a done-callback, which may run just after result() returns
+        for _ in range(100):
+            info = get_job_index(tmp_path).get(job_id)
+            if info['status'] != 'running':
+                break
+            time.sleep(0.05)
+        assert info['status'] == 'error' and info['error'] == 'engine exploded'
+        assert 'error' in info['shards'] and 'done' not in info['shards']
+    finally:
+        pool.shutdown()
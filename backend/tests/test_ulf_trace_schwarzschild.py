@@ -29,3 +29,36 @@ def test_ulf_trace_schwarzschild_samples():
     assert all(len(row) == 3 for row in eps0)
     # values should be finite and positive
     assert all(isinstance(val, (int, float)) for row in eps0 for val in row)
+
+
+def test_ulf_trace_accepts_tolerances_and_validates_them():
+    app = create_app()
+    client = TestClient(app)
+    body = {
+        "objects": [
+            {
+                "id": "bh1",
+                "kind": "schwarzschild",
+                "params": {"M": 0.01},
+                "center": {"x": 0.0, "y": 0.0, "z": 0.0},
+            }
+        ],
+        "sources": [
+            {
+                "kind": "point",
+                "position": {"x": -10.0, "y": 1.0, "z": 0.0},
+                "direction": {"x": 1.0, "y": 0.0, "z": 0.0},
+            }
+        ],
+        "samples": 20,
+        "model": "schwarzschild",
+        "rtol": 1e-8,
+        "atol": 1e-10,
+    }
+    res = client.post('/ulf/trace', json=body)
+    assert res.status_code == 200
+    assert len(res.json()['traces'][0]['points']) == 20
+
+    body["rtol"] = 0
+    res = client.post('/ulf/trace', json=body)
+    assert res.status_code == 422
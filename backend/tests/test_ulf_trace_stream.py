@@ -0,0 +1,74 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from sunstone_backend.api.app import create_app
+from sunstone_backend.settings import get_settings
+
+
+def _body(n):
+    return {
+        "objects": [
+            {
+                "id": "bh1",
+                "kind": "schwarzschild",
+                "params": {"M": 0.01},
+                "center": {"x": 0.0, "y": 0.0, "z": 0.0},
+            }
+        ],
+        "sources": [
+            {
+                "kind": "point",
+                "position": {"x": -10.0, "y": 1.0 + 0.5 * k, "z": 0.0},
+                "direction": {"x": 1.0, "y": 0.0, "z": 0.0},
+            }
+            for k in range(n)
+        ],
+        "samples": 15,
+        "model": "schwarzschild",
+    }
+
+
+def test_trace_job_stream_ndjson_and_sse_resume(tmp_path):
+    settings = get_settings()
+    settings.data_dir = tmp_path
+    old = (settings.ulf_trace_workers, settings.ulf_trace_shard_rays)
+    settings.ulf_trace_workers = 2
+    settings.ulf_trace_shard_rays = 2
+    try:
+        client = TestClient(create_app())
+        job_id = client.post('/ulf/trace_job', json=_body(5)).json()['job_id']
+
+        res = client.get(f'/ulf/trace_job/{job_id}/stream')
+        assert res.status_code == 200
+        assert res.headers['content-type'].startswith('application/x-ndjson')
+        lines = [json.loads(line) for line in res.text.splitlines() if line]
+        assert lines[-1] == {'status': 'done'}
+        assert [line['index'] for line in lines[:-1]] == [0, 1, 2, 3, 4]
+        assert all(len(line['trace']['points']) == 15 for line in lines[:-1])
+
+        for _ in range(100):
+            info = client.get(f'/ulf/trace_job/{job_id}').json()
+            if info['status'] == 'done':
+                break
+            time.sleep(0.1)
+        assert [line['trace'] for line in lines[:-1]] == info['result']['traces']
+
+        # resume from an offset in the middle of a shard
+        res = client.get(f'/ulf/trace_job/{job_id}/stream?offset=3')
+        indices = [json.loads(line).get('index') for line in res.text.splitlines() if line]
+        assert indices == [3, 4, None]
+
+        res = client.get(
+            f'/ulf/trace_job/{job_id}/stream?format=sse', headers={'Last-Event-ID': '1'}
+        )
+        assert res.headers['content-type'].startswith('text/event-stream')
+        events = [e for e in res.text.split('\n\n') if e]
+        ids = [line[4:] for e in events for line in e.splitlines() if line.startswith('id: ')]
+        assert ids == ['2', '3', '4']
+        assert events[-1].startswith('event: status')
+
+        assert client.get('/ulf/trace_job/nope/stream').status_code == 404
+    finally:
+        settings.ulf_trace_workers, settings.ulf_trace_shard_rays = old
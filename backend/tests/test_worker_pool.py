@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from sunstone_backend.jobs import LocalJobRunner
+from sunstone_backend.store import RunStore
+from sunstone_backend.worker_pool import WorkerPool, _WarmWorker
+
+SPEC = {"version": "0.1", "monitors": [{"type": "point", "id": "E0"}]}
+
+
+def _wait(predicate, timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.02)
+
+
+def _pid_gone(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    return False
+
+
+def _ready_pool(**kwargs) -> WorkerPool:
+    pool = WorkerPool(**kwargs)
+    worker = pool.warm(sys.executable, "dummy")
+    assert worker.ready.wait(60)
+    return pool
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> RunStore:
+    return RunStore(tmp_path)
+
+
+def _run(store: RunStore, spec: dict = SPEC):
+    proj = store.create_project("pool")
+    run = store.create_run(project_id=proj["id"], spec=spec, backend="dummy")
+    return run, store.run_dir(run.id)
+
+
+def test_warm_worker_forks_runs(store: RunStore) -> None:
+    pool = _ready_pool()
+    try:
+        warm_pid = pool.stats()[0]["pid"]
+        for _ in range(2):
+            run, run_dir = _run(store)
+            t0 = time.perf_counter()
+            pid = pool.submit(sys.executable, "dummy", run_dir)
+            assert pid is not None and pid != warm_pid
+            # dispatch is a fork, not an interpreter start
+            assert time.perf_counter() - t0 < 1.0
+            _wait(lambda run_id=run.id: store.load_status(run_id).status == "succeeded")
+            assert (run_dir / "outputs" / "monitors" / "E0.zarr").exists()
+            assert (run_dir / "logs" / "stderr.log").exists()
+        assert pool.stats()[0]["pid"] == warm_pid
+    finally:
+        pool.shutdown()
+
+
+def test_worker_recycles_after_max_runs(store: RunStore) -> None:
+    pool = _ready_pool(max_runs=1)
+    try:
+        first = pool.stats()[0]["pid"]
+        _, run_dir = _run(store)
+        assert pool.submit(sys.executable, "dummy", run_dir) is not None
+        # the retired worker is replaced right away
+        _wait(lambda: any(w["pid"] != first and w["ready"] for w in pool.stats()))
+        _wait(lambda: _pid_gone(first))
+    finally:
+        pool.shutdown()
+
+
+def test_cancel_kills_only_the_run(store: RunStore) -> None:
+    pool = _ready_pool()
+    try:
+        warm_pid = pool.stats()[0]["pid"]
+        # the run blocks reading its spec from a FIFO nobody writes to until it is canceled
+        run, run_dir = _run(store)
+        (run_dir / "spec.json").unlink()
+        os.mkfifo(run_dir / "spec.json")
+        pid = pool.submit(sys.executable, "dummy", run_dir)
+        assert pid is not None
+        os.killpg(pid, signal.SIGTERM)
+        _wait(lambda: _pid_gone(pid))
+        assert not _pid_gone(warm_pid)
+    finally:
+        pool.shutdown()
+
+
+def test_local_runner_starts_cold_until_pool_is_warm(store: RunStore, monkeypatch) -> None:
+    pool = WorkerPool()
+    launched = []
+
+    class FakePopen:
+        def __init__(self, cmd, **kwargs):
+            launched.append(cmd)
+            self.pid = 4321
+
+    try:
+        run, run_dir = _run(store)
+        monkeypatch.setattr(pool, "submit", lambda python, backend, run_dir: None)
+        monkeypatch.setattr("sunstone_backend.jobs.subprocess.Popen", FakePopen)
+        job = LocalJobRunner(pool=pool).submit(run=run, run_dir=run_dir, backend="dummy")
+        assert job.pid == 4321
+        assert launched and launched[0][1:3] == ["-m", "sunstone_backend.worker"]
+    finally:
+        pool.shutdown()
+
+
+def test_replies_buffered_together_are_read_one_by_one() -> None:
+    read_fd, write_fd = os.pipe()
+
+    class FakeProc:
+        stdout = os.fdopen(read_fd, "rb", buffering=0)
+
+    worker = _WarmWorker(FakeProc())
+    try:
+        os.write(write_fd, b'{"pid": 1}\n{"pid": 2}\n{"pi')
+        assert WorkerPool._readline(worker, 1.0) == '{"pid": 1}'
+        # the second reply arrived in the same read; it must not wait for the pipe
+        assert WorkerPool._readline(worker, 0.0) == '{"pid": 2}'
+        assert WorkerPool._readline(worker, 0.05) is None
+        os.write(write_fd, b'd": 3}\n')
+        assert WorkerPool._readline(worker, 1.0) == '{"pid": 3}'
+        os.close(write_fd)
+        assert WorkerPool._readline(worker, 1.0) is None
+    finally:
+        FakeProc.stdout.close()
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnhandledThreadExceptionWarning")
+def test_unreadable_worker_is_discarded_and_marked_failed(monkeypatch) -> None:
+    class FakePopen:
+        # like the Popen stand-ins other tests install: no real pipes behind it
+        def __init__(self, cmd, **kwargs):
+            self.pid = 4321
+            self.stdin = None
+            self.stdout = b""
+
+        def poll(self):
+            return 0
+
+    monkeypatch.setattr("sunstone_backend.worker_pool.subprocess.Popen", FakePopen)
+    pool = WorkerPool()
+    worker = pool.warm(sys.executable, "dummy")
+    assert worker is not None
+    _wait(lambda: not pool.stats(), timeout=5)
+    assert not worker.ready.is_set()
+    assert pool.warm(sys.executable, "dummy") is None
+    assert pool.submit(sys.executable, "dummy", Path("unused")) is None
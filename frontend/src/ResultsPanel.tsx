@@ -1,5 +1,5 @@
 import React, { useEffect, useState } from 'react'
-import { getArtifacts, downloadArtifactUrl } from './sunstoneApi'
+import { getArtifacts, downloadArtifactUrl, listMonitors, monitorCsvUrl } from './sunstoneApi'
 import type { ArtifactEntry } from './types'
 
 type Props = {
@@ -20,6 +20,14 @@ type Props = {
   setBoundaryPerFace?: (v: boolean) => void
 }
 
+function monitorUrl(runId: string, key: string) {
+  return key.startsWith('zarr:') ? monitorCsvUrl(runId, key.slice(5)) : downloadArtifactUrl(runId, key)
+}
+
+function monitorLabel(key: string) {
+  return key.startsWith('zarr:') ? key.slice(5) : key.split('/').slice(-1)[0]
+}
+
 function paletteColor(name: 'viridis' | 'jet' | 'gray' | 'lava', t: number) {
   const x = Math.max(0, Math.min(1, t))
   if (name === 'gray') {
@@ -197,6 +205,8 @@ const ResultsPanel: React.FC<Props> = ({
   const [artifacts, setArtifacts] = useState<ArtifactEntry[]>([])
   const [selectedField, setSelectedField] = useState<string | null>(null)
   const [selectedMonitor, setSelectedMonitor] = useState<string | null>(null)
+  // Monitors recorded as Zarr, shown through the backend's CSV export (keys 'zarr:<id>')
+  const [zarrMonitors, setZarrMonitors] = useState<string[]>([])
   const [fieldPayload, setFieldPayload] = useState<any | null>(null)
 
   // Monitor plotting state
@@ -231,6 +241,15 @@ const ResultsPanel: React.FC<Props> = ({
       } catch (err) {
         // ignore
       }
+      try {
+        const mons = await listMonitors(runId)
+        if (!mounted) return
+        const keys = mons.map((m) => `zarr:${m.id}`)
+        setZarrMonitors(keys)
+        setSelectedMonitor((current) => current ?? keys[0] ?? null)
+      } catch (err) {
+        // older backends have no monitor listing
+      }
     }
     poll()
     if (livePreview) timer = window.setInterval(poll, 3000)
@@ -260,7 +279,7 @@ const ResultsPanel: React.FC<Props> = ({
     async function fetchMonitor() {
       if (!runId || !selectedMonitor) return
       try {
-        const res = await fetch(downloadArtifactUrl(runId, selectedMonitor))
+        const res = await fetch(monitorUrl(runId, selectedMonitor))
         if (!res.ok) return
         const text = await res.text()
         const parsed = parseCSV(text)
@@ -280,6 +299,11 @@ const ResultsPanel: React.FC<Props> = ({
 
   const fieldArtifacts = artifacts.filter((a) => a.path.includes('outputs/fields/') && a.path.endsWith('.json'))
   const monitorArtifacts = artifacts.filter((a) => a.path.includes('outputs/monitors/') && a.path.endsWith('.csv'))
+  // CSV artifacts first; Zarr monitors without an exported CSV next to them
+  const monitorKeys = [
+    ...monitorArtifacts.map((a) => a.path),
+    ...zarrMonitors.filter((k) => !monitorArtifacts.some((a) => a.path.endsWith(`/${k.slice(5)}.csv`))),
+  ]
 
   return (
     <div className="results-panel panel" style={{ padding: 12, marginBottom: 12 }}>
@@ -342,7 +366,7 @@ const ResultsPanel: React.FC<Props> = ({
 
       <div>
         <div style={{ display: 'flex', gap: 8, marginBottom: 8 }}>
-          {fieldArtifacts.length === 0 && monitorArtifacts.length === 0 && (
+          {fieldArtifacts.length === 0 && monitorKeys.length === 0 && (
             <div className="muted">No detector artifacts found for this run.</div>
           )}
           {fieldArtifacts.map((a) => (
@@ -369,8 +393,8 @@ const ResultsPanel: React.FC<Props> = ({
           {pointArtifacts.filter((p) => !planeArtifacts.some((a) => p.path.includes(a.path.split('_plane_field.json')[0]))).map((a) => (
             <button key={a.path} onClick={() => { setFieldPayload(null); setSelectedField(a.path); setSelectedMonitor(null) }} className={selectedField === a.path ? 'active' : ''}>{a.path.split('/').slice(-1)[0]}</button>
           ))}
-          {monitorArtifacts.map((a) => (
-            <button key={a.path} onClick={() => { setSelectedMonitor(a.path); setSelectedField(null) }} disabled={selectedMonitor === a.path}>{a.path.split('/').slice(-1)[0]}</button>
+          {monitorKeys.map((key) => (
+            <button key={key} onClick={() => { setSelectedMonitor(key); setSelectedField(null) }} disabled={selectedMonitor === key}>{monitorLabel(key)}</button>
           ))}
         </div>
 
@@ -469,8 +493,8 @@ const ResultsPanel: React.FC<Props> = ({
         {selectedMonitor && (
           <div>
             <div style={{ marginBottom: 8, display: 'flex', alignItems: 'center', gap: 8 }}>
-              <strong>{selectedMonitor.split('/').slice(-1)[0]}</strong>
-              <button style={{ marginLeft: 8 }} onClick={() => { if (!runId) return; window.open(downloadArtifactUrl(runId, selectedMonitor), '_blank') }}>Download</button>
+              <strong>{monitorLabel(selectedMonitor)}</strong>
+              <button style={{ marginLeft: 8 }} onClick={() => { if (!runId) return; window.open(monitorUrl(runId, selectedMonitor), '_blank') }}>Download</button>
               <label style={{ marginLeft: 12 }}>Plot
                 <select value={monitorPlotMode} onChange={(e) => setMonitorPlotMode(e.target.value as any)} style={{ marginLeft: 6 }}>
                   <option value="time">Time series</option>
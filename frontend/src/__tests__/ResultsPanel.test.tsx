@@ -12,6 +12,10 @@ vi.mock('../sunstoneApi', async () => {
       ]
     }),
     downloadArtifactUrl: vi.fn((runId: string, path: string) => `http://localhost:8000/runs/${runId}/artifacts/${encodeURIComponent(path)}`),
+    listMonitors: vi.fn(async () => [
+      { id: 'E0', path: 'outputs/monitors/point_group_0.zarr', components: ['Ez'], samples: 3, dtype: 'float64', complete: true },
+    ]),
+    monitorCsvUrl: vi.fn((runId: string, id: string) => `http://localhost:8000/runs/${runId}/monitors/${id}?format=csv`),
   }
 })
 
@@ -35,6 +39,10 @@ describe('ResultsPanel', () => {
         const csv = 't,value\n0,0\n1e-15,1\n2e-15,0.5\n3e-15,0.2\n4e-15,0.1'
         return Promise.resolve({ ok: true, text: async () => csv })
       }
+      if (url.endsWith('/monitors/E0?format=csv')) {
+        const csv = 't,Ez\n0,0\n1e-15,0.7\n2e-15,0.3'
+        return Promise.resolve({ ok: true, text: async () => csv })
+      }
       return Promise.resolve({ ok: false, status: 404 })
     })
   })
@@ -76,4 +84,14 @@ describe('ResultsPanel', () => {
     // FFT rendering should replace the path (still a path present)
     await waitFor(() => expect(document.querySelector('.results-panel svg path')).toBeInTheDocument())
   })
-})
\ No newline at end of file
+
+  it('plots Zarr monitors through the CSV export endpoint', async () => {
+    render(<ResultsPanel runId={'r1'} snapshotEnabled={true} setSnapshotEnabled={() => {}} livePreview={false} setLivePreview={() => {}} previewComponent={'Ez'} setPreviewComponent={() => {}} previewPalette={'viridis'} setPreviewPalette={() => {}} snapshotStride={4} setSnapshotStride={() => {}} hideCad={false} setHideCad={() => {}} />)
+
+    await waitFor(() => expect(screen.getByRole('button', { name: 'E0' })).toBeInTheDocument())
+    await userEvent.click(screen.getByRole('button', { name: 'E0' }))
+
+    await waitFor(() => expect(globalAny.fetch).toHaveBeenCalledWith('http://localhost:8000/runs/r1/monitors/E0?format=csv'))
+    await waitFor(() => expect(document.querySelector('.results-panel svg path')).toBeInTheDocument())
+  })
+})
@@ -11,6 +11,8 @@ vi.mock('../sunstoneApi', async () => {
       ]
     }),
     downloadArtifactUrl: vi.fn((runId: string, path: string) => `http://localhost:8000/runs/${runId}/artifacts/${encodeURIComponent(path)}`),
+    listMonitors: vi.fn(async () => []),
+    monitorCsvUrl: vi.fn((runId: string, id: string) => `http://localhost:8000/runs/${runId}/monitors/${id}?format=csv`),
   }
 })
 
@@ -1,4 +1,4 @@
-import type { ArtifactEntry, ProjectRecord, RunRecord } from './types'
+import type { ArtifactEntry, MonitorSeriesEntry, ProjectRecord, RunRecord } from './types'
 import { apiBaseUrl } from './config'
 
 async function http<T>(path: string, init?: RequestInit): Promise<T> {
@@ -97,6 +97,15 @@ export function downloadArtifactUrl(runId: string, path: string): string {
   return `${apiBaseUrl}/runs/${encodeURIComponent(runId)}/artifacts/${encodeURIComponent(path)}`
 }
 
+export async function listMonitors(runId: string): Promise<MonitorSeriesEntry[]> {
+  return await http<MonitorSeriesEntry[]>(`/runs/${encodeURIComponent(runId)}/monitors`)
+}
+
+// CSV export of a monitor recorded as Zarr (outputs/monitors/*.zarr), generated by the backend
+export function monitorCsvUrl(runId: string, monitorId: string): string {
+  return `${apiBaseUrl}/runs/${encodeURIComponent(runId)}/monitors/${encodeURIComponent(monitorId)}?format=csv`
+}
+
 export async function createMaterial(body: any): Promise<{ id: string; path?: string }> {
   return await http<{ id: string; path?: string }>(`/materials`, {
     method: 'POST',
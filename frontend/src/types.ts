@@ -17,3 +17,12 @@ export type ArtifactEntry = {
   size_bytes: number
   mtime: number
 }
+
+export type MonitorSeriesEntry = {
+  id: string
+  path: string
+  components: string[]
+  samples: number
+  dtype: string
+  complete: boolean
+}
@@ -10,8 +10,10 @@ from .bundle import (
     plot_waveform,
     plot_waveform_fft,
     load_monitor_series,
+    load_monitor_spectrum,
     plot_monitor_series,
     plot_monitor_fft,
+    load_field_movie,
     export_field_movie,
 )
 
@@ -31,8 +33,10 @@ __all__ = [
     "plot_waveform",
     "plot_waveform_fft",
     "load_monitor_series",
+    "load_monitor_spectrum",
     "plot_monitor_series",
     "plot_monitor_fft",
+    "load_field_movie",
     "export_field_movie",
     # symmetry exports
     "invariant_tensor_basis",
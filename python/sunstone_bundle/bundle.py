@@ -227,14 +227,64 @@ def plot_waveform_fft(bundle: Bundle, waveform_id: str | None = None, source_id:
     plt.tight_layout()
 
 
-def load_monitor_series(run_dir: Path, monitor_id: str, component: str = "Ez"):
+def _open_monitor(run_dir: Path, monitor_id: str):
+    """(zarr group, index of the monitor in a point group or None) holding a monitor's series."""
+    import zarr
+
+    monitors_dir = run_dir / "outputs" / "monitors"
+    own = monitors_dir / f"{monitor_id}.zarr"
+    if own.exists():
+        return zarr.open_group(str(own), mode="r"), None
+    for path in sorted(monitors_dir.glob("*.zarr")):
+        group = zarr.open_group(str(path), mode="r")
+        ids = list(group.attrs.get("ids", []))
+        if monitor_id in ids and "values" in group:
+            return group, ids.index(monitor_id)
+    return None, None
+
+
+def load_monitor_series(run_dir: Path, monitor_id: str, component: str = "Ez", start: int | None = None, stop: int | None = None, step: int | None = None):
+    """(t, values) of one monitor component, for samples[start:stop:step].
+
+    Reads the Zarr outputs chunk by chunk (values may be complex); falls back to the CSV tables
+    of older runs or of the optional CSV export.
+    """
+    window = slice(start, stop, step)
+    if (run_dir / "outputs" / "monitors").exists():
+        group, index = _open_monitor(run_dir, monitor_id)
+        if group is not None:
+            n = int(group.attrs.get("samples", group["t"].shape[0]))
+            window = slice(*window.indices(n))
+            if index is None:
+                if component not in group:
+                    raise KeyError(f"{component} not recorded for monitor {monitor_id}")
+                return group["t"][window], group[component][window]
+            components = list(group.attrs["components"])
+            if component not in components:
+                raise KeyError(f"{component} not recorded for monitor {monitor_id}")
+            return group["t"][window], group["values"][window, index, components.index(component)]
+
     path = run_dir / "outputs" / "monitors" / f"{monitor_id}.csv"
     if not path.exists():
         raise FileNotFoundError(path)
-    rows = np.genfromtxt(path, delimiter=",", names=True)
-    t = rows["t"]
+    rows = np.genfromtxt(path, delimiter=",", names=True, dtype=None)
+    t = np.asarray(rows["t"], dtype=float)
     y = rows[component]
-    return t, y
+    if y.dtype.kind in "SU":
+        y = np.array([complex(v) for v in y.astype(str)])
+    return t[window], y[window]
+
+
+def load_monitor_spectrum(run_dir: Path, monitor_id: str, component: str = "Ez"):
+    """(freq, complex DFT) of a DFT monitor ("type": "dft"), from outputs/spectra/<id>.npz."""
+    path = run_dir / "outputs" / "spectra" / f"{monitor_id}.npz"
+    if not path.exists():
+        raise FileNotFoundError(path)
+    with np.load(path) as data:
+        components = data["components"].tolist()
+        if component not in components:
+            raise KeyError(f"{component} not recorded for monitor {monitor_id}")
+        return data["freq"], data["dft"][:, components.index(component)]
 
 
 def plot_monitor_series(run_dir: Path, monitor_id: str, component: str = "Ez"):
@@ -260,26 +310,43 @@ def plot_monitor_fft(run_dir: Path, monitor_id: str, component: str = "Ez"):
     plt.tight_layout()
 
 
-def export_field_movie(run_dir: Path, out_path: Path, component: str = "Ez", fps: int = 20):
-    try:
-        import imageio.v2 as imageio
-    except Exception as exc:  # pragma: no cover
-        raise RuntimeError("imageio is required for exporting movies") from exc
+def load_field_movie(run_dir: Path, component: str = "Ez"):
+    """(times, frames) of a run's field movie; frames is lazy for the Zarr store of newer runs.
+
+    A movie still being written is returned up to its last flushed frame.
+    """
+    zarr_path = run_dir / "outputs" / "fields" / "field_movie.zarr"
+    if zarr_path.exists():
+        import zarr
+
+        group = zarr.open_group(str(zarr_path), mode="r")
+        frames = int(group.attrs.get("frames", 0))
+        if component not in group:
+            raise KeyError(f"{component} not in movie data")
+        return group["times"][:frames], group[component]
 
     movie_path = run_dir / "outputs" / "fields" / "field_movie.npz"
     if not movie_path.exists():
-        raise FileNotFoundError(movie_path)
-
+        raise FileNotFoundError(zarr_path)
     data = np.load(movie_path)
     if component not in data:
         raise KeyError(f"{component} not in movie data")
+    return data["times"], data[component]
 
-    frames = data[component]
-    images = []
-    vmin, vmax = np.min(frames), np.max(frames)
-    for frame in frames:
-        norm = (frame - vmin) / (vmax - vmin + 1e-12)
-        img = (plt.cm.viridis(norm)[:, :, :3] * 255).astype(np.uint8)
-        images.append(img)
 
-    imageio.mimsave(out_path, images, fps=fps)
+def export_field_movie(run_dir: Path, out_path: Path, component: str = "Ez", fps: int = 20):
+    try:
+        import imageio.v2 as imageio
+    except Exception as exc:  # pragma: no cover
+        raise RuntimeError("imageio is required for exporting movies") from exc
+
+    times, frames = load_field_movie(run_dir, component)
+    n = len(times)
+    # one pass per chunk-sized block for the colour range, a second for the frames
+    block = 64
+    vmin = min(float(np.min(frames[i : i + block])) for i in range(0, n, block)) if n else 0.0
+    vmax = max(float(np.max(frames[i : i + block])) for i in range(0, n, block)) if n else 0.0
+    with imageio.get_writer(out_path, fps=fps) as writer:
+        for i in range(n):
+            norm = (np.asarray(frames[i]) - vmin) / (vmax - vmin + 1e-12)
+            writer.append_data((plt.cm.viridis(norm)[:, :, :3] * 255).astype(np.uint8))